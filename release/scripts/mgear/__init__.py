@@ -4,7 +4,12 @@
 from pkgutil import extend_path
 import sys
 # import exceptions
-from . import menu
+try:
+    from . import menu
+except ImportError:
+    # Maya is not available. Only the Maya free modules can be used, like
+    # the headless skin file tools (mgear.core.skin_tools)
+    menu = None
 
 # extend mGear python package by adding the current module
 __path__ = extend_path(__path__, __name__)
@@ -1,18 +1,24 @@
-import pymel.core as pm
 import mgear
 
+# pymel is imported inside the functions, so the Maya free modules of this
+# package can be used outside Maya
+
 
 def getMayaVer():
     """Get Maya version
 
     :return: Maya version
     """
+    import pymel.core as pm
+
     version = pm.versions.current()
     return version
 
 
 def aboutMgear(*args):
     """About mgear"""
+    import pymel.core as pm
+
     version = mgear.getVersion()
     note = """
 
@@ -0,0 +1,370 @@
+"""Bake world matrices to transforms without changing the current time.
+
+The bake has 2 passes. The matrices are sampled in a DG context at each
+time, so the playhead doesn't move and the viewport doesn't refresh. Then
+the channel values of all the frames are computed in one
+``transform_batch`` call per transform, and each animation curve gets
+all its keys in one bulk write.
+
+The session sampler caches the sampled world matrices, so the transfers
+of the same frame range share one sampling pass.
+"""
+
+# Maya imports
+from maya import cmds
+import maya.api.OpenMaya as om2
+
+# mGear imports
+from mgear.core import callbackManager
+from mgear.core import transform_batch
+from mgear.core.matrix_sampler import MatrixSampler
+
+CHANNELS = ("tx", "ty", "tz", "rx", "ry", "rz", "sx", "sy", "sz")
+
+# channel values tolerance, to check a bake against its world matrices
+TOLERANCE = 1e-4
+
+# session sampler and the callbacks clearing it
+_sampler = None
+_samplerCallbacks = None
+
+
+def bakeFrames(startFrame, endFrame, keyframes=None):
+    """Get the frames to bake in a frame range
+
+    Arguments:
+        startFrame (int): The first frame
+        endFrame (int): The last frame
+        keyframes (list of float, optional): Only bake the frames with a
+            key, None to bake all the frames
+
+    Returns:
+        list of int: The frames
+    """
+    frames = range(int(startFrame), int(endFrame) + 1)
+    if keyframes is None:
+        return list(frames)
+    keyframes = set(keyframes)
+    return [f for f in frames if f in keyframes]
+
+
+def _getPlug(name):
+    selectionList = om2.MSelectionList()
+    selectionList.add(name)
+    return selectionList.getPlug(0)
+
+
+def _evaluate(plugs, time):
+    # get the plug values at a time, in a DG context
+    context = om2.MDGContext(om2.MTime(time, om2.MTime.uiUnit()))
+    if hasattr(om2, "MDGContextGuard"):
+        # Maya 2022 and up, the context argument is deprecated
+        with om2.MDGContextGuard(context):
+            return [plug.asMObject() for plug in plugs]
+    return [plug.asMObject(context) for plug in plugs]
+
+
+def _matrices(plugs, frame):
+    return [
+        tuple(om2.MFnMatrixData(obj).matrix())
+        for obj in _evaluate(plugs, frame)
+    ]
+
+
+def samplePlugs(attributes, frames):
+    """Sample many matrix attributes at many frames
+
+    The attributes are evaluated in a DG context, the current time is not
+    changed.
+
+    Arguments:
+        attributes (list of str): The matrix attributes
+        frames (list of float): The frames
+
+    Returns:
+        list of list: The flat 16 floats matrices, [attribute][frame]
+    """
+    plugs = [_getPlug(a) for a in attributes]
+    result = [[] for _ in plugs]
+    for frame in frames:
+        for values, matrix in zip(result, _matrices(plugs, frame)):
+            values.append(matrix)
+    return result
+
+
+def sampleMatrices(nodes, frames, attr="worldMatrix[0]"):
+    """Sample a matrix attribute of many nodes at many frames
+
+    Arguments:
+        nodes (list of str or PyNode): The nodes
+        frames (list of float): The frames
+        attr (str, optional): The matrix attribute
+
+    Returns:
+        list of list: The flat 16 floats matrices, [node][frame]
+    """
+    return samplePlugs(["{}.{}".format(n, attr) for n in nodes], frames)
+
+
+def getSampler():
+    """Get the session matrix sampler
+
+    The world matrices requested by the transfers are sampled in one pass
+    per frame and cached. The cache is cleared when an animation curve is
+    edited, the time changes or a scene is opened.
+
+    Returns:
+        MatrixSampler: The sampler, of matrix attribute names
+    """
+    global _sampler, _samplerCallbacks
+    if _sampler is None:
+        _sampler = MatrixSampler(_matrices, _getPlug)
+        _samplerCallbacks = callbackManager.CallbackManager()
+        _samplerCallbacks.animCurveEditedCB(
+            "matrixSamplerCurveEdited", _sampler.clear
+        )
+        _samplerCallbacks.timeChangedCB(
+            "matrixSamplerTimeChanged", _sampler.clear
+        )
+        _samplerCallbacks.newSceneCB("matrixSamplerNewScene", _sampler.clear)
+    return _sampler
+
+
+def requestMatrices(nodes, frames, attr="worldMatrix[0]"):
+    """Request matrices to the session sampler, for the next sampling pass
+
+    Arguments:
+        nodes (list of str or PyNode): The nodes
+        frames (list of float): The frames
+        attr (str, optional): The matrix attribute
+    """
+    getSampler().request(["{}.{}".format(n, attr) for n in nodes], frames)
+
+
+def cachedMatrices(nodes, frames, attr="worldMatrix[0]"):
+    """Get matrices from the session sampler
+
+    The missing matrices are sampled with all the pending requests.
+
+    Arguments:
+        nodes (list of str or PyNode): The nodes
+        frames (list of float): The frames
+        attr (str, optional): The matrix attribute
+
+    Returns:
+        list of list: The flat 16 floats matrices, [node][frame]
+    """
+    return getSampler().get(
+        ["{}.{}".format(n, attr) for n in nodes], frames
+    )
+
+
+def _unitFactors():
+    # internal units to UI units, linear and angular
+    return (
+        om2.MDistance(1.0).asUnits(om2.MDistance.uiUnit()),
+        om2.MAngle(1.0).asUnits(om2.MAngle.uiUnit()),
+    )
+
+
+def _animCurve(attr):
+    curves = cmds.listConnections(
+        attr, source=True, destination=False, type="animCurve"
+    )
+    return curves[0] if curves else None
+
+
+def setKeys(attributes, frames, values):
+    """Key many attributes at many frames with bulk writes
+
+    All the frames are keyed in one call, then each animation curve gets
+    its values in one ``setAttr`` of its keys. The frame range should not
+    have other keys, cut them before.
+
+    Arguments:
+        attributes (list of str): The attributes
+        frames (list of float): The frames, sorted
+        values (list): For each attribute, the values of the frames in UI
+            units, or a single value for all the frames
+    """
+    if not attributes or not frames:
+        return
+    frames = list(frames)
+    cmds.setKeyframe(attributes, time=frames)
+
+    curves = []
+    for attr, attrValues in zip(attributes, values):
+        if not hasattr(attrValues, "__len__"):
+            attrValues = [attrValues] * len(frames)
+        curve = _animCurve(attr)
+        indices = None
+        if curve:
+            indices = cmds.keyframe(
+                curve,
+                query=True,
+                indexValue=True,
+                time=(frames[0], frames[-1]),
+            )
+        if indices and indices == list(
+            range(indices[0], indices[0] + len(frames))
+        ):
+            timeValues = []
+            for frame, value in zip(frames, attrValues):
+                timeValues.extend((frame, value))
+            cmds.setAttr(
+                "{}.ktv[{}:{}]".format(curve, indices[0], indices[-1]),
+                *timeValues
+            )
+            curves.append(curve)
+        else:
+            # animation layers or keys in the way, one key at the time
+            for frame, value in zip(frames, attrValues):
+                cmds.setKeyframe(attr, time=frame, value=value)
+
+    if curves:
+        # recompute the tangents from the new values
+        cmds.keyTangent(
+            curves,
+            edit=True,
+            time=(frames[0], frames[-1]),
+            inTangentType=cmds.keyTangent(query=True, g=True, itt=True)[0],
+            outTangentType=cmds.keyTangent(query=True, g=True, ott=True)[0],
+        )
+
+
+def _keyableChannels(node):
+    attrs = cmds.listAttr(node, keyable=True, unlocked=True, shortNames=True)
+    attrs = set(attrs or [])
+    return [i for i, c in enumerate(CHANNELS) if c in attrs]
+
+
+def _transformData(node, linear, angular):
+    # the static values of the transform matrix composition, in radians
+    # and internal units
+    def vector(attr, factor):
+        return tuple(v / factor for v in cmds.getAttr(node + attr)[0])
+
+    rotateAxis = vector(".rotateAxis", angular)
+    jointOrient = None
+    if cmds.objectType(node, isAType="joint"):
+        jointOrient = vector(".jointOrient", angular)
+    pivots = tuple(
+        vector(attr, linear)
+        for attr in (
+            ".rotatePivot",
+            ".rotatePivotTranslate",
+            ".scalePivot",
+            ".scalePivotTranslate",
+        )
+    )
+    return (
+        cmds.getAttr(node + ".rotateOrder"),
+        rotateAxis if any(rotateAxis) else None,
+        jointOrient if jointOrient and any(jointOrient) else None,
+        pivots if any(any(p) for p in pivots) else None,
+    )
+
+
+def _closestAncestors(paths):
+    # index of the closest baked ancestor of each node, or None
+    ancestors = []
+    for path in paths:
+        closest = None
+        for i, other in enumerate(paths):
+            if path.startswith(other + "|"):
+                if closest is None or len(other) > len(paths[closest]):
+                    closest = i
+        ancestors.append(closest)
+    return ancestors
+
+
+def bakeWorldMatrices(nodes, frames, matrices):
+    """Key transforms to follow world matrices, without changing the time
+
+    The parent matrices are sampled once for all the frames. A node under
+    another baked node gets its parent matrix from the ancestor target
+    matrices. Then the bake is checked in one more sampling pass, and the
+    nodes driven by other baked nodes, like a space switch on a baked
+    control, are baked again until they follow their matrices.
+    The keys of the baked channels should be cut before the bake.
+
+    Arguments:
+        nodes (list of str or PyNode): The transforms
+        frames (list of float): The frames, sorted
+        matrices (list of list): For each node, the flat 16 floats world
+            matrix of each frame
+    """
+    if not nodes or not frames:
+        return
+    paths = [cmds.ls(str(n), long=True)[0] for n in nodes]
+    linear, angular = _unitFactors()
+    data = [_transformData(p, linear, angular) for p in paths]
+    channelIndices = [_keyableChannels(p) for p in paths]
+    ancestors = _closestAncestors(paths)
+    # the parents before their children
+    order = sorted(range(len(paths)), key=lambda i: paths[i].count("|"))
+
+    def channels(i, parentMatrices):
+        local = transform_batch.multiply_matrices(
+            matrices[i], transform_batch.inverse_matrices(parentMatrices)
+        )
+        return transform_batch.matrices_to_channels(local, *data[i])
+
+    def write(indices, values):
+        attributes = []
+        attrValues = []
+        for i in indices:
+            for c in channelIndices[i]:
+                factor = linear if c < 3 else angular if c < 6 else 1.0
+                attributes.append("{}.{}".format(paths[i], CHANNELS[c]))
+                attrValues.append([v[c] * factor for v in values[i]])
+        setKeys(attributes, frames, attrValues)
+
+    # bake, with the parent matrices before the bake
+    ancestorIndices = sorted(set(a for a in ancestors if a is not None))
+    samples = samplePlugs(
+        ["{}.parentMatrix[0]".format(p) for p in paths]
+        + ["{}.worldMatrix[0]".format(paths[a]) for a in ancestorIndices],
+        frames,
+    )
+    ancestorSamples = dict(zip(ancestorIndices, samples[len(paths):]))
+    values = {}
+    for i in order:
+        parent = samples[i]
+        a = ancestors[i]
+        if a is not None:
+            # the offset to the ancestor is not baked, it stays, on top
+            # of the ancestor target matrices
+            offsets = transform_batch.multiply_matrices(
+                parent,
+                transform_batch.inverse_matrices(ancestorSamples[a]),
+            )
+            parent = transform_batch.multiply_matrices(offsets, matrices[a])
+        values[i] = channels(i, parent)
+    write(order, values)
+
+    # check the bake, with the parent matrices after the bake. Each pass
+    # fixes at least one level of dependency, plus one pass to check the
+    # last rebake
+    for _ in range(len(paths) + 1):
+        samples = sampleMatrices(paths, frames, "parentMatrix[0]")
+        rebake = []
+        for i in order:
+            newValues = channels(i, samples[i])
+            for c in channelIndices[i]:
+                if any(
+                    abs(a[c] - b[c]) > TOLERANCE
+                    for a, b in zip(newValues, values[i])
+                ):
+                    rebake.append(i)
+                    values[i] = newValues
+                    break
+        if not rebake:
+            break
+        cmds.cutKey(
+            [paths[i] for i in rebake],
+            attribute=CHANNELS,
+            time=(frames[0], frames[-1]),
+            clear=True,
+        )
+        write(rebake, values)
@@ -3,10 +3,11 @@ import re
 import traceback
 from functools import partial
 
-from .six import PY2
-
 # Maya imports
 from maya import cmds
+from maya import mel
+import maya.OpenMaya as om
+import maya.api.OpenMaya as om2
 import pymel.core as pm
 from pymel import versions
 
@@ -20,6 +21,12 @@ from mgear.core import transform
 from mgear.core import utils
 from mgear.core import attribute
 from mgear.core import vector
+from mgear.core import anim_bake
+from mgear.core import transform_batch
+from mgear.core import callbackManager
+from mgear.core.mirror_map import MirrorMap
+from mgear.core.mirror_map import cycleOffset
+from mgear.core.node_cache import NodeCache
 from mgear.core.attribute import reset_selected_channels_value
 from mgear.core.pickWalk import get_all_tag_children
 
@@ -43,6 +50,13 @@ POS_IK_TOKEN = "_spinePosition_ctl"
 # No mirror attributes ------------------------------------------------
 NO_MIRROR_ATTRIBUTES = ["isRig", "uiHost", "_ctl"]
 
+# mirror maps by rig root long name, see getMirrorMap
+_MIRROR_MAPS = {}
+
+# session node cache and the callbacks flushing it, see getNode
+_NODE_CACHE = None
+_NODE_CACHE_CALLBACKS = None
+
 ##################################################
 # util
 
@@ -385,9 +399,50 @@ def stripNamespace(nodeName):
     return nodeName.split(":")[-1]
 
 
+def _validNode(key, entry):
+    # the cached node still exists, with the same name
+    handle, _ = entry
+    if not handle.isValid():
+        return False
+    name = ":".join(key) if key[0] else key[1]
+    return om.MFnDependencyNode(handle.object()).name() == name
+
+
+def _flushNodeCache(*args):
+    if mgear.logDebug:
+        mgear.log(_NODE_CACHE.report())
+    _NODE_CACHE.clear()
+
+
+def getNodeCache():
+    """Get the session node cache of getNode
+
+    The cache is flushed when a scene is opened or a reference is loaded.
+    In debug mode, the hit rate is logged on each flush.
+
+    Returns:
+        NodeCache: The cache, of (MObjectHandle, PyNode) entries by
+            (namespace, short name)
+    """
+    global _NODE_CACHE, _NODE_CACHE_CALLBACKS
+    if _NODE_CACHE is None:
+        _NODE_CACHE = NodeCache(_validNode)
+        _NODE_CACHE_CALLBACKS = callbackManager.CallbackManager()
+        _NODE_CACHE_CALLBACKS.newSceneCB(
+            "nodeCacheNewScene", _flushNodeCache
+        )
+        _NODE_CACHE_CALLBACKS.referenceLoadedCB(
+            "nodeCacheReferenceLoaded", _flushNodeCache
+        )
+    return _NODE_CACHE
+
+
 def getNode(nodeName):
     """Get a PyNode from the string name
 
+    The nodes are cached by namespace and short name, a cached node is
+    checked to still exist with the same name. The DAG paths are not
+    cached.
 
     Args:
         nodeName (str): Node name
@@ -395,12 +450,24 @@ def getNode(nodeName):
     Returns:
         PyNode or None: The node. or None if the object can't be found
     """
+    nodeName = str(nodeName)
+    key = None
+    if "|" not in nodeName and "." not in nodeName:
+        key = (getNamespace(nodeName), stripNamespace(nodeName))
+        entry = getNodeCache().get(key)
+        if entry is not None:
+            return entry[1]
+
     try:
-        return pm.PyNode(nodeName)
+        node = pm.PyNode(nodeName)
 
     except pm.MayaNodeError:
         return None
 
+    if key is not None:
+        _NODE_CACHE.add(key, (node.__apimhandle__(), node))
+    return node
+
 
 def listAttrForMirror(node):
     """List attributes to invert the value for mirror posing
@@ -1166,6 +1233,22 @@ def spine_FKToIK(fkControls, ikControls, matchMatrix_dict=None):
     attribute.reset_SRT(ikControls)
     attribute.reset_SRT(fkControls)
 
+    for ikCtl, fk in spine_FKToIKTargets(fkControls, ikControls):
+        ikCtl.setMatrix(matchMatrix_dict[fk], worldSpace=True)
+
+
+def spine_FKToIKTargets(fkControls, ikControls):
+    """Get the fk control matched by each ik control, with the controls
+    reset. Supports component: spine_S_shape_01, spine_ik_02
+
+    Args:
+        fkControls (list): of of nodes, IN THE ORDER OF HIERARCHY
+        ikControls (list): of of nodes
+
+    Returns:
+        list: of (ik control PyNode, fk control name), in the matching
+        order
+    """
     rootFk = fkControls[0]
     endFk = fkControls[-1]
     # get the ik controls sorted from the list provided
@@ -1180,27 +1263,23 @@ def spine_FKToIK(fkControls, ikControls, matchMatrix_dict=None):
     ikPosCtl = [pm.PyNode(ik) for ik in ikControls if POS_IK_TOKEN in ik]
     tanCtl = [pm.PyNode(ik) for ik in ikControls if TAN_TOKEN in ik]
 
-    # while the nodes are reset, get the closest counterparts
-    if tanCtl:
-        closestFk2Tan = getClosestNode(tanCtl[0], fkControls)
-
-    closestFk2Tan1 = getClosestNode(tan1Ctl, fkControls)
-    closestFk2Tan0 = getClosestNode(tan0Ctl, fkControls)
-
+    targets = []
     # optional controls if they exist
     if ikPosCtl:
-        ikPosCtl[0].setMatrix(matchMatrix_dict[endFk], worldSpace=True)
+        targets.append((ikPosCtl[0], endFk))
 
     # constrain the top and bottom of the ik controls
-    ik0Ctl.setMatrix(matchMatrix_dict[rootFk], worldSpace=True)
-    ik1Ctl.setMatrix(matchMatrix_dict[endFk], worldSpace=True)
+    targets.append((ik0Ctl, rootFk))
+    targets.append((ik1Ctl, endFk))
 
+    # while the nodes are reset, get the closest counterparts
     if tanCtl:
-        tanCtl[0].setMatrix(matchMatrix_dict[closestFk2Tan], worldSpace=True)
+        targets.append((tanCtl[0], getClosestNode(tanCtl[0], fkControls)))
 
     # contrain the tan controls
-    tan0Ctl.setMatrix(matchMatrix_dict[closestFk2Tan0], worldSpace=True)
-    tan1Ctl.setMatrix(matchMatrix_dict[closestFk2Tan1], worldSpace=True)
+    targets.append((tan0Ctl, getClosestNode(tan0Ctl, fkControls)))
+    targets.append((tan1Ctl, getClosestNode(tan1Ctl, fkControls)))
+    return targets
 
 
 ##################################################
@@ -1229,9 +1308,212 @@ def getMirrorTarget(nameSpace, node):
         return node
 
 
+def _getRigRoot(node):
+    # long name of the rig root of a node, or None
+    path = cmds.ls(str(node), long=True)
+    if not path:
+        return None
+    parts = path[0].split("|")
+    for i in range(len(parts), 1, -1):
+        candidate = "|".join(parts[:i])
+        if cmds.attributeQuery("is_rig", node=candidate, exists=True):
+            return candidate
+    return None
+
+
+def _listSetMembers(objectSet):
+    # long names of the members of a set and its sub sets
+    members = []
+    for member in cmds.sets(objectSet, query=True) or []:
+        if cmds.objectType(member) == "objectSet":
+            members.extend(_listSetMembers(member))
+        else:
+            members.extend(cmds.ls(member, long=True))
+    return members
+
+
+def _channelPlug(node, attr):
+    # the plug of a numeric channel and the kind of value, or None
+    selectionList = om2.MSelectionList()
+    selectionList.add("{}.{}".format(node, attr))
+    plug = selectionList.getPlug(0)
+    obj = plug.attribute()
+    if obj.hasFn(om2.MFn.kUnitAttribute):
+        unitType = om2.MFnUnitAttribute(obj).unitType()
+        if unitType == om2.MFnUnitAttribute.kAngle:
+            return plug, "angle"
+        if unitType == om2.MFnUnitAttribute.kDistance:
+            return plug, "distance"
+        return None
+    if obj.hasFn(om2.MFn.kEnumAttribute):
+        return plug, "int"
+    if obj.hasFn(om2.MFn.kNumericAttribute):
+        numericType = om2.MFnNumericAttribute(obj).numericType()
+        if numericType in (
+            om2.MFnNumericData.kFloat,
+            om2.MFnNumericData.kDouble,
+        ):
+            return plug, "float"
+        if numericType in (
+            om2.MFnNumericData.kBoolean,
+            om2.MFnNumericData.kByte,
+            om2.MFnNumericData.kChar,
+            om2.MFnNumericData.kShort,
+            om2.MFnNumericData.kInt,
+        ):
+            return plug, "int"
+    return None
+
+
+def _readChannel(plug, kind):
+    # the value of a channel, in UI units like getAttr
+    if kind == "angle":
+        return plug.asMAngle().asUnits(om2.MAngle.uiUnit())
+    if kind == "distance":
+        return plug.asMDistance().asUnits(om2.MDistance.uiUnit())
+    if kind == "int":
+        return plug.asInt()
+    return plug.asDouble()
+
+
+def _setChannels(writes):
+    # set many channels in one command, or one at the time if it fails
+    if not writes:
+        return
+    try:
+        mel.eval(
+            "".join(
+                'setAttr "{}.{}" {};'.format(node, attr, repr(value))
+                for node, attr, value in writes
+            )
+        )
+    except RuntimeError:
+        for node, attr, value in writes:
+            try:
+                cmds.setAttr("{}.{}".format(node, attr), value)
+            except RuntimeError as e:
+                mgear.log(
+                    "applyMirror failed: {0} {1}: {2}".format(node, attr, e),
+                    mgear.sev_error,
+                )
+
+
+def getMirrorChannels(srcNode, targetNode):
+    """Get the channels to copy to mirror a node
+
+    Same channels and invert values as calculateMirrorData, but only the
+    numeric channels the target can set, as in applyMirror.
+
+    Args:
+        srcNode (PyNode): The source Node
+        targetNode (PyNode): Target node
+
+    Returns:
+        list: of (attr, target attr, invert) tuples
+    """
+    results = []
+    for attrName in listAttrForMirror(srcNode):
+        invCheckName = getInvertCheckButtonAttrName(attrName)
+        inv = 1
+        if pm.attributeQuery(
+            invCheckName, node=srcNode, shortName=True, exists=True
+        ):
+            if srcNode.attr(invCheckName).get():
+                inv = -1
+
+        if isSideElement(attrName):
+            invAttrName = swapSideLabel(attrName)
+        else:
+            invAttrName = attrName
+
+        if any(invAttrName.count(skip) for skip in NO_MIRROR_ATTRIBUTES):
+            continue
+        if not pm.attributeQuery(
+            invAttrName, node=targetNode, shortName=True, exists=True
+        ) or targetNode.attr(invAttrName).isLocked():
+            continue
+        if _channelPlug(srcNode.longName(), attrName) is None:
+            continue
+        results.append((attrName, invAttrName, inv))
+    return results
+
+
+def getMirrorMap(model):
+    """Get the mirror map of a rig
+
+    The map is built once from the controllers set: counterpart of each
+    control, invert flags and settable channels. It is cached by rig root
+    and built again when the rig is rebuilt.
+
+    Args:
+        model (str or PyNode): Rig root
+
+    Returns:
+        MirrorMap: The mirror map, the controls are long names
+    """
+    root = cmds.ls(str(model), long=True)[0]
+    cached = _MIRROR_MAPS.get(root)
+    if cached is not None:
+        handle, mirrorMap = cached
+        if (
+            handle.isValid()
+            and om2.MFnDagNode(handle.object()).fullPathName() == root
+        ):
+            return mirrorMap
+
+    nameSpace = getNamespace(root.split("|")[-1])
+    mirrorMap = MirrorMap()
+    controlSet = root.split("|")[-1] + CTRL_GRP_SUFFIX
+    if cmds.objExists(controlSet):
+        for control in set(_listSetMembers(controlSet)):
+            node = pm.PyNode(control)
+            target = getMirrorTarget(nameSpace, node)
+            if target is None:
+                continue
+            channels = getMirrorChannels(node, target)
+            mirrorMap.add(control, target.longName(), channels)
+            for attr, _, _ in channels:
+                mirrorMap.handles[(control, attr)] = _channelPlug(
+                    control, attr
+                )
+
+    selectionList = om2.MSelectionList()
+    selectionList.add(root)
+    _MIRROR_MAPS[root] = (
+        om2.MObjectHandle(selectionList.getDependNode(0)),
+        mirrorMap,
+    )
+    return mirrorMap
+
+
+def clearMirrorMaps():
+    """Clear the cached mirror maps"""
+    _MIRROR_MAPS.clear()
+
+
+def _groupByMirrorMap(nodes):
+    # the rig controls by rig root, (mirror map, long names), and the
+    # nodes without mirror map
+    mapped = {}
+    others = []
+    for node in nodes:
+        root = _getRigRoot(node)
+        name = cmds.ls(str(node), long=True)[0]
+        mirrorMap = getMirrorMap(root) if root else None
+        if mirrorMap is not None and name in mirrorMap:
+            mapped.setdefault(root, (mirrorMap, []))[1].append(name)
+        else:
+            others.append(node)
+    return mapped, others
+
+
 def mirrorPose(flip=False, nodes=None):
     """Summary
 
+    The controls of a rig are mirrored with the mirror map of the rig,
+    one read and one write for all of them. The other nodes use the mirror
+    data of each attribute.
+
     Args:
         flip (bool, options): Set the function behaviour to flip
         nodes (None,  [PyNode]): Controls to mirro/flip the pose
@@ -1242,13 +1524,26 @@ def mirrorPose(flip=False, nodes=None):
     if not nodes:
         return
 
+    # the node reported if the mirroring fails
+    current = nodes[0]
     pm.undoInfo(ock=1)
     try:
         nameSpace = False
         nameSpace = getNamespace(nodes[0])
 
+        # rig controls, by mirror map
+        mapped, others = _groupByMirrorMap(nodes)
+        for mirrorMap, controls in mapped.values():
+            current = controls[0]
+            plan = mirrorMap.plan(controls, flip)
+            values = {}
+            for channel in mirrorMap.reads(plan):
+                values[channel] = _readChannel(*mirrorMap.handles[channel])
+            _setChannels(mirrorMap.writes(plan, values))
+
         mirrorEntries = []
-        for oSel in nodes:
+        for oSel in others:
+            current = oSel
             target = getMirrorTarget(nameSpace, oSel)
             mirrorEntries.extend(calculateMirrorData(oSel, target))
 
@@ -1264,7 +1559,7 @@ def mirrorPose(flip=False, nodes=None):
         pm.displayWarning(
             "If you are using Custom naming rules in controls. "
             "It is possible that the name configuration makes hard to track "
-            "the correct object to mirror for {}".format(oSel.name())
+            "the correct object to mirror for {}".format(current)
         )
         import traceback
 
@@ -1275,6 +1570,149 @@ def mirrorPose(flip=False, nodes=None):
         pm.undoInfo(cck=1)
 
 
+def _channelInput(attr):
+    # the time animation curve of a channel, "" if the channel has no
+    # input, None if it is driven by another node, like an animation layer
+    inputs = cmds.listConnections(attr, source=True, destination=False)
+    if not inputs:
+        return ""
+    if cmds.nodeType(inputs[0]).startswith("animCurveT"):
+        return inputs[0]
+    return None
+
+
+def _wrapCurve(curve, offset, start, end):
+    # offset the keys of a cycle, the keys moved after the end of the
+    # cycle are wrapped back to its start
+    keys = cmds.keyframe(curve, query=True, timeChange=True) or []
+    if start in keys and end in keys:
+        # the end key closes the loop, it is rebuilt after the wrap
+        cmds.cutKey(curve, time=(end, end), clear=True)
+    cmds.keyframe(curve, edit=True, relative=True, timeChange=offset)
+    cmds.setKeyframe(curve, insert=True, time=end)
+    cmds.keyframe(
+        curve,
+        edit=True,
+        time=(end + 1e-3, end + offset),
+        relative=True,
+        timeChange=start - end,
+        option="over",
+    )
+    value = cmds.keyframe(
+        curve, query=True, eval=True, time=(end, end), valueChange=True
+    )[0]
+    cmds.setKeyframe(curve, time=start, value=value)
+
+
+def mirrorAnimation(flip=False, nodes=None, timeOffset=0, cycle=None):
+    """Mirror or flip the animation of controls
+
+    The animation curves are copied to the mirror controls by the mirror
+    map of the rig, the keys and tangents of the inverted channels are
+    negated. All the source curves are duplicated before any change, then
+    each target channel gets its new curve. The frames are never evaluated,
+    the cost depends on the number of curves and keys.
+    The channels driven by other nodes, like animation layers, are skipped.
+
+    Args:
+        flip (bool, optional): Flip the animation instead of mirroring it
+        nodes (None, [PyNode]): Controls to mirror/flip the animation
+        timeOffset (float, optional): Frames to offset the mirrored keys
+        cycle (tuple, optional): The (start, end) frames of a cycle, the
+            offset keys moved after the end are wrapped to the start
+    """
+    if nodes is None:
+        nodes = pm.selected()
+
+    if not nodes:
+        return
+
+    if cycle is not None:
+        timeOffset = cycleOffset(timeOffset, cycle)
+
+    copies = []
+    for mirrorMap, controls in _groupByMirrorMap(nodes)[0].values():
+        copies.extend(mirrorMap.copies(mirrorMap.plan(controls, flip)))
+
+    pm.undoInfo(openChunk=True)
+    try:
+        # the source curves and values, before the writes
+        sources = {}
+        created = []
+        for control, attr, _, _, invert in copies:
+            if (control, attr, invert) in sources:
+                continue
+            name = "{}.{}".format(control, attr)
+            curve = _channelInput(name)
+            value = None
+            if curve:
+                curve = cmds.duplicate(curve)[0]
+                created.append(curve)
+                if invert == -1:
+                    cmds.scaleKey(curve, valueScale=-1, valuePivot=0)
+                if cycle is not None:
+                    if timeOffset:
+                        _wrapCurve(curve, timeOffset, *cycle)
+                elif timeOffset:
+                    cmds.keyframe(
+                        curve,
+                        edit=True,
+                        relative=True,
+                        timeChange=timeOffset,
+                    )
+            elif curve == "":
+                value = cmds.getAttr(name) * invert
+            sources[(control, attr, invert)] = (curve, value)
+
+        writes = []
+        oldCurves = set()
+        newCurves = []
+        for control, attr, counterpart, counterpartAttr, invert in copies:
+            curve, value = sources[(control, attr, invert)]
+            name = "{}.{}".format(counterpart, counterpartAttr)
+            target = _channelInput(name)
+            if curve is None or target is None:
+                mgear.log(
+                    "mirrorAnimation skipped {}, driven by another "
+                    "node".format(
+                        name if target is None else control + "." + attr
+                    ),
+                    mgear.sev_warning,
+                )
+                continue
+            if target:
+                cmds.disconnectAttr(target + ".output", name)
+                oldCurves.add(target)
+            if curve:
+                if any(curve == c for c, _ in newCurves):
+                    # a source copied to several channels
+                    curve = cmds.duplicate(curve)[0]
+                cmds.connectAttr(curve + ".output", name)
+                newCurves.append((curve, name))
+            else:
+                writes.append((counterpart, counterpartAttr, value))
+
+        # delete the unused curves, then name the new curves like Maya
+        connected = set(c for c, _ in newCurves)
+        unused = [c for c in created if c not in connected]
+        unused.extend(
+            c for c in oldCurves if not cmds.listConnections(c + ".output")
+        )
+        if unused:
+            cmds.delete(unused)
+        for curve, name in newCurves:
+            cmds.rename(curve, name.split("|")[-1].replace(".", "_"))
+        _setChannels(writes)
+
+    except Exception as e:
+        pm.displayWarning("Flip/Mirror animation fail")
+        traceback.print_exc()
+        print(e)
+
+    finally:
+        pm.undoInfo(closeChunk=True)
+
+
 def applyMirror(nameSpace, mirrorEntry):
     """Apply mirror pose
 
@@ -1685,11 +2123,13 @@ class AbstractAnimationTransfer(QtWidgets.QDialog):
         """returns matrice List[frame][controller number]."""
         if pole_vector_matrices is None:
             pole_vector_matrices = []
+        # the matrices are shared with the other transfers of the range
+        matrices = anim_bake.cachedMatrices(
+            val_src_nodes, list(range(start, end + 1))
+        )
         res = []
-        for idx, x in enumerate(range(start, end + 1)):
-            tmp = []
-            for n in val_src_nodes:
-                tmp.append(pm.getAttr(n + ".worldMatrix", time=x))
+        for idx, tmp in enumerate(zip(*matrices)):
+            tmp = [transform.arrayToMatrix(m) for m in tmp]
             try:
                 tmp[-1] = pole_vector_matrices[idx]
             except IndexError:
@@ -1701,17 +2141,23 @@ class AbstractAnimationTransfer(QtWidgets.QDialog):
         # type: (int, int, List[pm.nodetypes.Transform]) ->
         # List[List[pm.datatypes.Matrix]]
         """returns matrice List[frame][controller number]."""
-        from . import vector, transform
-
-        res = []
-        for x in range(start, end + 1):
-            a, b, c, dist = fkc + [1.0]
-            v = vector.calculatePoleVector(a, b, c, dist, time=x)
-            # this needs to be a matrix for the get set method used in the
-            # transfer main loop
-            m = transform.setMatrixPosition(pm.dt.Matrix(), v)
-            res.append(m)
-        return res
+        # sample the 3 fk positions up front and solve all the frames in
+        # one batch call
+        frames = range(start, end + 1)
+        a, b, c = [
+            [
+                cmds.getAttr("{}.worldMatrix".format(n), time=x)[12:15]
+                for x in frames
+            ]
+            for n in fkc
+        ]
+        positions = transform_batch.pole_vectors(a, b, c, 1.0)
+        # this needs to be a matrix for the get set method used in the
+        # transfer main loop
+        return [
+            transform.arrayToMatrix(m)
+            for m in transform_batch.translation_matrices(positions)
+        ]
 
     def transfer(self, startFrame, endFrame, onlyKeyframes, *args, **kwargs):
         # type: (int, int, bool, *str, **str) -> None
@@ -1719,6 +2165,58 @@ class AbstractAnimationTransfer(QtWidgets.QDialog):
             "must be implemented in each " "specialized class"
         )
 
+    def getTransferNodes(self, *args, **kwargs):
+        # type: (*str, **str) -> tuple
+        """returns the value source, key source and key destination nodes
+        and the definition of the transfer, without changing the scene."""
+        raise NotImplementedError(
+            "must be implemented in each " "specialized class"
+        )
+
+    def getBakeSamples(
+        self,
+        val_src_nodes,
+        key_src_nodes,
+        startFrame,
+        endFrame,
+        onlyKeyframes=True,
+        definition="",
+    ):
+        # type: (List[pm.nodetypes.Transform],
+        # List[pm.nodetypes.Transform], int, int, bool, str) -> tuple
+        """returns the frames to bake, the nodes to sample and if the pole
+        vector is solved from the 3 fk controls."""
+        keyframeList = sorted(
+            set(pm.keyframe(key_src_nodes, at=["t", "r", "s"], q=True))
+        )
+        frames = anim_bake.bakeFrames(
+            startFrame, endFrame, keyframeList if onlyKeyframes else None
+        )
+        solvePole = definition.upper() == "IK" and len(key_src_nodes) == 3
+        sampleNodes = list(val_src_nodes)
+        if solvePole:
+            sampleNodes.extend(key_src_nodes)
+        return frames, sampleNodes, solvePole
+
+    def requestMatrices(
+        self, startFrame, endFrame, onlyKeyframes, *args, **kwargs
+    ):
+        # type: (int, int, bool, *str, **str) -> None
+        """request the matrices of the transfer to the session sampler, to
+        sample them with the other transfers in one pass"""
+        val_src_n, key_src_n, _, definition = self.getTransferNodes(
+            *args, **kwargs
+        )
+        frames, sampleNodes, _ = self.getBakeSamples(
+            val_src_n,
+            key_src_n,
+            startFrame,
+            endFrame,
+            onlyKeyframes,
+            definition,
+        )
+        anim_bake.requestMatrices(sampleNodes, frames)
+
     def doItByUI(self):
         # type: () -> None
 
@@ -1770,47 +2268,43 @@ class AbstractAnimationTransfer(QtWidgets.QDialog):
 
         channels = ["tx", "ty", "tz", "rx", "ry", "rz", "sx", "sy", "sz"]
 
-        # right here we need to generate the matrix positions by calculating
-        # them if we have 3 fk controls.  Once we've grabbed the solved
-        # pole vector positions, we'll insert them into the list by passing
-        # them into the getWorldMatrix function.
-        # Doing it thisway should be safe as we've touched the least amount
-        # of code.
-        poleVectorMatrices = []
-        if definition.upper() == "IK":
-            if len(key_src_nodes) == 3:
-                poleVectorMatrices = self.getIKPoleVectorMatrices(
-                    startFrame, endFrame, key_src_nodes
-                )
-
-        worldMatrixList = self.getWorldMatrices(
-            startFrame, endFrame, val_src_nodes, poleVectorMatrices
+        frames, sampleNodes, solvePole = self.getBakeSamples(
+            val_src_nodes,
+            key_src_nodes,
+            startFrame,
+            endFrame,
+            onlyKeyframes,
+            definition,
         )
 
-        keyframeList = sorted(
-            set(pm.keyframe(key_src_nodes, at=["t", "r", "s"], q=True))
-        )
+        # first pass: sample the world matrices, and the fk positions to
+        # solve the pole vector if we have 3 fk controls, without moving
+        # the playhead
+        worldMatrixList = anim_bake.cachedMatrices(sampleNodes, frames)
+        if solvePole:
+            a, b, c = [
+                [m[12:15] for m in matrices]
+                for matrices in worldMatrixList[len(val_src_nodes):]
+            ]
+            # the pole vector position replaces the last matrix
+            worldMatrixList[len(val_src_nodes) - 1] = (
+                transform_batch.translation_matrices(
+                    transform_batch.pole_vectors(a, b, c, 1.0)
+                )
+            )
 
         # delete animation in the space switch channel and destination ctrls
         pm.cutKey(key_dst_nodes, at=channels, time=(startFrame, endFrame))
         pm.cutKey(switch_attr_name, time=(startFrame, endFrame))
 
-        for i, x in enumerate(range(startFrame, endFrame + 1)):
+        # set the new space in the channel
+        self.changeAttrToBoundValue()
+        anim_bake.setKeys([switch_attr_name], frames, [self.getValue()])
 
-            if onlyKeyframes and x not in keyframeList:
-                continue
-
-            pm.currentTime(x)
-
-            # set the new space in the channel
-            self.changeAttrToBoundValue()
-
-            # bake the stored transforms to the cotrols
-            for j, n in enumerate(key_dst_nodes):
-                n.setMatrix(worldMatrixList[i][j], worldSpace=True)
-
-            pm.setKeyframe(key_dst_nodes, at=channels)
-            pm.setKeyframe(switch_attr_name)
+        # second pass: bake the stored transforms to the controls
+        anim_bake.bakeWorldMatrices(
+            key_dst_nodes, frames, worldMatrixList[: len(val_src_nodes)]
+        )
 
         # if versions.current() <= 20180200:
         pm.cycleCheck(e=True)
@@ -1852,12 +2346,17 @@ class ParentSpaceTransfer(AbstractAnimationTransfer):
             )
             self.groupBox.setTitle(part)
 
+    def getTransferNodes(self, *args, **kwargs):
+        # type: (*str, **str) -> tuple
+        val_src_nodes = [self.ctrlNode]
+        return val_src_nodes, val_src_nodes, val_src_nodes, ""
+
     def transfer(self, startFrame, endFrame, onlyKeyframes, *args, **kwargs):
         # type: (int, int, bool, *str, **str) -> None
 
-        val_src_nodes = [self.ctrlNode]
-        key_src_nodes = val_src_nodes
-        key_dst_nodes = val_src_nodes
+        val_src_nodes, key_src_nodes, key_dst_nodes, _ = (
+            self.getTransferNodes()
+        )
 
         self.bakeAnimation(
             self.getChangeAttrName(),
@@ -2006,17 +2505,8 @@ class IkFkTransfer(AbstractAnimationTransfer):
 
     # ----------------------------------------------------------------
 
-    def transfer(
-        self,
-        startFrame,
-        endFrame,
-        onlyKeyframes,
-        ikRot,
-        switchTo=None,
-        *args,
-        **kargs
-    ):
-        # type: (int, int, bool, str, *str, **str) -> None
+    def getTransferNodes(self, ikRot, switchTo=None, *args, **kwargs):
+        # type: (str, str, *str, **str) -> tuple
 
         def fk_definition():
             src_nodes = self.fkTargets[:]
@@ -2031,7 +2521,7 @@ class IkFkTransfer(AbstractAnimationTransfer):
 
         def ik_definition():
             src_nodes = self.ikTarget + self.upvTarget
-            key_nodes = self.fkCtrls
+            key_nodes = self.fkCtrls[:]
             dst_nodes = self.ikCtrl + self.upvCtrl
             if ikRot:
                 if isinstance(self.ikRotTarget, list):
@@ -2042,23 +2532,36 @@ class IkFkTransfer(AbstractAnimationTransfer):
                     key_nodes.extend(self.ikRotCtl)
                 else:
                     key_nodes.append(self.ikRotCtl)
-
-            roll_att = self.getChangeRollAttrName()
-            pm.cutKey(roll_att, time=(startFrame, endFrame), cl=True)
-            pm.setAttr(roll_att, 0)
-
             return src_nodes, key_nodes, dst_nodes, "IK"
 
         if switchTo is not None:
             if "fk" in switchTo.lower():
-                val_src_n, key_src_n, key_dst_n, definition = fk_definition()
-            else:
-                val_src_n, key_src_n, key_dst_n, definition = ik_definition()
-        else:
-            if self.comboBoxSpaces.currentIndex() != 0:  # to FK
-                val_src_n, key_src_n, key_dst_n, definition = fk_definition()
-            else:  # to IK
-                val_src_n, key_src_n, key_dst_n, definition = ik_definition()
+                return fk_definition()
+            return ik_definition()
+        if self.comboBoxSpaces.currentIndex() != 0:  # to FK
+            return fk_definition()
+        return ik_definition()  # to IK
+
+    def transfer(
+        self,
+        startFrame,
+        endFrame,
+        onlyKeyframes,
+        ikRot,
+        switchTo=None,
+        *args,
+        **kargs
+    ):
+        # type: (int, int, bool, str, *str, **str) -> None
+
+        val_src_n, key_src_n, key_dst_n, definition = self.getTransferNodes(
+            ikRot, switchTo
+        )
+
+        if definition == "IK":
+            roll_att = self.getChangeRollAttrName()
+            pm.cutKey(roll_att, time=(startFrame, endFrame), cl=True)
+            pm.setAttr(roll_att, 0)
 
         self.bakeAnimation(
             self.getChangeAttrName(),
@@ -2157,6 +2660,69 @@ class IkFkTransfer(AbstractAnimationTransfer):
         if switchTo is None:
             switchTo = "fk"
 
+        ui = IkFkTransfer._createTransfer(
+            model, ikfk_attr, uihost, fks, ik, upv, ikRot, switchTo
+        )
+        ui.transfer(startFrame, endFrame, onlyKeyframes, ikRot, switchTo="fk")
+
+    @staticmethod
+    def executeMany(
+        switches,
+        startFrame=None,
+        endFrame=None,
+        onlyKeyframes=None,
+        switchTo=None,
+    ):
+        # type: (List[tuple], int, int, bool, str) -> None
+        """transfer many switches without displaying UI, like both arms and
+        legs. The matrices of all the switches are sampled in one pass.
+
+        Args:
+            switches (list): of (model, ikfk_attr, uihost, fks, ik, upv,
+            ikRot) tuples
+            startFrame (int, optional): start frame
+            endFrame (int, optional): end frame
+            onlyKeyframes (bool, optional): only transfer the keyframes
+            switchTo (str, optional): "fk" or "ik"
+        """
+        if startFrame is None:
+            startFrame = int(pm.playbackOptions(q=True, ast=True))
+
+        if endFrame is None:
+            endFrame = int(pm.playbackOptions(q=True, aet=True))
+
+        if onlyKeyframes is None:
+            onlyKeyframes = True
+
+        if switchTo is None:
+            switchTo = "fk"
+
+        transfers = []
+        for model, ikfk_attr, uihost, fks, ik, upv, ikRot in switches:
+            ui = IkFkTransfer._createTransfer(
+                model, ikfk_attr, uihost, fks, ik, upv, ikRot, switchTo
+            )
+            transfers.append((ui, ikRot))
+
+        # the switches are independent, the keys of one switch don't
+        # change the samples of the others
+        with anim_bake.getSampler().hold():
+            for ui, ikRot in transfers:
+                ui.requestMatrices(
+                    startFrame, endFrame, onlyKeyframes, ikRot, switchTo
+                )
+            for ui, ikRot in transfers:
+                ui.transfer(
+                    startFrame, endFrame, onlyKeyframes, ikRot, switchTo
+                )
+
+    @staticmethod
+    def _createTransfer(
+        model, ikfk_attr, uihost, fks, ik, upv, ikRot, switchTo
+    ):
+        # type: (pm.nodetypes.Transform, str, str,
+        # List[str], str, str, str, str) -> IkFkTransfer
+
         # Create minimal UI object
         ui = IkFkTransfer()
 
@@ -2167,7 +2733,7 @@ class IkFkTransfer(AbstractAnimationTransfer):
         ui.setCtrls(fks, ik, upv, ikRot)
         ui.setComboBoxItemsFormList(["IK", "FK"])
         ui.getValue = lambda: 0.0 if "fk" in switchTo.lower() else 1.0
-        ui.transfer(startFrame, endFrame, onlyKeyframes, ikRot, switchTo="fk")
+        return ui
 
     @staticmethod
     def toIK(model, ikfk_attr, uihost, fks, ik, upv, ikRot, **kwargs):
@@ -2368,36 +2934,26 @@ class SpineIkFkTransfer(AbstractAnimationTransfer):
             onlyKeyframes (bool, optional): transfer animation on other
             keyframes, if false, bake every frame
         """
-        # Temporaly turn off cycle check to avoid misleading cycle message
-        # on Maya 2016.  With Maya 2016.5 and 2017 the cycle warning doesn't
-        # show up
-        if bakeToIk:
-            key_src_nodes = fkControls
-            transferFunc = spine_FKToIK
-            key_dst_nodes = ikControls
-        else:
-            key_src_nodes = ikControls
-            transferFunc = spine_IKToFK
-            key_dst_nodes = fkControls
-
         # add all nodes, to get all of the keyframes
         allAnimNodes = fkControls + ikControls
         # remove duplicates
         keyframeList = sorted(
             set(pm.keyframe(allAnimNodes, at=["t", "r", "s"], q=True))
         )
+        frames = anim_bake.bakeFrames(
+            startFrame, endFrame, keyframeList if onlyKeyframes else None
+        )
 
         # when getAttr over time, it warns of a cycle
         if versions.current() <= 20180200:
             pm.cycleCheck(e=False)
             print("Maya version older than: 2018.02")
 
-        # create a dict of every frame, and every node involved on that frame
-        matchMatrix_dict = {}
-        for i, x in enumerate(range(startFrame, endFrame + 1)):
-            if onlyKeyframes and x not in keyframeList:
-                continue
-            matchMatrix_dict[x] = recordNodesMatrices(fkControls, x)
+        # first pass: sample the fk matrices of every frame involved,
+        # without moving the playhead
+        fkMatrices = dict(
+            zip(fkControls, anim_bake.cachedMatrices(fkControls, frames))
+        )
 
         channels = ["tx", "ty", "tz", "rx", "ry", "rz", "sx", "sy", "sz"]
 
@@ -2405,19 +2961,20 @@ class SpineIkFkTransfer(AbstractAnimationTransfer):
         pm.cutKey(fkControls, at=channels, time=(startFrame, endFrame))
         pm.cutKey(ikControls, at=channels, time=(startFrame, endFrame))
 
-        if PY2:
-            dic_items = matchMatrix_dict.iteritems
+        # the source controls stay reset, the destination controls match
+        # the fk controls
+        attribute.reset_SRT(allAnimNodes)
+        if bakeToIk:
+            targets = spine_FKToIKTargets(fkControls, ikControls)
         else:
-            dic_items = matchMatrix_dict.items
+            targets = [(fk, fk) for fk in fkControls]
 
-        for frame, matchDict in dic_items():
-            pm.currentTime(frame)
-            transferFunc(fkControls, ikControls, matchMatrix_dict=matchDict)
-
-            pm.setKeyframe(key_dst_nodes, at=channels)
-        # If there are keys on the source node outside of the provided range
-        # this wont have an effect
-        attribute.reset_SRT(key_src_nodes)
+        # second pass: bake the matching matrices to the controls
+        anim_bake.bakeWorldMatrices(
+            [dst for dst, _ in targets],
+            frames,
+            [fkMatrices[src] for _, src in targets],
+        )
 
         # re enable cycle check
         if versions.current() <= 20180200:
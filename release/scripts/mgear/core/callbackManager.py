@@ -48,6 +48,7 @@ from functools import wraps, partial
 
 # dcc
 from maya.api import OpenMaya as om
+from maya.api import OpenMayaAnim as oma
 
 # constants -------------------------------------------------------------------
 try:
@@ -227,6 +228,22 @@ def newSceneCB(callback_name, func):
     return callback_id
 
 
+@registerSessionCB
+def referenceLoadedCB(callback_name, func):
+    """When a reference is loaded, call the provided function
+
+    Args:
+        callback_name (str): name you want to assign cb
+        func (function): will be called upon
+
+    Returns:
+        long: maya id to created callback
+    """
+    callBackType = om.MSceneMessage.kAfterLoadReference
+    callback_id = om.MSceneMessage.addCallback(callBackType, func)
+    return callback_id
+
+
 @registerSessionCB
 def timeChangedCB(callback_name, func):
     """ANYTIME the time is changed, call the provided function
@@ -259,6 +276,21 @@ def userTimeChangedCB(callback_name, func):
     return callback_id
 
 
+@registerSessionCB
+def animCurveEditedCB(callback_name, func):
+    """When animation curves are edited, call the provided function
+
+    Args:
+        callback_name (str): name you want to assign cb
+        func (function): will be called upon
+
+    Returns:
+        long: maya id to created callback
+    """
+    callback_id = oma.MAnimMessage.addAnimCurveEditedCallback(func)
+    return callback_id
+
+
 @registerSessionCB
 def sampleCallback(callback_name, func):
     """argument order is important. Callback_name and func must always be first
@@ -461,6 +493,11 @@ class CallbackManager(object):
         callback_id = newSceneCB(callback_name, func)
         return callback_id
 
+    @registerManagerCB
+    def referenceLoadedCB(self, callback_name, func):
+        callback_id = referenceLoadedCB(callback_name, func)
+        return callback_id
+
     @registerManagerCB
     def timeChangedCB(self, callback_name, func):
         callback_id = timeChangedCB(callback_name, func)
@@ -470,3 +507,8 @@ class CallbackManager(object):
     def userTimeChangedCB(self, callback_name, func):
         callback_id = userTimeChangedCB(callback_name, func)
         return callback_id
+
+    @registerManagerCB
+    def animCurveEditedCB(self, callback_name, func):
+        callback_id = animCurveEditedCB(callback_name, func)
+        return callback_id
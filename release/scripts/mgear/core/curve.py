@@ -13,10 +13,16 @@ import json
 import maya.mel as mel
 
 import maya.OpenMaya as om
+import maya.api.OpenMaya as om2
 
 from mgear.core import applyop
 from mgear.core import utils
 from mgear.core import transform
+from mgear.core import nurbs
+
+# kept for backwards compatibility, the NURBS math lives in nurbs
+from mgear.core.nurbs import evaluate_cubic_nurbs  # noqa: F401
+from mgear.core.nurbs import cox_de_boor  # noqa: F401
 
 from .six import string_types
 
@@ -189,59 +195,88 @@ def createCuveFromEdges(
     return crv
 
 
-def get_uniform_world_positions_on_curve(curve, num_positions):
+def get_curve_data(curve):
+    """Get the world space NURBS data of a curve in one bulk read
+
+    Arguments:
+        curve (str or PyNode): The curve transform or shape
+
+    Returns:
+        list, int, list: The world control points, the degree and the full
+            knot vector (len(points) + degree + 1 knots)
     """
-    Get a specified number of uniformly distributed world positions along a
-    NURBS curve.
+    sel_list = om2.MSelectionList()
+    sel_list.add(str(curve))
+    dag_path = sel_list.getDagPath(0)
+    if dag_path.hasFn(om2.MFn.kTransform):
+        dag_path.extendToShape()
+    curve_fn = om2.MFnNurbsCurve(dag_path)
+    points = [(p.x, p.y, p.z) for p in curve_fn.cvPositions(om2.MSpace.kWorld)]
+    # Maya knot vectors don't store the first and last knots
+    knots = list(curve_fn.knots())
+    knots = [knots[0]] + knots + [knots[-1]]
+    return points, curve_fn.degree, knots
 
-    Args:
-        curve (str or PyNode): The name or PyNode of the NURBS curve.
-        num_positions (int): The number of uniformly distributed positions
-            to return.
+
+def get_arc_length_table(curve):
+    """Get the arc length table of a curve
+
+    The tables are cached by curve data hash, so the table is built once
+    and reused by the next queries on the same curve, until its CVs move.
+
+    Arguments:
+        curve (str or PyNode): The curve transform or shape
 
     Returns:
-        tuple: A list of tuples, where each tuple represents a world
-            position (x, y, z).
+        nurbs.ArcLengthTable: The world space arc length table
     """
-    # Get the MDagPath of the curve
-    sel_list = om.MSelectionList()
-    sel_list.add(curve)
-    curve_dag_path = om.MDagPath()
-    sel_list.getDagPath(0, curve_dag_path)
+    points, degree, knots = get_curve_data(curve)
+    return nurbs.get_arc_length_table(points, degree, knots)
 
-    # Create an MFnNurbsCurve function set to work with the curve
-    curve_fn = om.MFnNurbsCurve(curve_dag_path)
 
-    # Calculate the arc length of the curve
-    arc_length = curve_fn.length()
+def find_params_from_lengths(curve, lengths):
+    """Get the curve parameters at many world space lengths
 
-    # Calculate the interval length between positions
-    interval_length = arc_length / float(num_positions - 1)
+    Arguments:
+        curve (str or PyNode): The curve transform or shape
+        lengths (list of float): Lengths from the curve start
 
-    positions = []
+    Returns:
+        list: The parameters
+    """
+    return get_arc_length_table(curve).params_at_lengths(lengths)
 
-    # Loop through the number of positions to calculate U parameter and world
-    # position
-    for i in range(num_positions):
-        # Calculate the desired length for the current position
-        desired_length = interval_length * i
 
-        # Get the corresponding U parameter for the desired length
-        u_param = curve_fn.findParamFromLength(desired_length)
+def find_params_from_percentages(curve, percentages):
+    """Get the curve parameters at many percentages of the curve length
 
-        # Create a point in 3D space to store the world position
-        world_pos = om.MPoint()
+    Arguments:
+        curve (str or PyNode): The curve transform or shape
+        percentages (list of float): Length percentages (0 to 100)
 
-        # Get the world position at the given U parameter
-        curve_fn.getPointAtParam(u_param, world_pos, om.MSpace.kWorld)
+    Returns:
+        list: The parameters
+    """
+    return get_arc_length_table(curve).params_at_percentages(percentages)
 
-        # Append the world position as a tuple (x, y, z) to the positions list
-        positions.append(
-            datatypes.Point(world_pos.x, world_pos.y, world_pos.z)
-        )
 
-    # Return the positions as a tuple of tuples
-    return positions
+def get_uniform_world_positions_on_curve(curve, num_positions):
+    """
+    Get a specified number of uniformly distributed world positions along a
+    NURBS curve.
+
+    Args:
+        curve (str or PyNode): The name or PyNode of the NURBS curve.
+        num_positions (int): The number of uniformly distributed positions
+            to return.
+
+    Returns:
+        tuple: A list of tuples, where each tuple represents a world
+            position (x, y, z).
+    """
+    table = get_arc_length_table(curve)
+    (positions,) = table.evaluate(table.uniform_params(num_positions))
+    return [datatypes.Point(p[0], p[1], p[2]) for p in positions]
 
 
 def getParamPositionsOnCurve(srcCrv, nbPoints):
@@ -254,23 +289,13 @@ def getParamPositionsOnCurve(srcCrv, nbPoints):
     Returns:
         tuple: world positions.
     """
-    if isinstance(srcCrv, str) or isinstance(srcCrv, str):
-        srcCrv = pm.PyNode(srcCrv)
-    length = srcCrv.length()
-    parL = srcCrv.findParamFromLength(length)
-    param = []
+    table = get_arc_length_table(srcCrv)
+    parL = table.end
     increment = parL / (nbPoints - 1)
-    p = 0.0
-    for x in range(nbPoints):
-        # we need to check that the param value never exceed the parL
-        if p > parL:
-            p = parL
-        pos = srcCrv.getPointAtParam(p, space="world")
-
-        param.append(pos)
-        p += increment
-
-    return param
+    # we need to check that the param value never exceed the parL
+    params = [min(increment * x, parL) for x in range(nbPoints)]
+    (positions,) = table.evaluate(params)
+    return [datatypes.Point(p[0], p[1], p[2]) for p in positions]
 
 
 def createCurveFromCurve(srcCrv, name, nbPoints, parent=None):
@@ -344,13 +369,7 @@ def findLenghtFromParam(crv, param):
             u = uLength / oLength
 
     """
-    node = pm.createNode("arcLengthDimension")
-    pm.connectAttr(
-        crv.getShape().attr("worldSpace[0]"), node.attr("nurbsGeometry")
-    )
-    node.attr("uParamValue").set(param)
-    uLength = node.attr("arcLength").get()
-    pm.delete(node.getParent())
+    (uLength,) = get_arc_length_table(crv).lengths_at_params([param])
     return uLength
 
 
@@ -1034,87 +1053,6 @@ def lock_first_point(crv):
 # ========================================
 
 
-def evaluate_cubic_nurbs(control_points, percentage, knots=None, weights=None):
-    """
-    Evaluate a cubic NURBS curve at a given percentage.
-
-    Args:
-        control_points (list): List of control points, each as [x, y, z].
-        percentage (float): Curve position as a percentage (0 to 100).
-        knots (list, optional): Knot vector.
-        weights (list, optional): List of weights corresponding to control
-                                  points.
-
-    Returns:
-        list: Evaluated point as [x, y, z].
-    """
-    n = len(control_points) - 1
-    p = 3  # Degree for cubic curve
-    d = len(control_points[0])  # Dimension of each point
-
-    if knots is None:
-        knots = (
-            [0] * (p + 1)
-            + [i for i in range(1, n - p + 2)]
-            + [n - p + 2] * (p + 1)
-        )
-
-    if weights is None:
-        weights = [1.0] * (n + 1)
-
-    # Normalize the u parameter to fit within the knot vector range
-    u = knots[p] + (knots[-(p + 1)] - knots[p]) * (percentage / 100.0)
-
-    # Slightly reduce u if percentage is 100 to avoid division by zero
-    if percentage == 100:
-        u -= 1e-5
-
-    C = [0.0 for _ in range(d)]
-    W = 0.0
-
-    for i in range(n + 1):
-        N = cox_de_boor(u, i, p, knots)
-        for j in range(d):
-            C[j] += N * weights[i] * control_points[i][j]
-        W += N * weights[i]
-
-    for j in range(d):
-        C[j] /= W
-
-    return C
-
-
-def cox_de_boor(u, i, p, knots):
-    """
-    Cox-De Boor algorithm to evaluate B-Spline basis function.
-
-    Args:
-        u (float): Parameter value.
-        i (int): Index of control point.
-        p (int): Degree of the curve.
-        knots (list): Knot vector.
-
-    Returns:
-        float: Evaluated B-Spline basis function value.
-    """
-    if p == 0:
-        return 1.0 if knots[i] <= u < knots[i + 1] else 0.0
-
-    N1 = 0
-    if knots[i] != knots[i + p]:
-        N1 = ((u - knots[i]) / (knots[i + p] - knots[i])) * cox_de_boor(
-            u, i, p - 1, knots
-        )
-
-    N2 = 0
-    if knots[i + 1] != knots[i + p + 1]:
-        N2 = (
-            (knots[i + p + 1] - u) / (knots[i + p + 1] - knots[i + 1])
-        ) * cox_de_boor(u, i + 1, p - 1, knots)
-
-    return N1 + N2
-
-
 def create_locator_at_curve_point(object_names, percentage):
     """
     Create a locator at a point on a cubic NURBS curve in Maya.
@@ -1122,7 +1060,13 @@ def create_locator_at_curve_point(object_names, percentage):
     Args:
         object_names (list): The names of the objects representing control
                              points in Maya.
-        percentage (float): Curve position as a percentage (0 to 100).
+        percentage (float or list): Curve position as a percentage (0 to
+            100). If a list, one locator is created per percentage and all
+            the points are evaluated in one batch.
+
+    Returns:
+        str or list: The locator name, or the names if percentage is a
+            list
 
     Example usage in Maya
     Select objects representing control points in Maya before running the script
@@ -1137,12 +1081,25 @@ def create_locator_at_curve_point(object_names, percentage):
         )
         control_points.append(pos)
 
-    point_on_curve = evaluate_cubic_nurbs(control_points, percentage)
+    if isinstance(percentage, (list, tuple)):
+        percentages = percentage
+    else:
+        percentages = [percentage]
+    (points_on_curve,) = nurbs.evaluate_percentages(
+        control_points, percentages
+    )
 
-    locator_name = cmds.spaceLocator()[0]
-    cmds.setAttr(locator_name + ".translateX", point_on_curve[0])
-    cmds.setAttr(locator_name + ".translateY", point_on_curve[1])
-    cmds.setAttr(locator_name + ".translateZ", point_on_curve[2])
+    locators = []
+    for point_on_curve in points_on_curve:
+        locator_name = cmds.spaceLocator()[0]
+        cmds.setAttr(locator_name + ".translateX", point_on_curve[0])
+        cmds.setAttr(locator_name + ".translateY", point_on_curve[1])
+        cmds.setAttr(locator_name + ".translateZ", point_on_curve[2])
+        locators.append(locator_name)
+
+    if isinstance(percentage, (list, tuple)):
+        return locators
+    return locators[0]
 
 
 def add_linear_skinning_to_curve(curve_name, joint_list):
@@ -20,6 +20,7 @@ from mgear.core.anim_utils import bindPose
 from mgear.core.pickWalk import get_all_tag_children
 from mgear.core.transform import resetTransform
 from mgear.core.anim_utils import mirrorPose
+from mgear.core.anim_utils import mirrorAnimation
 from mgear.core.anim_utils import get_host_from_node
 from mgear.core.anim_utils import change_rotate_order
 from mgear.core.anim_utils import ikFkMatch_with_namespace
@@ -83,6 +84,16 @@ def __mirror_flip_pose_callback(*args):
         mirrorPose(flip=args[1], nodes=[ctl])
 
 
+def __mirror_flip_animation_callback(*args):
+    """Wrapper function to call mGears mirrorAnimation function
+
+    Args:
+        list: callback from menuItem
+    """
+
+    mirrorAnimation(flip=args[1], nodes=args[0])
+
+
 def _get_controls(switch_control, blend_attr, comp_ctl_list=None):
     # OBSOLETE:This function is obsolete and just keep for
     #          backward compatibility
@@ -940,6 +951,22 @@ def mgear_dagmenu_fill(parent_menu, current_control):
         command=partial(__mirror_flip_pose_callback, child_controls, True),
     )
 
+    # add mirror/flip animation
+    cmds.menuItem(
+        parent=parent_menu,
+        label="Mirror animation",
+        command=partial(
+            __mirror_flip_animation_callback, _current_selection, False
+        ),
+    )
+    cmds.menuItem(
+        parent=parent_menu,
+        label="Flip animation",
+        command=partial(
+            __mirror_flip_animation_callback, _current_selection, True
+        ),
+    )
+
     # divider
     cmds.menuItem(parent=parent_menu, divider=True)
 
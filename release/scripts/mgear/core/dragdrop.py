@@ -110,7 +110,9 @@ def mgear_file_drop_action(theFile):
     elif theFile.endswith(skin.PACK_EXT):
         print("Import mGear Skin Pack file: {}".format(theFile))
         skin.importSkinPack(theFile)
-    elif theFile.endswith(skin.FILE_EXT) or theFile.endswith(skin.FILE_JSON_EXT):
+    elif theFile.endswith(
+        (skin.FILE_EXT, skin.FILE_JSON_EXT, skin.FILE_BIN_EXT)
+    ):
         print("Import mGear Skin  file: {}".format(theFile))
         skin.importSkin(theFile)
     elif theFile.endswith(rbf_io.RBF_FILE_EXTENSION):
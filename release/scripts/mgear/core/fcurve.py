@@ -1,9 +1,87 @@
+from functools import wraps
+
 import pymel.core as pm
+import maya.api.OpenMaya as om2
+import maya.api.OpenMayaAnim as oma2
+
+from mgear.core import fcurve_eval
+
+# getFCurveValues results by (fcurve, division), while a cache is active
+_valuesCache = None
+
+
+def getFCurveData(fcv_node):
+    """Get the keys and tangents of an FCurve, to evaluate it without Maya
+
+    Arguments:
+        fcv_node (pyNode or str): The FCurve.
+
+    Returns:
+        FCurve: The curve data, None for the curves with time input or
+            time output, not supported.
+
+    """
+    selectionList = om2.MSelectionList()
+    selectionList.add(str(fcv_node))
+    fnCurve = oma2.MFnAnimCurve(selectionList.getDependNode(0))
+    if not fnCurve.isUnitlessInput:
+        return None
+    curveType = fnCurve.animCurveType
+    if curveType == oma2.MFnAnimCurve.kAnimCurveUA:
+        unit = om2.MAngle(1.0).asUnits(om2.MAngle.uiUnit())
+    elif curveType == oma2.MFnAnimCurve.kAnimCurveUL:
+        unit = om2.MDistance(1.0).asUnits(om2.MDistance.uiUnit())
+    elif curveType == oma2.MFnAnimCurve.kAnimCurveUU:
+        unit = 1.0
+    else:
+        return None
+
+    stepTypes = {
+        oma2.MFnAnimCurve.kTangentStep: fcurve_eval.STEP,
+        oma2.MFnAnimCurve.kTangentStepNext: fcurve_eval.STEP_NEXT,
+    }
+    keys = range(fnCurve.numKeys)
+    inTangents = []
+    outTangents = []
+    for i in keys:
+        x, y = fnCurve.getTangentXY(i, True)
+        inTangents.append((x, y * unit))
+        x, y = fnCurve.getTangentXY(i, False)
+        outTangents.append((x, y * unit))
+    return fcurve_eval.FCurve(
+        [fnCurve.input(i) for i in keys],
+        [fnCurve.value(i) * unit for i in keys],
+        inTangents,
+        outTangents,
+        weighted=fnCurve.isWeighted,
+        steps=[
+            stepTypes.get(fnCurve.outTangentType(i), fcurve_eval.NO_STEP)
+            for i in keys
+        ],
+        preInfinity=fnCurve.preInfinityType,
+        postInfinity=fnCurve.postInfinityType,
+    )
+
+
+def _sampleFCurveValues(fcv_node, division):
+    # evaluation through the curve node, for the not supported curves
+    incr = 1 / (division - 1.0)
+
+    values = []
+    for i in range(division):
+        pm.setAttr(fcv_node + ".input", i * incr)
+        values.append(pm.getAttr(fcv_node + ".output"))
+
+    return values
 
 
 def getFCurveValues(fcv_node, division, factor=1):
     """Get X values evenly spaced on the FCurve.
 
+    The keys and tangents are read once and all the divisions are evaluated
+    in one call. While a cache is active (see cacheValues) the values are
+    cached by FCurve and division.
+
     Arguments:
         fcv_node (pyNode or str): The FCurve to evaluate.
         division (int): The number of division you want to evaluate on
@@ -17,11 +95,47 @@ def getFCurveValues(fcv_node, division, factor=1):
                                             self.divisions)
 
     """
-    incr = 1 / (division - 1.0)
+    key = (str(fcv_node), division)
+    values = None
+    if _valuesCache is not None:
+        values = _valuesCache.get(key)
 
-    values = []
-    for i in range(division):
-        pm.setAttr(fcv_node + ".input", i * incr)
-        values.append(pm.getAttr(fcv_node + ".output") * factor)
+    if values is None:
+        data = getFCurveData(fcv_node)
+        if data is None:
+            values = _sampleFCurveValues(fcv_node, division)
+        else:
+            values = data.sample(division)
+        if _valuesCache is not None:
+            _valuesCache[key] = values
 
-    return values
+    return [v * factor for v in values]
+
+
+def cacheValues(func):
+    """Decorator to cache the getFCurveValues results during a function
+
+    The cache is cleared when the outermost decorated function returns, so
+    the FCurves edited between two builds are evaluated again.
+
+    Arguments:
+        func (function): The function, i.e. a rig build.
+
+    Returns:
+        function: The wrapped function.
+
+    """
+
+    @wraps(func)
+    def wrap(*args, **kwargs):
+        global _valuesCache
+        outermost = _valuesCache is None
+        if outermost:
+            _valuesCache = {}
+        try:
+            return func(*args, **kwargs)
+        finally:
+            if outermost:
+                _valuesCache = None
+
+    return wrap
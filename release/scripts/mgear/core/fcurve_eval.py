@@ -0,0 +1,221 @@
+"""
+Animation curve evaluation from key and tangent data.
+
+This module is Maya free. An FCurve holds the keys and tangents of an
+animCurve, read once with ``MFnAnimCurve``, and evaluates it for many inputs
+without setting and reading the curve node attributes:
+
+    * non weighted tangents: Hermite segments, from the tangent slopes
+    * weighted tangents: Bezier segments, with the control points at one
+      third of the tangent vectors
+    * step and step next out tangents
+    * constant, linear, cycle, cycle with offset and oscillate infinities
+
+The tangents are the (x, y) tangent vectors of ``MFnAnimCurve.getTangentXY``
+"""
+
+import bisect
+import math
+
+# infinity types, same values as MFnAnimCurve.InfinityType
+CONSTANT = 0
+LINEAR = 1
+CYCLE = 3
+CYCLE_RELATIVE = 4
+OSCILLATE = 5
+
+# out tangent steps
+NO_STEP = 0
+STEP = 1
+STEP_NEXT = 2
+
+
+def _slope(tangent):
+    x, y = tangent
+    if x == 0.0:
+        # vertical tangent
+        return math.copysign(1e12, y) if y else 0.0
+    return y / x
+
+
+def _hermite(x, x0, y0, x1, y1, m0, m1):
+    h = x1 - x0
+    t = (x - x0) / h
+    t2 = t * t
+    t3 = t2 * t
+    return (
+        (2 * t3 - 3 * t2 + 1) * y0
+        + (t3 - 2 * t2 + t) * h * m0
+        + (-2 * t3 + 3 * t2) * y1
+        + (t3 - t2) * h * m1
+    )
+
+
+def _bezier(s, p0, p1, p2, p3):
+    u = 1.0 - s
+    return u * u * u * p0 + 3 * u * u * s * p1 + 3 * u * s * s * p2 + (
+        s * s * s * p3
+    )
+
+
+def _bezierDerivative(s, p0, p1, p2, p3):
+    u = 1.0 - s
+    return 3 * (u * u * (p1 - p0) + 2 * u * s * (p2 - p1) + s * s * (p3 - p2))
+
+
+def _solveBezierX(x, x0, x1, x2, x3, tolerance=1e-10):
+    # the x of the weighted segments is monotonic, Newton steps kept
+    # inside a bisection bracket
+    low, high = 0.0, 1.0
+    s = (x - x0) / (x3 - x0)
+    for _ in range(50):
+        error = _bezier(s, x0, x1, x2, x3) - x
+        if abs(error) < tolerance:
+            break
+        if error > 0.0:
+            high = s
+        else:
+            low = s
+        derivative = _bezierDerivative(s, x0, x1, x2, x3)
+        if derivative:
+            s -= error / derivative
+        if not derivative or s <= low or s >= high:
+            s = (low + high) * 0.5
+    return s
+
+
+class FCurve(object):
+    """Evaluable animation curve data
+
+    Args:
+        times (sequence): Key inputs, in increasing order
+        values (sequence): Key values
+        inTangents (sequence): (x, y) in tangent of each key
+        outTangents (sequence): (x, y) out tangent of each key
+        weighted (bool, optional): Weighted tangents curve
+        steps (sequence, optional): NO_STEP, STEP or STEP_NEXT out tangent
+            of each key
+        preInfinity (int, optional): Infinity type before the first key
+        postInfinity (int, optional): Infinity type after the last key
+
+    Example:
+        >>> fcv = FCurve([0, 1], [0, 1], [(1, 0)] * 2, [(1, 0)] * 2)
+        >>> fcv.sample(5)
+        [0.0, 0.15625, 0.5, 0.84375, 1.0]
+    """
+
+    def __init__(
+        self,
+        times,
+        values,
+        inTangents,
+        outTangents,
+        weighted=False,
+        steps=None,
+        preInfinity=CONSTANT,
+        postInfinity=CONSTANT,
+    ):
+        self.times = [float(t) for t in times]
+        self.values = [float(v) for v in values]
+        self.inTangents = [(float(x), float(y)) for x, y in inTangents]
+        self.outTangents = [(float(x), float(y)) for x, y in outTangents]
+        self.weighted = weighted
+        self.steps = list(steps) if steps else [NO_STEP] * len(self.times)
+        self.preInfinity = preInfinity
+        self.postInfinity = postInfinity
+
+    def _segment(self, x, i):
+        # value of the segment from key i to key i + 1
+        x0, x1 = self.times[i], self.times[i + 1]
+        y0, y1 = self.values[i], self.values[i + 1]
+        step = self.steps[i]
+        if step == STEP:
+            return y0
+        if step == STEP_NEXT:
+            return y1 if x > x0 else y0
+        if x1 <= x0:
+            return y1
+        if not self.weighted:
+            return _hermite(
+                x,
+                x0,
+                y0,
+                x1,
+                y1,
+                _slope(self.outTangents[i]),
+                _slope(self.inTangents[i + 1]),
+            )
+        ox, oy = self.outTangents[i]
+        ix, iy = self.inTangents[i + 1]
+        xs = (x0, x0 + ox / 3.0, x1 - ix / 3.0, x1)
+        s = _solveBezierX(x, *xs)
+        return _bezier(s, y0, y0 + oy / 3.0, y1 - iy / 3.0, y1)
+
+    def _evaluateInRange(self, x):
+        i = bisect.bisect_right(self.times, x) - 1
+        if i >= len(self.times) - 1:
+            return self.values[-1]
+        return self._segment(x, max(i, 0))
+
+    def _infinity(self, x, infinity, before):
+        first, last = self.times[0], self.times[-1]
+        span = last - first
+        if infinity == LINEAR:
+            if before:
+                return self.values[0] + (x - first) * _slope(
+                    self.inTangents[0]
+                )
+            return self.values[-1] + (x - last) * _slope(
+                self.outTangents[-1]
+            )
+        if infinity not in (CYCLE, CYCLE_RELATIVE, OSCILLATE) or span <= 0:
+            return self.values[0] if before else self.values[-1]
+        cycles = math.floor((x - first) / span)
+        offset = (x - first) - cycles * span
+        if infinity == OSCILLATE and int(cycles) % 2:
+            return self._evaluateInRange(last - offset)
+        value = self._evaluateInRange(first + offset)
+        if infinity == CYCLE_RELATIVE:
+            value += cycles * (self.values[-1] - self.values[0])
+        return value
+
+    def evaluate(self, inputs):
+        """Evaluate the curve for many inputs
+
+        Args:
+            inputs (sequence): The curve inputs
+
+        Returns:
+            list: The curve values
+        """
+        if not self.times:
+            return [0.0] * len(inputs)
+        first, last = self.times[0], self.times[-1]
+        result = []
+        for x in inputs:
+            if x < first:
+                result.append(self._infinity(x, self.preInfinity, True))
+            elif x > last:
+                result.append(self._infinity(x, self.postInfinity, False))
+            else:
+                result.append(self._evaluateInRange(x))
+        return result
+
+    def sample(self, division, factor=1.0):
+        """Get division values evenly spaced from input 0.0 to 1.0
+
+        Same sampling as ``fcurve.getFCurveValues``
+
+        Args:
+            division (int): The number of values
+            factor (float, optional): Multiplication factor
+
+        Returns:
+            list: The values
+        """
+        if division < 2:
+            inputs = [0.0] * division
+        else:
+            incr = 1 / (division - 1.0)
+            inputs = [i * incr for i in range(division)]
+        return [v * factor for v in self.evaluate(inputs)]
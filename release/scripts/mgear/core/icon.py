@@ -4,12 +4,13 @@
 # GLOBAL
 #############################################
 import pymel.core as pm
-import maya.OpenMaya as om
-import pymel.util as pmu
 from pymel.core import datatypes
 from mgear.core import curve, attribute
+from mgear.core import icon_shapes
+from maya import cmds
 
 import math
+import time
 
 import mgear
 
@@ -216,32 +217,18 @@ def cube(parent=None,
     Returns:
         dagNode: The newly created icon.
     """
-    lenX = width * 0.5
-    lenY = height * 0.5
-    lenZ = depth * 0.5
-
-    # p is positive, N is negative
-    ppp = datatypes.Vector(lenX, lenY, lenZ)
-    ppN = datatypes.Vector(lenX, lenY, lenZ * -1)
-    pNp = datatypes.Vector(lenX, lenY * -1, lenZ)
-    Npp = datatypes.Vector(lenX * -1, lenY, lenZ)
-    pNN = datatypes.Vector(lenX, lenY * -1, lenZ * -1)
-    NNp = datatypes.Vector(lenX * -1, lenY * -1, lenZ)
-    NpN = datatypes.Vector(lenX * -1, lenY, lenZ * -1)
-    NNN = datatypes.Vector(lenX * -1, lenY * -1, lenZ * -1)
-
-    v_array = [ppp, ppN, NpN, NNN, NNp, Npp, NpN, Npp, ppp, pNp, NNp, pNp, pNN,
-               ppN, pNN, NNN]
-
-    points = getPointArrayWithOffset(v_array,
-                                     pos_offset,
-                                     rot_offset)
-
-    node = curve.addCurve(parent, name, points, False, 1, m)
-
-    setcolor(node, color)
-
-    return node
+    return _template_icon(
+        "cube",
+        parent,
+        name,
+        color,
+        m,
+        pos_offset,
+        rot_offset,
+        width=width,
+        height=height,
+        depth=depth,
+    )
 
 
 def pyramid(parent=None,
@@ -272,26 +259,18 @@ def pyramid(parent=None,
         dagNode: The newly created icon.
 
     """
-    lenX = width * 0.5
-    lenY = height
-    lenZ = depth * 0.5
-
-    # p is positive, N is negative
-    top = datatypes.Vector(0, lenY, 0)
-    pp = datatypes.Vector(lenX, 0, lenZ)
-    pN = datatypes.Vector(lenX, 0, lenZ * -1)
-    Np = datatypes.Vector(lenX * -1, 0, lenZ)
-    NN = datatypes.Vector(lenX * -1, 0, lenZ * -1)
-
-    v_array = [pp, top, pN, pp, Np, top, NN, Np, NN, pN]
-
-    points = getPointArrayWithOffset(v_array, pos_offset, rot_offset)
-
-    node = curve.addCurve(parent, name, points, False, 1, m)
-
-    setcolor(node, color)
-
-    return node
+    return _template_icon(
+        "pyramid",
+        parent,
+        name,
+        color,
+        m,
+        pos_offset,
+        rot_offset,
+        width=width,
+        height=height,
+        depth=depth,
+    )
 
 
 def square(parent=None,
@@ -320,21 +299,17 @@ def square(parent=None,
         dagNode: The newly created icon.
 
     """
-    lenX = width * 0.5
-    lenZ = depth * 0.5
-
-    v0 = datatypes.Vector(lenX, 0, lenZ)
-    v1 = datatypes.Vector(lenX, 0, lenZ * -1)
-    v2 = datatypes.Vector(lenX * -1, 0, lenZ * -1)
-    v3 = datatypes.Vector(lenX * -1, 0, lenZ)
-
-    points = getPointArrayWithOffset([v0, v1, v2, v3], pos_offset, rot_offset)
-
-    node = curve.addCurve(parent, name, points, True, 1, m)
-
-    setcolor(node, color)
-
-    return node
+    return _template_icon(
+        "square",
+        parent,
+        name,
+        color,
+        m,
+        pos_offset,
+        rot_offset,
+        width=width,
+        depth=depth,
+    )
 
 
 def flower(parent=None,
@@ -362,25 +337,17 @@ def flower(parent=None,
         dagNode: The newly created icon.
 
     """
-    dlen = width
-
-    v0 = datatypes.Vector(0, -dlen, 0)
-    v1 = datatypes.Vector(-dlen * .4, dlen * .4, 0)
-    v2 = datatypes.Vector(dlen, 0, 0)
-    v3 = datatypes.Vector(-dlen * .4, -dlen * .4, 0)
-    v4 = datatypes.Vector(0, dlen, 0)
-    v5 = datatypes.Vector(dlen * .4, -dlen * .4, 0)
-    v6 = datatypes.Vector(-dlen, 0, 0)
-    v7 = datatypes.Vector(dlen * .4, dlen * .4, 0)
-
-    points = getPointArrayWithOffset(
-        [v0, v1, v2, v3, v4, v5, v6, v7], pos_offset, rot_offset)
-
-    node = curve.addCurve(parent, name, points, True, degree, m)
-
-    setcolor(node, color)
-
-    return node
+    return _template_icon(
+        "flower",
+        parent,
+        name,
+        color,
+        m,
+        pos_offset,
+        rot_offset,
+        width=width,
+        degree=degree,
+    )
 
 
 def circle(parent=None,
@@ -408,25 +375,17 @@ def circle(parent=None,
         dagNode: The newly created icon.
 
     """
-    dlen = width * 0.5
-
-    v0 = datatypes.Vector(0, 0, -dlen * 1.108)
-    v1 = datatypes.Vector(dlen * .78, 0, -dlen * .78)
-    v2 = datatypes.Vector(dlen * 1.108, 0, 0)
-    v3 = datatypes.Vector(dlen * .78, 0, dlen * .78)
-    v4 = datatypes.Vector(0, 0, dlen * 1.108)
-    v5 = datatypes.Vector(-dlen * .78, 0, dlen * .78)
-    v6 = datatypes.Vector(-dlen * 1.108, 0, 0)
-    v7 = datatypes.Vector(-dlen * .78, 0, -dlen * .78)
-
-    points = getPointArrayWithOffset(
-        [v0, v1, v2, v3, v4, v5, v6, v7], pos_offset, rot_offset)
-
-    node = curve.addCurve(parent, name, points, True, degree, m)
-
-    setcolor(node, color)
-
-    return node
+    return _template_icon(
+        "circle",
+        parent,
+        name,
+        color,
+        m,
+        pos_offset,
+        rot_offset,
+        width=width,
+        degree=degree,
+    )
 
 
 def cylinder(parent=None,
@@ -456,73 +415,18 @@ def cylinder(parent=None,
         dagNode: The newly created icon.
 
     """
-    dlen = width * .5
-    dhei = heigth * .5
-
-    if degree == 3:
-        offsetMult = 1
-    else:
-        offsetMult = 1.108
-
-    # upper circle
-    v0 = datatypes.Vector(0, dhei, -dlen * 1.108)
-    v1 = datatypes.Vector(dlen * .78, dhei, -dlen * .78)
-    v2 = datatypes.Vector(dlen * 1.108, dhei, 0)
-    v3 = datatypes.Vector(dlen * .78, dhei, dlen * .78)
-    v4 = datatypes.Vector(0, dhei, dlen * 1.108)
-    v5 = datatypes.Vector(-dlen * .78, dhei, dlen * .78)
-    v6 = datatypes.Vector(-dlen * 1.108, dhei, 0)
-    v7 = datatypes.Vector(-dlen * .78, dhei, -dlen * .78)
-
-    # lower circle
-    v8 = datatypes.Vector(0, -dhei, -dlen * 1.108)
-    v9 = datatypes.Vector(dlen * .78, -dhei, -dlen * .78)
-    v10 = datatypes.Vector(dlen * 1.108, -dhei, 0)
-    v11 = datatypes.Vector(dlen * .78, -dhei, dlen * .78)
-    v12 = datatypes.Vector(0, -dhei, dlen * 1.108)
-    v13 = datatypes.Vector(-dlen * .78, -dhei, dlen * .78)
-    v14 = datatypes.Vector(-dlen * 1.108, -dhei, 0)
-    v15 = datatypes.Vector(-dlen * .78, -dhei, -dlen * .78)
-
-    # curves
-    v16 = datatypes.Vector(0, dhei, -dlen * offsetMult)
-    v17 = datatypes.Vector(0, -dhei, -dlen * offsetMult)
-    v18 = datatypes.Vector(0, -dhei, dlen * offsetMult)
-    v19 = datatypes.Vector(0, dhei, dlen * offsetMult)
-
-    v20 = datatypes.Vector(dlen * offsetMult, dhei, 0)
-    v21 = datatypes.Vector(dlen * offsetMult, -dhei, 0)
-    v22 = datatypes.Vector(-dlen * offsetMult, - dhei, 0)
-    v23 = datatypes.Vector(-dlen * offsetMult, dhei, 0)
-
-    points = getPointArrayWithOffset(
-        [v0, v1, v2, v3, v4, v5, v6, v7], pos_offset, rot_offset)
-    node = curve.addCurve(parent, name, points, True, degree, m)
-
-    points = getPointArrayWithOffset(
-        [v8, v9, v10, v11, v12, v13, v14, v15], pos_offset, rot_offset)
-    crv_0 = curve.addCurve(parent, node + "_0crv", points, True, degree, m)
-
-    points = getPointArrayWithOffset([v16, v17], pos_offset, rot_offset)
-    crv_1 = curve.addCurve(parent, node + "_1crv", points, True, 1, m)
-
-    points = getPointArrayWithOffset([v18, v19], pos_offset, rot_offset)
-    crv_2 = curve.addCurve(parent, node + "_2crv", points, True, 1, m)
-
-    points = getPointArrayWithOffset([v20, v21], pos_offset, rot_offset)
-    crv_3 = curve.addCurve(parent, node + "_3crv", points, True, 1, m)
-
-    points = getPointArrayWithOffset([v22, v23], pos_offset, rot_offset)
-    crv_4 = curve.addCurve(parent, node + "_4crv", points, True, 1, m)
-
-    for crv in [crv_0, crv_1, crv_2, crv_3, crv_4]:
-        for shp in crv.listRelatives(shapes=True):
-            node.addChild(shp, add=True, shape=True)
-        pm.delete(crv)
-
-    setcolor(node, color)
-
-    return node
+    return _template_icon(
+        "cylinder",
+        parent,
+        name,
+        color,
+        m,
+        pos_offset,
+        rot_offset,
+        width=width,
+        height=heigth,
+        degree=degree,
+    )
 
 
 def compas(parent=None,
@@ -550,27 +454,17 @@ def compas(parent=None,
         dagNode: The newly created icon.
 
     """
-    dlen = width * 0.5
-
-    division = 24
-
-    point_pos = []
-    v = datatypes.Vector(0, 0, dlen)
-
-    for i in range(division):
-        if i == division / 2:
-            w = datatypes.Vector(v.x, v.y, v.z - dlen * .4)
-        else:
-            w = datatypes.Vector(v.x, v.y, v.z)
-        point_pos.append(w)
-        v = v.rotateBy((0, (2 * pmu.math.pi) / (division + 0.0), 0))
-
-    points = getPointArrayWithOffset(point_pos, pos_offset, rot_offset)
-    node = curve.addCurve(parent, name, points, True, degree, m)
-
-    setcolor(node, color)
-
-    return node
+    return _template_icon(
+        "compas",
+        parent,
+        name,
+        color,
+        m,
+        pos_offset,
+        rot_offset,
+        width=width,
+        degree=degree,
+    )
 
 
 def diamond(parent=None,
@@ -599,25 +493,16 @@ def diamond(parent=None,
         dagNode: The newly created icon.
 
     """
-    dlen = width * 0.5
-
-    top = datatypes.Vector(0, dlen, 0)
-    pp = datatypes.Vector(dlen, 0, dlen)
-    pN = datatypes.Vector(dlen, 0, dlen * -1)
-    Np = datatypes.Vector(dlen * -1, 0, dlen)
-    NN = datatypes.Vector(dlen * -1, 0, dlen * -1)
-    bottom = (0, -dlen, 0)
-
-    v_array = [pp, top, pN, pp, Np, top, NN, Np, NN, pN, bottom, NN, bottom,
-               Np, bottom, pp]
-
-    points = getPointArrayWithOffset(v_array, pos_offset, rot_offset)
-
-    node = curve.addCurve(parent, name, points, False, 1, m)
-
-    setcolor(node, color)
-
-    return node
+    return _template_icon(
+        "diamond",
+        parent,
+        name,
+        color,
+        m,
+        pos_offset,
+        rot_offset,
+        width=width,
+    )
 
 
 def cubewithpeak(parent=None,
@@ -644,28 +529,16 @@ def cubewithpeak(parent=None,
         dagNode: The newly created icon.
 
     """
-    dlen = width * 0.5
-
-    peak = datatypes.Vector(0, width, 0)
-    ppp = datatypes.Vector(dlen, dlen, dlen)
-    ppN = datatypes.Vector(dlen, dlen, dlen * -1)
-    pNp = datatypes.Vector(dlen, 0, dlen)
-    Npp = datatypes.Vector(dlen * -1, dlen, dlen)
-    pNN = datatypes.Vector(dlen, 0, dlen * -1)
-    NNp = datatypes.Vector(dlen * -1, 0, dlen)
-    NpN = datatypes.Vector(dlen * -1, dlen, dlen * -1)
-    NNN = datatypes.Vector(dlen * -1, 0, dlen * -1)
-
-    v_array = [peak, ppp, ppN, peak, NpN, ppN, NpN, peak, Npp, NpN, NNN, NNp,
-               Npp, NpN, Npp, ppp, pNp, NNp, pNp, pNN, ppN, pNN, NNN]
-
-    points = getPointArrayWithOffset(v_array, pos_offset, rot_offset)
-
-    node = curve.addCurve(parent, name, points, False, 1, m)
-
-    setcolor(node, color)
-
-    return node
+    return _template_icon(
+        "cubewithpeak",
+        parent,
+        name,
+        color,
+        m,
+        pos_offset,
+        rot_offset,
+        width=width,
+    )
 
 
 def sphere(parent=None,
@@ -693,49 +566,17 @@ def sphere(parent=None,
         dagNode: The newly created icon.
 
     """
-    dlen = width * .5
-
-    v0 = datatypes.Vector(0, 0, -dlen * 1.108)
-    v1 = datatypes.Vector(dlen * .78, 0, -dlen * .78)
-    v2 = datatypes.Vector(dlen * 1.108, 0, 0)
-    v3 = datatypes.Vector(dlen * .78, 0, dlen * .78)
-    v4 = datatypes.Vector(0, 0, dlen * 1.108)
-    v5 = datatypes.Vector(-dlen * .78, 0, dlen * .78)
-    v6 = datatypes.Vector(-dlen * 1.108, 0, 0)
-    v7 = datatypes.Vector(-dlen * .78, 0, -dlen * .78)
-
-    ro = datatypes.Vector([1.5708, 0, 0])
-
-    points = getPointArrayWithOffset(
-        [v0, v1, v2, v3, v4, v5, v6, v7], pos_offset, rot_offset)
-    node = curve.addCurve(parent, name, points, True, degree, m)
-
-    if rot_offset:
-        rot_offset += ro
-    else:
-        rot_offset = ro
-    points = getPointArrayWithOffset(
-        [v0, v1, v2, v3, v4, v5, v6, v7], pos_offset, rot_offset)
-    crv_0 = curve.addCurve(parent, node + "_0crv", points, True, degree, m)
-
-    ro = datatypes.Vector([1.5708, 0, 1.5708])
-    if rot_offset:
-        rot_offset += ro
-    else:
-        rot_offset = ro
-    points = getPointArrayWithOffset(
-        [v0, v1, v2, v3, v4, v5, v6, v7], pos_offset, rot_offset + ro + ro)
-
-    crv_1 = curve.addCurve(parent, node + "_1crv", points, True, degree, m)
-
-    for crv in [crv_0, crv_1]:
-        for shp in crv.listRelatives(shapes=True):
-            node.addChild(shp, add=True, shape=True)
-        pm.delete(crv)
-
-    setcolor(node, color)
-
-    return node
+    return _template_icon(
+        "sphere",
+        parent,
+        name,
+        color,
+        m,
+        pos_offset,
+        rot_offset,
+        width=width,
+        degree=degree,
+    )
 
 
 def arrow(parent=None,
@@ -762,24 +603,16 @@ def arrow(parent=None,
         dagNode: The newly created icon.
 
     """
-    dlen = width * 0.5
-
-    v0 = datatypes.Vector(0, 0.3 * dlen, -dlen)
-    v1 = datatypes.Vector(0, 0.3 * dlen, 0.3 * dlen)
-    v2 = datatypes.Vector(0, 0.6 * dlen, 0.3 * dlen)
-    v3 = datatypes.Vector(0, 0, dlen)
-    v4 = datatypes.Vector(0, -0.6 * dlen, 0.3 * dlen)
-    v5 = datatypes.Vector(0, -0.3 * dlen, 0.3 * dlen)
-    v6 = datatypes.Vector(0, -0.3 * dlen, -dlen)
-
-    points = getPointArrayWithOffset(
-        [v0, v1, v2, v3, v4, v5, v6], pos_offset, rot_offset)
-
-    node = curve.addCurve(parent, name, points, True, 1, m)
-
-    setcolor(node, color)
-
-    return node
+    return _template_icon(
+        "arrow",
+        parent,
+        name,
+        color,
+        m,
+        pos_offset,
+        rot_offset,
+        width=width,
+    )
 
 
 def crossarrow(parent=None,
@@ -806,42 +639,16 @@ def crossarrow(parent=None,
         dagNode: The newly created icon.
 
     """
-    dlen = width * 0.5
-
-    v0 = datatypes.Vector(0.2 * dlen, 0, 0.2 * dlen)
-    v1 = datatypes.Vector(0.2 * dlen, 0, 0.6 * dlen)
-    v2 = datatypes.Vector(0.4 * dlen, 0, 0.6 * dlen)
-    v3 = datatypes.Vector(0, 0, dlen)
-    v4 = datatypes.Vector(-0.4 * dlen, 0, 0.6 * dlen)
-    v5 = datatypes.Vector(-0.2 * dlen, 0, 0.6 * dlen)
-    v6 = datatypes.Vector(-0.2 * dlen, 0, 0.2 * dlen)
-    v7 = datatypes.Vector(-0.6 * dlen, 0, 0.2 * dlen)
-    v8 = datatypes.Vector(-0.6 * dlen, 0, 0.4 * dlen)
-    v9 = datatypes.Vector(-dlen, 0, 0)
-    v10 = datatypes.Vector(-0.6 * dlen, 0, -0.4 * dlen)
-    v11 = datatypes.Vector(-0.6 * dlen, 0, -0.2 * dlen)
-    v12 = datatypes.Vector(-0.2 * dlen, 0, -0.2 * dlen)
-    v13 = datatypes.Vector(-0.2 * dlen, 0, -0.6 * dlen)
-    v14 = datatypes.Vector(-0.4 * dlen, 0, -0.6 * dlen)
-    v15 = datatypes.Vector(0, 0, -dlen)
-    v16 = datatypes.Vector(0.4 * dlen, 0, -0.6 * dlen)
-    v17 = datatypes.Vector(0.2 * dlen, 0, -0.6 * dlen)
-    v18 = datatypes.Vector(0.2 * dlen, 0, -0.2 * dlen)
-    v19 = datatypes.Vector(0.6 * dlen, 0, -0.2 * dlen)
-    v20 = datatypes.Vector(0.6 * dlen, 0, -0.4 * dlen)
-    v21 = datatypes.Vector(dlen, 0, 0)
-    v22 = datatypes.Vector(0.6 * dlen, 0, 0.4 * dlen)
-    v23 = datatypes.Vector(0.6 * dlen, 0, 0.2 * dlen)
-
-    v_array = [v0, v1, v2, v3, v4, v5, v6, v7, v8, v9, v10, v11, v12, v13, v14,
-               v15, v16, v17, v18, v19, v20, v21, v22, v23]
-    points = getPointArrayWithOffset(v_array, pos_offset, rot_offset)
-
-    node = curve.addCurve(parent, name, points, True, 1, m)
-
-    setcolor(node, color)
-
-    return node
+    return _template_icon(
+        "crossarrow",
+        parent,
+        name,
+        color,
+        m,
+        pos_offset,
+        rot_offset,
+        width=width,
+    )
 
 
 def cross(parent=None,
@@ -868,36 +675,16 @@ def cross(parent=None,
         dagNode: The newly created icon.
 
     """
-    width = width * 0.35
-    offset1 = width * .5
-    offset2 = width * 1.5
-
-    v0 = datatypes.Vector(width, offset2, 0)
-    v1 = datatypes.Vector(offset2, width, 0)
-    v2 = datatypes.Vector(offset1, 0, 0)
-
-    v3 = datatypes.Vector(offset2, -width, 0)
-    v4 = datatypes.Vector(width, -offset2, 0)
-    v5 = datatypes.Vector(0, -offset1, 0)
-
-    v6 = datatypes.Vector(-width, -offset2, 0)
-    v7 = datatypes.Vector(-offset2, -width, 0)
-    v8 = datatypes.Vector(-offset1, 0, 0)
-
-    v9 = datatypes.Vector(-offset2, width, 0)
-    v10 = datatypes.Vector(-width, offset2, 0)
-    v11 = datatypes.Vector(0, offset1, 0)
-
-    points = getPointArrayWithOffset(
-        [v0, v1, v2, v3, v4, v5, v6, v7, v8, v9, v10, v11],
+    return _template_icon(
+        "cross",
+        parent,
+        name,
+        color,
+        m,
         pos_offset,
-        rot_offset)
-
-    node = curve.addCurve(parent, name, points, True, 1, m)
-
-    setcolor(node, color)
-
-    return node
+        rot_offset,
+        width=width,
+    )
 
 
 def null(parent=None,
@@ -924,32 +711,16 @@ def null(parent=None,
         dagNode: The newly created icon.
 
     """
-    dlen = width * .5
-
-    v0 = datatypes.Vector(dlen, 0, 0)
-    v1 = datatypes.Vector(-dlen, 0, 0)
-    v2 = datatypes.Vector(0, dlen, 0)
-    v3 = datatypes.Vector(0, -dlen, 0)
-    v4 = datatypes.Vector(0, 0, dlen)
-    v5 = datatypes.Vector(0, 0, -dlen)
-
-    points = getPointArrayWithOffset([v0, v1], pos_offset, rot_offset)
-    node = curve.addCurve(parent, name, points, False, 1, m)
-
-    points = getPointArrayWithOffset([v2, v3], pos_offset, rot_offset)
-    crv_0 = curve.addCurve(parent, name, points, False, 1, m)
-
-    points = getPointArrayWithOffset([v4, v5], pos_offset, rot_offset)
-    crv_1 = curve.addCurve(parent, name, points, False, 1, m)
-
-    for crv in [crv_0, crv_1]:
-        for shp in crv.listRelatives(shapes=True):
-            node.addChild(shp, add=True, shape=True)
-        pm.delete(crv)
-
-    setcolor(node, color)
-
-    return node
+    return _template_icon(
+        "null",
+        parent,
+        name,
+        color,
+        m,
+        pos_offset,
+        rot_offset,
+        width=width,
+    )
 
 
 def axis(parent=None,
@@ -1003,6 +774,243 @@ def axis(parent=None,
     return node
 
 
+##########################################################
+# Batch creation
+##########################################################
+def _matrix_list(m):
+    return [m[i][j] for i in range(4) for j in range(4)]
+
+
+def _build_icon(parent, name, m, color, curves):
+    """Create an icon transform and its curve shapes
+
+    Each curve shape is created directly under the icon with one
+    createNode and one setAttr of the curve data.
+
+    Arguments:
+        parent (dagNode): The parent for the new icon, or None
+        name (str): Name of the icon
+        m (matrix): The global transformation of the icon, or None
+        color (int or list of float): The color in index base or RGB
+        curves (list): (points, closed, degree) tuples, from
+            ``icon_shapes.shape_curves``
+
+    Returns:
+        str: The icon name
+    """
+    kwargs = {"name": name}
+    if parent is not None:
+        kwargs["parent"] = str(parent)
+    node = cmds.createNode("transform", **kwargs)
+    if m is None and parent is not None:
+        # the icon keeps its world transform when parented
+        m = datatypes.Matrix()
+    if m is not None:
+        cmds.xform(node, matrix=_matrix_list(m), worldSpace=True)
+
+    for i, (points, closed, degree) in enumerate(curves):
+        if i:
+            shape_name = "{}_{}crvShape".format(node, i - 1)
+        else:
+            shape_name = node + "Shape"
+        shape = cmds.createNode("nurbsCurve", name=shape_name, parent=node)
+        cvs, knots, spans, form = icon_shapes.curve_data(
+            points, closed, degree)
+        cmds.setAttr(shape + ".cc",
+                     degree, spans, form, False, 3,
+                     knots, len(cvs), *cvs,
+                     type="nurbsCurve")
+        cmds.setAttr(shape + ".overrideEnabled", True)
+        if isinstance(color, int):
+            cmds.setAttr(shape + ".overrideColor", color)
+        else:
+            cmds.setAttr(shape + ".overrideRGBColors", 1)
+            cmds.setAttr(shape + ".overrideColorRGB", *color)
+    return node
+
+
+def _template_icon(icon,
+                   parent,
+                   name,
+                   color,
+                   m,
+                   pos_offset,
+                   rot_offset,
+                   width=1,
+                   height=1,
+                   depth=1,
+                   degree=3):
+    """Create an icon from its ``icon_shapes`` template
+
+    Returns:
+        dagNode: The newly created icon.
+    """
+    curves = icon_shapes.shape_curves(
+        icon, width, height, depth, pos_offset, rot_offset, degree)
+    return pm.PyNode(_build_icon(parent, name, m, color, curves))
+
+
+def _build_icon_calls(curves, color, m, parent):
+    """Maya calls of ``_build_icon``
+
+    createNode and xform of the icon, then per curve: createNode, setAttr
+    of the curve data and 2 (index) or 3 (RGB) color setAttr.
+    """
+    calls = 1
+    if m is not None or parent is not None:
+        calls += 1
+    color_calls = 2 if isinstance(color, int) else 3
+    return calls + (2 + color_calls) * len(curves)
+
+
+def _add_curve_calls(curves, color, parent):
+    """Maya calls of ``_add_curve_icon``
+
+    Per curve: curve, setTransformation and addChild if parented. Per extra
+    curve: listRelatives, addChild and delete. Then setcolor: listRelatives
+    and 2 (index) or 3 (RGB) setAttr per shape.
+    """
+    count = len(curves)
+    per_curve = 3 if parent is not None else 2
+    color_calls = 2 if isinstance(color, int) else 3
+    return per_curve * count + 3 * (count - 1) + 1 + color_calls * count
+
+
+def _add_curve_icon(parent, name, m, color, curves):
+    """Create an icon with ``curve.addCurve``, as the icon functions did
+    before the templates. Used as the benchmark baseline
+
+    Returns:
+        dagNode: The newly created icon.
+    """
+    if m is None:
+        m = datatypes.Matrix()
+    node = None
+    for i, (points, closed, degree) in enumerate(curves):
+        crv_name = name if not i else "{}_{}crv".format(node, i - 1)
+        crv = curve.addCurve(
+            parent, crv_name, [list(p) for p in points], closed, degree, m)
+        if node is None:
+            node = crv
+            continue
+        for shp in crv.listRelatives(shapes=True):
+            node.addChild(shp, add=True, shape=True)
+        pm.delete(crv)
+    setcolor(node, color)
+    return node
+
+
+def _spec_curves(spec):
+    return icon_shapes.shape_curves(
+        spec["icon"],
+        spec.get("w", 1),
+        spec.get("h", 1),
+        spec.get("d", 1),
+        spec.get("po"),
+        spec.get("ro"),
+        spec.get("degree", 3),
+    )
+
+
+def create_batch(specs, report=None):
+    """Create many icons of mixed shapes
+
+    Same icons as ``create``, without its per icon argument handling. The
+    curves come from the shape templates, and each curve shape is created
+    directly under its icon with one createNode and one setAttr of the
+    curve data, without the temporary curve transforms, reparenting and
+    deletes of ``curve.addCurve``.
+
+    Arguments:
+        specs (list of dict): One dict per icon, with the ``create``
+            arguments: parent, name, m, color, icon, w, h, d, po, ro and
+            degree. Only name and icon are required.
+        report (dict, optional): If given, it is filled with the number of
+            "icons", the Maya "calls" of the batch, the "addCurveCalls" of
+            the same icons created with ``curve.addCurve`` and the batch
+            "time" in seconds. See benchmark_batch
+
+    Returns:
+        list of dagNode: The newly created icons.
+
+    Example:
+        .. code-block:: python
+
+            ctls = icon.create_batch([
+                {"name": "arm_ctl", "icon": "cube", "w": 2, "parent": root},
+                {"name": "hand_ctl", "icon": "circle", "color": 17},
+            ])
+
+    """
+    start = time.time()
+    calls = 0
+    add_curve_calls = 0
+    names = []
+    for spec in specs:
+        curves = _spec_curves(spec)
+        parent = spec.get("parent")
+        m = spec.get("m")
+        color = spec.get("color", [0, 0, 0])
+        names.append(
+            _build_icon(parent, spec.get("name", "icon"), m, color, curves)
+        )
+        calls += _build_icon_calls(curves, color, m, parent)
+        add_curve_calls += _add_curve_calls(curves, color, parent)
+
+    nodes = [pm.PyNode(n) for n in names]
+    if report is not None:
+        report["icons"] = len(nodes)
+        report["calls"] = calls
+        report["addCurveCalls"] = add_curve_calls
+        report["time"] = time.time() - start
+    return nodes
+
+
+def benchmark_batch(specs):
+    """Compare create_batch with the ``curve.addCurve`` creation
+
+    The icons are created both ways in the scene, then deleted.
+
+    Arguments:
+        specs (list of dict): The icons. See create_batch
+
+    Returns:
+        dict: The create_batch report, with the "addCurveTime" in seconds
+            and the "speedup"
+    """
+    start = time.time()
+    nodes = []
+    for spec in specs:
+        nodes.append(
+            _add_curve_icon(
+                spec.get("parent"),
+                spec.get("name", "icon"),
+                spec.get("m"),
+                spec.get("color", [0, 0, 0]),
+                _spec_curves(spec),
+            )
+        )
+    add_curve_time = time.time() - start
+    pm.delete(nodes)
+
+    report = {}
+    pm.delete(create_batch(specs, report))
+    report["addCurveTime"] = add_curve_time
+    report["speedup"] = add_curve_time / max(report["time"], 1e-9)
+    mgear.log(
+        "{} icons. Batch: {} Maya calls, {:.3f}s. addCurve: {} Maya calls, "
+        "{:.3f}s. x{:.1f}".format(
+            report["icons"],
+            report["calls"],
+            report["time"],
+            report["addCurveCalls"],
+            add_curve_time,
+            report["speedup"],
+        )
+    )
+    return report
+
+
 ##########################################################
 # Display helper Icons
 ##########################################################
@@ -1244,7 +1252,10 @@ def guideBladeIcon(parent=None,
 # ========================================================
 
 
-def getPointArrayWithOffset(point_pos, pos_offset=None, rot_offset=None):
+def getPointArrayWithOffset(point_pos,
+                            pos_offset=None,
+                            rot_offset=None,
+                            scale=None):
     """Get Point array with offset
 
     Convert a list of vector to a List of float and add the position and
@@ -1256,26 +1267,17 @@ def getPointArrayWithOffset(point_pos, pos_offset=None, rot_offset=None):
             center.
         rot_offset (vector): The rotation offset of the curve from its
             center. In radians.
+        scale (vector, optional): The xyz scale, applied before the
+            rotation offset.
 
     Returns:
         list of vector: the new point positions
 
     """
-    points = []
-    for v in point_pos:
-        if rot_offset:
-            mv = om.MVector(v.x, v.y, v.z)
-            mv = mv.rotateBy(om.MEulerRotation(rot_offset.x,
-                                               rot_offset.y,
-                                               rot_offset.z,
-                                               om.MEulerRotation.kXYZ))
-            v = datatypes.Vector(mv.x, mv.y, mv.z)
-        if pos_offset:
-            v = v + pos_offset
-
-        points.append(v)
-
-    return points
+    # the rotation matrix is computed once for all the points
+    points = icon_shapes.transform_points(
+        point_pos, scale, rot_offset, pos_offset)
+    return [datatypes.Vector(p[0], p[1], p[2]) for p in points]
 
 
 def setcolor(node, color):
@@ -0,0 +1,368 @@
+"""Control icon shape templates
+
+This module is Maya free. Each icon shape is registered once as normalized
+point arrays (width, height and depth of 1), and placed with one scale,
+rotation and offset transform per control. The ``icon`` functions, like
+``icon.cube`` or ``icon.create_batch``, build their curves from the
+templates.
+"""
+
+import math
+
+# template scale axes, from the icon width (w), height (h) and depth (d)
+UNIFORM = ("w", "w", "w")
+BOX = ("w", "h", "d")
+
+_templates = {}
+
+
+def register_shape(name, curves, scale=UNIFORM, degree=None):
+    """Register an icon shape template
+
+    Arguments:
+        name (str): The icon name
+        curves (list): (points, closed, degree) or (points, closed, degree,
+            rotation) tuples, one per curve shape. degree None uses the
+            degree requested on creation. The xyz euler rotation, in
+            radians, is added to the rotation offset of the icon
+        scale (tuple, optional): The icon size parameter ("w", "h" or "d")
+            scaling each axis
+        degree (int, optional): If set, the template is only used for this
+            requested degree
+    """
+    templateCurves = []
+    for crv in curves:
+        points, closed, deg = crv[:3]
+        rotation = tuple(float(a) for a in crv[3]) if len(crv) > 3 else None
+        templateCurves.append(
+            (
+                [tuple(float(c) for c in p) for p in points],
+                closed,
+                deg,
+                rotation,
+            )
+        )
+    _templates[(name, degree)] = {"curves": templateCurves, "scale": scale}
+
+
+def get_shape(name, degree=3):
+    """Get a registered icon shape template
+
+    Arguments:
+        name (str): The icon name
+        degree (int, optional): The requested degree
+
+    Returns:
+        dict: {"curves": [(points, closed, degree, rotation)],
+            "scale": axes}
+    """
+    template = _templates.get((name, degree)) or _templates.get((name, None))
+    if template is None:
+        raise KeyError("Not registered icon shape: {}".format(name))
+    return template
+
+
+def shape_names():
+    """Get the registered icon shape names"""
+    return sorted(set(name for name, _ in _templates))
+
+
+def euler_xyz_matrix(rotation):
+    """Get the rotation matrix of an XYZ euler rotation
+
+    Same rotation as ``MVector.rotateBy(MEulerRotation(x, y, z, kXYZ))``
+
+    Arguments:
+        rotation (sequence): xyz angles in radians
+
+    Returns:
+        tuple: 3 row vectors, to multiply as ``v * M``
+    """
+    cx, sx = math.cos(rotation[0]), math.sin(rotation[0])
+    cy, sy = math.cos(rotation[1]), math.sin(rotation[1])
+    cz, sz = math.cos(rotation[2]), math.sin(rotation[2])
+    # Rx * Ry * Rz with row vectors
+    return (
+        (cy * cz, cy * sz, -sy),
+        (sx * sy * cz - cx * sz, sx * sy * sz + cx * cz, sx * cy),
+        (cx * sy * cz + sx * sz, cx * sy * sz - sx * cz, cx * cy),
+    )
+
+
+def transform_points(points, scale=None, rotation=None, offset=None):
+    """Scale, rotate and offset many points
+
+    The rotation matrix is computed once for all the points.
+
+    Arguments:
+        points (sequence): Points
+        scale (sequence, optional): xyz scale
+        rotation (sequence, optional): xyz euler rotation in radians
+        offset (sequence, optional): xyz offset, added after the rotation
+
+    Returns:
+        list: (x, y, z) tuples
+    """
+    sx, sy, sz = scale if scale else (1.0, 1.0, 1.0)
+    ox, oy, oz = offset if offset else (0.0, 0.0, 0.0)
+    if rotation and any(rotation):
+        r0, r1, r2 = euler_xyz_matrix(rotation)
+    else:
+        r0, r1, r2 = (1.0, 0.0, 0.0), (0.0, 1.0, 0.0), (0.0, 0.0, 1.0)
+    result = []
+    for p in points:
+        x, y, z = p[0] * sx, p[1] * sy, p[2] * sz
+        result.append(
+            (
+                x * r0[0] + y * r1[0] + z * r2[0] + ox,
+                x * r0[1] + y * r1[1] + z * r2[1] + oy,
+                x * r0[2] + y * r1[2] + z * r2[2] + oz,
+            )
+        )
+    return result
+
+
+def shape_curves(
+    name, width=1, height=1, depth=1, pos_offset=None, rot_offset=None,
+    degree=3
+):
+    """Get the curves of an icon, placed from its template
+
+    Arguments:
+        name (str): The icon name
+        width (float, optional): Width of the shape
+        height (float, optional): Height of the shape
+        depth (float, optional): Depth of the shape
+        pos_offset (sequence, optional): xyz position offset
+        rot_offset (sequence, optional): xyz rotation offset in radians
+        degree (int, optional): The degree of the curves without fixed
+            degree
+
+    Returns:
+        list: (points, closed, degree) tuples
+    """
+    template = get_shape(name, degree)
+    sizes = {"w": width, "h": height, "d": depth}
+    scale = [sizes[axis] for axis in template["scale"]]
+    result = []
+    for points, closed, deg, rotation in template["curves"]:
+        if rotation is None:
+            rotation = rot_offset
+        elif rot_offset is not None:
+            rotation = [a + b for a, b in zip(rot_offset, rotation)]
+        result.append(
+            (
+                transform_points(points, scale, rotation, pos_offset),
+                closed,
+                degree if deg is None else deg,
+            )
+        )
+    return result
+
+
+def curve_data(points, closed=False, degree=3):
+    """Get the nurbsCurve data of a curve, as created by ``curve.addCurve``
+
+    Arguments:
+        points (list): The curve points
+        closed (bool, optional): Periodic curve
+        degree (int, optional): Curve degree
+
+    Returns:
+        tuple: cvs, knots, spans and form (0 open, 2 periodic)
+    """
+    points = list(points)
+    if closed:
+        spans = len(points)
+        points.extend(points[:degree])
+        knots = [float(k) for k in range(len(points) + degree - 1)]
+        return points, knots, spans, 2
+    spans = len(points) - degree
+    knots = (
+        [0.0] * degree
+        + [float(k) for k in range(1, spans)]
+        + [float(spans)] * degree
+    )
+    return points, knots, spans, 0
+
+
+######################################
+# Templates
+######################################
+
+
+def _circle(radius, y=0.0):
+    # the mGear 8 points circle, in the XZ plane
+    r = radius * 1.108
+    d = radius * 0.78
+    return [
+        (0, y, -r),
+        (d, y, -d),
+        (r, y, 0),
+        (d, y, d),
+        (0, y, r),
+        (-d, y, d),
+        (-r, y, 0),
+        (-d, y, -d),
+    ]
+
+
+def _register_builtin_shapes():
+    # p is positive, N is negative
+    h = 0.5
+    ppp, ppN, pNp, Npp = (h, h, h), (h, h, -h), (h, -h, h), (-h, h, h)
+    pNN, NNp, NpN, NNN = (h, -h, -h), (-h, -h, h), (-h, h, -h), (-h, -h, -h)
+    register_shape(
+        "cube",
+        [
+            (
+                [ppp, ppN, NpN, NNN, NNp, Npp, NpN, Npp, ppp, pNp, NNp, pNp,
+                 pNN, ppN, pNN, NNN],
+                False,
+                1,
+            )
+        ],
+        BOX,
+    )
+
+    top = (0, 1, 0)
+    pp, pN, Np, NN = (h, 0, h), (h, 0, -h), (-h, 0, h), (-h, 0, -h)
+    register_shape(
+        "pyramid",
+        [([pp, top, pN, pp, Np, top, NN, Np, NN, pN], False, 1)],
+        BOX,
+    )
+    register_shape(
+        "square", [([pp, pN, NN, Np], True, 1)], ("w", "w", "d")
+    )
+    register_shape(
+        "flower",
+        [
+            (
+                [(0, -1, 0), (-.4, .4, 0), (1, 0, 0), (-.4, -.4, 0),
+                 (0, 1, 0), (.4, -.4, 0), (-1, 0, 0), (.4, .4, 0)],
+                True,
+                None,
+            )
+        ],
+    )
+    register_shape("circle", [(_circle(h), True, None)])
+
+    for degree, offset_mult in ((3, 1.0), (None, 1.108)):
+        dlen = h * offset_mult
+        register_shape(
+            "cylinder",
+            [
+                (_circle(h, h), True, None),
+                (_circle(h, -h), True, None),
+                ([(0, h, -dlen), (0, -h, -dlen)], True, 1),
+                ([(0, -h, dlen), (0, h, dlen)], True, 1),
+                ([(dlen, h, 0), (dlen, -h, 0)], True, 1),
+                ([(-dlen, -h, 0), (-dlen, h, 0)], True, 1),
+            ],
+            ("w", "h", "w"),
+            degree,
+        )
+
+    division = 24
+    compas = []
+    for i in range(division):
+        # (0, 0, 0.5) rotated around Y, the opposite point is pulled out
+        angle = 2 * math.pi * i / division
+        z = h * math.cos(angle)
+        if i == division // 2:
+            z -= h * .4
+        compas.append((h * math.sin(angle), 0, z))
+    register_shape("compas", [(compas, True, None)])
+
+    bottom = (0, -h, 0)
+    top = (0, h, 0)
+    register_shape(
+        "diamond",
+        [
+            (
+                [pp, top, pN, pp, Np, top, NN, Np, NN, pN, bottom, NN, bottom,
+                 Np, bottom, pp],
+                False,
+                1,
+            )
+        ],
+    )
+
+    peak = (0, 1, 0)
+    ppp, ppN, Npp, NpN = (h, h, h), (h, h, -h), (-h, h, h), (-h, h, -h)
+    pNp, pNN, NNp, NNN = (h, 0, h), (h, 0, -h), (-h, 0, h), (-h, 0, -h)
+    register_shape(
+        "cubewithpeak",
+        [
+            (
+                [peak, ppp, ppN, peak, NpN, ppN, NpN, peak, Npp, NpN, NNN,
+                 NNp, Npp, NpN, Npp, ppp, pNp, NNp, pNp, pNN, ppN, pNN, NNN],
+                False,
+                1,
+            )
+        ],
+    )
+
+    # 3 circles, their euler rotations are added to the rotation offset
+    circle = _circle(h)
+    register_shape(
+        "sphere",
+        [
+            (circle, True, None),
+            (circle, True, None, (1.5708, 0, 0)),
+            (circle, True, None, (6.2832, 0, 4.7124)),
+        ],
+    )
+
+    register_shape(
+        "arrow",
+        [
+            (
+                [(0, .3 * h, -h), (0, .3 * h, .3 * h), (0, .6 * h, .3 * h),
+                 (0, 0, h), (0, -.6 * h, .3 * h), (0, -.3 * h, .3 * h),
+                 (0, -.3 * h, -h)],
+                True,
+                1,
+            )
+        ],
+    )
+
+    cross_arrow = [
+        (.2, .2), (.2, .6), (.4, .6), (0, 1), (-.4, .6), (-.2, .6),
+        (-.2, .2), (-.6, .2), (-.6, .4), (-1, 0), (-.6, -.4), (-.6, -.2),
+        (-.2, -.2), (-.2, -.6), (-.4, -.6), (0, -1), (.4, -.6), (.2, -.6),
+        (.2, -.2), (.6, -.2), (.6, -.4), (1, 0), (.6, .4), (.6, .2),
+    ]
+    register_shape(
+        "crossarrow",
+        [([(x * h, 0, z * h) for x, z in cross_arrow], True, 1)],
+    )
+
+    w = 0.35
+    o1 = w * .5
+    o2 = w * 1.5
+    register_shape(
+        "cross",
+        [
+            (
+                [(w, o2, 0), (o2, w, 0), (o1, 0, 0), (o2, -w, 0),
+                 (w, -o2, 0), (0, -o1, 0), (-w, -o2, 0), (-o2, -w, 0),
+                 (-o1, 0, 0), (-o2, w, 0), (-w, o2, 0), (0, o1, 0)],
+                True,
+                1,
+            )
+        ],
+    )
+
+    register_shape(
+        "null",
+        [
+            ([(h, 0, 0), (-h, 0, 0)], False, 1),
+            ([(0, h, 0), (0, -h, 0)], False, 1),
+            ([(0, 0, h), (0, 0, -h)], False, 1),
+        ],
+    )
+
+
+_register_builtin_shapes()
@@ -0,0 +1,118 @@
+"""
+Influence remapping for skin weight import.
+
+This module is Maya free. The imported influence names are resolved against
+the skinCluster influences with a name to index table built once, applying
+optional rules:
+
+    * stripNamespace: compare the names without namespaces
+    * swapSides: swap the L/R side labels (see ``string.convertRLName``)
+    * renames: ``(pattern, replacement)`` regular expression renames,
+      applied in order
+    * nearest: fallback to the closest target influence in space, for the
+      imported influences with a known position
+
+The rules are passed as keyword arguments, so a rules dictionary can be
+forwarded with ``**rules``.
+"""
+
+import re
+
+from . import spatial
+from . import string
+
+
+def shortName(name):
+    """Get the short name without namespace of a node name
+
+    Args:
+        name (str): The node name
+
+    Returns:
+        str: The name without path and namespace
+    """
+    return name.split("|")[-1].split(":")[-1]
+
+
+def applyRules(name, swapSides=False, renames=None):
+    """Apply the rename rules to an influence name
+
+    Args:
+        name (str): Imported influence name
+        swapSides (bool, optional): Swap the L/R side labels
+        renames (list, optional): (pattern, replacement) regex renames
+
+    Returns:
+        str: The renamed influence name
+    """
+    for pattern, replacement in renames or []:
+        name = re.sub(pattern, replacement, name)
+    if swapSides:
+        name = string.convertRLName(name)
+    return name
+
+
+def buildInfluenceRemap(
+    sourceInfluences,
+    targetInfluences,
+    stripNamespace=True,
+    swapSides=False,
+    renames=None,
+    nearest=False,
+    sourcePositions=None,
+    targetPositions=None,
+):
+    """Resolve the imported influences against the target influences
+
+    Args:
+        sourceInfluences (list): Imported influence names
+        targetInfluences (list): Target (skinCluster) influence names
+        stripNamespace (bool, optional): Compare the names without namespace
+        swapSides (bool, optional): Swap the L/R side labels
+        renames (list, optional): (pattern, replacement) regex renames
+        nearest (bool, optional): Map the unresolved influences to the
+            closest target influence. Requires the positions
+        sourcePositions (dict, optional): {name: (x, y, z)} positions of
+            the imported influences
+        targetPositions (list, optional): Positions of the target
+            influences, in the same order
+
+    Returns:
+        dict: "indices": target index of each source influence, -1 if
+            unmapped. "mapped": {source: target} resolved by name.
+            "nearest": {source: target} resolved by position.
+            "unmapped": source influences without target
+    """
+    exact = {}
+    short = {}
+    for ii, name in enumerate(targetInfluences):
+        exact.setdefault(name, ii)
+        short.setdefault(shortName(name), ii)
+
+    compiled = [(re.compile(p), r) for p, r in renames or []]
+    result = {"indices": [], "mapped": {}, "nearest": {}, "unmapped": []}
+    for name in sourceInfluences:
+        renamed = applyRules(name, swapSides, compiled)
+        ii = exact.get(renamed, -1)
+        if ii < 0 and stripNamespace:
+            ii = short.get(shortName(renamed), -1)
+        if ii >= 0:
+            result["mapped"][name] = targetInfluences[ii]
+        result["indices"].append(ii)
+
+    if nearest and sourcePositions and targetPositions:
+        tree = spatial.KDTree(targetPositions)
+        for si, name in enumerate(sourceInfluences):
+            if result["indices"][si] >= 0 or name not in sourcePositions:
+                continue
+            ii, _ = tree.nearest(sourcePositions[name])
+            if ii >= 0:
+                result["indices"][si] = ii
+                result["nearest"][name] = targetInfluences[ii]
+
+    result["unmapped"] = [
+        name
+        for name, ii in zip(sourceInfluences, result["indices"])
+        if ii < 0
+    ]
+    return result
@@ -0,0 +1,122 @@
+"""Cache of attribute values sampled over time.
+
+This module is Maya free. The sampler merges the (attributes, frames)
+requests of several tools and evaluates all of them in one pass per
+frame. The results are cached by attribute and frame until the sampler is
+cleared, so the next requests of the same range don't evaluate the scene
+again. ``anim_bake.getSampler`` gives the session sampler of the world
+matrices, cleared when the animation or the time changes.
+"""
+
+from contextlib import contextmanager
+
+
+class MatrixSampler(object):
+    """Merge, evaluate and cache attribute samples
+
+    Attributes:
+        evaluations (int): The number of frame evaluations done
+    """
+
+    def __init__(self, evaluate, resolve=None):
+        """
+        Arguments:
+            evaluate (function): Get the values of many attribute handles
+                at a frame, evaluate(handles, frame)
+            resolve (function, optional): Get the handle of an attribute
+                name, called once per attribute until the next clear. The
+                handles are the names without it.
+        """
+        self._evaluate = evaluate
+        self._resolve = resolve
+        self._cache = {}
+        self._handles = {}
+        self._pending = {}
+        self._holds = 0
+        self._stale = False
+        self.evaluations = 0
+
+    def request(self, attributes, frames):
+        """Add attributes to sample at frames, on the next sample
+
+        Arguments:
+            attributes (list of str): The attributes
+            frames (list of float): The frames
+        """
+        for attr in attributes:
+            cached = self._cache.get(attr, {})
+            missing = [f for f in frames if f not in cached]
+            if missing:
+                self._pending.setdefault(attr, set()).update(missing)
+
+    def sample(self):
+        """Evaluate all the requests, one evaluation per frame"""
+        byFrame = {}
+        for attr, frames in self._pending.items():
+            for frame in frames:
+                byFrame.setdefault(frame, []).append(attr)
+        self._pending = {}
+        for frame in sorted(byFrame):
+            attributes = byFrame[frame]
+            values = self._evaluate(
+                [self._handle(attr) for attr in attributes], frame
+            )
+            self.evaluations += 1
+            for attr, value in zip(attributes, values):
+                self._cache.setdefault(attr, {})[frame] = value
+
+    def get(self, attributes, frames):
+        """Get the values of attributes at frames
+
+        The missing values are sampled with all the pending requests.
+
+        Arguments:
+            attributes (list of str): The attributes
+            frames (list of float): The frames
+
+        Returns:
+            list of list: The values, [attribute][frame]
+        """
+        self.request(attributes, frames)
+        if self._pending:
+            self.sample()
+        return [
+            [self._cache[attr][f] for f in frames] for attr in attributes
+        ]
+
+    def clear(self, *args):
+        """Clear the cache, or once the holds are released
+
+        Arguments:
+            *args: The callback arguments, not used
+        """
+        if self._holds:
+            self._stale = True
+            return
+        self._cache = {}
+        self._handles = {}
+        self._pending = {}
+        self._stale = False
+
+    @contextmanager
+    def hold(self):
+        """Keep the cache while the block runs, the clears are delayed
+
+        For independent transfers, the samples of the next ones stay valid
+        while the previous ones write their keys.
+        """
+        self._holds += 1
+        try:
+            yield self
+        finally:
+            self._holds -= 1
+            if not self._holds and self._stale:
+                self.clear()
+
+    def _handle(self, attr):
+        if self._resolve is None:
+            return attr
+        handle = self._handles.get(attr)
+        if handle is None:
+            handle = self._handles[attr] = self._resolve(attr)
+        return handle
@@ -32,6 +32,9 @@ def install_skinning_menu():
         ("Export Skin Pack ASCII",
          partial(skin.exportJsonSkinPack, None, None),
          "mgear_package_out.svg"),
+        ("Export Skin Pack Binary Indexed",
+         partial(skin.exportBinSkinPack, None, None),
+         "mgear_package_out.svg"),
         ("-----", None),
         ("Get Names in gSkin File", partial(skin.getObjsFromSkinFile, None)),
         ("-----", None),
@@ -6,7 +6,10 @@
 import pymel.core as pm
 import pymel.core.datatypes as datatypes
 from maya import OpenMaya as om
+import maya.api.OpenMaya as om2
 from . import utils
+from . import mesh_topology
+from . import spatial
 
 
 #############################################
@@ -88,28 +91,10 @@ def getConcentricVertexLoop(loop, nbLoops):
         list: the loop list
 
     """
-    loopList = []
-    allLoops = []
-    for x in loop:
-        allLoops.append(x)
-    loopList.append(loop)
-
-    for x in range(nbLoops):
-        tempLoopList = []
-        for v in loop:
-            connected = v.connectedVertices()
-            for cv in connected:
-                if cv not in loop:
-                    if cv not in allLoops:
-                        allLoops.append(cv)
-                        tempLoopList.append(cv)
-        loop = []
-        for c in tempLoopList:
-            loop.append(c)
-
-        loopList.append(tempLoopList)
-
-    return loopList
+    mesh = loop[0].node()
+    topology = getMeshTopology(mesh)
+    loops = topology.concentric_loops(_vertexIndices(loop), nbLoops)
+    return [loop] + [[mesh.vtx[i] for i in x] for x in loops[1:]]
 
 
 def getVertexRowsFromLoops(loopList):
@@ -122,30 +107,10 @@ def getVertexRowsFromLoops(loopList):
         list: vertex rows
 
     """
-    rows = []
-    for x in loopList[0]:
-        rows.append([x])
-
-    loopListLength = len(loopList) - 1
-
-    for i in range(loopListLength):
-        for e, r in enumerate(rows):
-            cvs = r[-1].connectedVertices()
-            # little trick to force the expansion in 2 directions
-            cvs2 = False
-            if len(r) > 2:
-                cvs2 = r[-2].connectedVertices()
-
-            if cvs2:
-                for cv in cvs2:
-                    if cv in loopList[i + 1]:
-                        rows[e].append(cv)
-                        continue
-            for cv in cvs:
-                if cv in loopList[i + 1]:
-                    rows[e].append(cv)
-                    continue
-    return rows
+    mesh = loopList[0][0].node()
+    topology = getMeshTopology(mesh)
+    rows = topology.vertex_rows([_vertexIndices(x) for x in loopList])
+    return [[mesh.vtx[i] for i in row] for row in rows]
 
 
 #################################################
@@ -223,6 +188,8 @@ def edgeRangeInLoopFromMid(edgeList, midPos, endA, endB):
 def edgeLoopBetweenVertices(startPos, endPos):
     """Computes edge loop between two vertices.
 
+    The selection is not changed.
+
     Arguments:
         startPos (vertex): Start of edge loop
         endPos (vertex): End of edge loop
@@ -231,22 +198,125 @@ def edgeLoopBetweenVertices(startPos, endPos):
         Edge loop, if one exists. Otherwise None.
 
     """
+    mesh = startPos.node()
+    topology = getMeshTopology(mesh)
+    path = topology.edge_loop_path(startPos.index(), endPos.index())
+    if path is None:
+        return None
+    return _toMeshEdges(mesh, topology, path)
+
+
+def getEdgeLoop(edge):
+    """Get the edge loop of an edge.
+
+    Arguments:
+        edge (MeshEdge): The edge
+
+    Returns:
+        list: The loop edges, in order
+
+    """
+    mesh = edge.node()
+    topology = getMeshTopology(mesh)
+    return _toMeshEdges(
+        mesh, topology, topology.edge_loop(_topologyEdge(topology, edge))
+    )
+
+
+def getEdgeRing(edge):
+    """Get the edge ring of an edge.
+
+    Arguments:
+        edge (MeshEdge): The edge
+
+    Returns:
+        list: The ring edges, in order
+
+    """
+    mesh = edge.node()
+    topology = getMeshTopology(mesh)
+    return _toMeshEdges(
+        mesh, topology, topology.edge_ring(_topologyEdge(topology, edge))
+    )
+
+
+def getShortestVertexPath(startPos, endPos, useLength=True):
+    """Get the shortest path of vertices between two vertices.
 
-    oldSelection = pm.selected()
+    Arguments:
+        startPos (vertex): Start vertex
+        endPos (vertex): End vertex
+        useLength (bool): If True the path is the shortest in world space
+            length, else in number of edges
+
+    Returns:
+        list: The path vertices, None if there is no path
+
+    """
     mesh = startPos.node()
-    edgeLoops = []
-    for startEdge in startPos.connectedEdges():
-        for endEdge in endPos.connectedEdges():
-            testEdgeLoop = pm.polySelect(
-                mesh, edgeLoopPath=[startEdge.index(), endEdge.index()]
-            )
-            if testEdgeLoop:
-                edgeLoops.append(pm.selected())
-    pm.select(oldSelection, r=1)
-    if edgeLoops:
-        edgeLoops.sort(key=len)
-        return edgeLoops[0]
-    return None
+    topology = getMeshTopology(mesh)
+    points = None
+    if useLength:
+        points = om2.MFnMesh(_getDagPath(mesh)).getPoints(om2.MSpace.kWorld)
+    path = topology.shortest_path(startPos.index(), endPos.index(), points)
+    if path is None:
+        return None
+    return [mesh.vtx[i] for i in path]
+
+
+#################################################
+# TOPOLOGY
+#################################################
+
+
+def _getDagPath(mesh):
+    selectionList = om2.MSelectionList()
+    selectionList.add(str(mesh))
+    return selectionList.getDagPath(0)
+
+
+def getMeshTopology(mesh):
+    """Get the cached topology arrays of a mesh
+
+    The topology is built once from a single MFnMesh.getVertices call and
+    cached by topology hash (see mesh_topology).
+
+    Arguments:
+        mesh (dagNode or str): Mesh object
+
+    Returns:
+        MeshTopology: The mesh topology
+
+    """
+    fnMesh = om2.MFnMesh(_getDagPath(mesh))
+    counts, connects = fnMesh.getVertices()
+    return mesh_topology.get_topology(counts, connects, fnMesh.numVertices)
+
+
+def _vertexIndices(vertices):
+    return [i for v in vertices for i in v.indices()]
+
+
+def _topologyEdge(topology, edge):
+    # maya edge to topology edge index
+    fnMesh = om2.MFnMesh(_getDagPath(edge.node()))
+    return topology.edge_index(*fnMesh.getEdgeVertices(edge.index()))
+
+
+def _toMeshEdges(mesh, topology, edges):
+    # topology edges to maya edges, from the edges of the first vertex
+    dagPath = _getDagPath(mesh)
+    fnMesh = om2.MFnMesh(dagPath)
+    vertexIt = om2.MItMeshVertex(dagPath)
+    result = []
+    for edge in edges:
+        v0, v1 = topology.edge_vertices[edge]
+        vertexIt.setIndex(v0)
+        for index in vertexIt.getConnectedEdges():
+            if v1 in fnMesh.getEdgeVertices(index):
+                result.append(mesh.e[index])
+                break
+    return result
 
 
 #################################################
@@ -310,6 +380,10 @@ def bBoxData(obj=None, yZero=False, *args):
 def getClosestPolygonFromTransform(geo, loc):
     """Get closest polygon from transform
 
+    Note:
+        Each call queries the mesh again. For many transforms use
+        getClosestPolygonsFromTransforms, with a cached mesh locator.
+
     Arguments:
         geo (dagNode): Mesh object
         loc (matrix): location transform
@@ -353,6 +427,10 @@ def getClosestPolygonFromTransform(geo, loc):
 def getClosestVertexFromTransform(geo, loc):
     """Get closest vertex from transform
 
+    Note:
+        Each call queries the mesh again. For many transforms use
+        getClosestVerticesFromTransforms, with a cached mesh locator.
+
     Arguments:
         geo (dagNode or str): Mesh object
         loc (matrix): location transform
@@ -377,6 +455,93 @@ def getClosestVertexFromTransform(geo, loc):
     return closestVert
 
 
+def getMeshLocator(geo):
+    """Get the cached spatial locator of a mesh
+
+    The locator is built from the world space points and cached by points
+    hash (see spatial.getMeshLocator), so it is rebuilt only when the mesh
+    is deformed or changes topology.
+
+    Arguments:
+        geo (dagNode or str): Mesh object
+
+    Returns:
+        MeshLocator: The mesh locator
+
+    """
+    fnMesh = om2.MFnMesh(_getDagPath(geo))
+    points = fnMesh.getPoints(om2.MSpace.kWorld)
+    triangleCounts, triangles = fnMesh.getTriangles()
+    triangleFaces = [
+        face for face, count in enumerate(triangleCounts)
+        for _ in range(count)
+    ]
+    faceCounts, faceConnects = fnMesh.getVertices()
+    faceConnects = list(faceConnects)
+    faceVertices = []
+    offset = 0
+    for count in faceCounts:
+        faceVertices.append(faceConnects[offset:offset + count])
+        offset += count
+    return spatial.getMeshLocator(
+        points, triangles, triangleFaces, faceVertices
+    )
+
+
+def _getPositions(locs):
+    positions = []
+    for loc in locs:
+        if isinstance(loc, pm.nodetypes.Transform):
+            loc = loc.getTranslation(space="world")
+        positions.append((loc[0], loc[1], loc[2]))
+    return positions
+
+
+def getClosestPolygonsFromTransforms(geo, locs, locator=None):
+    """Get the closest polygon of many transforms
+
+    Arguments:
+        geo (dagNode or str): Mesh object
+        locs (list): Transforms or positions
+        locator (MeshLocator): The mesh locator, to reuse it between calls.
+            Default: getMeshLocator(geo)
+
+    Returns:
+        list: Closest polygons
+
+    """
+    geo = utils.as_pynode(geo)
+    if locator is None:
+        locator = getMeshLocator(geo)
+    faces = locator.closestFaces(_getPositions(locs))
+    return [geo.f[i] for i in faces]
+
+
+def getClosestVerticesFromTransforms(geo, locs, locator=None):
+    """Get the closest vertex of many transforms
+
+    Batch version of getClosestVertexFromTransform, the vertex is the
+    closest vertex of the closest polygon.
+
+    Arguments:
+        geo (dagNode or str): Mesh object
+        locs (list): Transforms or positions
+        locator (MeshLocator): The mesh locator, to reuse it between calls.
+            Default: getMeshLocator(geo)
+
+    Returns:
+        list: Closest vertices
+
+    >>> verts = mn.getClosestVerticesFromTransforms(geometry, joints)
+
+    """
+    geo = utils.as_pynode(geo)
+    if locator is None:
+        locator = getMeshLocator(geo)
+    vertices = locator.closestVertices(_getPositions(locs))
+    return [geo.vtx[i] for i in vertices]
+
+
 def find_mirror_edge(obj, edgeIndx):
     """Return the mirror edge of an edge
 
@@ -0,0 +1,396 @@
+"""
+Mesh topology adjacency arrays and navigation queries.
+
+This module is Maya free. A MeshTopology is built once from the polygon
+vertex counts and connects (the result of ``MFnMesh.getVertices``) and
+answers the edge loop, edge ring, concentric loop and shortest path
+queries with array walks, without components or selection.
+
+The edges are numbered in order of appearance in the faces, so they do not
+match the Maya edge indices. Queries take and return vertex indices, or
+edges as the topology edge indices (see ``edge_index`` and
+``edge_vertices``).
+
+The topologies are cached by topology hash, so the meshes sharing the same
+topology, or the same mesh between calls, share one MeshTopology.
+"""
+
+import heapq
+import struct
+import hashlib
+import math
+
+TOPOLOGY_CACHE_SIZE = 16
+
+_topology_cache = {}
+
+
+class MeshTopology(object):
+    """Adjacency arrays of a polygon mesh
+
+    Attributes:
+        vertex_count (int): Number of vertices
+        edge_vertices (list): (v0, v1) vertex indices of each edge
+        edge_faces (list): Faces of each edge
+        face_vertices (list): Vertices of each face, in order
+        face_edges (list): Edges of each face, edge i from vertex i to i + 1
+        vertex_edges (list): Edges of each vertex
+        vertex_neighbours (list): Vertices connected to each vertex
+
+    Example:
+        >>> topo = MeshTopology(*fnMesh.getVertices())
+        >>> loop = topo.edge_loop(topo.edge_index(0, 1))
+    """
+
+    def __init__(self, face_counts, face_connects, vertex_count=None):
+        if vertex_count is None:
+            vertex_count = max(face_connects) + 1 if face_connects else 0
+        self.vertex_count = vertex_count
+        self.face_vertices = []
+        self.face_edges = []
+        self.edge_vertices = []
+        self.edge_faces = []
+        self.vertex_edges = [[] for _ in range(vertex_count)]
+        self._edge_keys = {}
+
+        offset = 0
+        for face, count in enumerate(face_counts):
+            verts = list(face_connects[offset : offset + count])
+            offset += count
+            edges = []
+            for i, v0 in enumerate(verts):
+                v1 = verts[(i + 1) % count]
+                key = (v0, v1) if v0 < v1 else (v1, v0)
+                edge = self._edge_keys.get(key)
+                if edge is None:
+                    edge = len(self.edge_vertices)
+                    self._edge_keys[key] = edge
+                    self.edge_vertices.append(key)
+                    self.edge_faces.append([])
+                    self.vertex_edges[v0].append(edge)
+                    self.vertex_edges[v1].append(edge)
+                self.edge_faces[edge].append(face)
+                edges.append(edge)
+            self.face_vertices.append(verts)
+            self.face_edges.append(edges)
+
+        self.vertex_neighbours = [
+            [self.other_vertex(e, v) for e in edges]
+            for v, edges in enumerate(self.vertex_edges)
+        ]
+
+    # Edges -----------------------------------------------------------
+
+    def edge_index(self, v0, v1):
+        """Get the edge between 2 vertices
+
+        Args:
+            v0 (int): Vertex index
+            v1 (int): Vertex index
+
+        Returns:
+            int: The edge index, -1 if the vertices are not connected
+        """
+        key = (v0, v1) if v0 < v1 else (v1, v0)
+        return self._edge_keys.get(key, -1)
+
+    def other_vertex(self, edge, vertex):
+        """Get the other vertex of an edge
+
+        Args:
+            edge (int): Edge index
+            vertex (int): One of the edge vertices
+
+        Returns:
+            int: The other edge vertex
+        """
+        v0, v1 = self.edge_vertices[edge]
+        return v1 if v0 == vertex else v0
+
+    def is_border_edge(self, edge):
+        """True if the edge has a single face"""
+        return len(self.edge_faces[edge]) == 1
+
+    def next_loop_edge(self, edge, vertex):
+        """Get the edge continuing an edge loop through a vertex
+
+        Interior loops go through the 4 edges vertices, to the edge without
+        shared face. Border loops go through the 3 edges border vertices,
+        along the border.
+
+        Args:
+            edge (int): The current edge
+            vertex (int): The edge vertex to go through
+
+        Returns:
+            int: The next edge, -1 if the loop stops at the vertex
+        """
+        edges = self.vertex_edges[vertex]
+        faces = self.edge_faces[edge]
+        if len(faces) == 2 and len(edges) == 4:
+            candidates = [
+                e
+                for e in edges
+                if e != edge
+                and not any(f in faces for f in self.edge_faces[e])
+            ]
+        elif len(faces) == 1 and len(edges) == 3:
+            candidates = [
+                e for e in edges if e != edge and self.is_border_edge(e)
+            ]
+        else:
+            return -1
+        return candidates[0] if len(candidates) == 1 else -1
+
+    def _walk_loop(self, edge, vertex):
+        # edges following edge through vertex, and if the loop is closed
+        start = edge
+        result = []
+        for _ in range(len(self.edge_vertices)):
+            edge = self.next_loop_edge(edge, vertex)
+            if edge < 0:
+                return result, False
+            if edge == start:
+                return result, True
+            result.append(edge)
+            vertex = self.other_vertex(edge, vertex)
+        return result, False
+
+    def edge_loop(self, edge):
+        """Get the edge loop of an edge
+
+        Args:
+            edge (int): Edge index
+
+        Returns:
+            list: The loop edges, in order
+        """
+        v0, v1 = self.edge_vertices[edge]
+        forward, closed = self._walk_loop(edge, v1)
+        if closed:
+            return [edge] + forward
+        backward, _ = self._walk_loop(edge, v0)
+        return backward[::-1] + [edge] + forward
+
+    def edge_loop_path(self, start, end):
+        """Get the shortest edge loop path between 2 vertices
+
+        Args:
+            start (int): Start vertex index
+            end (int): End vertex index
+
+        Returns:
+            list: The path edges from start to end, None if the vertices
+                are not in the same edge loop
+        """
+        paths = []
+        for first in self.vertex_edges[start]:
+            path = [first]
+            vertex = self.other_vertex(first, start)
+            edge = first
+            while vertex != end:
+                edge = self.next_loop_edge(edge, vertex)
+                if edge < 0 or edge == first:
+                    path = None
+                    break
+                path.append(edge)
+                vertex = self.other_vertex(edge, vertex)
+            if path:
+                paths.append(path)
+        if not paths:
+            return None
+        return min(paths, key=len)
+
+    def _walk_ring(self, edge, face):
+        # edges facing edge through the quad faces, starting from face
+        start = edge
+        result = []
+        for _ in range(len(self.face_edges)):
+            edges = self.face_edges[face]
+            if len(edges) != 4:
+                return result, False
+            edge = edges[(edges.index(edge) + 2) % 4]
+            if edge == start:
+                return result, True
+            result.append(edge)
+            faces = [f for f in self.edge_faces[edge] if f != face]
+            if len(faces) != 1:
+                return result, False
+            face = faces[0]
+        return result, False
+
+    def edge_ring(self, edge):
+        """Get the edge ring of an edge
+
+        Args:
+            edge (int): Edge index
+
+        Returns:
+            list: The ring edges, in order
+        """
+        faces = self.edge_faces[edge]
+        if not faces:
+            return [edge]
+        forward, closed = self._walk_ring(edge, faces[0])
+        if closed or len(faces) != 2:
+            return [edge] + forward
+        backward, _ = self._walk_ring(edge, faces[1])
+        return backward[::-1] + [edge] + forward
+
+    # Vertices --------------------------------------------------------
+
+    def concentric_loops(self, loop, count):
+        """Get the vertex loops growing around a vertex loop
+
+        Same rings as ``meshNavigation.getConcentricVertexLoop``
+
+        Args:
+            loop (list): The vertex indices of the first loop
+            count (int): Number of loops to add
+
+        Returns:
+            list: The first loop and the count loops, as vertex indices
+        """
+        loop = list(loop)
+        seen = set(loop)
+        loops = [loop]
+        for _ in range(count):
+            ring = []
+            for v in loop:
+                for n in self.vertex_neighbours[v]:
+                    if n not in seen:
+                        seen.add(n)
+                        ring.append(n)
+            loops.append(ring)
+            loop = ring
+        return loops
+
+    def vertex_rows(self, loops):
+        """Get the vertex rows crossing concentric loops
+
+        Same rows as ``meshNavigation.getVertexRowsFromLoops``
+
+        Args:
+            loops (list): Concentric vertex loops
+
+        Returns:
+            list: One row of vertex indices per vertex of the first loop
+        """
+        rows = [[v] for v in loops[0]]
+        for ring in loops[1:]:
+            members = set(ring)
+            for row in rows:
+                neighbours = self.vertex_neighbours[row[-1]]
+                # little trick to force the expansion in 2 directions
+                if len(row) > 2:
+                    row.extend(
+                        n for n in self.vertex_neighbours[row[-2]]
+                        if n in members
+                    )
+                row.extend(n for n in neighbours if n in members)
+        return rows
+
+    def shortest_path(self, start, end, points=None):
+        """Get the shortest vertex path between 2 vertices
+
+        Args:
+            start (int): Start vertex index
+            end (int): End vertex index
+            points (sequence, optional): The vertex positions. If set, the
+                path is the shortest in length, else in number of edges
+
+        Returns:
+            list: The path vertex indices, None if there is no path
+        """
+        previous = {start: start}
+        if points is None:
+            front = [start]
+            while front and end not in previous:
+                next_front = []
+                for v in front:
+                    for n in self.vertex_neighbours[v]:
+                        if n not in previous:
+                            previous[n] = v
+                            next_front.append(n)
+                front = next_front
+        else:
+            distances = {start: 0.0}
+            heap = [(0.0, start)]
+            done = set()
+            while heap:
+                distance, v = heapq.heappop(heap)
+                if v in done:
+                    continue
+                if v == end:
+                    break
+                done.add(v)
+                p = points[v]
+                for n in self.vertex_neighbours[v]:
+                    q = points[n]
+                    d = distance + math.sqrt(
+                        (p[0] - q[0]) ** 2
+                        + (p[1] - q[1]) ** 2
+                        + (p[2] - q[2]) ** 2
+                    )
+                    if d < distances.get(n, float("inf")):
+                        distances[n] = d
+                        previous[n] = v
+                        heapq.heappush(heap, (d, n))
+        if end not in previous:
+            return None
+        path = [end]
+        while path[-1] != start:
+            path.append(previous[path[-1]])
+        return path[::-1]
+
+    def path_edges(self, path):
+        """Get the edges of a vertex path
+
+        Args:
+            path (list): Connected vertex indices
+
+        Returns:
+            list: The edge indices
+        """
+        return [self.edge_index(a, b) for a, b in zip(path, path[1:])]
+
+
+def topology_hash(face_counts, face_connects):
+    """Get a hash of the mesh topology, to use as cache key
+
+    Returns:
+        str: sha1 hex digest
+    """
+    data = struct.pack(
+        "<2I{}i{}i".format(len(face_counts), len(face_connects)),
+        len(face_counts),
+        len(face_connects),
+        *(list(face_counts) + list(face_connects))
+    )
+    return hashlib.sha1(data).hexdigest()
+
+
+def get_topology(face_counts, face_connects, vertex_count=None):
+    """Get the cached topology of a mesh
+
+    Args:
+        face_counts (sequence): Vertex count of each face
+        face_connects (sequence): Vertex indices of the faces
+        vertex_count (int, optional): Number of mesh vertices
+
+    Returns:
+        MeshTopology: The topology
+    """
+    key = (topology_hash(face_counts, face_connects), vertex_count)
+    topology = _topology_cache.get(key)
+    if topology is None:
+        if len(_topology_cache) >= TOPOLOGY_CACHE_SIZE:
+            _topology_cache.clear()
+        topology = MeshTopology(face_counts, face_connects, vertex_count)
+        _topology_cache[key] = topology
+    return topology
+
+
+def clear_topology_cache():
+    """Clear the topology cache"""
+    _topology_cache.clear()
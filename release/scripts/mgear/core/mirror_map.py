@@ -0,0 +1,151 @@
+"""Precomputed mirror data of the controls of a rig.
+
+This module is Maya free. A ``MirrorMap`` holds, for each control, its
+mirror counterpart and the channels to copy to it: the counterpart
+attribute, settable and not skipped, and the invert flag read from the
+``invTx``... attributes. ``anim_utils.getMirrorMap`` builds it once per rig
+from the controllers set. Mirroring or flipping a pose is then one read
+of the planned source channels and one write of the mirrored values.
+Mirroring an animation copies the planned source curves instead.
+"""
+
+
+def cycleOffset(timeOffset, cycle):
+    """Get the time offset of a mirrored cycle, inside the cycle length
+
+    Arguments:
+        timeOffset (float): The time offset
+        cycle (tuple): The (start, end) frames of the cycle
+
+    Returns:
+        float: The offset, from 0 to the cycle length excluded
+    """
+    start, end = cycle
+    length = float(end - start)
+    if length <= 0:
+        raise ValueError("Invalid cycle range: {}".format(cycle))
+    return timeOffset % length
+
+
+class MirrorMap(object):
+    """Mirror counterparts and channels of controls
+
+    Attributes:
+        counterparts (dict): The counterpart of each control, a center
+            control is its own counterpart
+        channels (dict): The (attr, counterpart attr, invert) channels of
+            each control, invert is -1 or 1
+        handles (dict): The read handle of each (control, attr) channel,
+            set by the builder
+    """
+
+    def __init__(self):
+        self.counterparts = {}
+        self.channels = {}
+        self.handles = {}
+
+    def __contains__(self, control):
+        return control in self.counterparts
+
+    def __len__(self):
+        return len(self.counterparts)
+
+    def add(self, control, counterpart, channels):
+        """Add a control
+
+        Arguments:
+            control (str): The control
+            counterpart (str): The mirror control
+            channels (list): The (attr, counterpart attr, invert) channels
+                to copy, only the settable counterpart attributes
+        """
+        self.counterparts[control] = counterpart
+        self.channels[control] = list(channels)
+
+    def plan(self, controls, flip=False):
+        """Get the channels to copy to mirror or flip the controls
+
+        Same rules as ``anim_utils.mirrorPose``: each control is copied to
+        its counterpart. To flip, the counterparts which are not in the
+        controls are also copied back.
+
+        Arguments:
+            controls (list of str): The controls
+            flip (bool, optional): Flip the pose
+
+        Returns:
+            list: The (control, attr, counterpart, counterpart attr,
+                invert) copies
+        """
+        selected = set(controls)
+        result = []
+        for control in controls:
+            counterpart = self.counterparts[control]
+            for attr, counterpartAttr, invert in self.channels[control]:
+                result.append(
+                    (control, attr, counterpart, counterpartAttr, invert)
+                )
+            if flip and counterpart not in selected:
+                for attr, counterpartAttr, invert in self.channels.get(
+                    counterpart, ()
+                ):
+                    result.append(
+                        (counterpart, attr, control, counterpartAttr, invert)
+                    )
+        return result
+
+    @staticmethod
+    def reads(plan):
+        """Get the channels to read for a plan
+
+        Arguments:
+            plan (list): The copies of ``plan``
+
+        Returns:
+            list: The unique (control, attr) channels
+        """
+        seen = set()
+        result = []
+        for control, attr, _, _, _ in plan:
+            if (control, attr) not in seen:
+                seen.add((control, attr))
+                result.append((control, attr))
+        return result
+
+    @staticmethod
+    def copies(plan):
+        """Get the copies of a plan, once per written channel
+
+        Arguments:
+            plan (list): The copies of ``plan``
+
+        Returns:
+            list: The (control, attr, counterpart, counterpart attr,
+                invert) copies, the last copy of a channel wins
+        """
+        result = {}
+        for copy in plan:
+            result[(copy[2], copy[3])] = copy
+        return list(result.values())
+
+    @staticmethod
+    def writes(plan, values):
+        """Get the mirrored values of a plan
+
+        All the values are read before the writes, so the copies of a
+        flip don't read a written value.
+
+        Arguments:
+            plan (list): The copies of ``plan``
+            values (dict): The value of each (control, attr) channel
+
+        Returns:
+            list: The (counterpart, counterpart attr, value) writes, once
+                per channel, the last copy wins
+        """
+        return [
+            (counterpart, counterpartAttr, values[(control, attr)] * invert)
+            for control, attr, counterpart, counterpartAttr, invert in (
+                MirrorMap.copies(plan)
+            )
+        ]
@@ -0,0 +1,84 @@
+"""Cache of resolved nodes, by namespace and short name.
+
+This module is Maya free. The cache stores the handle of each resolved
+node name and checks it with a cheap validation on access, so a deleted
+or renamed node is resolved again. ``anim_utils.getNode`` uses the session
+cache, flushed when a scene is opened or a reference is loaded.
+"""
+
+
+class NodeCache(object):
+    """Resolved nodes, validated on access
+
+    Attributes:
+        hits (int): The number of lookups found valid in the cache
+        misses (int): The number of lookups not cached or not valid
+    """
+
+    def __init__(self, validate):
+        """
+        Arguments:
+            validate (function): Check a cached entry, validate(key, value)
+                returns False if the node is deleted or renamed
+        """
+        self._validate = validate
+        self._entries = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """Get a cached entry
+
+        Arguments:
+            key (tuple): The (namespace, short name) of the node
+
+        Returns:
+            The entry, or None if it is not cached or not valid anymore
+        """
+        value = self._entries.get(key)
+        if value is not None:
+            if self._validate(key, value):
+                self.hits += 1
+                return value
+            del self._entries[key]
+        self.misses += 1
+        return None
+
+    def add(self, key, value):
+        """Cache an entry
+
+        Arguments:
+            key (tuple): The (namespace, short name) of the node
+            value: The entry
+        """
+        self._entries[key] = value
+
+    def hitRate(self):
+        """Get the ratio of the lookups found in the cache
+
+        Returns:
+            float: The hit rate, 0 without lookups
+        """
+        lookups = self.hits + self.misses
+        return float(self.hits) / lookups if lookups else 0.0
+
+    def report(self):
+        """Get a summary of the cache use
+
+        Returns:
+            str: The entries, lookups and hit rate
+        """
+        return "Node cache: {} nodes, {} lookups, {:.1%} hit rate".format(
+            len(self), self.hits + self.misses, self.hitRate()
+        )
+
+    def clear(self, *args):
+        """Remove all the entries, the counters are kept
+
+        Arguments:
+            *args: The callback arguments, not used
+        """
+        self._entries = {}
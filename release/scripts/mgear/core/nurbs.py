@@ -0,0 +1,793 @@
+"""
+NURBS curve evaluation.
+
+This module is Maya free. The curves are evaluated with the non recursive
+basis function algorithms of The NURBS Book (Piegl & Tiller, A2.1 to A2.3
+and A4.2), for all the samples in one call: the span lookup, basis functions
+and derivatives are computed once per sample instead of once per sample and
+control point.
+
+Supports any degree, knot vector and rational weights. The points are any
+sequence of 3 floats sequences.
+
+Example:
+    >>> positions, tangents = evaluate(points, [0.0, 0.5, 1.0], derivs=1)
+    >>> frames = parallel_transport_frames(positions, tangents)
+
+``ArcLengthTable`` gives the arc length parameterization of a curve, and
+``get_arc_length_table`` caches the tables by curve data hash, so uniform
+sampling of the same curve doesn't rebuild it.
+
+Run ``python -m mgear.core.nurbs`` to benchmark against the recursive
+``cox_de_boor`` evaluation.
+"""
+
+import math
+import struct
+import timeit
+import hashlib
+from bisect import bisect_right
+
+
+######################################
+# Knots and parameters
+######################################
+
+
+def uniform_knots(count, degree=3):
+    """Get the clamped uniform knot vector of a curve
+
+    Args:
+        count (int): Number of control points
+        degree (int, optional): Curve degree
+
+    Returns:
+        list: count + degree + 1 knots
+    """
+    if count <= degree:
+        raise ValueError(
+            "A degree {} curve needs at least {} points".format(
+                degree, degree + 1
+            )
+        )
+    inner = count - degree - 1
+    return (
+        [0.0] * (degree + 1)
+        + [float(i) for i in range(1, inner + 1)]
+        + [float(inner + 1)] * (degree + 1)
+    )
+
+
+def params_from_percentages(percentages, knots, degree=3):
+    """Map percentages (0 to 100) of the parameter range to parameters
+
+    Args:
+        percentages (sequence): The percentages
+        knots (sequence): Knot vector
+        degree (int, optional): Curve degree
+
+    Returns:
+        list: The parameters
+    """
+    start = knots[degree]
+    length = knots[-(degree + 1)] - start
+    return [start + length * (p / 100.0) for p in percentages]
+
+
+def find_span(u, degree, knots, count):
+    """Get the knot span index of a parameter (A2.1)
+
+    Args:
+        u (float): Parameter
+        degree (int): Curve degree
+        knots (sequence): Knot vector
+        count (int): Number of control points
+
+    Returns:
+        int: The span index
+    """
+    n = count - 1
+    if u >= knots[n + 1]:
+        return n
+    if u <= knots[degree]:
+        return degree
+    low = degree
+    high = n + 1
+    mid = (low + high) // 2
+    while u < knots[mid] or u >= knots[mid + 1]:
+        if u < knots[mid]:
+            high = mid
+        else:
+            low = mid
+        mid = (low + high) // 2
+    return mid
+
+
+######################################
+# Basis functions
+######################################
+
+
+def basis_functions(span, u, degree, knots):
+    """Get the non vanishing basis functions at a parameter (A2.2)
+
+    Args:
+        span (int): Knot span index of u
+        u (float): Parameter
+        degree (int): Curve degree
+        knots (sequence): Knot vector
+
+    Returns:
+        list: The degree + 1 values of N[span - degree] to N[span]
+    """
+    values = [1.0] + [0.0] * degree
+    left = [0.0] * (degree + 1)
+    right = [0.0] * (degree + 1)
+    for j in range(1, degree + 1):
+        left[j] = u - knots[span + 1 - j]
+        right[j] = knots[span + j] - u
+        saved = 0.0
+        for r in range(j):
+            temp = values[r] / (right[r + 1] + left[j - r])
+            values[r] = saved + right[r + 1] * temp
+            saved = left[j - r] * temp
+        values[j] = saved
+    return values
+
+
+def basis_function_derivatives(span, u, degree, knots, derivs):
+    """Get the basis functions and their derivatives at a parameter (A2.3)
+
+    Args:
+        span (int): Knot span index of u
+        u (float): Parameter
+        degree (int): Curve degree
+        knots (sequence): Knot vector
+        derivs (int): Highest derivative order
+
+    Returns:
+        list: ders[k][j] is the k-th derivative of N[span - degree + j]
+    """
+    p = degree
+    ndu = [[0.0] * (p + 1) for _ in range(p + 1)]
+    ndu[0][0] = 1.0
+    left = [0.0] * (p + 1)
+    right = [0.0] * (p + 1)
+    for j in range(1, p + 1):
+        left[j] = u - knots[span + 1 - j]
+        right[j] = knots[span + j] - u
+        saved = 0.0
+        for r in range(j):
+            # lower triangle
+            ndu[j][r] = right[r + 1] + left[j - r]
+            temp = ndu[r][j - 1] / ndu[j][r]
+            # upper triangle
+            ndu[r][j] = saved + right[r + 1] * temp
+            saved = left[j - r] * temp
+        ndu[j][j] = saved
+
+    ders = [[0.0] * (p + 1) for _ in range(derivs + 1)]
+    for j in range(p + 1):
+        ders[0][j] = ndu[j][p]
+
+    a = [[0.0] * (p + 1) for _ in range(2)]
+    for r in range(p + 1):
+        s1, s2 = 0, 1
+        a[0][0] = 1.0
+        for k in range(1, derivs + 1):
+            d = 0.0
+            rk = r - k
+            pk = p - k
+            if r >= k:
+                a[s2][0] = a[s1][0] / ndu[pk + 1][rk]
+                d = a[s2][0] * ndu[rk][pk]
+            j1 = 1 if rk >= -1 else -rk
+            j2 = k - 1 if r - 1 <= pk else p - r
+            for j in range(j1, j2 + 1):
+                a[s2][j] = (a[s1][j] - a[s1][j - 1]) / ndu[pk + 1][rk + j]
+                d += a[s2][j] * ndu[rk + j][pk]
+            if r <= pk:
+                a[s2][k] = -a[s1][k - 1] / ndu[pk + 1][r]
+                d += a[s2][k] * ndu[r][pk]
+            ders[k][r] = d
+            s1, s2 = s2, s1
+
+    factor = p
+    for k in range(1, derivs + 1):
+        for j in range(p + 1):
+            ders[k][j] *= factor
+        factor *= p - k
+    return ders
+
+
+######################################
+# Evaluation
+######################################
+
+
+def evaluate(points, params, degree=3, knots=None, weights=None, derivs=0):
+    """Evaluate a NURBS curve at many parameters
+
+    Args:
+        points (sequence): Control points
+        params (sequence): Parameters, in the knot vector range
+        degree (int, optional): Curve degree
+        knots (sequence, optional): Knot vector of len(points) + degree + 1
+            knots. Clamped uniform if None
+        weights (sequence, optional): Rational weight per control point
+        derivs (int, optional): Highest derivative order to return
+
+    Returns:
+        list: derivs + 1 lists of (x, y, z) tuples, one per parameter:
+            the positions, then the first derivatives...
+    """
+    count = len(points)
+    if knots is None:
+        knots = uniform_knots(count, degree)
+    if len(knots) != count + degree + 1:
+        raise ValueError(
+            "{} knots for {} points of degree {}. Expected {}".format(
+                len(knots), count, degree, count + degree + 1
+            )
+        )
+    p = degree
+    rational = weights is not None and any(w != 1.0 for w in weights)
+    if rational:
+        # homogeneous points
+        cpw = [
+            (pt[0] * w, pt[1] * w, pt[2] * w, w)
+            for pt, w in zip(points, weights)
+        ]
+    else:
+        cpw = [(pt[0], pt[1], pt[2], 1.0) for pt in points]
+    dim = 4 if rational else 3
+    binomials = [
+        [_binomial(k, i) for i in range(k + 1)] for k in range(derivs + 1)
+    ]
+
+    result = [[] for _ in range(derivs + 1)]
+    for u in params:
+        span = find_span(u, p, knots, count)
+        if derivs:
+            ders = basis_function_derivatives(span, u, p, knots, derivs)
+        else:
+            ders = [basis_functions(span, u, p, knots)]
+        first = span - p
+        homogeneous = []
+        for k in range(derivs + 1):
+            nk = ders[k]
+            value = [0.0] * dim
+            for j in range(p + 1):
+                n = nk[j]
+                if n:
+                    cp = cpw[first + j]
+                    for c in range(dim):
+                        value[c] += n * cp[c]
+            homogeneous.append(value)
+
+        if not rational:
+            for k in range(derivs + 1):
+                result[k].append(tuple(homogeneous[k]))
+            continue
+
+        # rational derivatives (A4.2)
+        values = []
+        w0 = homogeneous[0][3]
+        for k in range(derivs + 1):
+            v = homogeneous[k][:3]
+            for i in range(1, k + 1):
+                factor = binomials[k][i] * homogeneous[i][3]
+                prev = values[k - i]
+                for c in range(3):
+                    v[c] -= factor * prev[c]
+            values.append([c / w0 for c in v])
+        for k in range(derivs + 1):
+            result[k].append(tuple(values[k]))
+    return result
+
+
+def evaluate_percentages(
+    points, percentages, degree=3, knots=None, weights=None, derivs=0
+):
+    """Evaluate a NURBS curve at many percentages of its parameter range
+
+    Args:
+        points (sequence): Control points
+        percentages (sequence): Curve positions as percentages (0 to 100)
+        degree (int, optional): Curve degree
+        knots (sequence, optional): Knot vector. Clamped uniform if None
+        weights (sequence, optional): Rational weight per control point
+        derivs (int, optional): Highest derivative order to return
+
+    Returns:
+        list: See evaluate
+    """
+    if knots is None:
+        knots = uniform_knots(len(points), degree)
+    params = params_from_percentages(percentages, knots, degree)
+    return evaluate(points, params, degree, knots, weights, derivs)
+
+
+def _binomial(n, k):
+    return math.factorial(n) // (math.factorial(k) * math.factorial(n - k))
+
+
+######################################
+# Frames
+######################################
+
+
+def _sub(a, b):
+    return (a[0] - b[0], a[1] - b[1], a[2] - b[2])
+
+
+def _dot(a, b):
+    return a[0] * b[0] + a[1] * b[1] + a[2] * b[2]
+
+
+def _cross(a, b):
+    return (
+        a[1] * b[2] - a[2] * b[1],
+        a[2] * b[0] - a[0] * b[2],
+        a[0] * b[1] - a[1] * b[0],
+    )
+
+
+def _normalize(a):
+    length = math.sqrt(_dot(a, a))
+    if length < 1e-12:
+        return (0.0, 0.0, 0.0)
+    return (a[0] / length, a[1] / length, a[2] / length)
+
+
+def _perpendicular(t):
+    # any unit vector perpendicular to t
+    axis = (1.0, 0.0, 0.0) if abs(t[0]) < 0.9 else (0.0, 1.0, 0.0)
+    return _normalize(_cross(t, axis))
+
+
+def frenet_frames(first, second):
+    """Get the Frenet frames from the curve derivatives
+
+    On straight segments the curvature is null and the normal is not
+    defined, the previous normal (or any perpendicular vector) is used.
+
+    Args:
+        first (list): First derivatives
+        second (list): Second derivatives
+
+    Returns:
+        list: (tangent, normal, binormal) unit vector tuples
+    """
+    frames = []
+    previous = None
+    for d1, d2 in zip(first, second):
+        tangent = _normalize(d1)
+        binormal = _normalize(_cross(d1, d2))
+        if binormal == (0.0, 0.0, 0.0):
+            normal = previous or _perpendicular(tangent)
+            # remove the tangent component of the reused normal
+            normal = _normalize(
+                _sub(
+                    normal,
+                    tuple(c * _dot(normal, tangent) for c in tangent),
+                )
+            )
+            binormal = _cross(tangent, normal)
+        else:
+            normal = _cross(binormal, tangent)
+        previous = normal
+        frames.append((tangent, normal, binormal))
+    return frames
+
+
+def parallel_transport_frames(positions, first, up=None):
+    """Get the rotation minimizing frames along the samples
+
+    Double reflection method (Wang et al. 2008, Computation of Rotation
+    Minimizing Frames).
+
+    Args:
+        positions (list): Sample positions
+        first (list): First derivatives at the samples
+        up (sequence, optional): Initial normal hint. Projected on the
+            plane perpendicular to the first tangent
+
+    Returns:
+        list: (tangent, normal, binormal) unit vector tuples
+    """
+    if not positions:
+        return []
+    tangents = [_normalize(d) for d in first]
+    t0 = tangents[0]
+    if up is None:
+        normal = _perpendicular(t0)
+    else:
+        normal = _normalize(
+            _sub(up, tuple(c * _dot(up, t0) for c in t0))
+        )
+        if normal == (0.0, 0.0, 0.0):
+            normal = _perpendicular(t0)
+    frames = [(t0, normal, _cross(t0, normal))]
+    for i in range(len(positions) - 1):
+        t_i = tangents[i]
+        t_next = tangents[i + 1]
+        v1 = _sub(positions[i + 1], positions[i])
+        c1 = _dot(v1, v1)
+        if c1 < 1e-24:
+            frames.append((t_next, normal, _cross(t_next, normal)))
+            continue
+        f = 2.0 / c1
+        r_l = _sub(normal, tuple(c * f * _dot(v1, normal) for c in v1))
+        t_l = _sub(t_i, tuple(c * f * _dot(v1, t_i) for c in v1))
+        v2 = _sub(t_next, t_l)
+        c2 = _dot(v2, v2)
+        if c2 < 1e-24:
+            normal = _normalize(r_l)
+        else:
+            f = 2.0 / c2
+            normal = _normalize(
+                _sub(r_l, tuple(c * f * _dot(v2, r_l) for c in v2))
+            )
+        frames.append((t_next, normal, _cross(t_next, normal)))
+    return frames
+
+
+######################################
+# Arc length
+######################################
+
+# 5 points Gauss-Legendre quadrature on [-1, 1]
+GAUSS_NODES = (
+    -0.9061798459386640,
+    -0.5384693101056831,
+    0.0,
+    0.5384693101056831,
+    0.9061798459386640,
+)
+GAUSS_WEIGHTS = (
+    0.2369268850561891,
+    0.4786286704993665,
+    0.5688888888888889,
+    0.4786286704993665,
+    0.2369268850561891,
+)
+
+ARC_LENGTH_CACHE_SIZE = 256
+_arc_length_cache = {}
+
+
+class ArcLengthTable(object):
+    """Cumulative arc length table of a NURBS curve
+
+    Each knot span is split in ``samples`` intervals, and the length of each
+    interval is integrated with Gauss-Legendre quadrature. The inverse
+    lookups are binary searches in the table, refined with Newton steps.
+
+    Args:
+        points (sequence): Control points
+        degree (int, optional): Curve degree
+        knots (sequence, optional): Knot vector. Clamped uniform if None
+        weights (sequence, optional): Rational weight per control point
+        samples (int, optional): Table intervals per knot span
+    """
+
+    def __init__(self, points, degree=3, knots=None, weights=None, samples=8):
+        self.points = [tuple(float(c) for c in pt[:3]) for pt in points]
+        self.degree = degree
+        self.knots = list(knots or uniform_knots(len(points), degree))
+        self.weights = list(weights) if weights else None
+        self.start = self.knots[degree]
+        self.end = self.knots[len(points)]
+
+        self.params = [self.start]
+        for i in range(degree, len(points)):
+            a, b = self.knots[i], self.knots[i + 1]
+            if b > a:
+                step = (b - a) / samples
+                self.params.extend(a + step * j for j in range(1, samples))
+                self.params.append(b)
+        intervals = list(zip(self.params[:-1], self.params[1:]))
+        self.lengths = [0.0]
+        total = 0.0
+        for length in self._integrate(intervals):
+            total += length
+            self.lengths.append(total)
+        self.length = total
+
+    def evaluate(self, params, derivs=0):
+        """Evaluate the curve. See evaluate"""
+        return evaluate(
+            self.points, params, self.degree, self.knots, self.weights, derivs
+        )
+
+    def _clamp(self, u):
+        return min(max(u, self.start), self.end)
+
+    def _speeds(self, params):
+        _, first = self.evaluate(params, derivs=1)
+        return [math.sqrt(_dot(d, d)) for d in first]
+
+    def _integrate(self, intervals):
+        # one batched evaluation for the quadrature nodes of all intervals
+        nodes = []
+        for a, b in intervals:
+            half = (b - a) * 0.5
+            mid = (a + b) * 0.5
+            nodes.extend(mid + half * x for x in GAUSS_NODES)
+        speeds = self._speeds(nodes)
+        count = len(GAUSS_NODES)
+        lengths = []
+        for i, (a, b) in enumerate(intervals):
+            chunk = speeds[i * count : (i + 1) * count]
+            integral = sum(w * v for w, v in zip(GAUSS_WEIGHTS, chunk))
+            lengths.append((b - a) * 0.5 * integral)
+        return lengths
+
+    def lengths_at_params(self, params):
+        """Get the arc length from the curve start to many parameters
+
+        Args:
+            params (sequence): The parameters
+
+        Returns:
+            list: The lengths
+        """
+        params = [self._clamp(u) for u in params]
+        rows = [
+            min(bisect_right(self.params, u), len(self.params) - 1) - 1
+            for u in params
+        ]
+        partial = self._integrate(
+            [(self.params[i], u) for i, u in zip(rows, params)]
+        )
+        return [self.lengths[i] + d for i, d in zip(rows, partial)]
+
+    def params_at_lengths(self, lengths, iterations=3):
+        """Get the parameters at many arc lengths from the curve start
+
+        Args:
+            lengths (sequence): The lengths. Clamped to the curve length
+            iterations (int, optional): Newton refinement steps
+
+        Returns:
+            list: The parameters
+        """
+        table = self.lengths
+        params = []
+        bounds = []
+        targets = []
+        for length in lengths:
+            length = min(max(length, 0.0), self.length)
+            i = min(bisect_right(table, length), len(table) - 1) - 1
+            a, b = self.params[i], self.params[i + 1]
+            span = table[i + 1] - table[i]
+            ratio = (length - table[i]) / span if span > 0.0 else 0.0
+            params.append(a + (b - a) * ratio)
+            bounds.append((a, b))
+            targets.append(length)
+
+        for _ in range(iterations):
+            errors = [
+                current - target
+                for current, target in zip(
+                    self.lengths_at_params(params), targets
+                )
+            ]
+            speeds = self._speeds(params)
+            for i, (error, speed) in enumerate(zip(errors, speeds)):
+                if speed > 1e-12:
+                    a, b = bounds[i]
+                    params[i] = min(max(params[i] - error / speed, a), b)
+        return params
+
+    def params_at_percentages(self, percentages, iterations=3):
+        """Get the parameters at many percentages (0 to 100) of the length
+
+        Args:
+            percentages (sequence): The length percentages
+            iterations (int, optional): Newton refinement steps
+
+        Returns:
+            list: The parameters
+        """
+        return self.params_at_lengths(
+            [self.length * p / 100.0 for p in percentages], iterations
+        )
+
+    def uniform_params(self, count):
+        """Get the parameters of count points evenly spaced along the curve
+
+        Args:
+            count (int): Number of points, including both curve ends
+
+        Returns:
+            list: The parameters
+        """
+        if count < 2:
+            return [self.start] * count
+        return self.params_at_percentages(
+            [100.0 * i / (count - 1) for i in range(count)]
+        )
+
+
+def curve_hash(points, degree, knots=None, weights=None):
+    """Get a hash of the curve data, to use as cache key
+
+    Returns:
+        str: sha1 hex digest
+    """
+    values = [float(c) for pt in points for c in pt[:3]]
+    values.extend(float(k) for k in knots or [])
+    values.extend(float(w) for w in weights or [])
+    data = struct.pack(
+        "<3I{}d".format(len(values)),
+        degree,
+        len(points),
+        len(knots or []),
+        *values
+    )
+    return hashlib.sha1(data).hexdigest()
+
+
+def get_arc_length_table(points, degree=3, knots=None, weights=None):
+    """Get the cached arc length table of a curve
+
+    The tables are cached by curve data hash, so the table of a curve is
+    built once and reused until its control points change.
+
+    Args:
+        points (sequence): Control points
+        degree (int, optional): Curve degree
+        knots (sequence, optional): Knot vector. Clamped uniform if None
+        weights (sequence, optional): Rational weight per control point
+
+    Returns:
+        ArcLengthTable: The table
+    """
+    key = curve_hash(points, degree, knots, weights)
+    table = _arc_length_cache.get(key)
+    if table is None:
+        if len(_arc_length_cache) >= ARC_LENGTH_CACHE_SIZE:
+            _arc_length_cache.clear()
+        table = ArcLengthTable(points, degree, knots, weights)
+        _arc_length_cache[key] = table
+    return table
+
+
+def clear_arc_length_cache():
+    """Clear the arc length table cache"""
+    _arc_length_cache.clear()
+
+
+######################################
+# Reference implementation
+######################################
+
+
+def evaluate_cubic_nurbs(control_points, percentage, knots=None, weights=None):
+    """
+    Evaluate a cubic NURBS curve at a given percentage.
+
+    Args:
+        control_points (list): List of control points, each as [x, y, z].
+        percentage (float): Curve position as a percentage (0 to 100).
+        knots (list, optional): Knot vector.
+        weights (list, optional): List of weights corresponding to control
+                                  points.
+
+    Returns:
+        list: Evaluated point as [x, y, z].
+    """
+    n = len(control_points) - 1
+    p = 3  # Degree for cubic curve
+    d = len(control_points[0])  # Dimension of each point
+
+    if knots is None:
+        knots = (
+            [0] * (p + 1)
+            + [i for i in range(1, n - p + 2)]
+            + [n - p + 2] * (p + 1)
+        )
+
+    if weights is None:
+        weights = [1.0] * (n + 1)
+
+    # Normalize the u parameter to fit within the knot vector range
+    u = knots[p] + (knots[-(p + 1)] - knots[p]) * (percentage / 100.0)
+
+    # Slightly reduce u if percentage is 100 to avoid division by zero
+    if percentage == 100:
+        u -= 1e-5
+
+    C = [0.0 for _ in range(d)]
+    W = 0.0
+
+    for i in range(n + 1):
+        N = cox_de_boor(u, i, p, knots)
+        for j in range(d):
+            C[j] += N * weights[i] * control_points[i][j]
+        W += N * weights[i]
+
+    for j in range(d):
+        C[j] /= W
+
+    return C
+
+
+def cox_de_boor(u, i, p, knots):
+    """
+    Cox-De Boor algorithm to evaluate B-Spline basis function.
+
+    Args:
+        u (float): Parameter value.
+        i (int): Index of control point.
+        p (int): Degree of the curve.
+        knots (list): Knot vector.
+
+    Returns:
+        float: Evaluated B-Spline basis function value.
+    """
+    if p == 0:
+        return 1.0 if knots[i] <= u < knots[i + 1] else 0.0
+
+    N1 = 0
+    if knots[i] != knots[i + p]:
+        N1 = ((u - knots[i]) / (knots[i + p] - knots[i])) * cox_de_boor(
+            u, i, p - 1, knots
+        )
+
+    N2 = 0
+    if knots[i + 1] != knots[i + p + 1]:
+        N2 = (
+            (knots[i + p + 1] - u) / (knots[i + p + 1] - knots[i + 1])
+        ) * cox_de_boor(u, i + 1, p - 1, knots)
+
+    return N1 + N2
+
+
+def benchmark(count=32, samples=200, repeat=3):
+    """Time the batched evaluation against the recursive cox_de_boor one
+
+    Args:
+        count (int, optional): Number of control points
+        samples (int, optional): Number of samples
+        repeat (int, optional): Number of timing runs, the best is kept
+
+    Returns:
+        dict: "reference" and "batched" times in seconds and the "speedup"
+    """
+    points = [
+        (math.cos(i * 0.5), math.sin(i * 0.5), i * 0.1) for i in range(count)
+    ]
+    knots = uniform_knots(count, 3)
+    percentages = [100.0 * i / samples for i in range(samples)]
+
+    def reference():
+        return [
+            evaluate_cubic_nurbs(points, pct, knots) for pct in percentages
+        ]
+
+    def batched():
+        return evaluate_percentages(points, percentages, 3, knots)
+
+    timings = {
+        "reference": min(timeit.repeat(reference, number=1, repeat=repeat)),
+        "batched": min(timeit.repeat(batched, number=1, repeat=repeat)),
+    }
+    timings["speedup"] = timings["reference"] / max(timings["batched"], 1e-9)
+    return timings
+
+
+if __name__ == "__main__":
+    for count in (8, 32, 128):
+        result = benchmark(count)
+        print(
+            "{} points: cox_de_boor {:.4f}s, batched {:.4f}s, "
+            "x{:.1f}".format(
+                count,
+                result["reference"],
+                result["batched"],
+                result["speedup"],
+            )
+        )
@@ -12,16 +12,32 @@ This module is derivated from Chad Vernon's Skin IO.
 #############################################
 import os
 import json
+import time
+import shutil
 import pickle as pickle
 
+from array import array
+from multiprocessing.pool import ThreadPool
+
 import pymel.core as pm
 from maya import cmds
 import maya.OpenMaya as OpenMaya
+import maya.api.OpenMaya as om2
+import maya.api.OpenMayaAnim as oma2
 from .six import string_types
-
-FILE_EXT = ".gSkin"
-FILE_JSON_EXT = ".jSkin"
-PACK_EXT = ".gSkinPack"
+from . import weight_array
+from . import skin_format
+from . import skin_tools
+from . import influence_remap
+from . import weight_transfer
+
+FILE_EXT = skin_format.FILE_EXT
+FILE_JSON_EXT = skin_format.FILE_JSON_EXT
+FILE_BIN_EXT = skin_format.FILE_BIN_EXT
+PACK_EXT = skin_format.PACK_EXT
+MANIFEST_EXT = ".gSkinManifest"
+PRUNE_THRESHOLD = 0.001
+MANIFEST_VERSION = 2
 
 ######################################
 # Skin getters
@@ -153,43 +169,219 @@ def getCurrentWeights(skinCls, dagPath, components):
     return weights
 
 
+######################################
+# Skin array access
+######################################
+
+
+def getSkinClusterFn(skinCls):
+    """Get the API 2.0 function set of a skinCluster
+
+    Arguments:
+        skinCls (PyNode or str): The skincluster node
+
+    Returns:
+        MFnSkinCluster: The skinCluster function set
+    """
+    sel = om2.MSelectionList()
+    sel.add(str(skinCls))
+    return oma2.MFnSkinCluster(sel.getDependNode(0))
+
+
+def getCompleteComponents(dagPath):
+    """Get the complete components of a deformable shape
+
+    Arguments:
+        dagPath (om2.MDagPath): The shape dagpath
+
+    Returns:
+        MObject: The components covering all the points of the shape
+    """
+    if dagPath.hasFn(om2.MFn.kMesh):
+        fnComp = om2.MFnSingleIndexedComponent()
+        components = fnComp.create(om2.MFn.kMeshVertComponent)
+        fnComp.setCompleteData(om2.MFnMesh(dagPath).numVertices)
+    elif dagPath.hasFn(om2.MFn.kNurbsCurve):
+        fnComp = om2.MFnSingleIndexedComponent()
+        components = fnComp.create(om2.MFn.kCurveCVComponent)
+        fnComp.setCompleteData(om2.MFnNurbsCurve(dagPath).numCVs)
+    elif dagPath.hasFn(om2.MFn.kNurbsSurface):
+        fnSurface = om2.MFnNurbsSurface(dagPath)
+        fnComp = om2.MFnDoubleIndexedComponent()
+        components = fnComp.create(om2.MFn.kSurfaceCVComponent)
+        fnComp.setCompleteData(fnSurface.numCVsInU, fnSurface.numCVsInV)
+    else:
+        raise TypeError(
+            "{}: is not supported.".format(dagPath.partialPathName())
+        )
+    return components
+
+
+def getGeometryComponentsArray(skinCls):
+    """Get the API 2.0 geometry dagpath and components from skincluster
+
+    Arguments:
+        skinCls (PyNode): The skincluster node
+
+    Returns:
+        MFnSkinCluster, MDagPath, MObject: The function set, the dagpath of
+            the deformed shape and its complete components
+    """
+    fn = getSkinClusterFn(skinCls)
+    dagPath = fn.getPathAtIndex(0)
+    return fn, dagPath, getCompleteComponents(dagPath)
+
+
+def getInfluenceNames(fn):
+    """Get the influence names without namespace
+
+    Arguments:
+        fn (MFnSkinCluster): The skinCluster function set
+
+    Returns:
+        list: The influence names, in skinCluster influence index order
+    """
+    # cast influenceWithoutNamespace as string otherwise it can end up
+    # as DependNodeName(u'jointName') in the data.
+    return [
+        str(pm.PyNode(path.partialPathName()).stripNamespace())
+        for path in fn.influenceObjects()
+    ]
+
+
+def getWeightsArray(skinCls):
+    """Get all the skinCluster weights in one bulk call
+
+    Arguments:
+        skinCls (PyNode): The skincluster node
+
+    Returns:
+        weight_array.DenseWeights: vertex major weight block
+    """
+    fn, dagPath, components = getGeometryComponentsArray(skinCls)
+    weights, numInfluences = fn.getWeights(dagPath, components)
+    values = array(weight_array.WEIGHT_TYPE, weights)
+    vertexCount = int(len(values) / numInfluences) if numInfluences else 0
+    return weight_array.DenseWeights(
+        getInfluenceNames(fn), vertexCount, values
+    )
+
+
+def setWeightsArray(skinCls, weights, normalize=False):
+    """Set all the skinCluster weights in one bulk call
+
+    Arguments:
+        skinCls (PyNode): The skincluster node
+        weights (DenseWeights or SparseWeights): The weight block. The
+            columns should follow the skinCluster influence index order.
+        normalize (bool, optional): Normalize the weights after set
+    """
+    if isinstance(weights, weight_array.SparseWeights):
+        weights = weights.toDense()
+    fn, dagPath, components = getGeometryComponentsArray(skinCls)
+    influenceIndices = om2.MIntArray(range(weights.influenceCount))
+    fn.setWeights(
+        dagPath,
+        components,
+        influenceIndices,
+        om2.MDoubleArray(weights.values),
+        normalize,
+        False,
+    )
+
+
+def getBlendWeightsArray(skinCls):
+    """Get the dual quaternion blend weights in one bulk call
+
+    Arguments:
+        skinCls (PyNode): The skincluster node
+
+    Returns:
+        array: The blend weight per vertex
+    """
+    fn, dagPath, components = getGeometryComponentsArray(skinCls)
+    return array(
+        weight_array.WEIGHT_TYPE, fn.getBlendWeights(dagPath, components)
+    )
+
+
+def setBlendWeightsArray(skinCls, values):
+    """Set the dual quaternion blend weights in one bulk call
+
+    Arguments:
+        skinCls (PyNode): The skincluster node
+        values (sequence): The blend weight per vertex
+    """
+    fn, dagPath, components = getGeometryComponentsArray(skinCls)
+    fn.setBlendWeights(dagPath, components, om2.MDoubleArray(values))
+
+
+def conditionSkinWeights(
+    skinCls,
+    pruneThreshold=PRUNE_THRESHOLD,
+    maxInfluences=0,
+    normalize=True,
+    quantizeBits=0,
+):
+    """Prune, limit, normalize and quantize the skinCluster weights
+
+    Game engines usually require 4 or 8 influences per vertex and 8 or 16
+    bits weights. All the operations are done in one pass over the weight
+    arrays. See weight_array.conditionWeights
+
+    Arguments:
+        skinCls (PyNode): The skincluster node
+        pruneThreshold (float, optional): Prune threshold. 0 to skip
+        maxInfluences (int, optional): Max influences per vertex. 0 to skip
+        normalize (bool, optional): Normalize the weights
+        quantizeBits (int, optional): 8 or 16. 0 to skip
+
+    Returns:
+        dict: The maximum per vertex error introduced by each operation
+    """
+    weights, report = weight_array.conditionWeights(
+        getWeightsArray(skinCls),
+        pruneThreshold=pruneThreshold,
+        maxInfluences=maxInfluences,
+        normalize=normalize,
+        quantizeBits=quantizeBits,
+    )
+    setWeightsArray(skinCls, weights)
+    pm.displayInfo(
+        "{}: max vertex error prune {:.6f}, limit {:.6f}, normalize {:.6f}, "
+        "quantize {:.6f}, total {:.6f}. {} vertices limited".format(
+            skinCls.name(),
+            report["prune"],
+            report["limit"],
+            report["normalize"],
+            report["quantize"],
+            report["total"],
+            report["limitedVertices"],
+        )
+    )
+    return report
+
+
 ######################################
 # Skin Collectors
 ######################################
 
 
 def collectInfluenceWeights(skinCls, dagPath, components, dataDic):
-    weights = getCurrentWeights(skinCls, dagPath, components)
-
-    influencePaths = OpenMaya.MDagPathArray()
-    numInfluences = skinCls.__apimfn__().influenceObjects(influencePaths)
-    numComponentsPerInfluence = int(weights.length() / numInfluences)
-    for ii in range(influencePaths.length()):
-        influenceName = influencePaths[ii].partialPathName()
-        influenceWithoutNamespace = pm.PyNode(influenceName).stripNamespace()
-        # build a dictionary of {vtx: weight}. Skip 0.0 weights.
-        inf_w = {
-            jj: weights[jj * numInfluences + ii]
-            for jj in range(numComponentsPerInfluence)
-            if weights[jj * numInfluences + ii] != 0.0
-        }
-        # cast to float to avoid rounding errors when dividing integers?
-        dataDic["vertexCount"] = int(weights.length() / float(numInfluences))
-        # cast influenceWithoutNamespace as string otherwise it can end up
-        # as DependNodeName(u'jointName') in the data.
-        dataDic["weights"][str(influenceWithoutNamespace)] = inf_w
+    # dagPath and components are kept for backwards compatibility. The
+    # weights are read in bulk from the skinCluster deformed shape.
+    weights = getWeightsArray(skinCls)
+    dataDic["vertexCount"] = weights.vertexCount
+    # build a dictionary of {vtx: weight}. Skip 0.0 weights.
+    dataDic["weights"].update(weights.toInfluenceDict())
 
 
 def collectBlendWeights(skinCls, dagPath, components, dataDic):
-    weights = OpenMaya.MDoubleArray()
-    skinCls.__apimfn__().getBlendWeights(dagPath, components, weights)
+    weights = getBlendWeightsArray(skinCls)
     # round the weights down. This should be safe on Dual Quat blends
     # because it is not normalized. And 6 should be more than accurate enough.
-    dataDic["blendWeights"] = {
-        i: round(weights[i], 6)
-        for i in range(weights.length())
-        if round(weights[i], 6) != 0.0
-    }
+    rounded = [round(w, 6) for w in weights]
+    dataDic["blendWeights"] = {i: w for i, w in enumerate(rounded) if w != 0.0}
 
 
 def collectData(skinCls, dataDic):
@@ -203,11 +395,158 @@ def collectData(skinCls, dataDic):
     dataDic["skinClsName"] = skinCls.name()
 
 
+def collectDataArray(skinCls, dataDic):
+    """Collect the skin data keeping the weights as arrays
+
+    Arguments:
+        skinCls (PyNode): The skincluster node
+        dataDic (dict): The object skin data to fill
+    """
+    weights = getWeightsArray(skinCls)
+    dataDic["vertexCount"] = weights.vertexCount
+    dataDic["weights"] = weights.toSparse()
+    dataDic["blendWeights"] = getBlendWeightsArray(skinCls)
+
+    for attr in ["skinningMethod", "normalizeWeights"]:
+        dataDic[attr] = skinCls.attr(attr).get()
+
+    dataDic["skinClsName"] = skinCls.name()
+
+
+def arrayDataToDict(dataDic):
+    """Convert array backed skin data to the dictionary skin data format
+
+    Arguments:
+        dataDic (dict): The object skin data collected by collectDataArray
+
+    Returns:
+        dict: The object skin data as collected by collectData
+    """
+    return skin_tools.arrayDataToDict(dataDic)
+
+
+def getDataInfluences(dataDic):
+    """Get the influence names of an object skin data
+
+    Arguments:
+        dataDic (dict): The object skin data
+
+    Returns:
+        list: The influence names
+    """
+    weights = dataDic["weights"]
+    if isinstance(
+        weights, (weight_array.DenseWeights, weight_array.SparseWeights)
+    ):
+        return list(weights.influences)
+    return list(weights.keys())
+
+
 ######################################
 # Skin export
 ######################################
 
 
+def collectSkinData(obj, file_ext=FILE_EXT):
+    """Collect the skin data of one object
+
+    Arguments:
+        obj (PyNode): The skinned object
+        file_ext (str, optional): Destination file extension. The binary
+            indexed format keeps the weights as arrays.
+
+    Returns:
+        dict: The object skin data. None if the object has no skinCluster
+    """
+    skinCls = getSkinCluster(obj)
+    if not skinCls:
+        pm.displayWarning(
+            obj.name() + ": Skipped because don't have Skin Cluster"
+        )
+        return
+
+    dataDic = {
+        "weights": {},
+        "blendWeights": [],
+        "skinClsName": "",
+        "objName": "",
+        "nameSpace": "",
+        "vertexCount": 0,
+        "skinDataFormat": "compressed",
+    }
+
+    dataDic["objName"] = obj.name()
+    dataDic["nameSpace"] = obj.namespace()
+
+    collectDataArray(skinCls, dataDic)
+    # start by pruning by a tiny amount. Enough to not make  noticeable
+    # change to the skin, but it will remove infinitely small weights.
+    # Otherwise, compressing will do almost nothing!
+    # The pruning is done on the exported data, for any geometry type, and
+    # doesn't modify the scene
+    dataDic["weights"], _ = weight_array.conditionWeights(
+        dataDic["weights"],
+        pruneThreshold=PRUNE_THRESHOLD,
+        normalize=bool(dataDic["normalizeWeights"]),
+    )
+    if file_ext != FILE_BIN_EXT:
+        dataDic = arrayDataToDict(dataDic)
+
+    exportMsg = "Exported skinCluster {} ({} influences, {} points) {}"
+    pm.displayInfo(
+        exportMsg.format(
+            skinCls.name(),
+            len(getDataInfluences(dataDic)),
+            dataDic["vertexCount"],
+            obj.name(),
+        )
+    )
+    return dataDic
+
+
+def writeSkinData(filePath, packDic):
+    """Serialize the collected skin data to a skin file
+
+    This function doesn't use any Maya command, so it can run on a worker
+    thread.
+
+    Arguments:
+        filePath (str): gSkin, jSkin or bSkin file path
+        packDic (dict): {"objs": [names], "objDDic": [dataDic], ...}
+
+    Returns:
+        int: The written file size in bytes
+    """
+    if filePath.endswith(FILE_BIN_EXT):
+        skin_format.writeSkinFile(filePath, packDic["objDDic"])
+        return os.path.getsize(filePath)
+    elif filePath.endswith(FILE_EXT):
+        with skin_format.replaceOpen(filePath, "wb") as fp:
+            pickle.dump(packDic, fp, pickle.HIGHEST_PROTOCOL)
+    else:
+        with skin_format.replaceOpen(filePath, "w") as fp:
+            json.dump(packDic, fp, indent=4, sort_keys=True)
+    # the index sidecar lets the UI list the objects without reading the
+    # whole file
+    skin_format.writeIndexSidecar(filePath, packDic["objDDic"])
+    return os.path.getsize(filePath)
+
+
+def _displayThroughput(label, count, size, elapsed):
+    elapsed = max(elapsed, 1e-6)
+    pm.displayInfo(
+        "{}: {} meshes, {:.2f} MB in {:.2f}s "
+        "({:.2f} meshes/s, {:.2f} MB/s)".format(
+            label,
+            count,
+            size / 1048576.0,
+            elapsed,
+            count / elapsed,
+            size / 1048576.0 / elapsed,
+        )
+    )
+
+
 def exportSkin(filePath=None, objs=None, *args):
     if not objs:
         if pm.selected():
@@ -220,8 +559,11 @@ def exportSkin(filePath=None, objs=None, *args):
 
     if not filePath:
 
-        f2 = "jSkin ASCII  (*{});;gSkin Binary (*{})".format(
-            FILE_JSON_EXT, FILE_EXT
+        f2 = (
+            "jSkin ASCII  (*{});;gSkin Binary (*{});;"
+            "bSkin Binary Indexed (*{})".format(
+                FILE_JSON_EXT, FILE_EXT, FILE_BIN_EXT
+            )
         )
         f3 = ";;All Files (*.*)"
         fileFilters = f2 + f3
@@ -232,9 +574,7 @@ def exportSkin(filePath=None, objs=None, *args):
         else:
             return False
 
-    if not filePath.endswith(FILE_EXT) and not filePath.endswith(
-        FILE_JSON_EXT
-    ):
+    if not filePath.endswith((FILE_EXT, FILE_JSON_EXT, FILE_BIN_EXT)):
         # filePath += file_ext
         pm.displayWarning("Not valid file extension for: {}".format(filePath))
         return
@@ -242,61 +582,163 @@ def exportSkin(filePath=None, objs=None, *args):
     _, file_ext = os.path.splitext(filePath)
     # object parsing
     for obj in objs:
-        skinCls = getSkinCluster(obj)
-        if not skinCls:
-            pm.displayWarning(
-                obj.name() + ": Skipped because don't have Skin Cluster"
-            )
-            pass
-        else:
-            # start by pruning by a tiny amount. Enough to not make  noticeable
-            # change to the skin, but it will remove infinitely small weights.
-            # Otherwise, compressing will do almost nothing!
-            if isinstance(obj.getShape(), pm.nodetypes.Mesh):
-                # TODO: Implement pruning on nurbs. Less straight-forward
-                pm.skinPercent(skinCls, obj, pruneWeights=0.001)
-
-            dataDic = {
-                "weights": {},
-                "blendWeights": [],
-                "skinClsName": "",
-                "objName": "",
-                "nameSpace": "",
-                "vertexCount": 0,
-                "skinDataFormat": "compressed",
-            }
-
-            dataDic["objName"] = obj.name()
-            dataDic["nameSpace"] = obj.namespace()
-
-            collectData(skinCls, dataDic)
-
+        dataDic = collectSkinData(obj, file_ext)
+        if dataDic:
             packDic["objs"].append(obj.name())
             packDic["objDDic"].append(dataDic)
-            exportMsg = "Exported skinCluster {} ({} influences, {} points) {}"
-            pm.displayInfo(
-                exportMsg.format(
-                    skinCls.name(),
-                    len(dataDic["weights"].keys()),
-                    len(dataDic["blendWeights"]),
-                    obj.name(),
-                )
-            )
 
     if packDic["objs"]:
-        if filePath.endswith(FILE_EXT):
-            with open(filePath, "wb") as fp:
-                pickle.dump(packDic, fp, pickle.HIGHEST_PROTOCOL)
-        else:
-            with open(filePath, "w") as fp:
-                json.dump(packDic, fp, indent=4, sort_keys=True)
-
+        writeSkinData(filePath, packDic)
         return True
 
 
-def exportSkinPack(packPath=None, objs=None, use_json=False, *args):
+def getManifestPath(packPath):
+    """Get the incremental export manifest path of a skin pack
+
+    Arguments:
+        packPath (str): gSkinPack file path
+
+    Returns:
+        str: The manifest file path, next to the skin pack
+    """
+    return os.path.splitext(packPath)[0] + MANIFEST_EXT
+
+
+def readManifest(packPath):
+    """Read the content hashes stored next to a skin pack
+
+    Arguments:
+        packPath (str): gSkinPack file path
+
+    Returns:
+        dict: {skinFileName: {"hash", "size", "mtime"}}. Empty if there is
+            no valid manifest
+    """
+    manifestPath = getManifestPath(packPath)
+    if not os.path.isfile(manifestPath):
+        return {}
+    try:
+        with open(manifestPath, "r") as fp:
+            manifest = json.load(fp)
+    except ValueError:
+        pm.displayWarning("Invalid skin pack manifest: " + manifestPath)
+        return {}
+    if manifest.get("version") != MANIFEST_VERSION:
+        return {}
+    return manifest.get("files", {})
+
+
+def writeManifest(packPath, files):
+    """Write the content hashes next to a skin pack
+
+    The size and modification time of each skin file are stored with its
+    hash, so a file changed by another export is not reused.
+
+    Arguments:
+        packPath (str): gSkinPack file path
+        files (dict): {skinFileName: hash}, the skin files are next to the
+            skin pack
+    """
+    root = os.path.dirname(packPath)
+    entries = {}
+    for fileName, digest in files.items():
+        entry = _fileStamp(os.path.join(root, fileName))
+        if entry:
+            entry["hash"] = digest
+            entries[fileName] = entry
+    manifest = {"version": MANIFEST_VERSION, "files": entries}
+    with open(getManifestPath(packPath), "w") as fp:
+        json.dump(manifest, fp, indent=4, sort_keys=True)
+
+
+def removeManifest(packPath):
+    """Remove the manifest of a skin pack, if any
+
+    Arguments:
+        packPath (str): gSkinPack file path
+    """
+    manifestPath = getManifestPath(packPath)
+    if os.path.isfile(manifestPath):
+        os.remove(manifestPath)
+
+
+def _fileStamp(path):
+    # size and modification time of a file, or None
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return {"size": stat.st_size, "mtime": stat.st_mtime}
+
+
+def _isManifestFile(path, entry):
+    # the file is still the one recorded in the manifest entry
+    stamp = _fileStamp(path)
+    return (
+        stamp is not None
+        and stamp["size"] == entry.get("size")
+        and stamp["mtime"] == entry.get("mtime")
+    )
+
+
+def _reuseSkinFile(source, target):
+    """Reuse an unchanged skin file. Hard link it if possible, else copy it
+
+    The skin files are never written in place, see skin_format.replaceOpen,
+    so exporting one of the packs again doesn't change the linked file.
+
+    Returns:
+        bool: False if the source file doesn't exist
+    """
+    if not os.path.isfile(source):
+        return False
+    if os.path.exists(target):
+        if os.path.realpath(source) == os.path.realpath(target):
+            return True
+        os.remove(target)
+    try:
+        os.link(source, target)
+    except (OSError, AttributeError):
+        shutil.copy2(source, target)
+    sourceIndex = skin_format.getIndexPath(source)
+    if os.path.isfile(sourceIndex):
+        # the target keeps the source size and mtime, so the index is valid
+        shutil.copyfile(sourceIndex, skin_format.getIndexPath(target))
+    return True
+
+
+def exportSkinPack(
+    packPath=None,
+    objs=None,
+    use_json=False,
+    use_bin=False,
+    workers=0,
+    incremental=False,
+    *args
+):
+    """Export one skin file per object and the skin pack file listing them
+
+    Arguments:
+        packPath (str, optional): gSkinPack file path. If None, a file
+            dialog is shown
+        objs (list, optional): Objects to export. If None, the selection
+        use_json (bool, optional): Export jSkin ASCII files
+        use_bin (bool, optional): Export bSkin binary indexed files
+        workers (int, optional): If not 0, pipelined mode. The weights are
+            extracted on the main thread while the encoding, compression
+            and file writes run on a pool with this number of threads
+        incremental (bool or str, optional): If True, hash the skin data of
+            each object and only rewrite the skin files that changed since
+            the last incremental export of this pack. If it is the path of
+            a previously exported gSkinPack, the unchanged skin files are
+            hard linked (or copied) from it. A skin file is only reused
+            if its size and modification time are the ones recorded in
+            the manifest. A non incremental export removes the manifest.
+    """
     if use_json:
         file_ext = FILE_JSON_EXT
+    elif use_bin:
+        file_ext = FILE_BIN_EXT
     else:
         file_ext = FILE_EXT
 
@@ -325,22 +767,92 @@ def exportSkinPack(packPath=None, objs=None, use_json=False, *args):
 
     packDic["rootPath"], packName = os.path.split(packPath)
 
+    if incremental:
+        if isinstance(incremental, string_types):
+            previousPack = incremental
+        else:
+            previousPack = packPath
+        previousRoot = os.path.dirname(previousPack)
+        previousFiles = readManifest(previousPack)
+    # the skin files are rewritten, the manifest is valid again once the
+    # export is done
+    removeManifest(packPath)
+    manifest = {}
+    reused = []
+
+    startTime = time.time()
+    pool = ThreadPool(workers) if workers else None
+    results = []
     for obj in objs:
         fileName = obj.stripNamespace() + file_ext
         filePath = os.path.join(packDic["rootPath"], fileName)
-        if exportSkin(filePath, [obj], use_json):
+        if pool or incremental:
+            # Maya data is only read from the main thread, the workers only
+            # receive the collected data
+            if incremental:
+                # hash the full precision arrays, whatever the file format
+                dataDic = collectSkinData(obj, FILE_BIN_EXT)
+            else:
+                dataDic = collectSkinData(obj, file_ext)
+            if not dataDic:
+                continue
+            packDic["packFiles"].append(fileName)
+
+            if incremental:
+                digest = skin_format.hashSkinData(dataDic)
+                manifest[fileName] = digest
+                previous = previousFiles.get(fileName, {})
+                previousPath = os.path.join(previousRoot, fileName)
+                if (
+                    previous.get("hash") == digest
+                    and _isManifestFile(previousPath, previous)
+                    and _reuseSkinFile(previousPath, filePath)
+                ):
+                    reused.append(fileName)
+                    continue
+                if file_ext != FILE_BIN_EXT:
+                    dataDic = arrayDataToDict(dataDic)
+
+            objPack = {"objs": [obj.name()], "objDDic": [dataDic]}
+            objPack["bypassObj"] = []
+            if pool:
+                results.append(
+                    pool.apply_async(writeSkinData, (filePath, objPack))
+                )
+            else:
+                results.append(writeSkinData(filePath, objPack))
+        elif exportSkin(filePath, [obj]):
             packDic["packFiles"].append(fileName)
+            results.append(os.path.getsize(filePath))
             pm.displayInfo(filePath)
         else:
             pm.displayWarning(
                 obj.name() + ": Skipped because don't have Skin Cluster"
             )
 
+    if pool:
+        pool.close()
+        pool.join()
+        # get() raises the exceptions of the workers
+        results = [r.get() for r in results]
+
     if packDic["packFiles"]:
         data_string = json.dumps(packDic, indent=4, sort_keys=True)
         with open(packPath, "w") as f:
             f.write(data_string + "\n")
         pm.displayInfo("Skin Pack exported: " + packPath)
+        if incremental:
+            writeManifest(packPath, manifest)
+            pm.displayInfo(
+                "Incremental export: {} unchanged skin files reused, "
+                "{} written".format(len(reused), len(results))
+            )
+        _displayThroughput(
+            "Skin Pack export",
+            len(results),
+            sum(results),
+            time.time() - startTime,
+        )
     else:
         pm.displayWarning(
             "Any of the selected objects have Skin Cluster. "
@@ -352,47 +864,112 @@ def exportJsonSkinPack(packPath=None, objs=None, *args):
     exportSkinPack(packPath, objs, use_json=True)
 
 
+def exportBinSkinPack(packPath=None, objs=None, *args):
+    exportSkinPack(packPath, objs, use_bin=True)
+
+
 ######################################
 # Skin setters
 ######################################
 
 
-def setInfluenceWeights(skinCls, dagPath, components, dataDic, compressed):
-    unusedImports = []
-    weights = getCurrentWeights(skinCls, dagPath, components)
-    influencePaths = OpenMaya.MDagPathArray()
-    numInfluences = skinCls.__apimfn__().influenceObjects(influencePaths)
-    numComponentsPerInfluence = int(weights.length() / numInfluences)
-
-    for importedInfluence, wtValues in dataDic["weights"].items():
-        for ii in range(influencePaths.length()):
-            influenceName = influencePaths[ii].partialPathName()
-            nnspace = pm.PyNode(influenceName).stripNamespace()
-            influenceWithoutNamespace = nnspace
-            if influenceWithoutNamespace == importedInfluence:
-                if compressed:
-                    for jj in range(numComponentsPerInfluence):
-                        # json keys can't be integers. The vtx number key
-                        # is unicode. example: vtx[35] would be: u"35": 0.6974,
-                        # But the binary format is still an int, so check both.
-                        # if the key doesn't exist, set it to 0.0
-                        wt = wtValues.get(jj) or wtValues.get(str(jj)) or 0.0
-                        weights.set(wt, jj * numInfluences + ii)
-                else:
-                    for jj in range(numComponentsPerInfluence):
-                        wt = wtValues[jj]
-                        weights.set(wt, jj * numInfluences + ii)
-                    break
-        else:
-            unusedImports.append(importedInfluence)
+def getInfluencePositions(names):
+    """Get the world positions of the scene nodes with the given names
+
+    Arguments:
+        names (list): Node names. The names not found in the scene are
+            skipped
+
+    Returns:
+        dict: {name: (x, y, z)}
+    """
+    positions = {}
+    for name in names:
+        nodes = cmds.ls(name, type="transform") or cmds.ls(
+            "*:" + name, type="transform"
+        )
+        if nodes:
+            positions[name] = tuple(
+                cmds.xform(
+                    nodes[0], query=True, worldSpace=True, translation=True
+                )
+            )
+    return positions
 
-    influenceIndices = OpenMaya.MIntArray(numInfluences)
-    for ii in range(numInfluences):
-        influenceIndices.set(ii, ii)
-    skinCls.__apimfn__().setWeights(
-        dagPath, components, influenceIndices, weights, False
+
+def setInfluenceWeights(
+    skinCls, dagPath, components, dataDic, compressed, remapRules=None
+):
+    """Set the imported weights on the skinCluster influences
+
+    The imported influences are resolved once with a name to index table,
+    and all the weights are set in one bulk call. The skinCluster
+    influences without imported weights keep their weights.
+
+    Arguments:
+        skinCls (PyNode): The skincluster node
+        dagPath (MDagPath): Kept for backwards compatibility
+        components (MObject): Kept for backwards compatibility
+        dataDic (dict): The object skin data
+        compressed (bool): Kept for backwards compatibility. Both weight
+            formats are detected
+        remapRules (dict, optional): influence_remap.buildInfluenceRemap
+            rules. stripNamespace, swapSides, renames and nearest
+
+    Returns:
+        dict: The influence_remap.buildInfluenceRemap result. "unmapped"
+            lists the imported influences without skinCluster influence
+    """
+    remapRules = dict(remapRules or {})
+    weights = getWeightsArray(skinCls)
+
+    imported = dataDic["weights"]
+    if isinstance(imported, dict):
+        # The compressed format skips 0.0 weights, the missing vertices are
+        # set to 0.0. The original format is a full list for every vertex
+        imported = weight_array.SparseWeights.fromInfluenceDict(
+            imported, weights.vertexCount
+        )
+    elif isinstance(imported, weight_array.DenseWeights):
+        imported = imported.toSparse()
+
+    if remapRules.get("nearest"):
+        fn = getSkinClusterFn(skinCls)
+        remapRules["targetPositions"] = [
+            cmds.xform(
+                path.fullPathName(),
+                query=True,
+                worldSpace=True,
+                translation=True,
+            )
+            for path in fn.influenceObjects()
+        ]
+        remapRules["sourcePositions"] = getInfluencePositions(
+            [
+                name
+                for name in imported.influences
+                if name not in weights.influences
+            ]
+        )
+    result = influence_remap.buildInfluenceRemap(
+        imported.influences, weights.influences, **remapRules
     )
 
+    remapped = imported.remapIndices(
+        weights.influences, result["indices"]
+    ).toDense()
+    for ii in set(ii for ii in result["indices"] if ii >= 0):
+        weights.setColumn(ii, remapped.column(ii))
+    setWeightsArray(skinCls, weights)
+
+    if result["unmapped"]:
+        pm.displayWarning(
+            "{}: imported influences not found: {}".format(
+                skinCls.name(), ", ".join(result["unmapped"])
+            )
+        )
+    return result
+
 
 def setBlendWeights(skinCls, dagPath, components, dataDic, compressed):
     if compressed:
@@ -400,25 +977,26 @@ def setBlendWeights(skinCls, dagPath, components, dataDic, compressed):
         # set it to 0.0. JSON keys can't be integers. The vtx number key
         # is unicode. example: vtx[35] would be: u"35": 0.6974,
         # But the binary format is still an int, so cast the key to int.
-        blendWeights = OpenMaya.MDoubleArray(dataDic["vertexCount"])
-        for key, value in dataDic["blendWeights"].items():
-            blendWeights.set(value, int(key))
+        blendWeights = weight_array.columnFromValues(
+            dataDic["blendWeights"], dataDic["vertexCount"]
+        )
     else:
         # The original weight format was a full list for every vertex
         # For backwards compatibility on older skin files:
-        blendWeights = OpenMaya.MDoubleArray(len(dataDic["blendWeights"]))
-        for ii, w in enumerate(dataDic["blendWeights"]):
-            blendWeights.set(w, ii)
+        blendWeights = dataDic["blendWeights"]
 
-    skinCls.__apimfn__().setBlendWeights(dagPath, components, blendWeights)
+    setBlendWeightsArray(skinCls, blendWeights)
 
 
-def setData(skinCls, dataDic, compressed):
+def setData(skinCls, dataDic, compressed, remapRules=None):
     dagPath, components = getGeometryComponents(skinCls)
-    setInfluenceWeights(skinCls, dagPath, components, dataDic, compressed)
+    result = setInfluenceWeights(
+        skinCls, dagPath, components, dataDic, compressed, remapRules
+    )
     for attr in ["skinningMethod", "normalizeWeights"]:
         skinCls.attr(attr).set(dataDic[attr])
     setBlendWeights(skinCls, dagPath, components, dataDic, compressed)
+    return result
 
 
 ######################################
@@ -429,9 +1007,14 @@ def setData(skinCls, dataDic, compressed):
 def _getObjsFromSkinFile(filePath=None, *args):
     # retrive the object names inside gSkin file
     if not filePath:
-        f1 = "mGear Skin (*{0} *{1})".format(FILE_EXT, FILE_JSON_EXT)
-        f2 = ";;gSkin Binary (*{0});;jSkin ASCII  (*{1})".format(
-            FILE_EXT, FILE_JSON_EXT
+        f1 = "mGear Skin (*{0} *{1} *{2})".format(
+            FILE_EXT, FILE_JSON_EXT, FILE_BIN_EXT
+        )
+        f2 = (
+            ";;gSkin Binary (*{0});;jSkin ASCII  (*{1});;"
+            "bSkin Binary Indexed (*{2})".format(
+                FILE_EXT, FILE_JSON_EXT, FILE_BIN_EXT
+            )
         )
         f3 = ";;All Files (*.*)"
         fileFilters = f1 + f2 + f3
@@ -441,14 +1024,8 @@ def _getObjsFromSkinFile(filePath=None, *args):
     if not isinstance(filePath, string_types):
         filePath = filePath[0]
 
-    # Read in the file
-    with open(filePath, "r") as fp:
-        if filePath.endswith(FILE_EXT):
-            data = pickle.load(fp)
-        else:
-            data = json.load(fp)
-
-        return data["objs"]
+    # Only the bSkin index or the index sidecar is read if possible
+    return [e["objName"] for e in skin_tools.listObjects(filePath)]
 
 
 def getObjsFromSkinFile(filePath=None, *args):
@@ -458,20 +1035,22 @@ def getObjsFromSkinFile(filePath=None, *args):
             print(x)
 
 
-def importSkin(filePath=None, *args):
+def _iterSkinFileData(filePath):
+    """Yield the object skin data stored in a skin file
 
-    if not filePath:
-        f1 = "mGear Skin (*{0} *{1})".format(FILE_EXT, FILE_JSON_EXT)
-        f2 = ";;gSkin Binary (*{0});;jSkin ASCII  (*{1})".format(
-            FILE_EXT, FILE_JSON_EXT
-        )
-        f3 = ";;All Files (*.*)"
-        fileFilters = f1 + f2 + f3
-        filePath = pm.fileDialog2(fileMode=1, fileFilter=fileFilters)
-    if not filePath:
+    The binary indexed format is decoded one object at the time.
+
+    Arguments:
+        filePath (str): gSkin, jSkin or bSkin file path
+
+    Yields:
+        dict: The object skin data
+    """
+    if filePath.endswith(FILE_BIN_EXT):
+        with skin_format.SkinFileReader(filePath) as reader:
+            for objName in reader.objects():
+                yield reader.readDataDic(objName)
         return
-    if not isinstance(filePath, string_types):
-        filePath = filePath[0]
 
     # Read in the file
     if filePath.endswith(FILE_EXT):
@@ -482,86 +1061,172 @@ def importSkin(filePath=None, *args):
             dataPack = json.load(fp)
 
     for data in dataPack["objDDic"]:
-        # This checks if the jSkin file has the new style compressed format.
-        # use a skinDataFormat key to check for backwards compatibility.
-        # If it doesn't exist, just continue with the old method.
-        compressed = False
-        if "skinDataFormat" in data:
-            if data["skinDataFormat"] == "compressed":
-                compressed = True
+        yield data
+
+
+def applySkinData(data, remapRules=None, report=None):
+    """Apply the skin data of one object to the scene
+
+    Arguments:
+        data (dict): The object skin data
+        remapRules (dict, optional): Influence remapping rules. See
+            setInfluenceWeights
+        report (dict, optional): If given, the influence remapping result is
+            stored in it with the object name as key
+
+    Returns:
+        bool: True if the skin was applied
+    """
+    # This checks if the jSkin file has the new style compressed format.
+    # use a skinDataFormat key to check for backwards compatibility.
+    # If it doesn't exist, just continue with the old method.
+    compressed = False
+    if "skinDataFormat" in data:
+        if data["skinDataFormat"] == "compressed":
+            compressed = True
+
+    try:
+        skinCluster = False
+        objName = data["objName"]
+        objNode = pm.PyNode(objName)
 
         try:
-            skinCluster = False
-            objName = data["objName"]
-            objNode = pm.PyNode(objName)
+            # use getShapes() else meshes with 2+ shapes will fail.
+            # TODO: multiple shape nodes is not currently supported in
+            # the file structure! It should raise an error.
+            # Also noIntermediate otherwise it will count shapeOrig nodes.
+            objShapes = objNode.getShapes(noIntermediate=True)
+
+            if isinstance(objNode.getShape(), pm.nodetypes.Mesh):
+                meshVertices = pm.polyEvaluate(objShapes, vertex=True)
+            elif isinstance(objNode.getShape(), pm.nodetypes.NurbsSurface):
+                # if nurbs, count the cvs instead of the vertices.
+                meshVertices = sum([len(shape.cv) for shape in objShapes])
+            elif isinstance(objNode.getShape(), pm.nodetypes.NurbsCurve):
+                meshVertices = sum([len(shape.cv) for shape in objShapes])
+            else:
+                # TODO: Implement other skinnable objs like lattices.
+                meshVertices = 0
 
-            try:
-                # use getShapes() else meshes with 2+ shapes will fail.
-                # TODO: multiple shape nodes is not currently supported in
-                # the file structure! It should raise an error.
-                # Also noIntermediate otherwise it will count shapeOrig nodes.
-                objShapes = objNode.getShapes(noIntermediate=True)
-
-                if isinstance(objNode.getShape(), pm.nodetypes.Mesh):
-                    meshVertices = pm.polyEvaluate(objShapes, vertex=True)
-                elif isinstance(objNode.getShape(), pm.nodetypes.NurbsSurface):
-                    # if nurbs, count the cvs instead of the vertices.
-                    meshVertices = sum([len(shape.cv) for shape in objShapes])
-                elif isinstance(objNode.getShape(), pm.nodetypes.NurbsCurve):
-                    meshVertices = sum([len(shape.cv) for shape in objShapes])
-                else:
-                    # TODO: Implement other skinnable objs like lattices.
-                    meshVertices = 0
-
-                if compressed:
-                    importedVertices = data["vertexCount"]
-                else:
-                    importedVertices = len(data["blendWeights"])
-                if meshVertices != importedVertices:
-                    warningMsg = "Vertex counts on {} do not match. {} != {}"
-                    pm.displayWarning(
-                        warningMsg.format(
-                            objName, meshVertices, importedVertices
-                        )
+            if compressed:
+                importedVertices = data["vertexCount"]
+            else:
+                importedVertices = len(data["blendWeights"])
+            if meshVertices != importedVertices:
+                warningMsg = "Vertex counts on {} do not match. {} != {}"
+                pm.displayWarning(
+                    warningMsg.format(
+                        objName, meshVertices, importedVertices
                     )
-                    continue
+                )
+                return False
+        except Exception:
+            pass
+
+        if getSkinCluster(objNode):
+            skinCluster = getSkinCluster(objNode)
+        else:
+            try:
+                joints = getDataInfluences(data)
+                # strip | from longName, or skinCluster command may fail.
+                skinName = data["skinClsName"].replace("|", "")
+                skinCluster = pm.skinCluster(
+                    joints, objNode, tsb=True, nw=2, n=skinName
+                )
             except Exception:
-                pass
+                sceneJoints = set(
+                    [pm.PyNode(x).name() for x in pm.ls(type="joint")]
+                )
+                notFound = []
+                for j in getDataInfluences(data):
+                    if j not in sceneJoints:
+                        notFound.append(str(j))
+                pm.displayWarning(
+                    "Object: " + objName + " Skiped. Can't "
+                    "found corresponding deformer for the "
+                    "following joints: " + str(notFound)
+                )
+                return False
+        if skinCluster:
+            result = setData(skinCluster, data, compressed, remapRules)
+            if report is not None:
+                report[objName] = result
+            print("Imported skin for: {}".format(objName))
+            return True
 
-            if getSkinCluster(objNode):
-                skinCluster = getSkinCluster(objNode)
-            else:
-                try:
-                    joints = list(data["weights"].keys())
-                    # strip | from longName, or skinCluster command may fail.
-                    skinName = data["skinClsName"].replace("|", "")
-                    skinCluster = pm.skinCluster(
-                        joints, objNode, tsb=True, nw=2, n=skinName
-                    )
-                except Exception:
-                    sceneJoints = set(
-                        [pm.PyNode(x).name() for x in pm.ls(type="joint")]
-                    )
-                    notFound = []
-                    for j in data["weights"].keys():
-                        if j not in sceneJoints:
-                            notFound.append(str(j))
-                    pm.displayWarning(
-                        "Object: " + objName + " Skiped. Can't "
-                        "found corresponding deformer for the "
-                        "following joints: " + str(notFound)
-                    )
-                    continue
-            if skinCluster:
-                setData(skinCluster, data, compressed)
-                print("Imported skin for: {}".format(objName))
+    except Exception:
+        warningMsg = "Object: {} Skipped. Can NOT be found in the scene"
+        pm.displayWarning(warningMsg.format(objName))
+    return False
 
-        except Exception:
-            warningMsg = "Object: {} Skipped. Can NOT be found in the scene"
-            pm.displayWarning(warningMsg.format(objName))
+
+def importSkin(filePath=None, remapRules=None, *args):
+    """Import the skin of the objects of a skin file
+
+    Arguments:
+        filePath (str, optional): gSkin, jSkin or bSkin file path. If None,
+            a file dialog is shown
+        remapRules (dict, optional): Influence remapping rules. See
+            setInfluenceWeights
+
+    Returns:
+        dict: {objName: influence remapping result}
+    """
+
+    if not filePath:
+        f1 = "mGear Skin (*{0} *{1} *{2})".format(
+            FILE_EXT, FILE_JSON_EXT, FILE_BIN_EXT
+        )
+        f2 = (
+            ";;gSkin Binary (*{0});;jSkin ASCII  (*{1});;"
+            "bSkin Binary Indexed (*{2})".format(
+                FILE_EXT, FILE_JSON_EXT, FILE_BIN_EXT
+            )
+        )
+        f3 = ";;All Files (*.*)"
+        fileFilters = f1 + f2 + f3
+        filePath = pm.fileDialog2(fileMode=1, fileFilter=fileFilters)
+    if not filePath:
+        return
+    if not isinstance(filePath, string_types):
+        filePath = filePath[0]
+
+    report = {}
+    for data in _iterSkinFileData(filePath):
+        applySkinData(data, remapRules or None, report)
+    return report
+
+
+def loadSkinData(filePath):
+    """Read and decode all the object skin data of a skin file
+
+    This function doesn't use any Maya command, so it can run on a worker
+    thread.
+
+    Arguments:
+        filePath (str): gSkin, jSkin or bSkin file path
+
+    Returns:
+        list: The object skin data
+    """
+    return list(_iterSkinFileData(filePath))
 
 
-def importSkinPack(filePath=None, *args):
+def importSkinPack(filePath=None, workers=0, remapRules=None, *args):
+    """Import all the skin files of a skin pack
+
+    Arguments:
+        filePath (str, optional): gSkinPack file path. If None, a file
+            dialog is shown
+        workers (int, optional): If not 0, pipelined mode. The skin files
+            are read and decoded ahead on a pool with this number of threads
+            while the main thread applies the already decoded weights
+        remapRules (dict, optional): Influence remapping rules. See
+            setInfluenceWeights
+
+    Returns:
+        dict: {objName: influence remapping result}
+    """
     if not filePath:
         filePath = pm.fileDialog2(
             fileMode=1, fileFilter="mGear skinPack (*%s)" % PACK_EXT
@@ -573,9 +1238,33 @@ def importSkinPack(filePath=None, *args):
 
     with open(filePath) as fp:
         packDic = json.load(fp)
-        for pFile in packDic["packFiles"]:
-            filePath = os.path.join(os.path.split(filePath)[0], pFile)
-            importSkin(filePath, True)
+    rootPath = os.path.split(filePath)[0]
+    skinFiles = [os.path.join(rootPath, f) for f in packDic["packFiles"]]
+
+    startTime = time.time()
+    if workers:
+        pool = ThreadPool(workers)
+        loaded = pool.imap(loadSkinData, skinFiles)
+    else:
+        pool = None
+        loaded = (_iterSkinFileData(f) for f in skinFiles)
+    report = {}
+    try:
+        for objData in loaded:
+            for data in objData:
+                applySkinData(data, remapRules or None, report)
+    finally:
+        if pool:
+            pool.close()
+            pool.join()
+
+    _displayThroughput(
+        "Skin Pack import",
+        len(skinFiles),
+        sum(os.path.getsize(f) for f in skinFiles),
+        time.time() - startTime,
+    )
+    return report
 
 
 ######################################
@@ -583,7 +1272,76 @@ def importSkinPack(filePath=None, *args):
 ######################################
 
 
+def getMeshPointsArray(mesh, triangles=False):
+    """Get the world space points of a mesh in one bulk call
+
+    Arguments:
+        mesh (PyNode or str): The mesh transform or shape
+        triangles (bool, optional): Also return the triangulation
+
+    Returns:
+        list or (list, list): [(x, y, z)] points and, if triangles is True,
+            the flat triangle vertex indices
+    """
+    mesh = pm.PyNode(mesh)
+    if not isinstance(mesh, pm.nodetypes.Mesh):
+        mesh = mesh.getShapes(noIntermediate=True)[0]
+    sel = om2.MSelectionList()
+    sel.add(mesh.longName())
+    fnMesh = om2.MFnMesh(sel.getDagPath(0))
+    points = [(p.x, p.y, p.z) for p in fnMesh.getPoints(om2.MSpace.kWorld)]
+    if triangles:
+        return points, list(fnMesh.getTriangles()[1])
+    return points
+
+
+def transferSkinWeights(
+    sourceMesh, targetMesh, mode=weight_transfer.CLOSEST_POINT, **kwargs
+):
+    """Transfer the skin weights between two skinned meshes in one batch
+
+    Unlike copySkinWeights the result is deterministic and doesn't depend on
+    the Maya version. The influences are matched by name.
+
+    Arguments:
+        sourceMesh (PyNode or str): Skinned source mesh
+        targetMesh (PyNode or str): Skinned target mesh
+        mode (str, optional): closestPoint, barycentric or inverseDistance.
+            See weight_transfer
+        **kwargs: Other weight_transfer.transferWeights arguments
+
+    Returns:
+        weight_array.SparseWeights: The new target weights
+    """
+    sourceSkin = getSkinCluster(sourceMesh)
+    targetSkin = getSkinCluster(targetMesh)
+    sourcePoints, triangles = getMeshPointsArray(sourceMesh, triangles=True)
+    weights = weight_transfer.transferWeights(
+        getWeightsArray(sourceSkin).toSparse(),
+        sourcePoints,
+        getMeshPointsArray(targetMesh),
+        mode=mode,
+        triangles=triangles,
+        **kwargs
+    )
+    targetInfluences = getInfluenceNames(getSkinClusterFn(targetSkin))
+    weights = weights.remapInfluences(targetInfluences)
+    setWeightsArray(targetSkin, weights)
+    return weights
+
+
 def skinCopy(sourceMesh=None, targetMesh=None, *args, **kwargs):
+    """Copy the skin of a source mesh to one or more target meshes
+
+    Arguments:
+        sourceMesh (PyNode or str, optional): Skinned source mesh. If None,
+            the last selected object
+        targetMesh (PyNode or str, optional): Target mesh. If None, the
+            selected objects but the last one
+        **kwargs: name (str) the new skinCluster name. transfer_mode (str)
+            if set, the weights are transferred with the weight_transfer
+            engine in this mode instead of copySkinWeights
+    """
     if not sourceMesh or not targetMesh:
         if len(pm.selected()) >= 2:
             sourceMesh = pm.selected()[-1]
@@ -620,21 +1378,29 @@ def skinCopy(sourceMesh=None, targetMesh=None, *args, **kwargs):
             skinCluster = pm.skinCluster(
                 oDef, targetMesh, tsb=True, nw=1, n=skinName
             )
-            pm.copySkinWeights(
-                sourceSkin=ss.stripNamespace(),
-                destinationSkin=skinCluster.name(),
-                noMirror=True,
-                influenceAssociation="oneToOne",
-                smooth=True,
-                normalize=True,
-            )
+            transferMode = kwargs.get("transfer_mode")
+            if transferMode and isinstance(
+                targetMesh.getShape(), pm.nodetypes.Mesh
+            ):
+                transferSkinWeights(sourceMesh, targetMesh, transferMode)
+            else:
+                pm.copySkinWeights(
+                    sourceSkin=ss.stripNamespace(),
+                    destinationSkin=skinCluster.name(),
+                    noMirror=True,
+                    influenceAssociation="oneToOne",
+                    smooth=True,
+                    normalize=True,
+                )
             skinCluster.skinningMethod.set(skinMethod)
         else:
             errorMsg = "Source Mesh : {} doesn't have a skinCluster."
             pm.displayError(errorMsg.format(sourceMesh.name()))
 
 
-def skin_copy_add(sourceMesh=None, targetMesh=None, layer_name=None, *args):
+def skin_copy_add(
+    sourceMesh=None, targetMesh=None, layer_name=None, transfer_mode=None, *args
+):
     """
     Copies skinning information from a source mesh to a target mesh, adding/Stacking the
     new skinning on top of any existing skin clusters on the target mesh.
@@ -653,6 +1419,8 @@ def skin_copy_add(sourceMesh=None, targetMesh=None, layer_name=None, *args):
         targetMesh (str, optional): The name of the target mesh to which the skinning
             information will be applied. Defaults to None.
         layer_name (str, optional): Custom Layer name for the skinCluster Node
+        transfer_mode (str, optional): If set, the weights are transferred
+            with the weight_transfer engine in this mode. See skinCopy
         *args: Additional arguments passed to the function. Not used in the
             current implementation.
 
@@ -683,7 +1451,9 @@ def skin_copy_add(sourceMesh=None, targetMesh=None, layer_name=None, *args):
     else:
         sc_name = None
     # Copy the skin from sourceMesh to targetMesh
-    skinCopy(sourceMesh, targetMesh, name=sc_name)
+    skinCopy(
+        sourceMesh, targetMesh, name=sc_name, transfer_mode=transfer_mode
+    )
     new_skin = getSkinCluster(targetMesh, first_SC=True)
 
     if previous_skin:
@@ -0,0 +1,736 @@
+"""
+Indexed binary skin file format.
+
+This module is Maya free. It reads and writes the ``.bSkin`` container used by
+``skin.exportSkin`` and ``skin.exportSkinPack``.
+
+File layout (little endian)::
+
+    header      magic, version, flags, object count, index offset, index size
+    blocks      per object CSR weight blocks and blend weights
+    index       utf-8 json list with one entry per object
+
+Each object entry in the index stores the object metadata (name, namespace,
+vertex count, influences, skinning attributes) and the offset table of its
+blocks. The blocks are stored as ``uint32`` row pointers, ``uint16`` influence
+indices (``uint32`` over 65536 influences) and ``float32`` weights, optionally
+compressed with zlib or lz4.
+
+The reader memory maps the file and only decodes the blocks of the requested
+objects. Listing the objects, or validating the file structure, only reads the
+header and the index. Unlike the pickled ``.gSkin`` format, loading a file
+never executes code.
+"""
+
+import os
+import sys
+import json
+import mmap
+import zlib
+import struct
+import hashlib
+import contextlib
+from array import array
+
+from . import weight_array
+
+try:
+    import lz4.frame as lz4
+except ImportError:
+    lz4 = None
+
+FILE_EXT = ".gSkin"
+FILE_JSON_EXT = ".jSkin"
+FILE_BIN_EXT = ".bSkin"
+PACK_EXT = ".gSkinPack"
+
+MAGIC = b"MGSKIN\x00\x00"
+FORMAT_VERSION = 1
+
+# magic, version, flags, object count, index offset, index size
+HEADER = struct.Struct("<8sHHIQQ")
+
+COMPRESSION_NONE = "none"
+COMPRESSION_ZLIB = "zlib"
+COMPRESSION_LZ4 = "lz4"
+
+POINTER_TYPE = "I"
+INDEX_TYPE = "H"
+LARGE_INDEX_TYPE = "I"
+WEIGHT_TYPE = "f"
+
+_BIG_ENDIAN = sys.byteorder == "big"
+
+
+class SkinFormatError(Exception):
+    """Raised when a file is not a valid binary skin file"""
+
+
+######################################
+# Encoding
+######################################
+
+
+def _toBytes(values):
+    if _BIG_ENDIAN:
+        values = array(values.typecode, values)
+        values.byteswap()
+    if hasattr(values, "tobytes"):
+        return values.tobytes()
+    return values.tostring()
+
+
+def _fromBytes(typecode, data):
+    values = array(typecode)
+    if hasattr(values, "frombytes"):
+        values.frombytes(data)
+    else:
+        values.fromstring(data)
+    if _BIG_ENDIAN:
+        values.byteswap()
+    return values
+
+
+def compress(data, compression=COMPRESSION_ZLIB):
+    """Compress a raw block
+
+    Args:
+        data (bytes): The raw block
+        compression (str, optional): none, zlib or lz4
+
+    Returns:
+        bytes: The compressed block
+    """
+    if compression == COMPRESSION_ZLIB:
+        return zlib.compress(data, 6)
+    elif compression == COMPRESSION_LZ4:
+        if lz4 is None:
+            raise SkinFormatError("lz4 compression is not available")
+        return lz4.compress(data)
+    return data
+
+
+def decompress(data, compression):
+    """Decompress a block
+
+    Args:
+        data (bytes): The compressed block
+        compression (str): none, zlib or lz4
+
+    Returns:
+        bytes: The raw block
+    """
+    if compression == COMPRESSION_ZLIB:
+        return zlib.decompress(data)
+    elif compression == COMPRESSION_LZ4:
+        if lz4 is None:
+            raise SkinFormatError("lz4 compression is not available")
+        return lz4.decompress(data)
+    elif compression != COMPRESSION_NONE:
+        raise SkinFormatError("Unknown compression: {}".format(compression))
+    return data
+
+
+def _encodeBlock(name, typecode, values, compression):
+    raw = _toBytes(array(typecode, values))
+    data = compress(raw, compression)
+    info = {
+        "type": typecode,
+        "count": len(values),
+        "rawSize": len(raw),
+        "size": len(data),
+        "compression": compression,
+        "crc32": zlib.crc32(data) & 0xFFFFFFFF,
+    }
+    return name, info, data
+
+
+def encodeObject(dataDic, compression=COMPRESSION_ZLIB):
+    """Encode the skin data of one object
+
+    This is the expensive part of the writing, and it doesn't touch the file,
+    so it can run on a worker thread.
+
+    Args:
+        dataDic (dict): Object skin data. "weights" is a SparseWeights or
+            DenseWeights block, "blendWeights" a sequence with one value per
+            vertex. The rest of the keys are stored as metadata.
+        compression (str, optional): none, zlib or lz4
+
+    Returns:
+        dict, list: The index entry without offsets and the list of
+            (blockName, blockInfo, bytes) encoded blocks
+    """
+    weights = dataDic["weights"]
+    if isinstance(weights, weight_array.DenseWeights):
+        weights = weights.toSparse()
+    indexType = INDEX_TYPE
+    if weights.influenceCount > 65536:
+        indexType = LARGE_INDEX_TYPE
+
+    blocks = [
+        _encodeBlock("indptr", POINTER_TYPE, weights.indptr, compression),
+        _encodeBlock("indices", indexType, weights.indices, compression),
+        _encodeBlock("data", WEIGHT_TYPE, weights.data, compression),
+    ]
+    blendWeights = dataDic.get("blendWeights")
+    if blendWeights is not None and any(blendWeights):
+        blocks.append(
+            _encodeBlock(
+                "blendWeights", WEIGHT_TYPE, blendWeights, compression
+            )
+        )
+
+    entry = {
+        k: v
+        for k, v in dataDic.items()
+        if k not in ("weights", "blendWeights")
+    }
+    entry["vertexCount"] = weights.vertexCount
+    entry["influences"] = list(weights.influences)
+    entry["nnz"] = weights.nnz
+    entry["blocks"] = {}
+    return entry, blocks
+
+
+def hashSkinData(dataDic):
+    """Content hash of the skin data of one object
+
+    The hash covers the weights, the blend weights, the influence list and
+    the rest of the metadata (skinning attributes, names). It is computed
+    on full precision buffers, so it doesn't depend on the file format.
+
+    Args:
+        dataDic (dict): Object skin data. See encodeObject
+
+    Returns:
+        str: sha1 hex digest
+    """
+    weights = dataDic["weights"]
+    if isinstance(weights, weight_array.DenseWeights):
+        weights = weights.toSparse()
+    meta = {
+        k: v
+        for k, v in dataDic.items()
+        if k not in ("weights", "blendWeights")
+    }
+    meta["vertexCount"] = weights.vertexCount
+    meta["influences"] = list(weights.influences)
+
+    digest = hashlib.sha1()
+    digest.update(json.dumps(meta, sort_keys=True).encode("utf-8"))
+    digest.update(_toBytes(array("I", weights.indptr)))
+    digest.update(_toBytes(array("I", weights.indices)))
+    digest.update(_toBytes(array("d", weights.data)))
+    blendWeights = dataDic.get("blendWeights")
+    if blendWeights is not None and any(blendWeights):
+        digest.update(_toBytes(array("d", blendWeights)))
+    return digest.hexdigest()
+
+
+######################################
+# Writer
+######################################
+
+
+def _tempPath(filePath):
+    return "{}.{}.tmp".format(filePath, os.getpid())
+
+
+def _replaceFile(source, target):
+    if hasattr(os, "replace"):
+        os.replace(source, target)
+        return
+    # Python 2, rename doesn't overwrite an existing file on Windows
+    if os.path.exists(target):
+        os.remove(target)
+    os.rename(source, target)
+
+
+@contextlib.contextmanager
+def replaceOpen(filePath, mode="wb"):
+    """Open a temporary file, moved over the file path once written
+
+    The existing file is replaced, never written in place, so a hard link
+    to it, from another skin pack, keeps the previous data. The file is
+    left untouched if the writing fails.
+
+    Example:
+        >>> with replaceOpen(path, "w") as fp:
+        >>>     json.dump(data, fp)
+
+    Args:
+        filePath (str): Destination path
+        mode (str, optional): The file open mode, "wb" or "w"
+    """
+    tempPath = _tempPath(filePath)
+    try:
+        with open(tempPath, mode) as fp:
+            yield fp
+    except BaseException:
+        if os.path.exists(tempPath):
+            os.remove(tempPath)
+        raise
+    _replaceFile(tempPath, filePath)
+
+
+class SkinFileWriter(object):
+    """Streaming writer for the binary skin file format
+
+    Example:
+        >>> with SkinFileWriter(path) as writer:
+        >>>     writer.addObject(dataDic)
+    """
+
+    def __init__(self, filePath, compression=COMPRESSION_ZLIB):
+        self.filePath = filePath
+        self.compression = compression
+        self.entries = []
+        # written next to the file, then moved over it. See replaceOpen
+        self._tempPath = _tempPath(filePath)
+        self._fp = open(self._tempPath, "wb")
+        self._fp.write(HEADER.pack(MAGIC, FORMAT_VERSION, 0, 0, 0, 0))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, tb):
+        if excType is None:
+            self.close()
+        else:
+            self.abort()
+
+    def abort(self):
+        """Discard the written data, the file path is left untouched"""
+        if not self._fp.closed:
+            self._fp.close()
+        if os.path.exists(self._tempPath):
+            os.remove(self._tempPath)
+
+    def addObject(self, dataDic):
+        """Encode and write the skin data of one object
+
+        Args:
+            dataDic (dict): Object skin data. See encodeObject
+        """
+        self.addEncoded(*encodeObject(dataDic, self.compression))
+
+    def addEncoded(self, entry, blocks):
+        """Write an already encoded object
+
+        Args:
+            entry (dict): The index entry returned by encodeObject
+            blocks (list): The encoded blocks returned by encodeObject
+        """
+        for name, info, data in blocks:
+            info = dict(info)
+            info["offset"] = self._fp.tell()
+            self._fp.write(data)
+            entry["blocks"][name] = info
+        self.entries.append(entry)
+
+    def close(self):
+        if self._fp.closed:
+            return
+        index = json.dumps(self.entries, sort_keys=True).encode("utf-8")
+        indexOffset = self._fp.tell()
+        self._fp.write(index)
+        self._fp.seek(0)
+        self._fp.write(
+            HEADER.pack(
+                MAGIC,
+                FORMAT_VERSION,
+                0,
+                len(self.entries),
+                indexOffset,
+                len(index),
+            )
+        )
+        self._fp.close()
+        _replaceFile(self._tempPath, self.filePath)
+
+
+def writeSkinFile(filePath, objects, compression=COMPRESSION_ZLIB):
+    """Write a binary skin file
+
+    Args:
+        filePath (str): Destination path
+        objects (list): Object skin data dictionaries. See encodeObject
+        compression (str, optional): none, zlib or lz4
+    """
+    with SkinFileWriter(filePath, compression) as writer:
+        for dataDic in objects:
+            writer.addObject(dataDic)
+
+
+######################################
+# Reader
+######################################
+
+
+def isSkinFile(filePath):
+    """Check the magic number of a file
+
+    Args:
+        filePath (str): File path
+
+    Returns:
+        bool: True if the file is a binary skin file
+    """
+    try:
+        with open(filePath, "rb") as fp:
+            return fp.read(len(MAGIC)) == MAGIC
+    except (IOError, OSError):
+        return False
+
+
+def readHeader(fp):
+    """Read and check the header of an open binary skin file
+
+    Args:
+        fp (file): File object open in binary mode at the file start
+
+    Returns:
+        tuple: version, flags, object count, index offset, index size
+    """
+    data = fp.read(HEADER.size)
+    if len(data) != HEADER.size:
+        raise SkinFormatError("File too small to be a binary skin file")
+    magic, version, flags, count, offset, size = HEADER.unpack(data)
+    if magic != MAGIC:
+        raise SkinFormatError("Not a binary skin file")
+    if version > FORMAT_VERSION:
+        raise SkinFormatError(
+            "Unsupported binary skin file version: {}".format(version)
+        )
+    return version, flags, count, offset, size
+
+
+def readIndex(filePath):
+    """Read only the object index of a binary skin file
+
+    Args:
+        filePath (str): File path
+
+    Returns:
+        list: The index entries
+    """
+    with open(filePath, "rb") as fp:
+        _, _, count, offset, size = readHeader(fp)
+        fp.seek(offset)
+        entries = json.loads(fp.read(size).decode("utf-8"))
+    if len(entries) != count:
+        raise SkinFormatError("Corrupted index in {}".format(filePath))
+    return entries
+
+
+class SkinFileReader(object):
+    """Memory mapped reader for the binary skin file format
+
+    Only the header and the index are read on construction. The weight blocks
+    are decoded on demand.
+
+    Example:
+        >>> with SkinFileReader(path) as reader:
+        >>>     for name in reader.objects():
+        >>>         weights = reader.readWeights(name)
+    """
+
+    def __init__(self, filePath):
+        self.filePath = filePath
+        self._fp = open(filePath, "rb")
+        try:
+            self.version, self.flags, count, offset, size = readHeader(
+                self._fp
+            )
+            self.fileSize = os.fstat(self._fp.fileno()).st_size
+            self._mm = mmap.mmap(self._fp.fileno(), 0, access=mmap.ACCESS_READ)
+            self.entries = json.loads(
+                self._mm[offset : offset + size].decode("utf-8")
+            )
+        except Exception:
+            self._fp.close()
+            raise
+        if len(self.entries) != count:
+            self.close()
+            raise SkinFormatError("Corrupted index in {}".format(filePath))
+        self._entries = {e["objName"]: e for e in self.entries}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, tb):
+        self.close()
+
+    def close(self):
+        if not self._fp.closed:
+            self._mm.close()
+            self._fp.close()
+
+    def objects(self):
+        """Object names in file order"""
+        return [e["objName"] for e in self.entries]
+
+    def info(self, objName):
+        """Get the index entry of an object
+
+        Args:
+            objName (str): Object name as exported
+
+        Returns:
+            dict: The index entry
+        """
+        try:
+            return self._entries[objName]
+        except KeyError:
+            raise KeyError(
+                "{} is not in {}".format(objName, self.filePath)
+            )
+
+    def readBlock(self, objName, blockName, checksum=False):
+        """Decode one block of an object
+
+        Args:
+            objName (str): Object name
+            blockName (str): indptr, indices, data or blendWeights
+            checksum (bool, optional): Check the block crc32
+
+        Returns:
+            array: The decoded values
+        """
+        block = self.info(objName)["blocks"][blockName]
+        start = block["offset"]
+        data = self._mm[start : start + block["size"]]
+        if checksum and zlib.crc32(data) & 0xFFFFFFFF != block["crc32"]:
+            raise SkinFormatError(
+                "Checksum mismatch on {}.{}".format(objName, blockName)
+            )
+        return _fromBytes(
+            block["type"], decompress(data, block["compression"])
+        )
+
+    def readWeights(self, objName):
+        """Decode the weights of an object
+
+        Args:
+            objName (str): Object name
+
+        Returns:
+            weight_array.SparseWeights: The weights
+        """
+        entry = self.info(objName)
+        return weight_array.SparseWeights(
+            entry["influences"],
+            entry["vertexCount"],
+            array(
+                weight_array.POINTER_TYPE, self.readBlock(objName, "indptr")
+            ),
+            array(weight_array.INDEX_TYPE, self.readBlock(objName, "indices")),
+            array(weight_array.WEIGHT_TYPE, self.readBlock(objName, "data")),
+        )
+
+    def readBlendWeights(self, objName):
+        """Decode the blend weights of an object
+
+        Args:
+            objName (str): Object name
+
+        Returns:
+            array: One blend weight per vertex
+        """
+        entry = self.info(objName)
+        if "blendWeights" not in entry["blocks"]:
+            return array(
+                weight_array.WEIGHT_TYPE, [0.0] * entry["vertexCount"]
+            )
+        return array(
+            weight_array.WEIGHT_TYPE, self.readBlock(objName, "blendWeights")
+        )
+
+    def readDataDic(self, objName):
+        """Decode an object to the skin data dictionary used by skin.setData
+
+        Args:
+            objName (str): Object name
+
+        Returns:
+            dict: skin data, with array backed weights and blend weights
+        """
+        dataDic = {
+            k: v
+            for k, v in self.info(objName).items()
+            if k not in ("blocks", "influences", "nnz")
+        }
+        dataDic["skinDataFormat"] = "compressed"
+        dataDic["weights"] = self.readWeights(objName)
+        dataDic["blendWeights"] = self.readBlendWeights(objName)
+        return dataDic
+
+    def validate(self, checksum=False):
+        """Validate the file structure
+
+        Args:
+            checksum (bool, optional): Also check the block crc32. This reads
+                all the blocks.
+
+        Returns:
+            list: Error messages. Empty if the file is valid
+        """
+        errors = []
+        indexStart = HEADER.size
+        for entry in self.entries:
+            name = entry["objName"]
+            blocks = entry["blocks"]
+            for required in ("indptr", "indices", "data"):
+                if required not in blocks:
+                    errors.append(
+                        "{}: missing {} block".format(name, required)
+                    )
+            for blockName, block in blocks.items():
+                start, size = block["offset"], block["size"]
+                if start < indexStart or start + size > self.fileSize:
+                    errors.append(
+                        "{}.{}: block out of file bounds".format(
+                            name, blockName
+                        )
+                    )
+                    continue
+                itemSize = array(block["type"]).itemsize
+                if block["rawSize"] != block["count"] * itemSize:
+                    errors.append(
+                        "{}.{}: inconsistent block size".format(
+                            name, blockName
+                        )
+                    )
+                if checksum:
+                    data = self._mm[start : start + size]
+                    if zlib.crc32(data) & 0xFFFFFFFF != block["crc32"]:
+                        errors.append(
+                            "{}.{}: checksum mismatch".format(name, blockName)
+                        )
+            if "indptr" in blocks and (
+                blocks["indptr"]["count"] != entry["vertexCount"] + 1
+            ):
+                errors.append("{}: row pointers count mismatch".format(name))
+            if "data" in blocks and blocks["data"]["count"] != entry["nnz"]:
+                errors.append("{}: weight count mismatch".format(name))
+        return errors
+
+
+######################################
+# Index sidecar
+######################################
+
+INDEX_EXT = ".gSkinIndex"
+INDEX_VERSION = 1
+
+# file systems store the modification time with different resolutions
+MTIME_TOLERANCE = 0.01
+
+
+def getIndexPath(filePath):
+    """Get the index sidecar path of a gSkin or jSkin file"""
+    return filePath + INDEX_EXT
+
+
+def indexEntry(dataDic):
+    """Get the index entry of an object skin data
+
+    Supports the array backed and the dictionary skin data, in the
+    compressed and the legacy format.
+
+    Args:
+        dataDic (dict): The object skin data
+
+    Returns:
+        dict: {"objName", "vertexCount", "influences"}
+    """
+    weights = dataDic["weights"]
+    if isinstance(weights, dict):
+        influences = list(weights.keys())
+        if dataDic.get("skinDataFormat") == "compressed":
+            vertexCount = dataDic["vertexCount"]
+        else:
+            vertexCount = len(dataDic["blendWeights"])
+    else:
+        influences = list(weights.influences)
+        vertexCount = weights.vertexCount
+    return {
+        "objName": dataDic["objName"],
+        "vertexCount": vertexCount,
+        "influences": [str(name) for name in influences],
+    }
+
+
+def writeIndexSidecar(filePath, objects):
+    """Write the index sidecar of a gSkin or jSkin file
+
+    The sidecar stores the size and modification time of the skin file, to
+    detect it is stale if the skin file is written without it.
+
+    Args:
+        filePath (str): The skin file path. It must exist
+        objects (list): The object skin data dictionaries or index entries
+    """
+    stat = os.stat(filePath)
+    sidecar = {
+        "version": INDEX_VERSION,
+        "size": stat.st_size,
+        "mtime": stat.st_mtime,
+        "objects": [
+            o if "weights" not in o else indexEntry(o) for o in objects
+        ],
+    }
+    with open(getIndexPath(filePath), "w") as fp:
+        json.dump(sidecar, fp)
+
+
+def readIndexSidecar(filePath):
+    """Read the index sidecar of a gSkin or jSkin file
+
+    Args:
+        filePath (str): The skin file path
+
+    Returns:
+        list or None: The index entries. None if there is no sidecar, or if
+            it is stale
+    """
+    indexPath = getIndexPath(filePath)
+    try:
+        stat = os.stat(filePath)
+        with open(indexPath, "r") as fp:
+            sidecar = json.load(fp)
+    except (IOError, OSError, ValueError):
+        return None
+    if (
+        sidecar.get("version") != INDEX_VERSION
+        or sidecar.get("size") != stat.st_size
+        or abs(sidecar.get("mtime", 0) - stat.st_mtime) > MTIME_TOLERANCE
+    ):
+        return None
+    return sidecar["objects"]
+
+
+def readObjectIndex(filePath):
+    """Read the object index of a skin file, without decoding the weights
+
+    The binary indexed format stores the index in the file. For the gSkin
+    and jSkin formats the index sidecar is used if it is up to date.
+
+    Args:
+        filePath (str): gSkin, jSkin or bSkin file path
+
+    Returns:
+        list or None: {"objName", "vertexCount", "influences"} entries. None
+            if the gSkin or jSkin file has no up to date sidecar
+    """
+    if filePath.endswith(FILE_BIN_EXT):
+        return [
+            {
+                "objName": e["objName"],
+                "vertexCount": e["vertexCount"],
+                "influences": e["influences"],
+            }
+            for e in readIndex(filePath)
+        ]
+    return readIndexSidecar(filePath)
@@ -0,0 +1,635 @@
+"""
+Headless skin file toolkit.
+
+This module is Maya free. It reads the gSkin, jSkin and bSkin files (and
+gSkinPack packs) exported by ``skin.exportSkin`` and ``skin.exportSkinPack``,
+so they can be inspected, compared, merged and validated on machines without
+Maya.
+
+Command line usage::
+
+    python -m mgear.core.skin_tools list body.bSkin
+    python -m mgear.core.skin_tools diff old.gSkinPack new.gSkinPack
+    python -m mgear.core.skin_tools merge out.bSkin a.jSkin b.gSkin
+    python -m mgear.core.skin_tools validate body.gSkin
+    python -m mgear.core.skin_tools condition body.bSkin game.bSkin -m 4
+
+NumPy is optional. When it can be imported, the weight conversions and the
+diffs are vectorized.
+
+Note:
+    gSkin files are python pickles. Only load gSkin files from trusted
+    sources.
+"""
+
+import os
+import sys
+import json
+import pickle
+import argparse
+
+from . import skin_format
+from . import weight_array
+from .weight_array import numpy
+
+FILE_EXT = skin_format.FILE_EXT
+FILE_JSON_EXT = skin_format.FILE_JSON_EXT
+FILE_BIN_EXT = skin_format.FILE_BIN_EXT
+PACK_EXT = skin_format.PACK_EXT
+
+NORMALIZE_TOLERANCE = 1e-3
+
+
+######################################
+# Data conversion
+######################################
+
+
+def dictDataToArray(dataDic):
+    """Convert the dictionary skin data format to array backed skin data
+
+    Both the compressed and the legacy full list formats are supported.
+
+    Args:
+        dataDic (dict): The object skin data as stored in gSkin/jSkin files
+
+    Returns:
+        dict: The object skin data, with SparseWeights weights and array
+            blend weights
+    """
+    dataDic = dict(dataDic)
+    weights = dataDic["weights"]
+    if isinstance(weights, weight_array.DenseWeights):
+        weights = weights.toSparse()
+    if isinstance(weights, weight_array.SparseWeights):
+        vertexCount = weights.vertexCount
+    elif dataDic.get("skinDataFormat") == "compressed":
+        vertexCount = dataDic["vertexCount"]
+    else:
+        # The original weight format was a full list for every vertex
+        vertexCount = len(dataDic["blendWeights"])
+    if isinstance(weights, dict):
+        weights = weight_array.SparseWeights.fromInfluenceDict(
+            weights, vertexCount
+        )
+    dataDic["vertexCount"] = vertexCount
+    dataDic["skinDataFormat"] = "compressed"
+    dataDic["weights"] = weights
+    dataDic["blendWeights"] = weight_array.array(
+        weight_array.WEIGHT_TYPE,
+        weight_array.columnFromValues(dataDic["blendWeights"], vertexCount),
+    )
+    return dataDic
+
+
+def arrayDataToDict(dataDic):
+    """Convert array backed skin data to the dictionary skin data format
+
+    Args:
+        dataDic (dict): The object skin data with array backed weights
+
+    Returns:
+        dict: The object skin data as stored in gSkin/jSkin files
+    """
+    dataDic = dict(dataDic)
+    dataDic["weights"] = dataDic["weights"].toInfluenceDict()
+    rounded = [round(w, 6) for w in dataDic["blendWeights"]]
+    dataDic["blendWeights"] = {i: w for i, w in enumerate(rounded) if w != 0.0}
+    return dataDic
+
+
+######################################
+# File IO
+######################################
+
+
+def getPackFiles(packPath):
+    """Get the skin file paths of a skin pack
+
+    Args:
+        packPath (str): gSkinPack file path
+
+    Returns:
+        list: The skin file paths
+    """
+    with open(packPath, "r") as fp:
+        packDic = json.load(fp)
+    rootPath = os.path.dirname(packPath)
+    return [os.path.join(rootPath, f) for f in packDic["packFiles"]]
+
+
+def readSkinFile(filePath):
+    """Read all the object skin data of a skin file or skin pack
+
+    Args:
+        filePath (str): gSkin, jSkin, bSkin or gSkinPack file path
+
+    Returns:
+        list: The array backed object skin data
+    """
+    if filePath.endswith(PACK_EXT):
+        objects = []
+        for skinFile in getPackFiles(filePath):
+            objects.extend(readSkinFile(skinFile))
+        return objects
+
+    if filePath.endswith(FILE_BIN_EXT):
+        with skin_format.SkinFileReader(filePath) as reader:
+            return [reader.readDataDic(name) for name in reader.objects()]
+
+    dataPack = readDataPack(filePath)
+    return [dictDataToArray(data) for data in dataPack["objDDic"]]
+
+
+def readDataPack(filePath):
+    """Read the data pack dictionary of a gSkin or jSkin file
+
+    Args:
+        filePath (str): gSkin or jSkin file path
+
+    Returns:
+        dict: {"objs": [names], "objDDic": [dataDic], ...}
+    """
+    if filePath.endswith(FILE_EXT):
+        with open(filePath, "rb") as fp:
+            return pickle.load(fp)
+    with open(filePath, "r") as fp:
+        return json.load(fp)
+
+
+def writeSkinFile(filePath, objects):
+    """Write object skin data to a skin file
+
+    Args:
+        filePath (str): gSkin, jSkin or bSkin file path
+        objects (list): The object skin data, array backed or not
+    """
+    objects = [dictDataToArray(data) for data in objects]
+    if filePath.endswith(FILE_BIN_EXT):
+        skin_format.writeSkinFile(filePath, objects)
+        return
+
+    packDic = {
+        "objs": [data["objName"] for data in objects],
+        "objDDic": [arrayDataToDict(data) for data in objects],
+        "bypassObj": [],
+    }
+    if filePath.endswith(FILE_EXT):
+        with skin_format.replaceOpen(filePath, "wb") as fp:
+            pickle.dump(packDic, fp, pickle.HIGHEST_PROTOCOL)
+    elif filePath.endswith(FILE_JSON_EXT):
+        with skin_format.replaceOpen(filePath, "w") as fp:
+            json.dump(packDic, fp, indent=4, sort_keys=True)
+    else:
+        raise ValueError("Not valid file extension for: {}".format(filePath))
+    skin_format.writeIndexSidecar(filePath, objects)
+
+
+######################################
+# Inspect
+######################################
+
+
+def listObjects(filePath, cache=False):
+    """List the objects of a skin file without decoding the weights if possible
+
+    The bSkin index, or the up to date index sidecar of gSkin and jSkin
+    files, is read instead of the whole file.
+
+    Args:
+        filePath (str): gSkin, jSkin, bSkin or gSkinPack file path
+        cache (bool, optional): Write the missing or stale index sidecars.
+            By default, listing doesn't write any file
+
+    Returns:
+        list: {"objName", "vertexCount", "influences"} dictionaries
+    """
+    if filePath.endswith(PACK_EXT):
+        result = []
+        for skinFile in getPackFiles(filePath):
+            result.extend(listObjects(skinFile, cache))
+        return result
+
+    entries = skin_format.readObjectIndex(filePath)
+    if entries is not None:
+        return entries
+    entries = [
+        skin_format.indexEntry(data)
+        for data in readDataPack(filePath)["objDDic"]
+    ]
+    if cache:
+        try:
+            skin_format.writeIndexSidecar(filePath, entries)
+        except (IOError, OSError):
+            pass
+    return entries
+
+
+######################################
+# Diff
+######################################
+
+
+def diffWeights(weightsA, weightsB):
+    """Compare two weight blocks of the same object
+
+    The influences are matched by name. Missing influences count as 0.0
+
+    Args:
+        weightsA (SparseWeights): Reference weights
+        weightsB (SparseWeights): Compared weights
+
+    Returns:
+        dict: "influences": {name: max absolute delta} for the influences
+            with changes. "vertices": per vertex sum of the absolute deltas.
+            "added"/"removed": influences only in B/A. "maxDelta": the max
+            vertex delta. None if the vertex counts don't match
+    """
+    if weightsA.vertexCount != weightsB.vertexCount:
+        return None
+    added = [n for n in weightsB.influences if n not in weightsA.influences]
+    removed = [n for n in weightsA.influences if n not in weightsB.influences]
+    influences = list(weightsA.influences) + added
+    if numpy is not None:
+        return _diffWeightsNumpy(
+            weightsA, weightsB, influences, added, removed
+        )
+    a = weightsA.remapInfluences(influences)
+    b = weightsB.remapInfluences(influences)
+
+    influenceDelta = [0.0] * len(influences)
+    vertexDelta = weight_array.array(weight_array.WEIGHT_TYPE)
+    aPtr, aInd, aData = a.indptr, a.indices, a.data
+    bPtr, bInd, bData = b.indptr, b.indices, b.data
+    for vtx in range(a.vertexCount):
+        aStart, aEnd = aPtr[vtx], aPtr[vtx + 1]
+        bStart, bEnd = bPtr[vtx], bPtr[vtx + 1]
+        rowA = aData[aStart:aEnd]
+        rowB = bData[bStart:bEnd]
+        indA = aInd[aStart:aEnd]
+        indB = bInd[bStart:bEnd]
+        if indA == indB:
+            if rowA == rowB:
+                vertexDelta.append(0.0)
+                continue
+            deltas = zip(indA, [abs(x - y) for x, y in zip(rowA, rowB)])
+        else:
+            row = dict(zip(indA, rowA))
+            for i, w in zip(indB, rowB):
+                row[i] = row.get(i, 0.0) - w
+            deltas = [(i, abs(w)) for i, w in row.items()]
+        total = 0.0
+        for i, d in deltas:
+            total += d
+            if d > influenceDelta[i]:
+                influenceDelta[i] = d
+        vertexDelta.append(total)
+
+    return {
+        "influences": {
+            name: d for name, d in zip(influences, influenceDelta) if d
+        },
+        "vertices": vertexDelta,
+        "added": added,
+        "removed": removed,
+        "maxDelta": max(vertexDelta) if len(vertexDelta) else 0.0,
+    }
+
+
+def _diffWeightsNumpy(weightsA, weightsB, influences, added, removed):
+    # the weights of B are subtracted from A by (vertex, influence) key
+    count = max(len(influences), 1)
+    index = {name: ii for ii, name in enumerate(influences)}
+    keys = []
+    values = []
+    for weights, sign in ((weightsA, 1.0), (weightsB, -1.0)):
+        remap = numpy.array(
+            [index[name] for name in weights.influences] or [0],
+            dtype=numpy.int64,
+        )
+        cols = remap[weight_array.asNumpy(weights.indices).astype(numpy.int64)]
+        keys.append(weight_array.rowIndices(weights) * count + cols)
+        values.append(weight_array.asNumpy(weights.data) * sign)
+    keys = numpy.concatenate(keys)
+    values = numpy.concatenate(values)
+    order = numpy.argsort(keys, kind="stable")
+    keys = keys[order]
+    unique, starts = numpy.unique(keys, return_index=True)
+    if len(keys):
+        deltas = numpy.abs(numpy.add.reduceat(values[order], starts))
+    else:
+        deltas = values
+
+    vertexDelta = numpy.bincount(
+        unique // count, weights=deltas, minlength=weightsA.vertexCount
+    )
+    influenceDelta = numpy.zeros(len(influences))
+    numpy.maximum.at(influenceDelta, unique % count, deltas)
+    return {
+        "influences": {
+            name: float(d)
+            for name, d in zip(influences, influenceDelta)
+            if d
+        },
+        "vertices": weight_array.fromNumpy(
+            vertexDelta, weight_array.WEIGHT_TYPE
+        ),
+        "added": added,
+        "removed": removed,
+        "maxDelta": float(vertexDelta.max()) if len(vertexDelta) else 0.0,
+    }
+
+
+def diffFiles(filePathA, filePathB):
+    """Compare the objects of two skin files or skin packs
+
+    Args:
+        filePathA (str): Reference file path
+        filePathB (str): Compared file path
+
+    Returns:
+        dict: "objects": {objName: diffWeights result} for the objects in
+            both files. "added"/"removed": objects only in B/A.
+            "vertexCountMismatch": objects with a different vertex count
+    """
+    objectsA = {d["objName"]: d for d in readSkinFile(filePathA)}
+    objectsB = {d["objName"]: d for d in readSkinFile(filePathB)}
+    result = {
+        "objects": {},
+        "added": [n for n in objectsB if n not in objectsA],
+        "removed": [n for n in objectsA if n not in objectsB],
+        "vertexCountMismatch": [],
+    }
+    for name, dataA in objectsA.items():
+        if name not in objectsB:
+            continue
+        diff = diffWeights(dataA["weights"], objectsB[name]["weights"])
+        if diff is None:
+            result["vertexCountMismatch"].append(name)
+        else:
+            result["objects"][name] = diff
+    return result
+
+
+######################################
+# Merge
+######################################
+
+
+def mergeSkinFiles(filePaths, outPath):
+    """Merge skin files and skin packs in one skin file
+
+    If the same object is in more than one file, the last one wins.
+
+    Args:
+        filePaths (list): gSkin, jSkin, bSkin or gSkinPack file paths
+        outPath (str): Destination gSkin, jSkin or bSkin file path
+
+    Returns:
+        list: The merged object names
+    """
+    merged = {}
+    order = []
+    for filePath in filePaths:
+        for data in readSkinFile(filePath):
+            if data["objName"] not in merged:
+                order.append(data["objName"])
+            merged[data["objName"]] = data
+    writeSkinFile(outPath, [merged[name] for name in order])
+    return order
+
+
+######################################
+# Validate
+######################################
+
+
+def validateWeights(weights, tolerance=NORMALIZE_TOLERANCE):
+    """Check the normalization of a weight block
+
+    Args:
+        weights (SparseWeights): The weights
+        tolerance (float, optional): Max allowed deviation of the vertex
+            weight sum from 1.0
+
+    Returns:
+        dict: "notNormalized": vertex indices, "negative": vertex indices
+            with negative weights, "maxDeviation": max deviation from 1.0
+    """
+    indptr, data = weights.indptr, weights.data
+    notNormalized = []
+    negative = []
+    maxDeviation = 0.0
+    for vtx in range(weights.vertexCount):
+        row = data[indptr[vtx] : indptr[vtx + 1]]
+        deviation = abs(sum(row) - 1.0)
+        if deviation > maxDeviation:
+            maxDeviation = deviation
+        if deviation > tolerance:
+            notNormalized.append(vtx)
+        if row and min(row) < 0.0:
+            negative.append(vtx)
+    return {
+        "notNormalized": notNormalized,
+        "negative": negative,
+        "maxDeviation": maxDeviation,
+    }
+
+
+def validateFile(filePath, tolerance=NORMALIZE_TOLERANCE):
+    """Validate the structure and the normalization of a skin file
+
+    Args:
+        filePath (str): gSkin, jSkin, bSkin or gSkinPack file path
+        tolerance (float, optional): Max allowed deviation of the vertex
+            weight sum from 1.0
+
+    Returns:
+        list: Error messages. Empty if the file is valid
+    """
+    errors = []
+    if filePath.endswith(FILE_BIN_EXT):
+        with skin_format.SkinFileReader(filePath) as reader:
+            errors.extend(reader.validate(checksum=True))
+    if errors:
+        return errors
+    for data in readSkinFile(filePath):
+        if not data.get("normalizeWeights", 1):
+            continue
+        result = validateWeights(data["weights"], tolerance)
+        if result["notNormalized"]:
+            errors.append(
+                "{}: {} vertices not normalized (max deviation {:.6f})".format(
+                    data["objName"],
+                    len(result["notNormalized"]),
+                    result["maxDeviation"],
+                )
+            )
+        if result["negative"]:
+            errors.append(
+                "{}: {} vertices with negative weights".format(
+                    data["objName"], len(result["negative"])
+                )
+            )
+    return errors
+
+
+######################################
+# Condition
+######################################
+
+
+def conditionSkinFile(filePath, outPath, **kwargs):
+    """Prune, limit, normalize and quantize the weights of a skin file
+
+    Args:
+        filePath (str): Source gSkin, jSkin, bSkin or gSkinPack file path
+        outPath (str): Destination gSkin, jSkin or bSkin file path
+        **kwargs: weight_array.conditionWeights arguments
+
+    Returns:
+        dict: {objName: conditionWeights report}
+    """
+    objects = readSkinFile(filePath)
+    reports = {}
+    for data in objects:
+        data["weights"], reports[data["objName"]] = (
+            weight_array.conditionWeights(data["weights"], **kwargs)
+        )
+    writeSkinFile(outPath, objects)
+    return reports
+
+
+######################################
+# Command line
+######################################
+
+
+def _cmdList(args):
+    for info in listObjects(args.file, args.cache):
+        print(
+            "{}: {} vertices, {} influences".format(
+                info["objName"], info["vertexCount"], len(info["influences"])
+            )
+        )
+        if args.influences:
+            for name in info["influences"]:
+                print("    " + name)
+    return 0
+
+
+def _cmdDiff(args):
+    result = diffFiles(args.fileA, args.fileB)
+    for name in result["removed"]:
+        print("- {}".format(name))
+    for name in result["added"]:
+        print("+ {}".format(name))
+    for name in result["vertexCountMismatch"]:
+        print("! {}: vertex count mismatch".format(name))
+    changed = 0
+    for name, diff in sorted(result["objects"].items()):
+        if diff["maxDelta"] <= args.threshold:
+            continue
+        changed += 1
+        print("~ {}: max vertex delta {:.6f}".format(name, diff["maxDelta"]))
+        for inf in diff["removed"]:
+            print("    - {}".format(inf))
+        for inf in diff["added"]:
+            print("    + {}".format(inf))
+        for inf, delta in sorted(diff["influences"].items()):
+            if delta > args.threshold:
+                print("    ~ {}: {:.6f}".format(inf, delta))
+    if (
+        changed
+        or result["added"]
+        or result["removed"]
+        or result["vertexCountMismatch"]
+    ):
+        return 1
+    return 0
+
+
+def _cmdMerge(args):
+    names = mergeSkinFiles(args.files, args.output)
+    print("Merged {} objects in {}".format(len(names), args.output))
+    return 0
+
+
+def _cmdValidate(args):
+    errors = validateFile(args.file, args.tolerance)
+    for error in errors:
+        print(error)
+    if not errors:
+        print("{}: valid".format(args.file))
+    return 1 if errors else 0
+
+
+def _cmdCondition(args):
+    reports = conditionSkinFile(
+        args.file,
+        args.output,
+        pruneThreshold=args.prune,
+        maxInfluences=args.max_influences,
+        quantizeBits=args.bits,
+    )
+    for name, report in sorted(reports.items()):
+        print(
+            "{}: max vertex error {:.6f}, {} vertices limited".format(
+                name, report["total"], report["limitedVertices"]
+            )
+        )
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="skin_tools", description="mGear headless skin file toolkit"
+    )
+    subparsers = parser.add_subparsers(dest="command")
+    subparsers.required = True
+
+    sub = subparsers.add_parser("list", help="List objects and influences")
+    sub.add_argument("file")
+    sub.add_argument("-i", "--influences", action="store_true")
+    sub.add_argument(
+        "-c",
+        "--cache",
+        action="store_true",
+        help="Write the missing or stale index sidecars",
+    )
+    sub.set_defaults(func=_cmdList)
+
+    sub = subparsers.add_parser("diff", help="Compare two skin files")
+    sub.add_argument("fileA")
+    sub.add_argument("fileB")
+    sub.add_argument("-t", "--threshold", type=float, default=1e-5)
+    sub.set_defaults(func=_cmdDiff)
+
+    sub = subparsers.add_parser("merge", help="Merge skin files")
+    sub.add_argument("output")
+    sub.add_argument("files", nargs="+")
+    sub.set_defaults(func=_cmdMerge)
+
+    sub = subparsers.add_parser("validate", help="Validate a skin file")
+    sub.add_argument("file")
+    sub.add_argument(
+        "-t", "--tolerance", type=float, default=NORMALIZE_TOLERANCE
+    )
+    sub.set_defaults(func=_cmdValidate)
+
+    sub = subparsers.add_parser(
+        "condition", help="Prune, limit, normalize and quantize weights"
+    )
+    sub.add_argument("file")
+    sub.add_argument("output")
+    sub.add_argument("-p", "--prune", type=float, default=0.001)
+    sub.add_argument("-m", "--max-influences", type=int, default=0)
+    sub.add_argument("-b", "--bits", type=int, default=0)
+    sub.set_defaults(func=_cmdCondition)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
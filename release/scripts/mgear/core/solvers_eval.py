@@ -0,0 +1,1099 @@
+"""
+Reference evaluation of the mgear_solvers nodes.
+
+This module is Maya free. It computes the same math as the C++ nodes of
+``src`` for many evaluations in one call, so the offline tools (bakers,
+exporters, retargeting) can solve thousands of frames without a DG
+evaluation:
+
+    * ``ikfk2bone``: mgear_ikfk2Bone
+    * ``roll_spline_kine``: mgear_rollSplineKine
+    * ``slide_curve``: mgear_slideCurve2
+    * ``squash_stretch``: mgear_squashStretch2
+    * ``spine_point_at``: mgear_spinePointAt
+    * ``spring``: mgear_springNode
+
+The node quirks are kept, so the results match the nodes, and they are
+noted in the function docstrings.
+
+Conventions, same as ``mgear.core.transform_batch``:
+    * vectors are (x, y, z) sequences
+    * matrices are flat tuples of 16 floats, row major, with row vectors
+      and the translation in the last row (the ``MMatrix`` layout)
+    * quaternions are (x, y, z, w) tuples
+    * angles are in degrees, like the node attributes
+
+The per evaluation arguments take a sequence with one value per
+evaluation, or a single value used for all of them.
+
+The matrices are decomposed in translation, rotation and scale like
+``MTransformationMatrix``, without shear.
+"""
+
+import math
+
+from mgear.core import nurbs
+from mgear.core import transform_batch
+
+IDENTITY = transform_batch.IDENTITY
+
+# same constant as degrees2radians of the nodes
+DEGREES_TO_RADIANS = 0.0174532925
+
+IKFK_OUTPUTS = ("outA", "outB", "outCenter", "outEff")
+
+# spinePointAt axe attribute: X, Y, Z, -X, -Y, -Z
+POINT_AT_AXES = (
+    (1.0, 0.0, 0.0),
+    (0.0, 1.0, 0.0),
+    (0.0, 0.0, 1.0),
+    (-1.0, 0.0, 0.0),
+    (0.0, -1.0, 0.0),
+    (0.0, 0.0, -1.0),
+)
+
+
+######################################
+# Per evaluation arguments
+######################################
+
+
+def _values(value, count):
+    # one float, bool or int per evaluation
+    if hasattr(value, "__len__"):
+        return _checked(value, count)
+    return [value] * count
+
+
+def _items(value, count, size):
+    # one vector (size 3) or matrix (size 16) per evaluation
+    if len(value) == size and not hasattr(value[0], "__len__"):
+        return [value] * count
+    return _checked(value, count)
+
+
+def _count(values=(), vectors=()):
+    # number of evaluations of the sequence arguments
+    counts = [len(v) for v in values if hasattr(v, "__len__")]
+    counts.extend(
+        len(v) for v in vectors if len(v) != 3 or hasattr(v[0], "__len__")
+    )
+    return max(counts) if counts else 1
+
+
+def _checked(values, count):
+    values = list(values)
+    if len(values) != count:
+        raise ValueError(
+            "{} values for {} evaluations".format(len(values), count)
+        )
+    return values
+
+
+######################################
+# Vectors and quaternions
+######################################
+
+
+def _add(a, b):
+    return (a[0] + b[0], a[1] + b[1], a[2] + b[2])
+
+
+def _sub(a, b):
+    return (a[0] - b[0], a[1] - b[1], a[2] - b[2])
+
+
+def _mul(a, s):
+    return (a[0] * s, a[1] * s, a[2] * s)
+
+
+def _dot(a, b):
+    return a[0] * b[0] + a[1] * b[1] + a[2] * b[2]
+
+
+def _cross(a, b):
+    return (
+        a[1] * b[2] - a[2] * b[1],
+        a[2] * b[0] - a[0] * b[2],
+        a[0] * b[1] - a[1] * b[0],
+    )
+
+
+def _length(a):
+    return math.sqrt(_dot(a, a))
+
+
+def _normalize(a):
+    length = _length(a)
+    if length == 0.0:
+        return (float(a[0]), float(a[1]), float(a[2]))
+    return (a[0] / length, a[1] / length, a[2] / length)
+
+
+def _clamp(value, low=0.0, high=1.0):
+    return min(max(value, low), high)
+
+
+def _lerp(a, b, blend):
+    return tuple(x * (1 - blend) + y * blend for x, y in zip(a, b))
+
+
+def _quatMul(a, b):
+    # hamilton product of (x, y, z, w) quaternions
+    return (
+        a[3] * b[0] + a[0] * b[3] + a[1] * b[2] - a[2] * b[1],
+        a[3] * b[1] - a[0] * b[2] + a[1] * b[3] + a[2] * b[0],
+        a[3] * b[2] + a[0] * b[1] - a[1] * b[0] + a[2] * b[3],
+        a[3] * b[3] - a[0] * b[0] - a[1] * b[1] - a[2] * b[2],
+    )
+
+
+def _rotate(v, q):
+    # MVector.rotateBy(MQuaternion)
+    norm = q[0] * q[0] + q[1] * q[1] + q[2] * q[2] + q[3] * q[3]
+    if not norm:
+        return tuple(v)
+    inverse = (-q[0] / norm, -q[1] / norm, -q[2] / norm, q[3] / norm)
+    r = _quatMul(_quatMul(q, (v[0], v[1], v[2], 0.0)), inverse)
+    return r[:3]
+
+
+def _rotateAlongAxis(v, axis, angle):
+    # rotateVectorAlongAxis: q2 * v * q2n with the MQuaternion product,
+    # which applies the left operand first
+    sa = math.sin(angle / 2.0)
+    ca = math.cos(angle / 2.0)
+    q2 = (axis[0] * sa, axis[1] * sa, axis[2] * sa, ca)
+    q2n = (-q2[0], -q2[1], -q2[2], ca)
+    return _quatMul(_quatMul(q2n, (v[0], v[1], v[2], 0.0)), q2)[:3]
+
+
+def _slerp(q1, q2, blend):
+    # MQuaternion slerp
+    return transform_batch.slerp_quaternions([q1], [q2], blend)[0]
+
+
+def _slerp2(qA, qB, blend):
+    # slerp2 of the nodes: returns qA for the close or opposite
+    # quaternions
+    dot = qA[0] * qB[0] + qA[1] * qB[1] + qA[2] * qB[2] + qA[3] * qB[3]
+    dot = max(-1.0, min(1.0, dot))
+    if round(-dot * dot + 1, 5) == 0:
+        return tuple(qA)
+    angle = math.acos(dot)
+    if round(math.sin(angle), 6) == 0:
+        return tuple(qA)
+    factor = 1 / math.sin(angle)
+    scaleA = math.sin((1.0 - blend) * angle) * factor
+    scaleB = math.sin(blend * angle) * factor
+    return tuple(scaleA * a + scaleB * b for a, b in zip(qA, qB))
+
+
+def _e2q(x, y, z):
+    # e2q of the nodes, degrees to quaternion
+    x *= DEGREES_TO_RADIANS
+    y *= DEGREES_TO_RADIANS
+    z *= DEGREES_TO_RADIANS
+    c1 = math.cos(y / 2.0)
+    s1 = math.sin(y / 2.0)
+    c2 = math.cos(z / 2.0)
+    s2 = math.sin(z / 2.0)
+    c3 = math.cos(x / 2.0)
+    s3 = math.sin(x / 2.0)
+    c1c2 = c1 * c2
+    s1s2 = s1 * s2
+    return (
+        c1c2 * s3 + s1s2 * c3,
+        s1 * c2 * c3 + c1 * s2 * s3,
+        c1 * s2 * c3 - s1 * c2 * s3,
+        c1c2 * c3 - s1s2 * s3,
+    )
+
+
+def _quaternionToEuler(q):
+    # xyz euler rotation, in radians
+    r0, r1, r2 = _quaternionRows(q)
+    y = math.asin(max(-1.0, min(1.0, -r0[2])))
+    if abs(r0[2]) < 1.0 - 1e-12:
+        return (math.atan2(r1[2], r2[2]), y, math.atan2(r0[1], r0[0]))
+    return (math.atan2(-r2[1], r1[1]), y, 0.0)
+
+
+def _eulerToQuaternion(euler):
+    # xyz euler rotation: x, then y, then z
+    x, y, z = (a * 0.5 for a in euler)
+    qx = (math.sin(x), 0.0, 0.0, math.cos(x))
+    qy = (0.0, math.sin(y), 0.0, math.cos(y))
+    qz = (0.0, 0.0, math.sin(z), math.cos(z))
+    return _quatMul(qz, _quatMul(qy, qx))
+
+
+######################################
+# Matrices
+######################################
+
+
+def _quaternionRows(q):
+    x, y, z, w = q
+    return (
+        (1 - 2 * (y * y + z * z), 2 * (x * y + w * z), 2 * (x * z - w * y)),
+        (2 * (x * y - w * z), 1 - 2 * (x * x + z * z), 2 * (y * z + w * x)),
+        (2 * (x * z + w * y), 2 * (y * z - w * x), 1 - 2 * (x * x + y * y)),
+    )
+
+
+def _rowsQuaternion(r0, r1, r2):
+    # quaternion of orthonormal rotation rows
+    trace = r0[0] + r1[1] + r2[2]
+    if trace > 0.0:
+        s = 0.5 / math.sqrt(trace + 1.0)
+        return (
+            (r1[2] - r2[1]) * s,
+            (r2[0] - r0[2]) * s,
+            (r0[1] - r1[0]) * s,
+            0.25 / s,
+        )
+    if r0[0] > r1[1] and r0[0] > r2[2]:
+        s = 2.0 * math.sqrt(max(1.0 + r0[0] - r1[1] - r2[2], 1e-30))
+        return (
+            0.25 * s,
+            (r1[0] + r0[1]) / s,
+            (r2[0] + r0[2]) / s,
+            (r1[2] - r2[1]) / s,
+        )
+    if r1[1] > r2[2]:
+        s = 2.0 * math.sqrt(max(1.0 + r1[1] - r0[0] - r2[2], 1e-30))
+        return (
+            (r1[0] + r0[1]) / s,
+            0.25 * s,
+            (r2[1] + r1[2]) / s,
+            (r2[0] - r0[2]) / s,
+        )
+    s = 2.0 * math.sqrt(max(1.0 + r2[2] - r0[0] - r1[1], 1e-30))
+    return (
+        (r2[0] + r0[2]) / s,
+        (r2[1] + r1[2]) / s,
+        0.25 * s,
+        (r0[1] - r1[0]) / s,
+    )
+
+
+def _decompose(m):
+    # translation, rotation and scale, orthonormalizing the rows from the
+    # X axis, like MTransformationMatrix. The shear is dropped
+    a0, a1, a2 = m[0:3], m[4:7], m[8:11]
+    x = _normalize(a0)
+    a1 = _sub(a1, _mul(x, _dot(x, a1)))
+    y = _normalize(a1)
+    a2 = _sub(_sub(a2, _mul(x, _dot(x, a2))), _mul(y, _dot(y, a2)))
+    z = _normalize(a2)
+    scale = [_length(a0), _length(a1), _length(a2)]
+    if _dot(x, _cross(y, z)) < 0.0:
+        scale = [-s for s in scale]
+        x, y, z = _mul(x, -1), _mul(y, -1), _mul(z, -1)
+    return tuple(m[12:15]), _rowsQuaternion(x, y, z), tuple(scale)
+
+
+def _compose(translation, q, scale):
+    norm = math.sqrt(sum(c * c for c in q)) or 1.0
+    q = tuple(c / norm for c in q)
+    m = []
+    for row, s in zip(_quaternionRows(q), scale):
+        m.extend((row[0] * s, row[1] * s, row[2] * s, 0.0))
+    m.extend((translation[0], translation[1], translation[2], 1.0))
+    return tuple(float(v) for v in m)
+
+
+def _axesQuaternion(x, y, z):
+    # getQuaternionFromAxes of the nodes
+    m = tuple(x) + (0.0,) + tuple(y) + (0.0,) + tuple(z) + (0.0,)
+    return _decompose(m + (0.0, 0.0, 0.0, 1.0))[1]
+
+
+def _setTranslation(m, translation):
+    return tuple(m[:12]) + (
+        translation[0], translation[1], translation[2], 1.0
+    )
+
+
+def _multiply(a, b):
+    return transform_batch.multiply_matrices([a], [b])[0]
+
+
+def _inverse(m):
+    # inverse of an affine matrix
+    a, b, c = m[0:3]
+    d, e, f = m[4:7]
+    g, h, i = m[8:11]
+    det = a * (e * i - f * h) - b * (d * i - f * g) + c * (d * h - e * g)
+    if det == 0.0:
+        raise ValueError("Singular matrix")
+    r = (
+        (e * i - f * h) / det,
+        (c * h - b * i) / det,
+        (b * f - c * e) / det,
+        (f * g - d * i) / det,
+        (a * i - c * g) / det,
+        (c * d - a * f) / det,
+        (d * h - e * g) / det,
+        (b * g - a * h) / det,
+        (a * e - b * d) / det,
+    )
+    tx, ty, tz = m[12:15]
+    return (
+        r[0], r[1], r[2], 0.0,
+        r[3], r[4], r[5], 0.0,
+        r[6], r[7], r[8], 0.0,
+        -(tx * r[0] + ty * r[3] + tz * r[6]),
+        -(tx * r[1] + ty * r[4] + tz * r[7]),
+        -(tx * r[2] + ty * r[5] + tz * r[8]),
+        1.0,
+    )
+
+
+def _interpolateTransform(xf1, xf2, blend):
+    if blend == 1.0:
+        return xf2
+    if blend == 0.0:
+        return xf1
+    t1, q1, s1 = _decompose(xf1)
+    t2, q2, s2 = _decompose(xf2)
+    return _compose(
+        _lerp(t1, t2, blend), _slerp(q1, q2, blend), _lerp(s1, s2, blend)
+    )
+
+
+def _bezier4point(a, tan_a, d, tan_d, u):
+    b = _add(a, tan_a)
+    c = _sub(d, tan_d)
+    ab = _lerp(a, b, u)
+    bc = _lerp(b, c, u)
+    cd = _lerp(c, d, u)
+    abbc = _lerp(ab, bc, u)
+    bccd = _lerp(bc, cd, u)
+    return _lerp(abbc, bccd, u), _normalize(_sub(bccd, abbc))
+
+
+######################################
+# ikfk2Bone
+######################################
+
+
+def _ikTransform(data, name):
+    root_t, _, root_s = _decompose(data["root"])
+    rootPos = root_t
+    effPos = data["eff"][12:15]
+    upvPos = data["upv"][12:15]
+    rootEff = _sub(effPos, rootPos)
+    rollAxis = _normalize(rootEff)
+    rootEffDistance = _length(rootEff)
+
+    global_scale = root_s[0]
+    scale = root_s
+
+    # distance with max stretch
+    restLength = (
+        data["lengthA"] * data["scaleA"] + data["lengthB"] * data["scaleB"]
+    ) * global_scale
+    distance = rootEffDistance
+    distance2 = distance
+    if distance > restLength * data["maxstretch"]:
+        distance = restLength * data["maxstretch"]
+
+    # softness adapted to the chain length
+    softness = data["softness"] * restLength * 0.1
+
+    # stretch and softness, from the real distance
+    stretch = max(1.0, distance / restLength)
+    da = restLength - softness
+    if softness > 0 and distance2 > da:
+        newlen = softness * (1.0 - math.exp(-(distance2 - da) / softness)) + da
+        stretch = distance / newlen
+
+    lengthA = data["lengthA"] * stretch * data["scaleA"] * global_scale
+    lengthB = data["lengthB"] * stretch * data["scaleB"] * global_scale
+
+    # reverse
+    d = distance / (lengthA + lengthB)
+    reverse = data["reverse"]
+    if reverse < 0.5:
+        reverse_scale = 1 - (reverse * 2 * (1 - d))
+    else:
+        reverse_scale = 1 - ((1 - reverse) * 2 * (1 - d))
+    lengthA *= reverse_scale
+    lengthB *= reverse_scale
+    invert = reverse > 0.5
+
+    # slide
+    slide = data["slide"]
+    if slide < 0.5:
+        slide_add = (lengthA * (slide * 2)) - lengthA
+    else:
+        slide_add = (lengthB * (slide * 2)) - lengthB
+    lengthA += slide_add
+    lengthB -= slide_add
+
+    # angles inside the triangle, law of cosines
+    angleA = 0.0
+    angleB = 0.0
+    if rootEffDistance < lengthA + lengthB and rootEffDistance > (
+        abs(lengthA - lengthB) + 1e-6
+    ):
+        a, b, c = lengthA, rootEffDistance, lengthB
+        angleA = math.acos(min(1.0, (a * a + b * b - c * c) / (2 * a * b)))
+        a, b, c = lengthB, lengthA, rootEffDistance
+        angleB = math.acos(min(1.0, (a * a + b * b - c * c) / (2 * a * b)))
+        if invert:
+            angleA = -angleA
+            angleB = -angleB
+
+    # X and Z axis
+    xAxis = _normalize(rootEff)
+    yAxis = _normalize(_sub(upvPos, _lerp(rootPos, effPos, 0.5)))
+    yAxis = _rotateAlongAxis(yAxis, rollAxis, data["roll"])
+    zAxis = _normalize(_cross(xAxis, yAxis))
+    yAxis = _normalize(_cross(zAxis, xAxis))
+
+    if angleA != 0.0:
+        xAxis = _rotateAlongAxis(xAxis, zAxis, -angleA)
+
+    if name == "outA":
+        if data["negate"]:
+            xAxis = _mul(xAxis, -1)
+        yAxis = _normalize(_cross(zAxis, xAxis))
+        q = _axesQuaternion(xAxis, yAxis, zAxis)
+        return _compose(rootPos, q, (lengthA, global_scale, global_scale))
+
+    bonePos = _add(_mul(xAxis, lengthA), rootPos)
+
+    if name == "outB":
+        if angleB != 0.0:
+            xAxis = _rotateAlongAxis(xAxis, zAxis, -(angleB - math.pi))
+        if data["negate"]:
+            xAxis = _mul(xAxis, -1)
+        yAxis = _normalize(_cross(zAxis, xAxis))
+        q = _axesQuaternion(xAxis, yAxis, zAxis)
+        return _compose(bonePos, q, (lengthB, global_scale, global_scale))
+
+    if name == "outCenter":
+        if angleB != 0.0:
+            if invert:
+                angleB += math.pi * 2
+            xAxis = _rotateAlongAxis(
+                xAxis, zAxis, -(angleB * 0.5 - math.pi * 0.5)
+            )
+        zAxis = _normalize(_cross(xAxis, yAxis))
+        if data["negate"]:
+            xAxis = _mul(xAxis, -1)
+        yAxis = _normalize(_cross(zAxis, xAxis))
+        q = _axesQuaternion(xAxis, yAxis, zAxis)
+        return _compose(bonePos, q, scale)
+
+    # outEff
+    if angleB != 0.0:
+        xAxis = _rotateAlongAxis(xAxis, zAxis, -(angleB - math.pi))
+    effPos = _add(bonePos, _mul(xAxis, lengthB))
+    return _setTranslation(data["eff"], effPos)
+
+
+def _fkTransform(data, name):
+    if name == "outA" or name == "outB":
+        if name == "outA":
+            bone, child = data["bone1"], data["bone2"]
+        else:
+            bone, child = data["bone2"], data["eff"]
+        translation, rotation, _ = _decompose(bone)
+        xAxis = _sub(child[12:15], translation)
+        scale = (_length(xAxis), 1.0, 1.0)
+        if data["negate"]:
+            xAxis = _mul(xAxis, -1)
+        xAxis = _normalize(xAxis)
+        if name == "outA":
+            zAxis = _rotate((0.0, 0.0, 1.0), rotation)
+            # not normalized, like the node
+            yAxis = _cross(zAxis, xAxis)
+        else:
+            yAxis = _rotate((0.0, 1.0, 0.0), rotation)
+            zAxis = _normalize(_cross(xAxis, yAxis))
+            yAxis = _normalize(_cross(zAxis, xAxis))
+        q = _axesQuaternion(xAxis, yAxis, zAxis)
+        return _compose(translation, q, scale)
+
+    if name == "outCenter":
+        # half of the xyz euler rotation from bone1 to bone2
+        local = _multiply(data["bone2"], _inverse(data["bone1"]))
+        translation, rotation, scale = _decompose(local)
+        euler = [a * 0.5 for a in _quaternionToEuler(rotation)]
+        local = _compose(translation, _eulerToQuaternion(euler), scale)
+        q = _decompose(_multiply(local, data["bone1"]))[1]
+        return _compose(data["bone2"][12:15], q, (1.0, 1.0, 1.0))
+
+    return tuple(data["eff"])
+
+
+def _ikfkTransform(ikparams, fkparams, blend, name):
+    if blend == 0.0:
+        return _fkTransform(fkparams, name)
+    if blend == 1.0:
+        return _ikTransform(ikparams, name)
+
+    # remove the scale to avoid the shearing
+    noScale = (1.0, 1.0, 1.0)
+    bones = {}
+    for prefix, solve, params in (
+        ("ik", _ikTransform, ikparams),
+        ("fk", _fkTransform, fkparams),
+    ):
+        for output in ("outA", "outB", "outEff"):
+            t, q, _ = _decompose(solve(params, output))
+            bones[prefix + output] = _compose(t, q, noScale)
+
+    # map the secondary transforms from global to local
+    for prefix in ("ik", "fk"):
+        bones[prefix + "outEff"] = _multiply(
+            bones[prefix + "outEff"], _inverse(bones[prefix + "outB"])
+        )
+        bones[prefix + "outB"] = _multiply(
+            bones[prefix + "outB"], _inverse(bones[prefix + "outA"])
+        )
+
+    blended = dict(fkparams)
+    blended["bone1"] = _interpolateTransform(
+        bones["fkoutA"], bones["ikoutA"], blend
+    )
+    bone2 = _interpolateTransform(bones["fkoutB"], bones["ikoutB"], blend)
+    eff = _interpolateTransform(bones["fkoutEff"], bones["ikoutEff"], blend)
+
+    # map the local transforms back to global
+    blended["bone2"] = _multiply(bone2, blended["bone1"])
+    blended["eff"] = _multiply(eff, blended["bone2"])
+    return _fkTransform(blended, name)
+
+
+def ikfk2bone(
+    roots,
+    ikrefs,
+    upvs,
+    fk0s,
+    fk1s,
+    fk2s,
+    lengthA,
+    lengthB,
+    negate=False,
+    roll=0.0,
+    scaleA=1.0,
+    scaleB=1.0,
+    maxstretch=1.5,
+    softness=0.0,
+    slide=0.5,
+    reverse=0.0,
+    blend=0.0,
+    parents=None,
+):
+    """Solve many evaluations of the mgear_ikfk2Bone node
+
+    Args:
+        roots (sequence): Root world matrices, one per evaluation
+        ikrefs (sequence): IK reference (effector) world matrices
+        upvs (sequence): Up vector world matrices
+        fk0s (sequence): FK first bone world matrices
+        fk1s (sequence): FK second bone world matrices
+        fk2s (sequence): FK effector world matrices
+        lengthA (float or sequence): First bone length
+        lengthB (float or sequence): Second bone length
+        negate (bool or sequence, optional): Negate the X axis
+        roll (float or sequence, optional): IK roll, in degrees
+        scaleA (float or sequence, optional): First bone length scale
+        scaleB (float or sequence, optional): Second bone length scale
+        maxstretch (float or sequence, optional): IK max stretch
+        softness (float or sequence, optional): IK softness
+        slide (float or sequence, optional): IK slide
+        reverse (float or sequence, optional): IK reverse
+        blend (float or sequence, optional): 0 for FK, 1 for IK
+        parents (dict, optional): The parent world matrix of the outputs,
+            one matrix or one per evaluation, by output name. Identity for
+            the missing outputs
+
+    Returns:
+        dict: The output matrices, one list per output name of
+            IKFK_OUTPUTS, in the parent spaces
+    """
+    count = len(roots)
+    roots = _checked(roots, count)
+    ikrefs = _items(ikrefs, count, 16)
+    upvs = _items(upvs, count, 16)
+    fk0s = _items(fk0s, count, 16)
+    fk1s = _items(fk1s, count, 16)
+    fk2s = _items(fk2s, count, 16)
+    scalars = [
+        _values(v, count)
+        for v in (
+            lengthA,
+            lengthB,
+            negate,
+            roll,
+            scaleA,
+            scaleB,
+            maxstretch,
+            softness,
+            slide,
+            reverse,
+            blend,
+        )
+    ]
+    parents = parents or {}
+    inverses = {}
+    for name in IKFK_OUTPUTS:
+        matrices = _items(parents.get(name, IDENTITY), count, 16)
+        inverses[name] = [_inverse(m) for m in matrices]
+
+    result = dict((name, []) for name in IKFK_OUTPUTS)
+    for i in range(count):
+        (
+            lA,
+            lB,
+            neg,
+            rollValue,
+            sA,
+            sB,
+            maxst,
+            soft,
+            slideValue,
+            rev,
+            blendValue,
+        ) = [s[i] for s in scalars]
+        ikparams = {
+            "root": roots[i],
+            "eff": ikrefs[i],
+            "upv": upvs[i],
+            "lengthA": lA,
+            "lengthB": lB,
+            "negate": neg,
+            "roll": rollValue * DEGREES_TO_RADIANS,
+            "scaleA": sA,
+            "scaleB": sB,
+            "maxstretch": maxst,
+            "softness": soft,
+            "slide": slideValue,
+            "reverse": rev,
+        }
+        fkparams = {
+            "root": roots[i],
+            "bone1": fk0s[i],
+            "bone2": fk1s[i],
+            "eff": fk2s[i],
+            "negate": neg,
+        }
+        for name in IKFK_OUTPUTS:
+            m = _ikfkTransform(ikparams, fkparams, blendValue, name)
+            result[name].append(_multiply(m, inverses[name][i]))
+    return result
+
+
+######################################
+# rollSplineKine
+######################################
+
+
+def _resample(samples, tangents, u):
+    # position and tangent at u of the length of a polyline
+    lengths = [0.0]
+    overall = 0.0
+    for a, b in zip(samples, samples[1:]):
+        overall += _length(_sub(b, a))
+        lengths.append(overall)
+    if overall <= 0.0:
+        return (0.0, 0.0, 0.0), (0.0, 0.0, 0.0)
+    for i in range(len(samples) - 1):
+        lengths[i + 1] = lengths[i + 1] / overall
+        if lengths[i] <= u <= lengths[i + 1]:
+            span = lengths[i + 1] - lengths[i]
+            v = (u - lengths[i]) / span if span else 0.0
+            return (
+                _lerp(samples[i], samples[i + 1], v),
+                _lerp(tangents[i], tangents[i + 1], v),
+            )
+    return (0.0, 0.0, 0.0), (0.0, 0.0, 0.0)
+
+
+def roll_spline_kine(
+    inputs,
+    parents,
+    rolls,
+    us,
+    output_parent=IDENTITY,
+    resample=False,
+    subdiv=10,
+    absolute=False,
+):
+    """Solve many evaluations of the mgear_rollSplineKine node
+
+    The controls are read once per frame and solved for all the u values.
+    Like the node, the output scale is the Z scale of the interpolated
+    scale, then the Y and Z scale of the last control.
+
+    Args:
+        inputs (sequence): Per frame, the control world matrices
+        parents (sequence): Per frame, the control parent world matrices
+        rolls (sequence): Per frame, the control rolls in degrees. Or a
+            single list for all the frames
+        us (sequence): The u values, 0.0 to 1.0 along the controls
+        output_parent (sequence, optional): The output parent world
+            matrix, one matrix or one per frame
+        resample (bool, optional): Resample the bezier
+        subdiv (int, optional): Number of resample points
+        absolute (bool, optional): Resample along the whole spline
+
+    Returns:
+        list: Per frame, one output matrix per u value
+    """
+    frames = len(inputs)
+    parents = _checked(parents, frames)
+    if rolls and not hasattr(rolls[0], "__len__"):
+        rolls = [rolls] * frames
+    rolls = _checked(rolls, frames)
+    output_parents = _items(output_parent, frames, 16)
+
+    result = []
+    for matrices, parentMatrices, roll, outputParent in zip(
+        inputs, parents, rolls, output_parents
+    ):
+        count = len(matrices)
+        if count < 2 or len(parentMatrices) != count or len(roll) != count:
+            raise ValueError("roll_spline_kine needs 2 or more controls")
+        roll = [a * DEGREES_TO_RADIANS for a in roll]
+        pos = []
+        tan = []
+        rot = []
+        scl = []
+        for m, p in zip(matrices, parentMatrices):
+            t, q, s = _decompose(m)
+            pos.append(t)
+            rot.append(_decompose(p)[1])
+            scl.append(s)
+            tan.append(_rotate((s[0] * 2.5, 0.0, 0.0), q))
+        lastScale = scl[-1]
+        inverse = _inverse(outputParent)
+
+        step = 1.0 / max(1, count - 1)
+        presample = None
+        if resample and absolute:
+            # samples of the whole spline, shared by all the u
+            samplestep = 1.0 / (subdiv - 1)
+            presample = [pos[0]]
+            presampletan = [tan[0]]
+            for i in range(1, subdiv):
+                sampleu = samplestep * i
+                index1 = min(count - 2, int(math.floor(sampleu / step)))
+                v = (sampleu - step * index1) / step
+                p, t = _bezier4point(
+                    pos[index1], tan[index1], pos[index1 + 1],
+                    tan[index1 + 1], v
+                )
+                presample.append(p)
+                presampletan.append(t)
+
+        frameResult = []
+        for u in us:
+            index1 = min(count - 2, int(math.floor(u / step)))
+            index2 = index1 + 1
+            v = (u - step * index1) / step
+
+            if not resample:
+                bezierPos, xAxis = _bezier4point(
+                    pos[index1], tan[index1], pos[index2], tan[index2], v
+                )
+            elif not absolute:
+                samplestep = 1.0 / (subdiv - 1)
+                samples = [pos[index1]]
+                tangents = [tan[index1]]
+                for i in range(1, subdiv):
+                    p, t = _bezier4point(
+                        pos[index1], tan[index1], pos[index2], tan[index2],
+                        samplestep * i
+                    )
+                    samples.append(p)
+                    tangents.append(t)
+                bezierPos, xAxis = _resample(samples, tangents, v)
+            else:
+                bezierPos, xAxis = _resample(presample, presampletan, u)
+
+            scl1 = _lerp(scl[index1], scl[index2], v)
+
+            # rotation, from the slerp of the parents and the roll
+            q = _slerp(rot[index1], rot[index2], v)
+            yAxis = _rotate((0.0, 1.0, 0.0), q)
+            a = roll[index1] * (1 - v) + roll[index2] * v
+            sa = math.sin(a / 2.0)
+            yAxis = _rotate(
+                yAxis,
+                (xAxis[0] * sa, xAxis[1] * sa, xAxis[2] * sa,
+                 math.cos(a / 2.0)),
+            )
+            zAxis = _normalize(_cross(xAxis, yAxis))
+            yAxis = _normalize(_cross(zAxis, xAxis))
+
+            q = _axesQuaternion(xAxis, yAxis, zAxis)
+            m = _compose(bezierPos, q, (scl1[2], lastScale[1], lastScale[2]))
+            frameResult.append(_multiply(m, inverse))
+        result.append(frameResult)
+    return result
+
+
+######################################
+# slideCurve2
+######################################
+
+
+def slide_curve(
+    curves,
+    point_count,
+    slave_length=1.0,
+    master_length=1.0,
+    position=0.0,
+    maxstretch=1.5,
+    maxsquash=0.5,
+    softness=0.5,
+    degree=3,
+    knots=None,
+    master_matrix=IDENTITY,
+    matrix=IDENTITY,
+):
+    """Solve many evaluations of the mgear_slideCurve2 deformer
+
+    The point_count slave curve points are evenly spaced along the length
+    of the master curve. Like the node, the points after the curve end
+    continue along the end tangent, the points before the curve start
+    stay on the start point.
+
+    Args:
+        curves (sequence): Per frame, the master curve control points
+        point_count (int): Number of slave curve points
+        slave_length (float or sequence, optional): Slave curve length
+        master_length (float or sequence, optional): Master curve rest
+            length
+        position (float or sequence, optional): 0.0 to 1.0 position of the
+            slave on the master curve
+        maxstretch (float or sequence, optional): Max stretch
+        maxsquash (float or sequence, optional): Max squash
+        softness (float or sequence, optional): Stretch and squash softness
+        degree (int, optional): Master curve degree
+        knots (sequence, optional): Master curve knot vector, see
+            ``nurbs.evaluate``. Clamped uniform if None
+        master_matrix (sequence, optional): The master_mat matrix, one or
+            one per frame
+        matrix (sequence, optional): The slave curve world matrix, one or
+            one per frame
+
+    Returns:
+        list: Per frame, the point_count (x, y, z) slave points
+    """
+    frames = len(curves)
+    scalars = [
+        _values(v, frames)
+        for v in (
+            slave_length,
+            master_length,
+            position,
+            maxstretch,
+            maxsquash,
+            softness,
+        )
+    ]
+    master_matrices = _items(master_matrix, frames, 16)
+    matrices = _items(matrix, frames, 16)
+
+    result = []
+    for i, points in enumerate(curves):
+        sl, ml, pos, maxst, maxsq, soft = [s[i] for s in scalars]
+        table = nurbs.ArcLengthTable(points, degree, knots)
+        length = table.length
+
+        # stretch and squash
+        expo = 1.0
+        if length > ml and maxst > 1:
+            if soft != 0:
+                stretch = (length - ml) / (sl * maxst)
+                expo = 1 - math.exp(-stretch / soft)
+            sl += min(sl * (maxst - 1) * expo, length - ml)
+        elif length < ml and maxsq < 1:
+            if soft != 0:
+                squash = (ml - length) / (sl * maxsq)
+                expo = 1 - math.exp(-squash / soft)
+            sl -= min(sl * (1 - maxsq) * expo, ml - length)
+
+        # position
+        size = sl / length
+        start = pos * (1 - size)
+        step = size / (point_count - 1.0) if point_count > 1 else 0.0
+        percentages = [start + j * step for j in range(point_count)]
+
+        params = table.params_at_lengths(
+            [min(max(p, 0.0), 1.0) * length for p in percentages]
+        )
+        positions = table.evaluate(params)[0]
+        startPoint, endPoint = table.evaluate([table.start, table.end])[0]
+        endTangent = _normalize(
+            table.evaluate([table.end], derivs=1)[1][0]
+        )
+
+        space = _multiply(_inverse(matrices[i]), master_matrices[i])
+        framePoints = []
+        for perc, point in zip(percentages, positions):
+            if perc < 0:
+                point = startPoint
+            elif perc > 1:
+                point = _add(endPoint, _mul(endTangent, length * (perc - 1)))
+            framePoints.append(
+                tuple(
+                    point[0] * space[c]
+                    + point[1] * space[4 + c]
+                    + point[2] * space[8 + c]
+                    + space[12 + c]
+                    for c in range(3)
+                )
+            )
+        result.append(framePoints)
+    return result
+
+
+######################################
+# squashStretch2
+######################################
+
+
+def squash_stretch(
+    global_scales,
+    driver=3.0,
+    driver_min=1.0,
+    driver_ctr=3.0,
+    driver_max=6.0,
+    axis=0,
+    squash=0.5,
+    stretch=-0.5,
+    blend=1.0,
+):
+    """Solve many evaluations of the mgear_squashStretch2 node
+
+    Args:
+        global_scales (sequence): The global scale vector, one or one per
+            evaluation
+        driver (float or sequence, optional): The driver value
+        driver_min (float or sequence, optional): Driver value of the full
+            squash
+        driver_ctr (float or sequence, optional): Driver rest value
+        driver_max (float or sequence, optional): Driver value of the full
+            stretch
+        axis (int or sequence, optional): The not scaled axis, 0, 1 or 2
+        squash (float or sequence, optional): Squash factor
+        stretch (float or sequence, optional): Stretch factor
+        blend (float or sequence, optional): Blend from the global scale
+
+    Returns:
+        list: The (x, y, z) output scales
+    """
+    sliders = (
+        driver,
+        driver_min,
+        driver_ctr,
+        driver_max,
+        axis,
+        squash,
+        stretch,
+        blend,
+    )
+    count = _count(sliders, [global_scales])
+    global_scales = _items(global_scales, count, 3)
+    scalars = [_values(v, count) for v in sliders]
+
+    result = []
+    for i, gscale in enumerate(global_scales):
+        d, dmin, dctr, dmax, ax, sq, st, b = [s[i] for s in scalars]
+        st *= _clamp(max(d - dctr, 0.0) / max(dmax - dctr, 0.0001))
+        sq *= _clamp(max(dctr - d, 0.0) / max(dctr - dmin, 0.0001))
+        factor = max(0.0, 1.0 + sq + st)
+        scl = [c * factor if a != ax else c for a, c in enumerate(gscale)]
+        scl = _lerp(gscale, scl, b)
+        result.append(tuple(max(c, 0.0001) for c in scl))
+    return result
+
+
+######################################
+# spinePointAt
+######################################
+
+
+def spine_point_at(rotsA, rotsB, axe=2, blend=0.5):
+    """Solve many evaluations of the mgear_spinePointAt node
+
+    Args:
+        rotsA (sequence): The (x, y, z) rotA rotation in degrees, one or
+            one per evaluation
+        rotsB (sequence): The rotB rotation, one or one per evaluation
+        axe (int or sequence, optional): Index of the POINT_AT_AXES axis
+        blend (float or sequence, optional): Blend from rotA to rotB
+
+    Returns:
+        list: The (x, y, z) pointAt vectors
+    """
+    count = _count((axe, blend), (rotsA, rotsB))
+    rotsA = _items(rotsA, count, 3)
+    rotsB = _items(rotsB, count, 3)
+    axes = _values(axe, count)
+    blends = _values(blend, count)
+
+    result = []
+    for rA, rB, a, b in zip(rotsA, rotsB, axes, blends):
+        q = _slerp2(_e2q(*rA), _e2q(*rB), b)
+        result.append(_rotate(POINT_AT_AXES[a], q))
+    return result
+
+
+######################################
+# springNode
+######################################
+
+
+def spring(goals, times=None, damping=1.0, stiffness=1.0, intensity=1.0):
+    """Simulate the mgear_springNode over a frame range
+
+    Like the node, the simulation restarts on the goal when the time goes
+    back or jumps more than one frame.
+
+    Args:
+        goals (sequence): The (x, y, z) goal of each frame
+        times (sequence, optional): The time of each frame. Consecutive
+            frames if None
+        damping (float or sequence, optional): Damping
+        stiffness (float or sequence, optional): Stiffness
+        intensity (float or sequence, optional): Spring intensity
+
+    Returns:
+        list: The (x, y, z) output of each frame
+    """
+    count = len(goals)
+    if times is None:
+        times = range(count)
+    times = _checked(times, count)
+    dampings = _values(damping, count)
+    stiffnesses = _values(stiffness, count)
+    intensities = _values(intensity, count)
+
+    result = []
+    previousTime = None
+    for goal, time, d, s, intensity in zip(
+        goals, times, dampings, stiffnesses, intensities
+    ):
+        goal = tuple(float(c) for c in goal)
+        if previousTime is None or not 0.0 <= time - previousTime <= 1.0:
+            previous = current = goal
+        velocity = _mul(_sub(current, previous), 1.0 - d)
+        position = _add(current, velocity)
+        position = _add(position, _mul(_sub(goal, position), s))
+
+        previous = current
+        current = position
+        previousTime = time
+
+        result.append(_add(goal, _mul(_sub(position, goal), intensity)))
+    return result
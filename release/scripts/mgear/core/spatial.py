@@ -0,0 +1,476 @@
+"""
+Spatial indices for closest point queries.
+
+This module is Maya free. The points are any sequence of 3 floats sequences
+(tuples, lists, MPoint, MVector...) so it can be fed with the result of
+``MFnMesh.getPoints`` or with plain python data.
+"""
+
+import heapq
+import struct
+import hashlib
+
+INF = float("inf")
+
+MESH_LOCATOR_CACHE_SIZE = 16
+
+_meshLocatorCache = {}
+
+
+def _distSq(a, b):
+    dx = a[0] - b[0]
+    dy = a[1] - b[1]
+    dz = a[2] - b[2]
+    return dx * dx + dy * dy + dz * dz
+
+
+class KDTree(object):
+    """Static 3D KD-tree over a point cloud
+
+    Example:
+        >>> tree = KDTree(points)
+        >>> index, distSq = tree.nearest((0, 1, 0))
+        >>> neighbours = tree.knn((0, 1, 0), 4)
+    """
+
+    def __init__(self, points, leafSize=8):
+        self.points = [(float(p[0]), float(p[1]), float(p[2])) for p in points]
+        self.leafSize = max(1, int(leafSize))
+        self._coords = [[p[axis] for p in self.points] for axis in range(3)]
+        self._order = list(range(len(self.points)))
+        # node arrays. Leaf nodes have axis -1, and left/right are the
+        # start/end of the leaf points in self._order
+        self._axis = []
+        self._split = []
+        self._left = []
+        self._right = []
+        if self.points:
+            self._build(0, len(self.points))
+
+    def __len__(self):
+        return len(self.points)
+
+    def _addNode(self, axis, split, left, right):
+        self._axis.append(axis)
+        self._split.append(split)
+        self._left.append(left)
+        self._right.append(right)
+        return len(self._axis) - 1
+
+    def _build(self, start, end):
+        order = self._order
+        if end - start <= self.leafSize:
+            return self._addNode(-1, 0.0, start, end)
+
+        # split on the axis with the largest extent
+        extents = []
+        for coords in self._coords:
+            values = [coords[i] for i in order[start:end]]
+            extents.append(max(values) - min(values))
+        axis = extents.index(max(extents))
+        coords = self._coords[axis]
+        order[start:end] = sorted(order[start:end], key=coords.__getitem__)
+        mid = (start + end) // 2
+
+        node = self._addNode(axis, coords[order[mid]], -1, -1)
+        self._left[node] = self._build(start, mid)
+        self._right[node] = self._build(mid, end)
+        return node
+
+    def _search(self, point, visitLeaf, bound):
+        """Depth first traversal, nearest side first
+
+        Args:
+            point (sequence): Query point
+            visitLeaf (callable): Called with the leaf point indices
+            bound (callable): Return the current squared search radius
+        """
+        if not self._axis:
+            return
+        axisList = self._axis
+        splitList = self._split
+        leftList = self._left
+        rightList = self._right
+        order = self._order
+        stack = [(0, 0.0)]
+        while stack:
+            node, minDist = stack.pop()
+            if minDist > bound():
+                continue
+            axis = axisList[node]
+            if axis < 0:
+                visitLeaf(order[leftList[node] : rightList[node]])
+                continue
+            diff = point[axis] - splitList[node]
+            if diff < 0.0:
+                near, far = leftList[node], rightList[node]
+            else:
+                near, far = rightList[node], leftList[node]
+            stack.append((far, max(minDist, diff * diff)))
+            stack.append((near, minDist))
+
+    def nearest(self, point):
+        """Get the closest point
+
+        Args:
+            point (sequence): Query point
+
+        Returns:
+            int, float: The closest point index and its squared distance.
+                (-1, inf) if the tree is empty
+        """
+        points = self.points
+        best = [INF, -1]
+
+        def visitLeaf(indices):
+            for i in indices:
+                d = _distSq(point, points[i])
+                if d < best[0]:
+                    best[0] = d
+                    best[1] = i
+
+        self._search(point, visitLeaf, lambda: best[0])
+        return best[1], best[0]
+
+    def knn(self, point, k):
+        """Get the k closest points
+
+        Args:
+            point (sequence): Query point
+            k (int): Number of points
+
+        Returns:
+            list: (index, squared distance) tuples, closest first
+        """
+        points = self.points
+        heap = []  # max heap of (-distSq, index)
+
+        def visitLeaf(indices):
+            for i in indices:
+                d = _distSq(point, points[i])
+                if len(heap) < k:
+                    heapq.heappush(heap, (-d, i))
+                elif d < -heap[0][0]:
+                    heapq.heapreplace(heap, (-d, i))
+
+        def bound():
+            if len(heap) < k:
+                return INF
+            return -heap[0][0]
+
+        self._search(point, visitLeaf, bound)
+        return [(i, -d) for d, i in sorted(heap, reverse=True)]
+
+    def within(self, point, radius):
+        """Get the points inside a sphere
+
+        Args:
+            point (sequence): Sphere center
+            radius (float): Sphere radius
+
+        Returns:
+            list: (index, squared distance) tuples, unsorted
+        """
+        points = self.points
+        radiusSq = radius * radius
+        result = []
+
+        def visitLeaf(indices):
+            for i in indices:
+                d = _distSq(point, points[i])
+                if d <= radiusSq:
+                    result.append((i, d))
+
+        self._search(point, visitLeaf, lambda: radiusSq)
+        return result
+
+    def nearestBatch(self, points):
+        """Get the closest point of many query points
+
+        Args:
+            points (sequence): Query points
+
+        Returns:
+            list, list: The closest point indices and squared distances
+        """
+        indices = []
+        distances = []
+        for point in points:
+            i, d = self.nearest(point)
+            indices.append(i)
+            distances.append(d)
+        return indices, distances
+
+
+def closestPointOnTriangle(p, a, b, c):
+    """Get the closest point on a triangle
+
+    Real-Time Collision Detection, Christer Ericson, 5.1.5
+
+    Args:
+        p (sequence): Query point
+        a (sequence): Triangle first vertex
+        b (sequence): Triangle second vertex
+        c (sequence): Triangle third vertex
+
+    Returns:
+        tuple, tuple: The closest point and its barycentric coordinates
+    """
+    abx, aby, abz = b[0] - a[0], b[1] - a[1], b[2] - a[2]
+    acx, acy, acz = c[0] - a[0], c[1] - a[1], c[2] - a[2]
+    apx, apy, apz = p[0] - a[0], p[1] - a[1], p[2] - a[2]
+    d1 = abx * apx + aby * apy + abz * apz
+    d2 = acx * apx + acy * apy + acz * apz
+    if d1 <= 0.0 and d2 <= 0.0:
+        return (a[0], a[1], a[2]), (1.0, 0.0, 0.0)
+
+    bpx, bpy, bpz = p[0] - b[0], p[1] - b[1], p[2] - b[2]
+    d3 = abx * bpx + aby * bpy + abz * bpz
+    d4 = acx * bpx + acy * bpy + acz * bpz
+    if d3 >= 0.0 and d4 <= d3:
+        return (b[0], b[1], b[2]), (0.0, 1.0, 0.0)
+
+    vc = d1 * d4 - d3 * d2
+    if vc <= 0.0 and d1 >= 0.0 and d3 <= 0.0:
+        v = d1 / (d1 - d3)
+        return (
+            (a[0] + v * abx, a[1] + v * aby, a[2] + v * abz),
+            (1.0 - v, v, 0.0),
+        )
+
+    cpx, cpy, cpz = p[0] - c[0], p[1] - c[1], p[2] - c[2]
+    d5 = abx * cpx + aby * cpy + abz * cpz
+    d6 = acx * cpx + acy * cpy + acz * cpz
+    if d6 >= 0.0 and d5 <= d6:
+        return (c[0], c[1], c[2]), (0.0, 0.0, 1.0)
+
+    vb = d5 * d2 - d1 * d6
+    if vb <= 0.0 and d2 >= 0.0 and d6 <= 0.0:
+        w = d2 / (d2 - d6)
+        return (
+            (a[0] + w * acx, a[1] + w * acy, a[2] + w * acz),
+            (1.0 - w, 0.0, w),
+        )
+
+    va = d3 * d6 - d5 * d4
+    if va <= 0.0 and (d4 - d3) >= 0.0 and (d5 - d6) >= 0.0:
+        w = (d4 - d3) / ((d4 - d3) + (d5 - d6))
+        return (
+            (
+                b[0] + w * (c[0] - b[0]),
+                b[1] + w * (c[1] - b[1]),
+                b[2] + w * (c[2] - b[2]),
+            ),
+            (0.0, 1.0 - w, w),
+        )
+
+    denom = 1.0 / (va + vb + vc)
+    v = vb * denom
+    w = vc * denom
+    return (
+        (
+            a[0] + abx * v + acx * w,
+            a[1] + aby * v + acy * w,
+            a[2] + abz * v + acz * w,
+        ),
+        (1.0 - v - w, v, w),
+    )
+
+
+class TriangleLocator(object):
+    """Closest triangle queries over a triangle soup
+
+    The triangle centroids are stored in a KD-tree. A triangle can't be
+    closer than its centroid distance minus its bounding radius, so the exact
+    closest triangle is always inside the centroid sphere of radius
+    ``bestDistance + maxTriangleRadius``
+
+    Args:
+        points (sequence): Mesh points
+        triangles (sequence): Flat triangle vertex indices, 3 per triangle.
+            The same layout returned by ``MFnMesh.getTriangles``
+    """
+
+    def __init__(self, points, triangles):
+        self.points = [(float(p[0]), float(p[1]), float(p[2])) for p in points]
+        self.triangles = [
+            tuple(triangles[i : i + 3]) for i in range(0, len(triangles), 3)
+        ]
+        centroids = []
+        self.maxRadius = 0.0
+        for tri in self.triangles:
+            a, b, c = [self.points[i] for i in tri]
+            center = (
+                (a[0] + b[0] + c[0]) / 3.0,
+                (a[1] + b[1] + c[1]) / 3.0,
+                (a[2] + b[2] + c[2]) / 3.0,
+            )
+            centroids.append(center)
+            radius = max(_distSq(center, a), _distSq(center, b))
+            radius = max(radius, _distSq(center, c))
+            self.maxRadius = max(self.maxRadius, radius)
+        self.maxRadius = self.maxRadius ** 0.5
+        self.tree = KDTree(centroids)
+
+    def _triangleDistance(self, point, triIndex):
+        tri = self.triangles[triIndex]
+        a, b, c = [self.points[i] for i in tri]
+        closest, bary = closestPointOnTriangle(point, a, b, c)
+        return _distSq(point, closest), closest, bary
+
+    def closest(self, point):
+        """Get the closest triangle
+
+        Args:
+            point (sequence): Query point
+
+        Returns:
+            int, tuple, tuple, float: triangle index, closest point,
+                barycentric coordinates and squared distance
+        """
+        first, _ = self.tree.nearest(point)
+        if first < 0:
+            return -1, None, None, INF
+        bestDist, bestPoint, bestBary = self._triangleDistance(point, first)
+        best = first
+        radius = bestDist ** 0.5 + self.maxRadius
+        for triIndex, _ in self.tree.within(point, radius):
+            if triIndex == first:
+                continue
+            dist, closest, bary = self._triangleDistance(point, triIndex)
+            if dist < bestDist:
+                best, bestDist, bestPoint, bestBary = (
+                    triIndex,
+                    dist,
+                    closest,
+                    bary,
+                )
+        return best, bestPoint, bestBary, bestDist
+
+
+class MeshLocator(TriangleLocator):
+    """Closest point, face and vertex queries over a polygon mesh
+
+    Args:
+        points (sequence): Mesh points
+        triangles (sequence): Flat triangle vertex indices, 3 per triangle
+        triangleFaces (sequence, optional): The polygon of each triangle.
+            Each triangle is its own polygon if None
+        faceVertices (sequence, optional): The vertices of each polygon.
+            The triangle vertices if None
+
+    Example:
+        >>> locator = MeshLocator(points, triangles, triangleFaces, faceVerts)
+        >>> faces = locator.closestFaces(guidePositions)
+        >>> vertices = locator.closestVertices(guidePositions)
+    """
+
+    def __init__(self, points, triangles, triangleFaces=None,
+                 faceVertices=None):
+        super(MeshLocator, self).__init__(points, triangles)
+        if triangleFaces is None:
+            triangleFaces = range(len(self.triangles))
+        self.triangleFaces = list(triangleFaces)
+        if faceVertices is None:
+            faceVertices = self.triangles
+        self.faceVertices = [tuple(verts) for verts in faceVertices]
+
+    def closestFaces(self, points):
+        """Get the closest polygon of many points
+
+        Args:
+            points (sequence): Query points
+
+        Returns:
+            list: The polygon indices, -1 for an empty mesh
+        """
+        result = []
+        for point in points:
+            triIndex = self.closest(point)[0]
+            if triIndex < 0:
+                result.append(-1)
+            else:
+                result.append(self.triangleFaces[triIndex])
+        return result
+
+    def closestPoints(self, points):
+        """Get the closest point on the mesh of many points
+
+        Args:
+            points (sequence): Query points
+
+        Returns:
+            list: (x, y, z) closest points
+        """
+        return [self.closest(point)[1] for point in points]
+
+    def closestVertices(self, points):
+        """Get the closest vertex of the closest polygon of many points
+
+        Same as ``meshNavigation.getClosestVertexFromTransform``, the vertex
+        is searched in the closest polygon.
+
+        Args:
+            points (sequence): Query points
+
+        Returns:
+            list: The vertex indices, -1 for an empty mesh
+        """
+        result = []
+        for point, face in zip(points, self.closestFaces(points)):
+            best = -1
+            bestDist = INF
+            if face >= 0:
+                for vertex in self.faceVertices[face]:
+                    dist = _distSq(point, self.points[vertex])
+                    if dist < bestDist:
+                        best, bestDist = vertex, dist
+            result.append(best)
+        return result
+
+
+def pointsHash(points, triangles=()):
+    """Get a hash of the mesh points and triangles, to use as cache key
+
+    Returns:
+        str: sha1 hex digest
+    """
+    values = [float(c) for p in points for c in (p[0], p[1], p[2])]
+    data = struct.pack(
+        "<2I{}d{}i".format(len(values), len(triangles)),
+        len(values),
+        len(triangles),
+        *(values + list(triangles))
+    )
+    return hashlib.sha1(data).hexdigest()
+
+
+def getMeshLocator(points, triangles, triangleFaces=None, faceVertices=None):
+    """Get the cached MeshLocator of a mesh
+
+    The locators are cached by points and triangles hash, so the locator of
+    a mesh is built once and reused until the mesh is deformed or changes
+    topology.
+
+    Args:
+        points (sequence): Mesh points
+        triangles (sequence): Flat triangle vertex indices
+        triangleFaces (sequence, optional): The polygon of each triangle
+        faceVertices (sequence, optional): The vertices of each polygon
+
+    Returns:
+        MeshLocator: The locator
+    """
+    key = pointsHash(points, triangles)
+    locator = _meshLocatorCache.get(key)
+    if locator is None:
+        if len(_meshLocatorCache) >= MESH_LOCATOR_CACHE_SIZE:
+            _meshLocatorCache.clear()
+        locator = MeshLocator(points, triangles, triangleFaces, faceVertices)
+        _meshLocatorCache[key] = locator
+    return locator
+
+
+def clearMeshLocatorCache():
+    """Clear the MeshLocator cache"""
+    _meshLocatorCache.clear()
@@ -8,6 +8,7 @@ from pymel.core import datatypes
 from pymel.core import nodetypes
 
 from mgear.core import vector
+from mgear.core import transform_batch
 
 import maya.OpenMaya as om
 import maya.OpenMayaUI as omui
@@ -765,6 +766,10 @@ def get_closes_transform(target_transform, source_transforms):
 def getClosestPolygonFromTransform(geo, loc):
     """Get closest polygon from transform
 
+    Note:
+        Each call queries the mesh again. For many transforms use
+        meshNavigation.getClosestPolygonsFromTransforms.
+
     Arguments:
         geo (dagNode): Mesh object
         loc (matrix): location transform
@@ -865,3 +870,141 @@ def get_raycast_translation_from_mouse_click(mesh, mpx, mpy):
         z = hitpoint.z
 
         return [x, y, z]
+
+
+##########################################################
+# BATCH
+##########################################################
+# thin adapters of the transform_batch kernel, returning datatypes objects
+
+
+def arrayToMatrix(values):
+    """Get a matrix from a flat list of 16 floats
+
+    Arguments:
+        values (list of float): Row major matrix values
+
+    Returns:
+        matrix: The matrix
+    """
+    return datatypes.Matrix(
+        [values[0:4], values[4:8], values[8:12], values[12:16]]
+    )
+
+
+def matrixToArray(m):
+    """Get the flat list of 16 floats of a matrix
+
+    Arguments:
+        m (matrix): The matrix
+
+    Returns:
+        tuple: Row major matrix values
+    """
+    return tuple(m[row][col] for row in range(4) for col in range(4))
+
+
+def _toVectors(vectors):
+    return [(v[0], v[1], v[2]) for v in vectors]
+
+
+def getTransformLookingAtBatch(positions, lookats, normal, axis="xy",
+                               negate=False):
+    """Batch version of getTransformLookingAt
+
+    Arguments:
+        positions (list of vector): The positions
+        lookats (list of vector): The aiming positions
+        normal (vector or list of vector): The normal, or one per position
+        axis (str): The 2 axis used for lookat and normal. Default "xy"
+        negate (bool): If true, invert the aiming direction.
+
+    Returns:
+        list of matrix: The transformation matrices
+    """
+    if not hasattr(normal[0], "__len__"):
+        normal = [normal] * len(positions)
+    return [arrayToMatrix(m) for m in transform_batch.looking_at_matrices(
+        _toVectors(positions), _toVectors(lookats), _toVectors(normal),
+        axis, negate)]
+
+
+def getChainTransformBatch(positions, normal, negate=False, axis="xz"):
+    """Batch version of getChainTransform
+
+    Arguments:
+        positions(list of vector): List with the chain positions.
+        normal (vector): Normal direction.
+        negate (bool): If true invert the chain orientation.
+        axis (str): The 2 axis used for lookat and normal. Default "xz"
+
+    Returns:
+        list of matrix: The transformation matrices of the chain.
+    """
+    return [arrayToMatrix(m) for m in transform_batch.chain_matrices(
+        _toVectors(positions), normal, negate, axis)]
+
+
+def getChainTransform2Batch(positions, normal, negate=False, axis="xz"):
+    """Batch version of getChainTransform2
+
+    Arguments:
+        positions(list of vector): List with the chain positions.
+        normal (vector): Normal direction.
+        negate (bool): If true invert the chain orientation.
+        axis (str): The 2 axis used for lookat and normal. Default "xz"
+
+    Returns:
+        list of matrix: The transformation matrices of the chain.
+    """
+    return [arrayToMatrix(m) for m in transform_batch.chain_matrices2(
+        _toVectors(positions), normal, negate, axis)]
+
+
+def getRotationFromAxisBatch(axesA, axesB, axis="xy", negate=False):
+    """Batch version of getRotationFromAxis
+
+    Arguments:
+        axesA (list of vector): Axis A vectors
+        axesB (list of vector): Axis B vectors
+        axis (str): The axis to use for the orientation. Default: "xy"
+        negate (bool): negates the axis orientation.
+
+    Returns:
+        list of matrix: The rotation matrices.
+    """
+    return [arrayToMatrix(m)
+            for m in transform_batch.rotation_from_axis_matrices(
+                _toVectors(axesA), _toVectors(axesB), axis, negate)]
+
+
+def getSymmetricalTransformBatch(transforms, axis="yz"):
+    """Batch version of getSymmetricalTransform
+
+    Arguments:
+        transforms (list of matrix): The transformation matrices to mirror.
+        axis (str): The mirror plane.
+
+    Returns:
+        list of matrix: The symmetrical transformation matrices.
+    """
+    return [arrayToMatrix(m) for m in transform_batch.mirror_matrices(
+        [matrixToArray(t) for t in transforms], axis)]
+
+
+def quaternionSlerpBatch(quaternions1, quaternions2, blend):
+    """Batch version of quaternionSlerp
+
+    Arguments:
+        quaternions1 (list of quaternion): Input quaternions 1.
+        quaternions2 (list of quaternion): Input quaternions 2.
+        blend (float or list of float): Blending value, or one per pair.
+
+    Returns:
+        list of quaternion: The interpolated quaternions.
+    """
+    result = transform_batch.slerp_quaternions(
+        [(q.x, q.y, q.z, q.w) for q in quaternions1],
+        [(q.x, q.y, q.z, q.w) for q in quaternions2],
+        blend)
+    return [datatypes.Quaternion(*q) for q in result]
@@ -0,0 +1,631 @@
+"""
+Batch kernel for chains of frames, mirroring, slerp, pole vectors and
+transform channels.
+
+This module is Maya free. It computes the same values as the
+``mgear.core.transform`` functions working on ``datatypes`` objects, for a
+whole chain or array in one call and without a pymel object per frame.
+``transform`` has thin adapters converting the results back to
+``datatypes.Matrix`` and ``datatypes.Quaternion``.
+
+Conventions:
+    * vectors are (x, y, z) sequences
+    * matrices are flat tuples of 16 floats, row major, with row vectors
+      and the translation in the last row (the ``MMatrix`` layout)
+    * quaternions are (x, y, z, w) tuples
+"""
+
+import math
+
+# lookat axis: the (source, sign) of the X, Y and Z rows. The sources are
+# 0 the aim direction, 1 the normal orthogonalized against the aim and
+# 2 their cross product. Same table as ``transform.getTransformLookingAt``
+AXIS_ROWS = {
+    "xy": ((0, 1), (1, 1), (2, 1)),
+    "xz": ((0, 1), (2, -1), (1, 1)),
+    "x-z": ((0, 1), (2, 1), (1, -1)),
+    "yx": ((1, 1), (0, 1), (2, -1)),
+    "-yx": ((1, 1), (0, -1), (2, -1)),
+    "y-x": ((1, -1), (0, 1), (2, -1)),
+    "yz": ((2, 1), (0, 1), (1, 1)),
+    "-yz": ((2, -1), (0, -1), (1, 1)),
+    "y-z": ((2, 1), (0, 1), (1, -1)),
+    "zx": ((1, 1), (2, 1), (0, 1)),
+    "-zx": ((1, 1), (2, -1), (0, -1)),
+    "z-x": ((1, -1), (2, -1), (0, 1)),
+    "zy": ((2, -1), (1, 1), (0, 1)),
+    "-zy": ((2, -1), (1, 1), (0, -1)),
+    "x-y": ((0, 1), (1, -1), (2, -1)),
+    "-xz": ((0, -1), (2, 1), (1, 1)),
+    "-xy": ((0, -1), (1, 1), (2, -1)),
+}
+
+# mirror plane: the matrix column negated by ``getSymmetricalTransform``
+MIRROR_COLUMN = {"yz": 0, "zx": 1, "xy": 2}
+
+IDENTITY = (
+    1.0, 0.0, 0.0, 0.0,
+    0.0, 1.0, 0.0, 0.0,
+    0.0, 0.0, 1.0, 0.0,
+    0.0, 0.0, 0.0, 1.0,
+)
+
+
+def _sub(a, b):
+    return (a[0] - b[0], a[1] - b[1], a[2] - b[2])
+
+
+def _dot(a, b):
+    return a[0] * b[0] + a[1] * b[1] + a[2] * b[2]
+
+
+def _cross(a, b):
+    return (
+        a[1] * b[2] - a[2] * b[1],
+        a[2] * b[0] - a[0] * b[2],
+        a[0] * b[1] - a[1] * b[0],
+    )
+
+
+def _normalize(a):
+    length = math.sqrt(a[0] * a[0] + a[1] * a[1] + a[2] * a[2])
+    if length == 0.0:
+        return (float(a[0]), float(a[1]), float(a[2]))
+    return (a[0] / length, a[1] / length, a[2] / length)
+
+
+def _quatMul(a, b):
+    # hamilton product of (x, y, z, w) quaternions
+    return (
+        a[3] * b[0] + a[0] * b[3] + a[1] * b[2] - a[2] * b[1],
+        a[3] * b[1] - a[0] * b[2] + a[1] * b[3] + a[2] * b[0],
+        a[3] * b[2] + a[0] * b[1] - a[1] * b[0] + a[2] * b[3],
+        a[3] * b[3] - a[0] * b[0] - a[1] * b[1] - a[2] * b[2],
+    )
+
+
+def _axisRows(axis):
+    try:
+        return AXIS_ROWS[axis]
+    except KeyError:
+        raise ValueError("Not valid lookat axis: {}".format(axis))
+
+
+def _frame(aim, normal, rows, position):
+    # same orthogonalization as getTransformLookingAt
+    a = _normalize(aim)
+    c = _normalize(_cross(a, normal))
+    b = _normalize(_cross(c, a))
+    sources = (a, b, c)
+    m = []
+    for source, sign in rows:
+        v = sources[source]
+        m.extend((sign * v[0], sign * v[1], sign * v[2], 0.0))
+    if position is None:
+        m.extend((0.0, 0.0, 0.0, 1.0))
+    else:
+        m.extend((position[0], position[1], position[2], 1.0))
+    return tuple(m)
+
+
+def transpose_vector(v, position0, position1):
+    """Transpose a vector from a segment direction to another one
+
+    Same result as ``vector.getTransposedVector``, including the rotation
+    built from the not normalized cross product.
+
+    Args:
+        v (sequence): The vector to transpose
+        position0 (sequence): The 2 positions of the first segment
+        position1 (sequence): The 2 positions of the second segment
+
+    Returns:
+        tuple: The transposed vector
+    """
+    v0 = _normalize(_sub(position0[1], position0[0]))
+    v1 = _normalize(_sub(position1[1], position1[0]))
+    ra = math.acos(max(-1.0, min(1.0, _dot(v0, v1))))
+    axis = _cross(v0, v1)
+    sa = math.sin(ra / 2.0)
+    ca = math.cos(ra / 2.0)
+    q2 = (axis[0] * sa, axis[1] * sa, axis[2] * sa, ca)
+    q2n = (-q2[0], -q2[1], -q2[2], ca)
+    # rotateAlongAxis computes q2 * v * q2n with the MQuaternion product,
+    # which applies the left operand first: q2n (x) v (x) q2 in hamilton
+    q = _quatMul(_quatMul(q2n, (v[0], v[1], v[2], 0.0)), q2)
+    return q[:3]
+
+
+def looking_at_matrices(positions, lookats, normals, axis="xy", negate=False):
+    """Get the lookat matrices of many positions
+
+    Batch version of ``transform.getTransformLookingAt``.
+
+    Args:
+        positions (sequence): The matrix positions
+        lookats (sequence): The aimed positions, one per position
+        normals (sequence): The normals, one per position, or a single
+            normal for all of them
+        axis (str, optional): The aim and normal axis
+        negate (bool, optional): Invert the aiming direction
+
+    Returns:
+        list: The matrices
+    """
+    rows = _axisRows(axis)
+    if len(normals) == 3 and not hasattr(normals[0], "__len__"):
+        normals = [normals] * len(positions)
+    result = []
+    for pos, lookat, normal in zip(positions, lookats, normals):
+        aim = _sub(pos, lookat) if negate else _sub(lookat, pos)
+        result.append(_frame(aim, normal, rows, pos))
+    return result
+
+
+def rotation_from_axis_matrices(axesA, axesB, axis="xy", negate=False):
+    """Get the rotation matrices of many axis pairs
+
+    Batch version of ``transform.getRotationFromAxis``.
+
+    Args:
+        axesA (sequence): The first axis vectors
+        axesB (sequence): The second axis vectors
+        axis (str, optional): The axis of the first and second vectors
+        negate (bool, optional): Negate the first axis
+
+    Returns:
+        list: The rotation matrices, without translation
+    """
+    rows = _axisRows(axis)
+    sign = -1.0 if negate else 1.0
+    return [
+        _frame((a[0] * sign, a[1] * sign, a[2] * sign), b, rows, None)
+        for a, b in zip(axesA, axesB)
+    ]
+
+
+def chain_matrices(positions, normal, negate=False, axis="xz"):
+    """Get the matrices of a chain of positions
+
+    Batch version of ``transform.getChainTransform``: one matrix per chain
+    segment, aiming to the next position, with the normal transposed from
+    segment to segment.
+
+    Args:
+        positions (sequence): The chain positions
+        normal (sequence): The normal of the first segment
+        negate (bool, optional): Invert the chain orientation
+        axis (str, optional): The aim and normal axis
+
+    Returns:
+        list: len(positions) - 1 matrices
+    """
+    rows = _axisRows(axis)
+    positions = [tuple(p) for p in positions]
+    normal = _normalize(normal)
+    result = []
+    for i in range(len(positions) - 1):
+        v0 = positions[i - 1]
+        v1 = positions[i]
+        v2 = positions[i + 1]
+        if i > 0:
+            normal = _normalize(transpose_vector(normal, (v0, v1), (v1, v2)))
+        aim = _sub(v1, v2) if negate else _sub(v2, v1)
+        result.append(_frame(aim, normal, rows, v1))
+    return result
+
+
+def chain_matrices2(positions, normal, negate=False, axis="xz"):
+    """Get the matrices of a chain of positions, including the last one
+
+    Batch version of ``transform.getChainTransform2``. The last matrix
+    keeps the orientation of the last segment.
+
+    Args:
+        positions (sequence): The chain positions
+        normal (sequence): The normal of the first segment
+        negate (bool, optional): Invert the chain orientation
+        axis (str, optional): The aim and normal axis
+
+    Returns:
+        list: len(positions) matrices
+    """
+    rows = _axisRows(axis)
+    lastRows = _axisRows("-" + axis)
+    positions = [tuple(p) for p in positions]
+    normal = _normalize(normal)
+    last = len(positions) - 1
+    result = []
+    for i in range(len(positions)):
+        v0 = positions[i - 1]
+        v1 = positions[i]
+        if i == last:
+            aim = _sub(v1, v0) if negate else _sub(v0, v1)
+            result.append(_frame(aim, normal, lastRows, v1))
+            continue
+        v2 = positions[i + 1]
+        if i > 0:
+            normal = _normalize(transpose_vector(normal, (v0, v1), (v1, v2)))
+        aim = _sub(v1, v2) if negate else _sub(v2, v1)
+        result.append(_frame(aim, normal, rows, v1))
+    return result
+
+
+def mirror_matrices(matrices, axis="yz"):
+    """Mirror many matrices through a plane
+
+    Batch version of ``transform.getSymmetricalTransform``.
+
+    Args:
+        matrices (sequence): Flat 16 floats matrices
+        axis (str, optional): The mirror plane, "yz", "zx" or "xy"
+
+    Returns:
+        list: The mirrored matrices
+    """
+    try:
+        column = MIRROR_COLUMN[axis]
+    except KeyError:
+        raise ValueError("Not valid mirror plane: {}".format(axis))
+    result = []
+    for m in matrices:
+        m = [float(value) for value in m]
+        for row in range(4):
+            m[row * 4 + column] = -m[row * 4 + column]
+        result.append(tuple(m))
+    return result
+
+
+def slerp_quaternions(quaternions1, quaternions2, blend):
+    """Slerp many quaternion pairs
+
+    Batch version of ``transform.quaternionSlerp``.
+
+    Args:
+        quaternions1 (sequence): (x, y, z, w) quaternions
+        quaternions2 (sequence): (x, y, z, w) quaternions
+        blend (float or sequence): The blend value, or one per pair
+
+    Returns:
+        list: The interpolated quaternions
+    """
+    if not hasattr(blend, "__len__"):
+        blend = [blend] * len(quaternions1)
+    result = []
+    for q1, q2, t in zip(quaternions1, quaternions2, blend):
+        dot = q1[0] * q2[0] + q1[1] * q2[1] + q1[2] * q2[2] + q1[3] * q2[3]
+        if dot < 0.0:
+            dot = -dot
+            q2 = (-q2[0], -q2[1], -q2[2], -q2[3])
+        arcos = math.acos(round(dot, 10))
+        sin = math.sin(arcos)
+        if sin > 0.001:
+            w1 = math.sin((1.0 - t) * arcos) / sin
+            w2 = math.sin(t * arcos) / sin
+        else:
+            w1 = 1.0 - t
+            w2 = t
+        result.append(tuple(w1 * a + w2 * b for a, b in zip(q1, q2)))
+    return result
+
+
+def multiply_matrices(matricesA, matricesB):
+    """Multiply many matrix pairs
+
+    Args:
+        matricesA (sequence): Flat 16 floats matrices
+        matricesB (sequence): Flat 16 floats matrices, or a single matrix
+            for all of them
+
+    Returns:
+        list: The A * B matrices
+    """
+    if len(matricesB) == 16 and not hasattr(matricesB[0], "__len__"):
+        matricesB = [matricesB] * len(matricesA)
+    result = []
+    for a, b in zip(matricesA, matricesB):
+        m = []
+        for row in range(0, 16, 4):
+            a0, a1, a2, a3 = a[row : row + 4]
+            for col in range(4):
+                m.append(
+                    a0 * b[col]
+                    + a1 * b[4 + col]
+                    + a2 * b[8 + col]
+                    + a3 * b[12 + col]
+                )
+        result.append(tuple(m))
+    return result
+
+
+def translation_matrices(positions):
+    """Get the identity rotation matrices placed at many positions
+
+    Args:
+        positions (sequence): The positions
+
+    Returns:
+        list: The matrices
+    """
+    return [IDENTITY[:12] + (p[0], p[1], p[2], 1.0) for p in positions]
+
+
+def pole_vectors(starts, mids, ends, pole_distance=1.0):
+    """Get the pole vector positions of many 3 joints chains
+
+    Batch version of ``vector.calculatePoleVector``, for instance to solve
+    the pole of a limb over F frames in one call. The pole is in front of
+    the mid joint, at the average bone length times pole_distance.
+
+    Args:
+        starts (sequence): The start joint positions, one per frame
+        mids (sequence): The mid joint positions
+        ends (sequence): The end joint positions
+        pole_distance (float, optional): The distance multiplier
+
+    Returns:
+        list: The (x, y, z) pole vector positions
+    """
+    result = []
+    for v1, v2, v3 in zip(starts, mids, ends):
+        a = _sub(v1, v2)
+        b = _sub(v3, v2)
+        distance = (
+            (math.sqrt(_dot(a, a)) + math.sqrt(_dot(b, b)))
+            * 0.5
+            * pole_distance
+        )
+        # same length bones, so the pole goes straight ahead of the mid
+        a = _normalize(a)
+        b = _normalize(b)
+        p1 = (
+            a[0] * distance + v2[0],
+            a[1] * distance + v2[1],
+            a[2] * distance + v2[2],
+        )
+        side = (
+            (b[0] - a[0]) * distance,
+            (b[1] - a[1]) * distance,
+            (b[2] - a[2]) * distance,
+        )
+        sideSq = _dot(side, side)
+        ratio = _dot(_sub(v2, p1), side) / sideSq if sideSq else 0.0
+        pointer = _normalize(
+            (
+                v2[0] - p1[0] - side[0] * ratio,
+                v2[1] - p1[1] - side[1] * ratio,
+                v2[2] - p1[2] - side[2] * ratio,
+            )
+        )
+        result.append(
+            (
+                pointer[0] * distance + v2[0],
+                pointer[1] * distance + v2[1],
+                pointer[2] * distance + v2[2],
+            )
+        )
+    return result
+
+
+# rotate orders, in the transform ``rotateOrder`` attribute index order
+ROTATE_ORDERS = ("xyz", "yzx", "zxy", "xzy", "yxz", "zyx")
+
+# axis index of the rotate order letters
+_AXIS_INDEX = {"x": 0, "y": 1, "z": 2}
+
+
+def _rotateOrder(rotate_order):
+    if not isinstance(rotate_order, str):
+        rotate_order = ROTATE_ORDERS[rotate_order]
+    try:
+        return tuple(_AXIS_INDEX[a] for a in rotate_order)
+    except KeyError:
+        raise ValueError("Not valid rotate order: {}".format(rotate_order))
+
+
+def _rows(m):
+    # the 3x3 rows of a flat matrix
+    return (tuple(m[0:3]), tuple(m[4:7]), tuple(m[8:11]))
+
+
+def _mul3(a, b):
+    return tuple(
+        tuple(
+            a[r][0] * b[0][c] + a[r][1] * b[1][c] + a[r][2] * b[2][c]
+            for c in range(3)
+        )
+        for r in range(3)
+    )
+
+
+def _transpose3(a):
+    return tuple(tuple(a[r][c] for r in range(3)) for c in range(3))
+
+
+def _vecMul3(v, a):
+    # row vector times 3x3
+    return tuple(
+        v[0] * a[0][c] + v[1] * a[1][c] + v[2] * a[2][c] for c in range(3)
+    )
+
+
+def _axisRotation(axis, angle):
+    c = math.cos(angle)
+    s = math.sin(angle)
+    if axis == 0:
+        return ((1.0, 0.0, 0.0), (0.0, c, s), (0.0, -s, c))
+    if axis == 1:
+        return ((c, 0.0, -s), (0.0, 1.0, 0.0), (s, 0.0, c))
+    return ((c, s, 0.0), (-s, c, 0.0), (0.0, 0.0, 1.0))
+
+
+def _eulerRotation(angles, order):
+    m = ((1.0, 0.0, 0.0), (0.0, 1.0, 0.0), (0.0, 0.0, 1.0))
+    for axis in order:
+        m = _mul3(m, _axisRotation(axis, angles[axis]))
+    return m
+
+
+def _eulerAngles(r, order):
+    # r is the row vector rotation Ri * Rj * Rk of the (i, j, k) order,
+    # read through its transpose, the column vector Ck * Cj * Ci
+    i, j, k = order
+    s = 1.0 if (j - i) % 3 == 1 else -1.0
+    angles = [0.0, 0.0, 0.0]
+    sinB = -s * r[i][k]
+    if abs(sinB) < 0.9999999:
+        angles[j] = math.asin(sinB)
+        angles[i] = math.atan2(s * r[j][k], r[k][k])
+        angles[k] = math.atan2(s * r[i][j], r[i][i])
+    else:
+        # gimbal lock, all the rotation goes to the first axis
+        angles[j] = math.copysign(math.pi * 0.5, sinB)
+        angles[i] = math.atan2(-s * r[k][j], r[j][j])
+    return angles
+
+
+def _closestAngle(angle, reference):
+    return angle + 2.0 * math.pi * round((reference - angle) / (2.0 * math.pi))
+
+
+def _filterEuler(angles, previous, order):
+    # the closest of the 2 equivalent rotations to the previous one, with
+    # the 360 degrees turns kept, like the euler filter
+    i, j, k = order
+    flipped = [0.0, 0.0, 0.0]
+    flipped[i] = angles[i] + math.pi
+    flipped[j] = math.pi - angles[j]
+    flipped[k] = angles[k] + math.pi
+    best = None
+    for candidate in (angles, flipped):
+        candidate = [_closestAngle(a, p) for a, p in zip(candidate, previous)]
+        distance = sum(abs(a - p) for a, p in zip(candidate, previous))
+        if best is None or distance < best[0]:
+            best = (distance, candidate)
+    return best[1]
+
+
+def inverse_matrices(matrices):
+    """Invert many transformation matrices
+
+    The matrices are affine, the last column is (0, 0, 0, 1).
+
+    Args:
+        matrices (sequence): Flat 16 floats matrices
+
+    Returns:
+        list: The inverse matrices
+    """
+    result = []
+    for m in matrices:
+        a, b, c = m[0:3]
+        d, e, f = m[4:7]
+        g, h, i = m[8:11]
+        co0 = e * i - f * h
+        co1 = f * g - d * i
+        co2 = d * h - e * g
+        det = a * co0 + b * co1 + c * co2
+        if det == 0.0:
+            raise ValueError("Singular matrix")
+        inv = 1.0 / det
+        r = (
+            (co0 * inv, (c * h - b * i) * inv, (b * f - c * e) * inv),
+            (co1 * inv, (a * i - c * g) * inv, (c * d - a * f) * inv),
+            (co2 * inv, (b * g - a * h) * inv, (a * e - b * d) * inv),
+        )
+        t = _vecMul3(m[12:15], r)
+        result.append(
+            r[0] + (0.0,) + r[1] + (0.0,) + r[2] + (0.0,)
+            + (-t[0], -t[1], -t[2], 1.0)
+        )
+    return result
+
+
+def euler_matrices(rotations, rotate_order="xyz"):
+    """Get the rotation matrices of many euler rotations
+
+    Args:
+        rotations (sequence): The (x, y, z) rotations, in radians
+        rotate_order (str or int, optional): The rotate order, or the
+            ``rotateOrder`` attribute index
+
+    Returns:
+        list: The flat 16 floats matrices
+    """
+    order = _rotateOrder(rotate_order)
+    result = []
+    for angles in rotations:
+        r = _eulerRotation(angles, order)
+        result.append(
+            r[0] + (0.0,) + r[1] + (0.0,) + r[2] + (0.0,) + IDENTITY[12:]
+        )
+    return result
+
+
+def matrices_to_channels(
+    matrices,
+    rotate_order="xyz",
+    rotate_axis=None,
+    joint_orient=None,
+    pivots=None,
+    previous=None,
+):
+    """Get the transform channel values of many local matrices
+
+    The inverse of the transform matrix composition, for the values a
+    transform needs to get each matrix. Shear is not supported.
+    The rotations are euler filtered: each rotation is the equivalent
+    rotation closest to the one of the previous matrix, so a baked curve
+    has no flip.
+
+    Args:
+        matrices (sequence): Flat 16 floats local matrices
+        rotate_order (str or int, optional): The rotate order, or the
+            ``rotateOrder`` attribute index
+        rotate_axis (sequence, optional): The rotate axis, in radians
+        joint_orient (sequence, optional): The joint orient, in radians
+        pivots (sequence, optional): The rotatePivot,
+            rotatePivotTranslate, scalePivot and scalePivotTranslate
+            vectors
+        previous (sequence, optional): The (x, y, z) rotation to filter
+            the first rotation against, in radians
+
+    Returns:
+        list: The (tx, ty, tz, rx, ry, rz, sx, sy, sz) values, the
+            rotations in radians
+    """
+    order = _rotateOrder(rotate_order)
+    ra = _eulerRotation(rotate_axis, (0, 1, 2)) if rotate_axis else None
+    jo = _eulerRotation(joint_orient, (0, 1, 2)) if joint_orient else None
+    if pivots:
+        rp, rpt, sp, spt = pivots
+    result = []
+    for m in matrices:
+        rows = _rows(m)
+        scale = [math.sqrt(_dot(row, row)) for row in rows]
+        if _dot(_cross(rows[0], rows[1]), rows[2]) < 0.0:
+            scale[0] = -scale[0]
+        q = tuple(
+            tuple(v / s if s else 0.0 for v in row)
+            for row, s in zip(rows, scale)
+        )
+        r = q
+        if ra is not None:
+            r = _mul3(_transpose3(ra), r)
+        if jo is not None:
+            r = _mul3(r, _transpose3(jo))
+        angles = _eulerAngles(r, order)
+        if previous is not None:
+            angles = _filterEuler(angles, previous, order)
+        previous = angles
+
+        t = m[12:15]
+        if pivots:
+            # the origin goes through the pivots before the translation
+            p = tuple(
+                -sp[a] * scale[a] + sp[a] + spt[a] - rp[a] for a in range(3)
+            )
+            p = _vecMul3(p, q)
+            t = tuple(t[a] - p[a] - rp[a] - rpt[a] for a in range(3))
+        result.append(tuple(t) + tuple(angles) + tuple(scale))
+    return result
@@ -6,6 +6,8 @@ import maya.OpenMaya as OpenMaya
 
 from pymel.core import datatypes
 
+from mgear.core import transform_batch
+
 
 #############################################
 # VECTOR OPERATIONS
@@ -218,6 +220,25 @@ def calculatePoleVector(p1, p2, p3, poleDistance=1, time=1):
     return pole_vector
 
 
+def calculatePoleVectorBatch(starts, mids, ends, poleDistance=1):
+    """Batch version of calculatePoleVector
+
+    Solves the pole vector of a 3 joints chain over many frames in one call,
+    from positions sampled beforehand.
+
+    Arguments:
+        starts (list of vector): Object A positions, one per frame
+        mids (list of vector): Object B positions
+        ends (list of vector): Object C positions
+        poleDistance (float): distance of the pole vector from the mid point
+
+    Returns:
+        list of vector: The pole vector positions.
+    """
+    return [datatypes.Vector(v) for v in transform_batch.pole_vectors(
+        starts, mids, ends, poleDistance)]
+
+
 ##########################################################
 # CLASS
 ##########################################################
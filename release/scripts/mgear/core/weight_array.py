@@ -0,0 +1,739 @@
+"""
+Array backed containers for deformer weights.
+
+This module is Maya free. It only works with python ``array.array`` buffers,
+so the weight blocks can be moved between the skinCluster and the disk with
+bulk calls, and converted to the legacy ``{influence: {vtx: weight}}`` dict
+format only when needed by the serialization.
+
+NumPy is optional. When it can be imported, the conversions, remaps and
+conditioning of the sparse blocks are vectorized, the buffers stay
+``array.array``.
+
+Two representations are provided:
+
+    * DenseWeights: vertex major block of ``vertexCount * influenceCount``
+      doubles. This is the same memory layout returned by
+      ``MFnSkinCluster.getWeights``.
+    * SparseWeights: CSR (compressed sparse row) block. One row per vertex,
+      storing only the non zero influence weights.
+"""
+
+from array import array
+
+try:
+    import numpy
+except ImportError:
+    # the pure python code is used
+    numpy = None
+
+# typecodes used for the buffers
+WEIGHT_TYPE = "d"
+INDEX_TYPE = "I"
+POINTER_TYPE = "L"
+
+
+def _zeros(size, typecode=WEIGHT_TYPE):
+    """Return a zero filled array of the given size"""
+    return array(typecode, [0]) * size
+
+
+class DenseWeights(object):
+    """Vertex major dense weight block
+
+    Attributes:
+        influences (list): Influence names. The column order
+        vertexCount (int): Number of vertices. The row count
+        values (array): Weight values. ``values[vtx * numInf + inf]``
+    """
+
+    def __init__(self, influences, vertexCount, values=None):
+        self.influences = list(influences)
+        self.vertexCount = int(vertexCount)
+        size = self.vertexCount * len(self.influences)
+        if values is None:
+            values = _zeros(size)
+        elif not isinstance(values, array) or values.typecode != WEIGHT_TYPE:
+            values = array(WEIGHT_TYPE, values)
+        if len(values) != size:
+            raise ValueError(
+                "Weight buffer size {} doesn't match {} vertices x {} "
+                "influences".format(
+                    len(values), self.vertexCount, len(self.influences)
+                )
+            )
+        self.values = values
+
+    @property
+    def influenceCount(self):
+        return len(self.influences)
+
+    def column(self, index):
+        """Get the weights of one influence for all the vertices
+
+        Args:
+            index (int): Influence index
+
+        Returns:
+            array: The influence weights
+        """
+        return self.values[index :: self.influenceCount]
+
+    def setColumn(self, index, weights):
+        """Set the weights of one influence for all the vertices
+
+        Args:
+            index (int): Influence index
+            weights (sequence): vertexCount weight values
+        """
+        if not isinstance(weights, array) or weights.typecode != WEIGHT_TYPE:
+            weights = array(WEIGHT_TYPE, weights)
+        self.values[index :: self.influenceCount] = weights
+
+    def row(self, vertex):
+        """Get the weights of one vertex for all the influences
+
+        Args:
+            vertex (int): Vertex index
+
+        Returns:
+            array: The vertex weights
+        """
+        start = vertex * self.influenceCount
+        return self.values[start : start + self.influenceCount]
+
+    def toInfluenceDict(self, skipZero=True):
+        """Convert to the skin file dictionary format
+
+        Args:
+            skipZero (bool, optional): If True, 0.0 weights are skipped. This
+                is the "compressed" skin data format.
+
+        Returns:
+            dict: {influenceName: {vtx: weight}} if skipZero
+                else {influenceName: [weight, ...]}
+        """
+        data = {}
+        for ii, name in enumerate(self.influences):
+            column = self.column(ii)
+            if skipZero:
+                data[name] = {
+                    jj: w for jj, w in enumerate(column) if w != 0.0
+                }
+            else:
+                data[name] = column.tolist()
+        return data
+
+    @classmethod
+    def fromInfluenceDict(cls, weights, vertexCount, influences=None):
+        """Create a dense block from the skin file dictionary format
+
+        Both the compressed ({vtx: weight}, with int or str keys) and the
+        legacy full list formats are supported.
+
+        Args:
+            weights (dict): {influenceName: {vtx: weight} or [weight, ...]}
+            vertexCount (int): Number of vertices
+            influences (list, optional): Column order. If None, the
+                dictionary keys order is used.
+
+        Returns:
+            DenseWeights: The new weight block
+        """
+        if influences is None:
+            influences = list(weights.keys())
+        dense = cls(influences, vertexCount)
+        for ii, name in enumerate(influences):
+            values = weights.get(name)
+            if not values:
+                continue
+            dense.setColumn(ii, columnFromValues(values, vertexCount))
+        return dense
+
+    def toSparse(self, threshold=0.0):
+        """Convert to CSR
+
+        Args:
+            threshold (float, optional): Weights with absolute value lower or
+                equal than this are dropped.
+
+        Returns:
+            SparseWeights: The sparse weight block
+        """
+        return SparseWeights.fromDense(self, threshold)
+
+    def copy(self):
+        return DenseWeights(self.influences, self.vertexCount, self.values[:])
+
+
+class SparseWeights(object):
+    """CSR weight block. One row per vertex.
+
+    The non zero weights of the vertex ``v`` are stored in
+    ``data[indptr[v]:indptr[v + 1]]`` and their influence indices in
+    ``indices[indptr[v]:indptr[v + 1]]``
+
+    Attributes:
+        influences (list): Influence names
+        vertexCount (int): Number of vertices
+        indptr (array): Row pointers. vertexCount + 1 items
+        indices (array): Influence index of each stored weight
+        data (array): Stored weights
+    """
+
+    def __init__(
+        self, influences, vertexCount, indptr=None, indices=None, data=None
+    ):
+        self.influences = list(influences)
+        self.vertexCount = int(vertexCount)
+        if indptr is None:
+            indptr = _zeros(self.vertexCount + 1, POINTER_TYPE)
+        self.indptr = _asArray(indptr, POINTER_TYPE)
+        self.indices = _asArray(indices or [], INDEX_TYPE)
+        self.data = _asArray(data or [], WEIGHT_TYPE)
+        if len(self.indptr) != self.vertexCount + 1:
+            raise ValueError(
+                "indptr should have {} items, got {}".format(
+                    self.vertexCount + 1, len(self.indptr)
+                )
+            )
+        if len(self.indices) != len(self.data):
+            raise ValueError("indices and data should have the same size")
+
+    @property
+    def influenceCount(self):
+        return len(self.influences)
+
+    @property
+    def nnz(self):
+        """Number of stored weights"""
+        return len(self.data)
+
+    def row(self, vertex):
+        """Get the stored weights of one vertex
+
+        Args:
+            vertex (int): Vertex index
+
+        Returns:
+            tuple: (indices, weights) arrays
+        """
+        start, end = self.indptr[vertex], self.indptr[vertex + 1]
+        return self.indices[start:end], self.data[start:end]
+
+    @classmethod
+    def fromDense(cls, dense, threshold=0.0):
+        """Create a CSR block from a dense block
+
+        Args:
+            dense (DenseWeights): The dense weight block
+            threshold (float, optional): Weights with absolute value lower
+                or equal than this are dropped.
+
+        Returns:
+            SparseWeights: The sparse weight block
+        """
+        numInf = dense.influenceCount
+        values = dense.values
+        indptr = array(POINTER_TYPE, [0])
+        indices = array(INDEX_TYPE)
+        data = array(WEIGHT_TYPE)
+        rowRange = range(numInf)
+        for start in range(0, len(values), numInf or 1):
+            row = values[start : start + numInf]
+            keep = [ii for ii in rowRange if abs(row[ii]) > threshold]
+            indices.extend(keep)
+            data.extend([row[ii] for ii in keep])
+            indptr.append(len(data))
+        # no influences, still need a row pointer per vertex
+        if not numInf:
+            indptr = _zeros(dense.vertexCount + 1, POINTER_TYPE)
+        return cls(dense.influences, dense.vertexCount, indptr, indices, data)
+
+    @classmethod
+    def fromInfluenceDict(cls, weights, vertexCount, influences=None):
+        """Create a CSR block from the skin file dictionary format
+
+        Args:
+            weights (dict): {influenceName: {vtx: weight} or [weight, ...]}
+            vertexCount (int): Number of vertices
+            influences (list, optional): Column order. If None, the
+                dictionary keys order is used.
+
+        Returns:
+            SparseWeights: The sparse weight block
+        """
+        if numpy is not None:
+            return _fromInfluenceDictNumpy(weights, vertexCount, influences)
+        return DenseWeights.fromInfluenceDict(
+            weights, vertexCount, influences
+        ).toSparse()
+
+    def toDense(self):
+        """Convert to a dense block
+
+        Returns:
+            DenseWeights: The dense weight block
+        """
+        numInf = self.influenceCount
+        values = _zeros(self.vertexCount * numInf)
+        indptr, indices, data = self.indptr, self.indices, self.data
+        for vtx in range(self.vertexCount):
+            offset = vtx * numInf
+            for kk in range(indptr[vtx], indptr[vtx + 1]):
+                values[offset + indices[kk]] = data[kk]
+        return DenseWeights(self.influences, self.vertexCount, values)
+
+    def toInfluenceDict(self):
+        """Convert to the compressed skin file dictionary format
+
+        Returns:
+            dict: {influenceName: {vtx: weight}}
+        """
+        columns = [{} for _ in self.influences]
+        indptr, indices, data = self.indptr, self.indices, self.data
+        for vtx in range(self.vertexCount):
+            for kk in range(indptr[vtx], indptr[vtx + 1]):
+                if data[kk] != 0.0:
+                    columns[indices[kk]][vtx] = data[kk]
+        return dict(zip(self.influences, columns))
+
+    def remapInfluences(self, influences):
+        """Get the same weights with another influence order
+
+        Args:
+            influences (list): The new influence names. The weights of the
+                influences not in this list are dropped. The new influences
+                get no weights.
+
+        Returns:
+            SparseWeights: The remapped weight block
+        """
+        newIndex = {name: ii for ii, name in enumerate(influences)}
+        remap = [newIndex.get(name, -1) for name in self.influences]
+        return self.remapIndices(influences, remap)
+
+    def remapIndices(self, influences, remap):
+        """Get the weights on other influences with an index table
+
+        Args:
+            influences (list): The new influence names
+            remap (list): The new influence index of each influence, -1 to
+                drop its weights. The weights of the influences remapped to
+                the same index are added
+
+        Returns:
+            SparseWeights: The remapped weight block
+        """
+        if numpy is not None:
+            return _remapIndicesNumpy(self, influences, remap)
+        indptr = array(POINTER_TYPE, [0])
+        indices = array(INDEX_TYPE)
+        data = array(WEIGHT_TYPE)
+        mapped = [ii for ii in remap if ii >= 0]
+        merge = len(set(mapped)) != len(mapped)
+        for vtx in range(self.vertexCount):
+            start, end = self.indptr[vtx], self.indptr[vtx + 1]
+            row = [
+                (remap[self.indices[kk]], self.data[kk])
+                for kk in range(start, end)
+                if remap[self.indices[kk]] >= 0
+            ]
+            if merge:
+                merged = {}
+                for ii, w in row:
+                    merged[ii] = merged.get(ii, 0.0) + w
+                row = merged.items()
+            row = sorted(row)
+            indices.extend([ii for ii, _ in row])
+            data.extend([w for _, w in row])
+            indptr.append(len(data))
+        return SparseWeights(
+            influences, self.vertexCount, indptr, indices, data
+        )
+
+    def copy(self):
+        return SparseWeights(
+            self.influences,
+            self.vertexCount,
+            self.indptr[:],
+            self.indices[:],
+            self.data[:],
+        )
+
+
+def _asArray(values, typecode):
+    if isinstance(values, array) and values.typecode == typecode:
+        return values
+    return array(typecode, values)
+
+
+######################################
+# NumPy fast path
+######################################
+
+
+def asNumpy(values):
+    """Get a NumPy view of an array buffer. NumPy must be available
+
+    Args:
+        values (array): The buffer
+
+    Returns:
+        numpy.ndarray: The read only view, or an empty array
+    """
+    if not len(values):
+        return numpy.zeros(0, dtype=values.typecode)
+    return numpy.frombuffer(values, dtype=values.typecode)
+
+
+def fromNumpy(values, typecode):
+    """Copy a NumPy array to an array buffer
+
+    Args:
+        values (numpy.ndarray): The values
+        typecode (str): The buffer typecode
+
+    Returns:
+        array: The buffer
+    """
+    result = array(typecode)
+    data = numpy.ascontiguousarray(values, dtype=typecode).tobytes()
+    if hasattr(result, "frombytes"):
+        result.frombytes(data)
+    else:
+        # Python 2
+        result.fromstring(data)
+    return result
+
+
+def rowIndices(weights):
+    """Get the vertex index of each stored weight. NumPy must be available
+
+    Args:
+        weights (SparseWeights): The weights
+
+    Returns:
+        numpy.ndarray: The int64 vertex indices
+    """
+    return numpy.repeat(
+        numpy.arange(weights.vertexCount, dtype=numpy.int64),
+        numpy.diff(asNumpy(weights.indptr).astype(numpy.int64)),
+    )
+
+
+def _sparseFromCoordinates(influences, vertexCount, rows, cols, values):
+    # CSR block from unique (vertex, influence, weight) coordinates, the
+    # rows are sorted by influence index
+    order = numpy.lexsort((cols, rows))
+    indptr = numpy.zeros(vertexCount + 1, dtype=numpy.int64)
+    numpy.cumsum(
+        numpy.bincount(rows, minlength=vertexCount)[:vertexCount],
+        out=indptr[1:],
+    )
+    if len(rows) and rows.max() >= vertexCount:
+        raise IndexError("Vertex index out of range")
+    return SparseWeights(
+        influences,
+        vertexCount,
+        fromNumpy(indptr, POINTER_TYPE),
+        fromNumpy(cols[order], INDEX_TYPE),
+        fromNumpy(values[order], WEIGHT_TYPE),
+    )
+
+
+def _fromInfluenceDictNumpy(weights, vertexCount, influences):
+    if influences is None:
+        influences = list(weights.keys())
+    rows = []
+    cols = []
+    values = []
+    for ii, name in enumerate(influences):
+        column = weights.get(name)
+        if not column:
+            continue
+        if isinstance(column, dict):
+            vertices = numpy.array(list(column), dtype=numpy.int64)
+            column = numpy.fromiter(
+                column.values(), dtype=numpy.float64, count=len(column)
+            )
+        else:
+            column = numpy.asarray(column, dtype=numpy.float64)
+            vertices = numpy.arange(len(column), dtype=numpy.int64)
+        keep = column != 0.0
+        rows.append(vertices[keep])
+        cols.append(numpy.full(int(keep.sum()), ii, dtype=numpy.int64))
+        values.append(column[keep])
+    if not rows:
+        return SparseWeights(influences, vertexCount)
+    return _sparseFromCoordinates(
+        influences,
+        vertexCount,
+        numpy.concatenate(rows),
+        numpy.concatenate(cols),
+        numpy.concatenate(values),
+    )
+
+
+def _remapIndicesNumpy(weights, influences, remap):
+    rows = rowIndices(weights)
+    cols = numpy.asarray(list(remap) or [-1], dtype=numpy.int64)[
+        asNumpy(weights.indices).astype(numpy.int64)
+    ]
+    values = asNumpy(weights.data)
+    keep = cols >= 0
+    rows, cols, values = rows[keep], cols[keep], values[keep]
+    mapped = [ii for ii in remap if ii >= 0]
+    if len(set(mapped)) != len(mapped):
+        # add the weights of the influences remapped to the same index
+        keys, inverse = numpy.unique(
+            rows * max(len(influences), 1) + cols, return_inverse=True
+        )
+        values = numpy.bincount(inverse.ravel(), weights=values)
+        rows = keys // max(len(influences), 1)
+        cols = keys % max(len(influences), 1)
+    return _sparseFromCoordinates(
+        influences, weights.vertexCount, rows, cols, values
+    )
+
+
+def columnFromValues(values, vertexCount):
+    """Build a full column from compressed or legacy influence values
+
+    json keys can't be integers. The vtx number key is unicode.
+    example: vtx[35] would be: u"35": 0.6974, But the binary format is still
+    an int, so both are supported.
+    """
+    if isinstance(values, dict):
+        column = [0.0] * vertexCount
+        for key, value in values.items():
+            column[int(key)] = value
+        return column
+    return values
+
+
+######################################
+# Weight conditioning
+######################################
+
+
+def _quantizeRow(values, steps, keepSum):
+    """Quantize a row of weights to 1 / steps increments
+
+    If keepSum, the largest remainder method is used, so the quantized row
+    has the same sum than the original one (rounded to the step).
+    """
+    scaled = [w * steps for w in values]
+    if not keepSum:
+        return [round(w) / float(steps) for w in scaled]
+    floors = [int(w) for w in scaled]
+    missing = int(round(sum(scaled))) - sum(floors)
+    if missing > 0:
+        order = sorted(
+            range(len(scaled)),
+            key=lambda i: scaled[i] - floors[i],
+            reverse=True,
+        )
+        for i in order[:missing]:
+            floors[i] += 1
+    return [w / float(steps) for w in floors]
+
+
+def _rowPositions(rows, vertexCount):
+    # position of each coordinate in its row, the rows are sorted
+    counts = numpy.bincount(rows, minlength=vertexCount)
+    starts = numpy.cumsum(counts) - counts
+    return numpy.arange(len(rows)) - starts[rows]
+
+
+def _maxRowSum(rows, values):
+    # the rows are summed in the coordinates order, like the python loop
+    if not len(rows):
+        return 0.0
+    return float(numpy.bincount(rows, weights=values).max())
+
+
+def _conditionWeightsNumpy(
+    weights, pruneThreshold, maxInfluences, normalize, steps, report
+):
+    count = weights.vertexCount
+    rows0 = rowIndices(weights)
+    cols0 = asNumpy(weights.indices).astype(numpy.int64)
+    values0 = asNumpy(weights.data).astype(numpy.float64)
+    # the conditioned coordinates are a subset of the input ones, the
+    # ids are their position in the input
+    ids = numpy.flatnonzero(values0 != 0.0)
+    rows, cols, values = rows0[ids], cols0[ids], values0[ids]
+
+    if pruneThreshold:
+        pruned = numpy.abs(values) <= pruneThreshold
+        report["prune"] = _maxRowSum(rows[pruned], numpy.abs(values[pruned]))
+        keep = ~pruned
+        rows, cols, values = rows[keep], cols[keep], values[keep]
+        ids = ids[keep]
+
+    if maxInfluences:
+        limited = numpy.bincount(rows, minlength=count) > maxInfluences
+        if limited.any():
+            # the limited rows are sorted by decreasing weight in their
+            # slots, the other rows keep their order
+            order = numpy.arange(len(rows))
+            sel = numpy.flatnonzero(limited[rows])
+            order[sel] = sel[numpy.lexsort((-values[sel], rows[sel]))]
+            rows, cols, values = rows[order], cols[order], values[order]
+            ids = ids[order]
+            keep = _rowPositions(rows, count) < maxInfluences
+            report["limit"] = _maxRowSum(
+                rows[~keep], numpy.abs(values[~keep])
+            )
+            report["limitedVertices"] = int(limited.sum())
+            rows, cols, values = rows[keep], cols[keep], values[keep]
+            ids = ids[keep]
+
+    if normalize and len(rows):
+        totals = numpy.bincount(rows, weights=values, minlength=count)
+        scaled = ((totals != 0.0) & (totals != 1.0))[rows]
+        normalized = values.copy()
+        normalized[scaled] = values[scaled] / totals[rows[scaled]]
+        report["normalize"] = _maxRowSum(rows, numpy.abs(values - normalized))
+        values = normalized
+
+    if steps and len(rows):
+        scaledValues = values * steps
+        if normalize:
+            # largest remainder, see _quantizeRow
+            floors = numpy.trunc(scaledValues)
+            missing = numpy.round(
+                numpy.bincount(rows, weights=scaledValues, minlength=count)
+            ) - numpy.bincount(rows, weights=floors, minlength=count)
+            sel = numpy.flatnonzero((missing > 0)[rows])
+            sel = sel[
+                numpy.lexsort((floors[sel] - scaledValues[sel], rows[sel]))
+            ]
+            positions = _rowPositions(rows[sel], count)
+            floors[sel[positions < missing[rows[sel]]]] += 1
+            quantized = floors / float(steps)
+        else:
+            quantized = numpy.round(scaledValues) / float(steps)
+        report["quantize"] = _maxRowSum(rows, numpy.abs(values - quantized))
+        keep = quantized != 0.0
+        rows, cols, values = rows[keep], cols[keep], quantized[keep]
+        ids = ids[keep]
+
+    # maximum error against the input weights
+    result = numpy.zeros(len(values0))
+    result[ids] = values
+    report["total"] = _maxRowSum(rows0, numpy.abs(values0 - result))
+
+    conditioned = _sparseFromCoordinates(
+        weights.influences, count, rows, cols, values
+    )
+    return conditioned, report
+
+
+def conditionWeights(
+    weights,
+    pruneThreshold=0.0,
+    maxInfluences=0,
+    normalize=True,
+    quantizeBits=0,
+):
+    """Prune, limit, normalize and quantize weights in one pass
+
+    The operations are applied per vertex in this order:
+
+        * prune: drop the weights lower or equal than pruneThreshold
+        * limit: keep only the maxInfluences highest weights
+        * normalize: scale the weights so they sum 1
+        * quantize: snap the weights to 1 / (2 ** quantizeBits - 1) steps,
+          keeping the row sum when normalizing
+
+    The vertices are processed together with NumPy if it is available.
+
+    Args:
+        weights (SparseWeights or DenseWeights): The weights
+        pruneThreshold (float, optional): Prune threshold. 0 to skip
+        maxInfluences (int, optional): Max influences per vertex. 0 to skip
+        normalize (bool, optional): Normalize the weights
+        quantizeBits (int, optional): 8 or 16 for game engine precision.
+            0 to skip
+
+    Returns:
+        SparseWeights, dict: The conditioned weights and the report. The
+            report stores, for each operation, the maximum per vertex error
+            it introduced (sum of the absolute weight differences), the
+            "total" maximum error against the input weights, and the number
+            of "limitedVertices"
+    """
+    if isinstance(weights, DenseWeights):
+        weights = weights.toSparse()
+    steps = (1 << quantizeBits) - 1 if quantizeBits else 0
+    report = {
+        "prune": 0.0,
+        "limit": 0.0,
+        "normalize": 0.0,
+        "quantize": 0.0,
+        "total": 0.0,
+        "limitedVertices": 0,
+    }
+    if numpy is not None:
+        return _conditionWeightsNumpy(
+            weights, pruneThreshold, maxInfluences, normalize, steps, report
+        )
+
+    indptr = array(POINTER_TYPE, [0])
+    indices = array(INDEX_TYPE)
+    data = array(WEIGHT_TYPE)
+    for vtx in range(weights.vertexCount):
+        start, end = weights.indptr[vtx], weights.indptr[vtx + 1]
+        original = dict(
+            zip(weights.indices[start:end], weights.data[start:end])
+        )
+        row = [(i, w) for i, w in original.items() if w != 0.0]
+
+        if pruneThreshold:
+            kept = [(i, w) for i, w in row if abs(w) > pruneThreshold]
+            if len(kept) != len(row):
+                error = sum(abs(w) for i, w in row if abs(w) <= pruneThreshold)
+                report["prune"] = max(report["prune"], error)
+                row = kept
+
+        if maxInfluences and len(row) > maxInfluences:
+            row.sort(key=lambda item: item[1], reverse=True)
+            error = sum(abs(w) for _, w in row[maxInfluences:])
+            report["limit"] = max(report["limit"], error)
+            report["limitedVertices"] += 1
+            row = row[:maxInfluences]
+
+        if normalize and row:
+            total = sum(w for _, w in row)
+            if total and total != 1.0:
+                normalized = [(i, w / total) for i, w in row]
+                error = sum(
+                    abs(a[1] - b[1]) for a, b in zip(row, normalized)
+                )
+                report["normalize"] = max(report["normalize"], error)
+                row = normalized
+
+        if steps and row:
+            values = _quantizeRow([w for _, w in row], steps, normalize)
+            error = sum(abs(a[1] - b) for a, b in zip(row, values))
+            report["quantize"] = max(report["quantize"], error)
+            row = [(i, w) for (i, _), w in zip(row, values) if w != 0.0]
+
+        row.sort()
+        result = dict(row)
+        error = sum(
+            abs(original.get(i, 0.0) - result.get(i, 0.0))
+            for i in set(original) | set(result)
+        )
+        report["total"] = max(report["total"], error)
+
+        indices.extend([i for i, _ in row])
+        data.extend([w for _, w in row])
+        indptr.append(len(data))
+
+    conditioned = SparseWeights(
+        weights.influences, weights.vertexCount, indptr, indices, data
+    )
+    return conditioned, report
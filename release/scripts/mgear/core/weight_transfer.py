@@ -0,0 +1,138 @@
+"""
+Closest point weight transfer engine.
+
+This module is Maya free. It transfers sparse weights from a source point
+cloud (or triangle mesh) to a target point cloud in one batch, so it can be
+unit-tested and benchmarked outside Maya. ``skin.skinCopy`` uses it when a
+``transfer_mode`` is given.
+
+Transfer modes:
+
+    * closestPoint: copy the weights of the closest source vertex
+    * barycentric: interpolate the weights of the closest point on the
+      closest source triangle
+    * inverseDistance: blend the weights of the k nearest source vertices
+      with inverse distance weighting
+"""
+
+from . import spatial
+from . import weight_array
+
+CLOSEST_POINT = "closestPoint"
+BARYCENTRIC = "barycentric"
+INVERSE_DISTANCE = "inverseDistance"
+
+MODES = (CLOSEST_POINT, BARYCENTRIC, INVERSE_DISTANCE)
+
+
+def _accumulateRow(weights, vertex, factor, row):
+    indptr, indices, data = weights.indptr, weights.indices, weights.data
+    for kk in range(indptr[vertex], indptr[vertex + 1]):
+        inf = indices[kk]
+        row[inf] = row.get(inf, 0.0) + data[kk] * factor
+
+
+def _rowsToSparse(influences, rows, normalize):
+    indptr = [0]
+    indices = []
+    data = []
+    for row in rows:
+        keys = sorted(k for k, w in row.items() if w != 0.0)
+        values = [row[k] for k in keys]
+        if normalize:
+            total = sum(values)
+            if total:
+                values = [w / total for w in values]
+        indices.extend(keys)
+        data.extend(values)
+        indptr.append(len(data))
+    return weight_array.SparseWeights(
+        influences, len(rows), indptr, indices, data
+    )
+
+
+def transferWeights(
+    sourceWeights,
+    sourcePoints,
+    targetPoints,
+    mode=CLOSEST_POINT,
+    triangles=None,
+    k=4,
+    power=2.0,
+    normalize=True,
+    index=None,
+):
+    """Transfer weights from a source point cloud to a target point cloud
+
+    Args:
+        sourceWeights (SparseWeights or DenseWeights): Source weights, one
+            row per source point
+        sourcePoints (sequence): Source points
+        targetPoints (sequence): Target points
+        mode (str, optional): closestPoint, barycentric or inverseDistance
+        triangles (sequence, optional): Flat source triangle vertex indices.
+            Required by the barycentric mode
+        k (int, optional): Number of neighbours of the inverseDistance mode
+        power (float, optional): Distance exponent of the inverseDistance
+            mode
+        normalize (bool, optional): Normalize the target weights
+        index (KDTree or TriangleLocator, optional): Prebuilt spatial index
+            of the source, to reuse it between transfers
+
+    Returns:
+        weight_array.SparseWeights: Target weights, one row per target point
+    """
+    if mode not in MODES:
+        raise ValueError(
+            "Unknown transfer mode: {}. Valid modes: {}".format(mode, MODES)
+        )
+    if isinstance(sourceWeights, weight_array.DenseWeights):
+        sourceWeights = sourceWeights.toSparse()
+    if sourceWeights.vertexCount != len(sourcePoints):
+        raise ValueError(
+            "Source weights have {} rows for {} points".format(
+                sourceWeights.vertexCount, len(sourcePoints)
+            )
+        )
+
+    rows = []
+    if mode == BARYCENTRIC:
+        if index is None:
+            if triangles is None:
+                raise ValueError("The barycentric mode requires triangles")
+            index = spatial.TriangleLocator(sourcePoints, triangles)
+        for point in targetPoints:
+            triIndex, _, bary, _ = index.closest(point)
+            row = {}
+            for vertex, factor in zip(index.triangles[triIndex], bary):
+                if factor:
+                    _accumulateRow(sourceWeights, vertex, factor, row)
+            rows.append(row)
+
+    elif mode == INVERSE_DISTANCE:
+        if index is None:
+            index = spatial.KDTree(sourcePoints)
+        halfPower = power * 0.5
+        for point in targetPoints:
+            neighbours = index.knn(point, k)
+            row = {}
+            if neighbours and neighbours[0][1] == 0.0:
+                # exact match, the inverse distance is not defined
+                _accumulateRow(sourceWeights, neighbours[0][0], 1.0, row)
+            else:
+                factors = [1.0 / (d ** halfPower) for _, d in neighbours]
+                total = sum(factors)
+                for (vertex, _), factor in zip(neighbours, factors):
+                    _accumulateRow(sourceWeights, vertex, factor / total, row)
+            rows.append(row)
+
+    else:
+        if index is None:
+            index = spatial.KDTree(sourcePoints)
+        closest, _ = index.nearestBatch(targetPoints)
+        for vertex in closest:
+            row = {}
+            _accumulateRow(sourceWeights, vertex, 1.0, row)
+            rows.append(row)
+
+    return _rowsToSparse(sourceWeights.influences, rows, normalize)
@@ -1,13 +1,119 @@
 # Weigth maps IO
 
+import os
 import json
+from array import array
 
 from maya import cmds
 import pymel.core as pm
-import maya.OpenMaya as OpenMaya
-from .six import string_types
+import maya.api.OpenMaya as om2
+from . import wmap_format
 
 FILE_EXT = ".wmap"
+BIN_FILE_EXT = wmap_format.FILE_EXT
+
+
+def get_deformed_geometries(deformer):
+    """Get the geometries deformed by a deformer and their weightList index
+
+    Args:
+        deformer (PyNode or str): Name or pynode of a deformer
+
+    Returns:
+        list: (geometry full path name, weightList index) tuples
+    """
+    deformer = str(deformer)
+    geometries = cmds.deformer(deformer, query=True, geometry=True) or []
+    indices = cmds.deformer(deformer, query=True, geometryIndices=True) or []
+    return [
+        (cmds.ls(geo, long=True)[0], int(index))
+        for geo, index in zip(geometries, indices)
+    ]
+
+
+def get_point_count(geometry):
+    """Get the number of points (vertices or cvs) of a geometry
+
+    Args:
+        geometry (str): The geometry name
+
+    Returns:
+        int: The point count
+    """
+    sel = om2.MSelectionList()
+    sel.add(geometry)
+    return om2.MItGeometry(sel.getDagPath(0)).count()
+
+
+def get_weights_array(deformer):
+    """Get the weight maps of all the geometries of a deformer in one pass
+
+    Each map is read with one bulk getAttr on the weightList multi range.
+
+    Args:
+        deformer (PyNode or str): Name or pynode of a deformer with weight map
+
+    Returns:
+        list: (geometry full path name, array of float weights) tuples, in
+            weightList index order
+    """
+    deformer = str(deformer)
+    maps = []
+    for geo, index in sorted(
+        get_deformed_geometries(deformer), key=lambda x: x[1]
+    ):
+        count = get_point_count(geo)
+        if not count:
+            maps.append((geo, array(wmap_format.FLOAT32)))
+            continue
+        weights = cmds.getAttr(
+            "{0}.weightList[{1}].weights[0:{2}]".format(
+                deformer, index, count - 1
+            )
+        )
+        if not isinstance(weights, list):
+            weights = [weights]
+        maps.append((geo, array(wmap_format.FLOAT32, weights)))
+    return maps
+
+
+def set_weights_array(deformer, maps):
+    """Set the weight maps of the geometries of a deformer
+
+    The maps are matched by geometry name. Full path names are tried first,
+    then the short names. Each map is set with one bulk setAttr.
+
+    Args:
+        deformer (PyNode or str): Name or pynode of a deformer with weight map
+        maps (list or dict): (geometry name, weights) tuples or
+            {geometry name: weights}
+
+    Returns:
+        list: The geometry names of the maps without matching geometry
+    """
+    deformer = str(deformer)
+    if isinstance(maps, dict):
+        maps = [(k, v) for k, v in maps.items() if not k.startswith("_")]
+    geometries = get_deformed_geometries(deformer)
+    full_names = dict(geometries)
+    short_names = dict((geo.split("|")[-1], i) for geo, i in geometries)
+
+    not_found = []
+    for name, weights in maps:
+        index = full_names.get(name)
+        if index is None:
+            index = short_names.get(name.split("|")[-1])
+        if index is None or not len(weights):
+            not_found.append(name)
+            continue
+        cmds.setAttr(
+            "{0}.weightList[{1}].weights[0:{2}]".format(
+                deformer, index, len(weights) - 1
+            ),
+            *weights,
+            size=len(weights)
+        )
+    return not_found
 
 
 def get_weights(deformer):
@@ -21,41 +127,11 @@ def get_weights(deformer):
     Returns:
         dict: The weights dictionary
     """
-    if isinstance(deformer, string_types):
-        deformer = pm.PyNode(deformer)
     dataDic = {}
     dataDic["_deformed_index"] = []
-    try:
-        fnSet = OpenMaya.MFnSet(deformer.__apimfn__().deformerSet())
-        members = OpenMaya.MSelectionList()
-        fnSet.getMembers(members, False)
-        dagPath = OpenMaya.MDagPath()
-        components = OpenMaya.MObject()
-        members.getDagPath(0, dagPath, components)
-
-        for m in range(members.length()):
-            dagPath = OpenMaya.MDagPath()
-            members.getDagPath(m, dagPath, components)
-            weights = OpenMaya.MFloatArray()
-            deformer.__apimfn__().getWeights(dagPath, components, weights)
-            dataDic[dagPath.fullPathName()] = [
-                weights[i] for i in range(weights.length())
-            ]
-            dataDic["_deformed_index"].append(dagPath.fullPathName())
-    except:
-        # Fallback to Maya cmds if Open Maya deformerSet and getWeights Fail
-        # Since Maya 2022 with new Component tags system this 2 method are not
-        # working because deformer Set are not used anymore
-        def_objs = deformer.outputGeometry.listConnections()
-        for e, mesh in enumerate(def_objs):
-            VertexNb = cmds.polyEvaluate(mesh.name(), v=1) - 1
-            weight = cmds.getAttr(
-                "{0}.weightList[{1}].weights[0:{2}]".format(
-                    deformer.name(), e, VertexNb
-                )
-            )
-            dataDic[mesh.fullPathName()] = weight
-            dataDic["_deformed_index"].append(mesh.fullPathName())
+    for geo, weights in get_weights_array(deformer):
+        dataDic[geo] = weights.tolist()
+        dataDic["_deformed_index"].append(geo)
 
     return dataDic
 
@@ -67,53 +143,38 @@ def set_weights(deformer, dataWeights):
 
     Args:
         deformer (PyNode or str): Name or pynode of a deformer with weight map
+        dataWeights (dict): The weights dictionary
     """
-
-    if isinstance(deformer, string_types):
-        deformer = pm.PyNode(deformer)
-    try:
-        fnSet = OpenMaya.MFnSet(deformer.__apimfn__().deformerSet())
-        members = OpenMaya.MSelectionList()
-        fnSet.getMembers(members, False)
-        dagPath = OpenMaya.MDagPath()
-        components = OpenMaya.MObject()
-        members.getDagPath(0, dagPath, components)
-
-        for m in range(members.length()):
-            dagPath = OpenMaya.MDagPath()
-            members.getDagPath(m, dagPath, components)
-            dw = dataWeights[dagPath.fullPathName()]
-            weights = OpenMaya.MFloatArray(len(dw))
-            for x in range(len(dw)):
-                weights.set(dw[x], int(x))
-
-            deformer.__apimfn__().setWeight(dagPath, components, weights)
-    except:
-        # Fallback to Maya cmds if Open Maya deformerSet and getWeights Fail
-        # Since Maya 2022 with new Component tags system this 2 method are not
-        # working because deformer Set are not used anymore
-        def_objs = deformer.outputGeometry.listConnections()
-        for mesh in def_objs:
-            if mesh.fullPathName() in dataWeights.keys():
-                weights = dataWeights[mesh.fullPathName()]
-                VertexNb = cmds.polyEvaluate(mesh.name(), v=1) - 1
-                idx = dataWeights["_deformed_index"].index(mesh.fullPathName())
-                cmds.setAttr(
-                    "{0}.weightList[{1}].weights[0:{2}]".format(
-                        deformer.name(), idx, VertexNb
-                    ),
-                    *weights,
-                    size=len(weights)
-                )
+    names = dataWeights.get("_deformed_index") or [
+        k for k in dataWeights.keys() if not k.startswith("_")
+    ]
+    not_found = set_weights_array(
+        deformer, [(name, dataWeights[name]) for name in names]
+    )
+    if not_found:
+        pm.displayWarning(
+            "{}: geometries not found: {}".format(
+                deformer, ", ".join(not_found)
+            )
+        )
 
 
-def export_weights(deformer, filePath):
+def export_weights(deformer, filePath, half=False):
     """Export the wmap to a  json file
 
+    If the file extension is .wmapz the compact binary format is used
+
     Args:
         deformer (PyNode or str): Name or pynode of a deformer with weight map
         filePath (str): Path to save the file
+        half (bool, optional): Store the .wmapz values as float16
     """
+    if filePath.endswith(BIN_FILE_EXT):
+        value_format = wmap_format.FLOAT16 if half else wmap_format.FLOAT32
+        wmap_format.write_wmapz(
+            filePath, get_weights_array(deformer), value_format
+        )
+        return
     wdata = get_weights(deformer)
     with open(filePath, "w") as fp:
         json.dump(wdata, fp, indent=4, sort_keys=True)
@@ -122,16 +183,75 @@ def export_weights(deformer, filePath):
 def import_weights(deformer, filePath):
     """Import the wmap from a  json file
 
+    If the file extension is .wmapz the compact binary format is used
+
     Args:
         deformer (PyNode or str): Name or pynode of a deformer to
                                   assign the wmap
         filePath (str): Path to load the file
     """
+    if filePath.endswith(BIN_FILE_EXT):
+        maps = wmap_format.read_wmapz(filePath)
+        not_found = set_weights_array(deformer, maps)
+        if not_found:
+            pm.displayWarning(
+                "{}: geometries not found: {}".format(
+                    deformer, ", ".join(not_found)
+                )
+            )
+        return
     with open(filePath, "r") as fp:
         wdata = json.load(fp)
     set_weights(deformer, wdata)
 
 
+def export_weights_batch(deformers, dirPath, half=False):
+    """Export the wmap of many deformers to .wmapz files
+
+    One file per deformer, named after the deformer
+
+    Args:
+        deformers (list): Names or pynodes of deformers with weight map
+        dirPath (str): Destination folder
+        half (bool, optional): Store the values as float16
+
+    Returns:
+        list: The exported file paths
+    """
+    filePaths = []
+    for deformer in deformers:
+        filePath = os.path.join(
+            dirPath, str(deformer).replace(":", "_") + BIN_FILE_EXT
+        )
+        export_weights(deformer, filePath, half)
+        filePaths.append(filePath)
+    return filePaths
+
+
+def import_weights_batch(deformers, dirPath):
+    """Import the .wmapz files of many deformers
+
+    The files are found by deformer name, as exported by
+    export_weights_batch. The deformers without file are skipped
+
+    Args:
+        deformers (list): Names or pynodes of deformers with weight map
+        dirPath (str): Source folder
+
+    Returns:
+        list: The imported file paths
+    """
+    filePaths = []
+    for deformer in deformers:
+        filePath = os.path.join(
+            dirPath, str(deformer).replace(":", "_") + BIN_FILE_EXT
+        )
+        if os.path.isfile(filePath):
+            import_weights(deformer, filePath)
+            filePaths.append(filePath)
+    return filePaths
+
+
 def export_weights_selected(filePath=None, *args):
     """Export the wmap to a  json file from selected objet
 
@@ -183,7 +303,12 @@ def file_browser(mode=1):
     Returns:
         str: file path
     """
-    fileFilters = "Deformer Weigth map (*{})".format(FILE_EXT)
+    fileFilters = (
+        "Deformer Weigth map (*{0} *{1});;"
+        "Weigth map json (*{0});;Weigth map binary (*{1})".format(
+            FILE_EXT, BIN_FILE_EXT
+        )
+    )
     startDir = pm.workspace(q=True, rootDirectory=True)
     filePath = pm.fileDialog2(
         fileMode=mode, startingDirectory=startDir, fileFilter=fileFilters
@@ -0,0 +1,217 @@
+"""
+Compact binary weight map format (.wmapz).
+
+This module is Maya free. A .wmapz file stores the weight maps of one
+deformer, one map per deformed geometry, in order.
+
+Layout::
+
+    header  : magic, version, flags, map count
+    payload : the maps, zlib compressed if the flags say so
+
+    map     : name, vertex count, value format, run count, runs
+    run     : kind, length [, values]
+
+The runs encode the all 0.0 and all 1.0 spans typical of cluster maps
+without values. Only the literal runs store values, as float16 or float32.
+
+Note:
+    float16 keeps ~3 significant digits, enough for most deformer maps. The
+    default is float32, which is lossless for the maps stored by Maya.
+"""
+
+import zlib
+import struct
+from array import array
+
+FILE_EXT = ".wmapz"
+
+MAGIC = b"MGWMAPZ\x00"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<8sHHI")
+MAP_HEADER = struct.Struct("<IBI")
+RUN = struct.Struct("<BI")
+
+FLAG_ZLIB = 1
+
+FLOAT32 = "f"
+FLOAT16 = "e"
+
+RUN_ZERO = 0
+RUN_ONE = 1
+RUN_VALUES = 2
+
+# shorter 0.0/1.0 spans are stored as values, a run header costs 5 bytes
+MIN_RUN = 4
+
+
+class WeightMapFormatError(Exception):
+    pass
+
+
+def find_runs(values, min_run=MIN_RUN):
+    """Split the weight values in 0.0, 1.0 and literal runs
+
+    Args:
+        values (sequence): The weight values
+        min_run (int, optional): Min length of the 0.0 and 1.0 runs
+
+    Returns:
+        list: (kind, start, end) tuples
+    """
+    runs = []
+    count = len(values)
+    literal_start = 0
+    i = 0
+    while i < count:
+        value = values[i]
+        if value == 0.0 or value == 1.0:
+            j = i + 1
+            while j < count and values[j] == value:
+                j += 1
+            if j - i >= min_run:
+                if literal_start < i:
+                    runs.append((RUN_VALUES, literal_start, i))
+                runs.append((RUN_ZERO if value == 0.0 else RUN_ONE, i, j))
+                literal_start = j
+            i = j
+        else:
+            i += 1
+    if literal_start < count:
+        runs.append((RUN_VALUES, literal_start, count))
+    return runs
+
+
+def encode_map(name, values, value_format=FLOAT32):
+    """Encode one weight map
+
+    Args:
+        name (str): The deformed geometry name
+        values (sequence): The weight value per vertex
+        value_format (str, optional): FLOAT32 or FLOAT16
+
+    Returns:
+        bytes: The encoded map
+    """
+    if value_format not in (FLOAT32, FLOAT16):
+        raise ValueError("Not valid value format: {}".format(value_format))
+    name = name.encode("utf-8")
+    runs = find_runs(values)
+    chunks = [
+        struct.pack("<H", len(name)),
+        name,
+        MAP_HEADER.pack(len(values), ord(value_format), len(runs)),
+    ]
+    for kind, start, end in runs:
+        chunks.append(RUN.pack(kind, end - start))
+        if kind == RUN_VALUES:
+            chunks.append(
+                struct.pack(
+                    "<{}{}".format(end - start, value_format),
+                    *values[start:end]
+                )
+            )
+    return b"".join(chunks)
+
+
+def decode_map(buf, offset=0):
+    """Decode one weight map
+
+    Args:
+        buf (bytes): The encoded maps
+        offset (int, optional): The map start offset
+
+    Returns:
+        str, array, int: The geometry name, the float32 weight values and
+            the offset of the next map
+    """
+    (name_size,) = struct.unpack_from("<H", buf, offset)
+    offset += 2
+    name = buf[offset : offset + name_size].decode("utf-8")
+    offset += name_size
+    count, value_format, run_count = MAP_HEADER.unpack_from(buf, offset)
+    offset += MAP_HEADER.size
+    value_format = chr(value_format)
+    value_size = struct.calcsize(value_format)
+
+    values = array(FLOAT32)
+    for _ in range(run_count):
+        kind, length = RUN.unpack_from(buf, offset)
+        offset += RUN.size
+        if kind == RUN_ZERO:
+            values.extend([0.0] * length)
+        elif kind == RUN_ONE:
+            values.extend([1.0] * length)
+        elif kind == RUN_VALUES:
+            values.extend(
+                struct.unpack_from(
+                    "<{}{}".format(length, value_format), buf, offset
+                )
+            )
+            offset += length * value_size
+        else:
+            raise WeightMapFormatError("Not valid run kind: {}".format(kind))
+    if len(values) != count:
+        raise WeightMapFormatError(
+            "{}: {} values decoded for {} vertices".format(
+                name, len(values), count
+            )
+        )
+    return name, values, offset
+
+
+def write_wmapz(filePath, maps, value_format=FLOAT32, compress=True):
+    """Write weight maps to a .wmapz file
+
+    Args:
+        filePath (str): Destination file path
+        maps (list): (geometry name, weight values) tuples
+        value_format (str, optional): FLOAT32 or FLOAT16
+        compress (bool, optional): zlib compress the payload
+
+    Returns:
+        int: The file size in bytes
+    """
+    payload = b"".join(
+        [encode_map(name, values, value_format) for name, values in maps]
+    )
+    flags = 0
+    if compress:
+        payload = zlib.compress(payload)
+        flags |= FLAG_ZLIB
+    with open(filePath, "wb") as fp:
+        fp.write(HEADER.pack(MAGIC, FORMAT_VERSION, flags, len(maps)))
+        fp.write(payload)
+    return HEADER.size + len(payload)
+
+
+def read_wmapz(filePath):
+    """Read the weight maps of a .wmapz file
+
+    Args:
+        filePath (str): The file path
+
+    Returns:
+        list: (geometry name, float32 weight values array) tuples
+    """
+    with open(filePath, "rb") as fp:
+        buf = fp.read()
+    if len(buf) < HEADER.size:
+        raise WeightMapFormatError("Not a wmapz file: {}".format(filePath))
+    magic, version, flags, count = HEADER.unpack_from(buf, 0)
+    if magic != MAGIC:
+        raise WeightMapFormatError("Not a wmapz file: {}".format(filePath))
+    if version > FORMAT_VERSION:
+        raise WeightMapFormatError(
+            "{}: format version {} is not supported".format(filePath, version)
+        )
+    payload = buf[HEADER.size :]
+    if flags & FLAG_ZLIB:
+        payload = zlib.decompress(payload)
+
+    maps = []
+    offset = 0
+    for _ in range(count):
+        name, values, offset = decode_map(payload, offset)
+        maps.append((name, values))
+    return maps
@@ -16,6 +16,7 @@ import mgear.core.utils
 from . import guide, component
 
 from mgear.core import primitive, attribute, skin, dag, icon, node
+from mgear.core import fcurve
 from mgear import shifter_classic_components
 from mgear import shifter_epic_components
 from mgear.shifter import naming
@@ -189,6 +190,7 @@ class Rig(object):
 
         self.component_finalize = False
 
+    @fcurve.cacheValues
     def buildFromDict(self, conf_dict):
         log_window()
         startTime = datetime.datetime.now()
@@ -232,6 +234,7 @@ class Rig(object):
 
         return build_data
 
+    @fcurve.cacheValues
     def buildFromSelection(self):
         """Build the rig from selected guides."""
 
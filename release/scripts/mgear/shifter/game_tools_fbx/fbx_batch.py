@@ -34,6 +34,7 @@ import maya.api.OpenMaya as om
 import pymel.core as pm
 
 from mgear.core import pyFBX as pfbx
+from mgear.core import skin
 import mgear.shifter.game_tools_disconnect as gtDisc
 
 def perform_fbx_condition(
@@ -124,6 +125,9 @@ def perform_fbx_condition(
         print("Removing Skinning..")
         # Remove skinning from geometry
         _delete_bind_poses()
+    elif export_data.get("max_influences", 0):
+        print("Limiting Skin Influences..")
+        _limit_skin_influences(export_data["max_influences"])
 
     if not blendshapes:
         # Remove blendshapes from geometry
@@ -317,6 +321,22 @@ def _export_skeletal_mesh_partitions(jnt_roots, export_data, scene_path):
     return True
 
 
+def _limit_skin_influences(max_influences):
+    """
+    Prunes, limits and normalizes the weights of all the skin clusters, so
+    each vertex has at most max_influences influences.
+    """
+    for skin_cluster in pm.ls(type="skinCluster"):
+        report = skin.conditionSkinWeights(
+            skin_cluster, maxInfluences=max_influences
+        )
+        print(
+            "    {} max vertex error: {:.6f}".format(
+                skin_cluster.name(), report["total"]
+            )
+        )
+
+
 def _delete_blendshapes():
     """
     Deletes all blendshape objects in the scene.
@@ -33,7 +33,8 @@ class FbxExportNode(object):
         "ue_enabled": False,
         "ue_file_path": "",
         "ue_active_skeleton":"",
-        "cull_joints":False
+        "cull_joints":False,
+        "max_influences": 0,
     }
     ANIM_CLIP_DATA = {
         "title": "Untitled",
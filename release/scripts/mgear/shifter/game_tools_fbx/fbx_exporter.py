@@ -85,6 +85,7 @@ class FBXExporter(MayaQWidgetDockableMixin, QtWidgets.QDialog):
             "ue_file_path": self.ue_file_path_lineedit,
             "ue_active_skeleton": self.ue_skeleton_listwgt,
             "cull_joints": self.culljoints_checkbox,
+            "max_influences": self.max_influences_spinbox,
         }
 
     def create_menu_bar(self):
@@ -372,6 +373,16 @@ class FBXExporter(MayaQWidgetDockableMixin, QtWidgets.QDialog):
         deformers_layout.addWidget(self.partitions_checkbox)
         deformers_layout.addWidget(self.culljoints_checkbox)
 
+        max_influences_label = QtWidgets.QLabel("Max Influences")
+        self.max_influences_spinbox = QtWidgets.QSpinBox()
+        self.max_influences_spinbox.setRange(0, 32)
+        self.max_influences_spinbox.setSpecialValueText("No Limit")
+        self.max_influences_spinbox.setToolTip(
+            "Limit the skin influences per vertex on the exported geometry"
+        )
+        deformers_layout.addWidget(max_influences_label)
+        deformers_layout.addWidget(self.max_influences_spinbox)
+
         # partitions layout
         self.partitions_label = QtWidgets.QLabel("Partitions")
         skeletal_mesh_layout.addWidget(self.partitions_label)
@@ -529,6 +540,9 @@ class FBXExporter(MayaQWidgetDockableMixin, QtWidgets.QDialog):
             self.partition_blendshape_toggled
         )
         self.culljoints_checkbox.toggled.connect(self.cull_joints_toggled)
+        self.max_influences_spinbox.valueChanged.connect(
+            self.max_influences_changed
+        )
 
     def get_root_joint(self):
         root_joint = self.joint_root_lineedit.text().split(",")
@@ -641,6 +655,10 @@ class FBXExporter(MayaQWidgetDockableMixin, QtWidgets.QDialog):
         export_node = self._get_or_create_export_node()
         export_node.save_root_data("cull_joints", cull_joint_active)
 
+    def max_influences_changed(self, value):
+        export_node = self._get_or_create_export_node()
+        export_node.save_root_data("max_influences", value)
+
     def partition_skinning_toggled(self):
         """Updates the Maya FBX Node, when checkbox it changed"""
         skinning_active = self.skinning_checkbox.isChecked()
@@ -1086,6 +1104,7 @@ class FBXExporter(MayaQWidgetDockableMixin, QtWidgets.QDialog):
             "ue_file_path": self.ue_file_path_lineedit.text(),
             "ue_active_skeleton": "",
             "cull_joints": self.culljoints_checkbox.isChecked(),
+            "max_influences": self.max_influences_spinbox.value(),
         }
 
         # converting qt list widget data to text
@@ -1117,6 +1136,7 @@ class FBXExporter(MayaQWidgetDockableMixin, QtWidgets.QDialog):
         self.partitions_checkbox.setChecked(data.get("use_partitions", False))
         self.export_tab.setCurrentIndex(data.get("export_tab", 0))
         self.culljoints_checkbox.setChecked(data.get("cull_joints", False))
+        self.max_influences_spinbox.setValue(data.get("max_influences", 0))
 
         self.ue_import_cbx.setChecked(data.get("ue_enabled", False))
         self.ue_file_path_lineedit.setText(data.get("ue_file_path", ""))
@@ -19,7 +19,7 @@ from pymel import versions
 # mgear
 import mgear
 from mgear.core import attribute, dag, vector, pyqt, skin, string, fcurve
-from mgear.core import utils, curve
+from mgear.core import utils, curve, skin_format
 from mgear.vendor.Qt import QtCore, QtWidgets, QtGui
 from mgear.anim_picker.gui import MAYA_OVERRIDE_COLOR
 
@@ -2378,13 +2378,38 @@ class GuideSettings(MayaQWidgetDockableMixin, QtWidgets.QDialog, HelperSlots):
             fileMode=1,
             startingDirectory=startDir,
             okc="Apply",
-            fileFilter="mGear skin (*%s)" % skin.FILE_EXT,
+            fileFilter="mGear skin (*{} *{})".format(
+                skin.FILE_EXT, skin.FILE_BIN_EXT
+            ),
         )
         if not filePath:
             return
         if not isinstance(filePath, string_types):
             filePath = filePath[0]
 
+        # the file is validated with its index only. A gSkin without an up
+        # to date index sidecar is not loaded, and not validated
+        try:
+            entries = skin_format.readObjectIndex(filePath)
+        except Exception as e:
+            pm.displayWarning(
+                "Not valid skin file: {}. {}".format(filePath, e)
+            )
+            return
+        if entries is not None:
+            missing = [
+                e["objName"]
+                for e in entries
+                if not pm.objExists(e["objName"])
+            ]
+            pm.displayInfo("{} objects in skin file".format(len(entries)))
+            if missing:
+                pm.displayWarning(
+                    "Skin file objects not found in the scene: {}".format(
+                        ", ".join(missing)
+                    )
+                )
+
         self.root.attr("skin").set(filePath)
         self.guideSettingsTab.skin_lineEdit.setText(filePath)
 
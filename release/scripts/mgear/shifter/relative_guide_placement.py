@@ -287,10 +287,11 @@ def getGuideRelativeDictionaryLegacy(mesh, guideOrder):
     """
     relativeGuide_dict = {}
     mesh = pm.PyNode(mesh)
-    for guide in guideOrder:
-        guide = pm.PyNode(guide)
-        # slow function A
-        clst_vert = meshNavigation.getClosestVertexFromTransform(mesh, guide)
+    locator = meshNavigation.getMeshLocator(mesh)
+    guides = [pm.PyNode(guide) for guide in guideOrder]
+    clst_verts = meshNavigation.getClosestVerticesFromTransforms(
+        mesh, guides, locator)
+    for guide, clst_vert in zip(guides, clst_verts):
         vertexIds = [clst_vert.name()]
         # slow function B
         orig_ref_matrix = getVertMatrix(clst_vert.name())
@@ -300,7 +301,8 @@ def getGuideRelativeDictionaryLegacy(mesh, guideOrder):
         mm = ((orig_ref_matrix - a_mat) * -1) + a_mat
         pos = mm[3][:3]
 
-        mr_vert = meshNavigation.getClosestVertexFromTransform(mesh, pos)
+        mr_vert = meshNavigation.getClosestVerticesFromTransforms(
+            mesh, [pos], locator)[0]
         mr_orig_ref_matrix = getVertMatrix(mr_vert.name())
         vertexIds.append(mr_vert.name())
 
@@ -325,10 +327,11 @@ def yieldGuideRelativeDictionary(mesh, guideOrder, relativeGuide_dict):
     Returns:
         dictionary: create a dictionary of guide:[[edgeIDs], relativeMatrix]
     """
-    for guide in guideOrder:
-        guide = pm.PyNode(guide)
-        # slow function A
-        clst_vert = meshNavigation.getClosestVertexFromTransform(mesh, guide)
+    locator = meshNavigation.getMeshLocator(mesh)
+    guides = [pm.PyNode(guide) for guide in guideOrder]
+    clst_verts = meshNavigation.getClosestVerticesFromTransforms(
+        mesh, guides, locator)
+    for guide, clst_vert in zip(guides, clst_verts):
         vertexIds = [clst_vert.name()]
         # slow function B
         orig_ref_matrix = getVertMatrix(clst_vert.name())
@@ -338,7 +341,8 @@ def yieldGuideRelativeDictionary(mesh, guideOrder, relativeGuide_dict):
         mm = ((orig_ref_matrix - a_mat) * -1) + a_mat
         pos = mm[3][:3]
 
-        mr_vert = meshNavigation.getClosestVertexFromTransform(mesh, pos)
+        mr_vert = meshNavigation.getClosestVerticesFromTransforms(
+            mesh, [pos], locator)[0]
         mr_orig_ref_matrix = getVertMatrix(mr_vert.name())
         vertexIds.append(mr_vert.name())
 
@@ -0,0 +1,161 @@
+/*
+
+MGEAR is under the terms of the MIT License
+
+Copyright (c) 2016 Jeremie Passerin, Miquel Campos
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+*/
+/////////////////////////////////////////////////
+// INCLUDE
+/////////////////////////////////////////////////
+// Micro benchmarks of the solver math core, no Maya needed.
+//
+// usage: mgear_solvers_benchmark [iterations]
+//
+// Prints the average cost of one evaluation of each kernel, in
+// nanoseconds. The inputs change with the iteration so the results can't
+// be hoisted out of the loops.
+#include "mgear_kinematics.h"
+
+#include <chrono>
+#include <cstdio>
+#include <cstdlib>
+#include <vector>
+
+using namespace mgear;
+
+/////////////////////////////////////////////////
+// INPUTS
+/////////////////////////////////////////////////
+static Mat44 pose(double tx, double ty, double tz, double rx, double ry, double rz)
+{
+   Xform t;
+   t.translation = Vec3(tx, ty, tz);
+   t.rotation = eulerXYZToQuaternion(Vec3(rx, ry, rz));
+   return t.asMatrix();
+}
+
+static double checksum(const Mat44& m)
+{
+   return m.m[0][0] + m.m[1][1] + m.m[2][2] + m.m[3][0] + m.m[3][1] + m.m[3][2];
+}
+
+/////////////////////////////////////////////////
+// BENCHMARK
+/////////////////////////////////////////////////
+template <typename Kernel>
+static double run(const char* name, int iterations, Kernel kernel)
+{
+   double sum = 0.0;
+   // warm up
+   for (int i = 0; i < iterations / 10 + 1; i++)
+      sum += kernel(i);
+
+   std::chrono::steady_clock::time_point start = std::chrono::steady_clock::now();
+   for (int i = 0; i < iterations; i++)
+      sum += kernel(i);
+   std::chrono::steady_clock::time_point end = std::chrono::steady_clock::now();
+
+   double ns = std::chrono::duration<double, std::nano>(end - start).count();
+   std::printf("%-32s %10.1f ns/eval\n", name, ns / iterations);
+   return sum;
+}
+
+int main(int argc, char** argv)
+{
+   int iterations = argc > 1 ? std::atoi(argv[1]) : 200000;
+   if (iterations < 1)
+      iterations = 1;
+
+   // ikfk2Bone: an arm with the effector moving around the reach limit
+   IKParams ik;
+   ik.lengthA = 3.0;
+   ik.lengthB = 3.0;
+   ik.softness = 0.2;
+   ik.root = pose(0, 0, 0, 0, 0, 0);
+   ik.upv = pose(3, 0, -4, 0, 0, 0);
+
+   FKParams fk;
+   fk.root = ik.root;
+   fk.bone1 = pose(0, 0, 0, 0, 0.3, 0.2);
+   fk.bone2 = pose(2.8, 0.6, -0.8, 0, 0.6, 0.2);
+   fk.eff = pose(5.0, 1.0, 0.4, 0.1, 0.6, 0.2);
+
+   // rollSplineKine: a 5 controls spine
+   const int count = 5;
+   std::vector<Mat44> inputs(count);
+   std::vector<Mat44> parents(count);
+   std::vector<double> roll(count);
+   for (int i = 0; i < count; i++){
+      inputs[i] = pose(0, i * 2.0, std::sin(i * 0.7), 0, 0, 1.5708 + 0.1 * i);
+      parents[i] = pose(0, i * 2.0, 0, 0.05 * i, 0, 0);
+      roll[i] = 0.2 * i;
+   }
+
+   double sum = 0.0;
+
+   sum += run("interpolateTransform", iterations, [&](int i){
+      return checksum(interpolateTransform(fk.bone1, fk.eff, (i % 100) * 0.01));
+   });
+
+   sum += run("bezier4point", iterations, [&](int i){
+      Vec3 p, t;
+      bezier4point(Vec3(0,0,0), Vec3(2.5,0,0), Vec3(10,1,0), Vec3(0,2.5,0), (i % 100) * 0.01, p, t);
+      return p.x + t.y;
+   });
+
+   sum += run("ikfk2Bone IK outB", iterations, [&](int i){
+      IKParams p = ik;
+      p.eff = pose(4.0 + (i % 100) * 0.03, 1, 0, 0, 0, 0);
+      return checksum(ikfk2Bone(p, fk, 1.0, kOutB));
+   });
+
+   sum += run("ikfk2Bone blend outB", iterations, [&](int i){
+      IKParams p = ik;
+      p.eff = pose(4.0 + (i % 100) * 0.03, 1, 0, 0, 0, 0);
+      return checksum(ikfk2Bone(p, fk, 0.5, kOutB));
+   });
+
+   RollSplineParams spline;
+   sum += run("rollSplineKine", iterations, [&](int i){
+      RollSplineParams p = spline;
+      p.u = (i % 100) * 0.01;
+      return checksum(rollSplineKine(&inputs[0], &parents[0], &roll[0], count, p));
+   });
+
+   sum += run("rollSplineKine resample", iterations, [&](int i){
+      RollSplineParams p = spline;
+      p.u = (i % 100) * 0.01;
+      p.resample = true;
+      return checksum(rollSplineKine(&inputs[0], &parents[0], &roll[0], count, p));
+   });
+
+   sum += run("rollSplineKine resample absolute", iterations, [&](int i){
+      RollSplineParams p = spline;
+      p.u = (i % 100) * 0.01;
+      p.resample = true;
+      p.absolute = true;
+      return checksum(rollSplineKine(&inputs[0], &parents[0], &roll[0], count, p));
+   });
+
+   std::printf("checksum %g\n", sum);
+   return 0;
+}
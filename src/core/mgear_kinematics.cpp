@@ -0,0 +1,436 @@
+/*
+
+MGEAR is under the terms of the MIT License
+
+Copyright (c) 2016 Jeremie Passerin, Miquel Campos
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+Author:     Jeremie Passerin      geerem@hotmail.com  www.jeremiepasserin.com
+Author:     Miquel Campos         hello@miquel-campos.com  www.miquel-campos.com
+Date:       2016 / 10 / 10
+
+*/
+/////////////////////////////////////////////////
+// INCLUDE
+/////////////////////////////////////////////////
+#include "mgear_kinematics.h"
+
+#include <algorithm>
+#include <vector>
+
+#define PI 3.14159265
+
+namespace mgear
+{
+
+/////////////////////////////////////////////////
+// IKFK 2 BONE
+/////////////////////////////////////////////////
+static Mat44 transform(const Vec3& translation, const Quat& rotation, const Vec3& scale)
+{
+   Xform result;
+   result.translation = translation;
+   result.rotation = rotation;
+   result.scale = scale;
+   return result.asMatrix();
+}
+
+Mat44 getIKTransform(IKParams data, IkFkOutput output){
+
+    // prepare all variables
+	Vec3 bonePos, rootPos, effPos, upvPos, rootEff, xAxis, yAxis, zAxis, rollAxis;
+
+	Xform root(data.root);
+    rootPos = root.translation;
+    effPos = data.eff.translation();
+    upvPos = data.upv.translation();
+    rootEff = effPos - rootPos;
+    rollAxis = rootEff.normal();
+
+    double rootEffDistance = rootEff.length();
+
+    // init the scaling
+	double global_scale = root.scale.x;
+
+    // Distance with MaxStretch ---------------------
+    double restLength = (data.lengthA * data.scaleA + data.lengthB * data.scaleB) * global_scale;
+    double distance = rootEffDistance;
+    double distance2 = distance;
+    if (distance > (restLength * data.maxstretch))
+        distance = restLength * data.maxstretch;
+
+    // Adapt Softness value to chain length --------
+    data.softness = data.softness * restLength * .1;
+
+    // Stretch and softness ------------------------
+    // We use the real distance from root to controler to calculate the softness
+    // This way we have softness working even when there is no stretch
+    double stretch = std::max(1.0, distance / restLength);
+    double da = restLength - data.softness;
+    if ((data.softness > 0) && (distance2 > da)){
+        double newlen = data.softness*(1.0 - exp(-(distance2 -da)/data.softness)) + da;
+        stretch = distance / newlen;
+	}
+
+    data.lengthA = data.lengthA * stretch * data.scaleA * global_scale;
+    data.lengthB = data.lengthB * stretch * data.scaleB * global_scale;
+
+    // Reverse -------------------------------------
+    double d = distance / (data.lengthA + data.lengthB);
+
+	double reverse_scale;
+    if (data.reverse < 0.5)
+        reverse_scale = 1-(data.reverse*2 * (1-d));
+    else
+        reverse_scale = 1-((1-data.reverse)*2 * (1-d));
+
+    data.lengthA *= reverse_scale;
+    data.lengthB *= reverse_scale;
+
+    bool invert = data.reverse > 0.5;
+
+    // Slide ---------------------------------------
+	double slide_add;
+    if (data.slide < .5)
+        slide_add = (data.lengthA * (data.slide * 2)) - (data.lengthA);
+    else
+        slide_add = (data.lengthB * (data.slide * 2)) - (data.lengthB);
+
+    data.lengthA += slide_add;
+    data.lengthB -= slide_add;
+
+    // calculate the angle inside the triangle!
+    double angleA = 0;
+    double angleB = 0;
+
+    // check if the divider is not null otherwise the result is nan
+    // and the output disapear from xsi, that breaks constraints
+    if ((rootEffDistance < data.lengthA + data.lengthB) && (rootEffDistance > std::fabs(data.lengthA - data.lengthB) + 1E-6)){
+
+        // use the law of cosine for lengthA
+        double a = data.lengthA;
+        double b = rootEffDistance;
+        double c = data.lengthB;
+
+        angleA = acos(std::min(1.0, (a * a + b * b - c * c ) / ( 2 * a * b)));
+
+        // use the law of cosine for lengthB
+        a = data.lengthB;
+        b = data.lengthA;
+        c = rootEffDistance;
+        angleB = acos(std::min(1.0, (a * a + b * b - c * c ) / ( 2 * a * b)));
+
+        // invert the angles if need be
+        if (invert){
+            angleA = -angleA;
+            angleB = -angleB;
+		}
+	}
+
+    // start with the X and Z axis
+    xAxis = rootEff.normal();
+    yAxis = linearInterpolate(rootPos, effPos, .5);
+    yAxis = (upvPos - yAxis).normal();
+    yAxis = rotateVectorAlongAxis(yAxis, rollAxis, data.roll);
+    zAxis = (xAxis ^ yAxis).normal();
+    yAxis = (zAxis ^ xAxis).normal();
+
+    // check if we need to rotate the bone
+    if (angleA != 0.0)
+        xAxis = rotateVectorAlongAxis(xAxis, zAxis, -angleA);
+
+    // switch depending on our mode
+    if (output == kOutA){
+
+        if (data.negate)
+            xAxis *= -1;
+        // cross the yAxis and normalize
+        yAxis = (zAxis ^ xAxis).normal();
+
+        // set the scaling + the position
+        return transform(rootPos, getQuaternionFromAxes(xAxis, yAxis, zAxis),
+                         Vec3(data.lengthA, global_scale, global_scale));
+	}
+
+    // calculate the position of the elbow!
+    bonePos = xAxis * data.lengthA;
+    bonePos += rootPos;
+
+    if (output == kOutB){
+
+        // check if we need to rotate the bone
+        if (angleB != 0.0)
+            xAxis = rotateVectorAlongAxis(xAxis, zAxis, -(angleB - PI));
+
+        if (data.negate)
+            xAxis *= -1;
+
+        // cross the yAxis and normalize
+        yAxis = (zAxis ^ xAxis).normal();
+
+        return transform(bonePos, getQuaternionFromAxes(xAxis, yAxis, zAxis),
+                         Vec3(data.lengthB, global_scale, global_scale));
+	}
+
+    if (output == kOutCenter){
+
+        // check if we need to rotate the bone
+        if (angleB != 0.0){
+            if (invert){
+                angleB += PI * 2;
+			}
+            xAxis = rotateVectorAlongAxis(xAxis, zAxis, -(angleB *.5 - PI*.5));
+		}
+
+        // cross the yAxis and normalize
+        // yAxis.Sub(upvPos,bonePos); // this was flipping the centerN when the elbow/upv was aligned to root/eff
+        zAxis = (xAxis ^ yAxis).normal();
+
+        if (data.negate)
+            xAxis *= -1;
+
+        yAxis = (zAxis ^ xAxis).normal();
+
+        // the root scaling + the position
+        return transform(bonePos, getQuaternionFromAxes(xAxis, yAxis, zAxis), root.scale);
+	}
+
+    // outEff
+    // check if we need to rotate the bone
+    if (angleB != 0.0)
+        xAxis = rotateVectorAlongAxis(xAxis, zAxis, -(angleB - PI));
+
+    // calculate the position of the effector!
+    effPos = bonePos + xAxis * data.lengthB;
+
+    // output the rotation
+    Mat44 result = data.eff;
+    result.setTranslation(effPos);
+    return result;
+}
+
+Mat44 getFKTransform(const FKParams& data, IkFkOutput output){
+
+	// prepare all variables
+	Vec3 xAxis, yAxis, zAxis;
+
+	if (output == kOutA){
+		Xform bone1(data.bone1);
+		xAxis = data.bone2.translation() - bone1.translation;
+
+		Vec3 scale(xAxis.length(), 1.0, 1.0);
+
+		if (data.negate)
+			xAxis *= -1;
+
+		// cross the yAxis and normalize
+		xAxis.normalize();
+
+		zAxis = rotateBy(Vec3(0,0,1), bone1.rotation);
+		yAxis = zAxis ^ xAxis;
+
+		// rotation
+		return transform(bone1.translation, getQuaternionFromAxes(xAxis, yAxis, zAxis), scale);
+	}
+	else if (output == kOutB){
+
+		Xform bone2(data.bone2);
+		xAxis = data.eff.translation() - bone2.translation;
+
+		Vec3 scale(xAxis.length(), 1.0, 1.0);
+
+		if (data.negate)
+			xAxis *= -1;
+
+		// cross the yAxis and normalize
+		xAxis.normalize();
+		yAxis = rotateBy(Vec3(0,1,0), bone2.rotation);
+		zAxis = (xAxis ^ yAxis).normal();
+		yAxis = (zAxis ^ xAxis).normal();
+
+		// rotation
+		return transform(bone2.translation, getQuaternionFromAxes(xAxis, yAxis, zAxis), scale);
+	}
+	else if (output == kOutCenter){
+
+        // Only +/-180 degree with this one but we don't get the shear issue anymore
+        Xform t(mapWorldPoseToObjectSpace(data.bone1, data.bone2));
+		Vec3 er = quaternionToEulerXYZ(t.rotation);
+        er *= .5;
+        t.rotation = eulerXYZToQuaternion(er);
+        Xform world(mapObjectPoseToWorldSpace(data.bone1, t.asMatrix()));
+
+		// rotation
+		return transform(data.bone2.translation(), world.rotation, Vec3(1.0, 1.0, 1.0));
+	}
+
+	return data.eff;
+}
+
+static Mat44 noScale(const Mat44& m)
+{
+	Xform t(m);
+	t.scale = Vec3(1.0, 1.0, 1.0);
+	return t.asMatrix();
+}
+
+Mat44 ikfk2Bone(const IKParams& ikparams, const FKParams& fkparams, double blend, IkFkOutput output){
+
+	if(blend == 0.0)
+		return getFKTransform(fkparams, output);
+	else if(blend == 1.0)
+		return getIKTransform(ikparams, output);
+
+	// here is where the blending happens!
+	// remove scale to avoid shearing issue
+	// This is not necessary in Softimage because the scaling hierarchy is not computed the same way.
+	Mat44 ikbone1 = noScale(getIKTransform(ikparams, kOutA));
+	Mat44 ikbone2 = noScale(getIKTransform(ikparams, kOutB));
+	Mat44 ikeff = noScale(getIKTransform(ikparams, kOutEff));
+
+	Mat44 fkbone1 = noScale(getFKTransform(fkparams, kOutA));
+	Mat44 fkbone2 = noScale(getFKTransform(fkparams, kOutB));
+	Mat44 fkeff = noScale(getFKTransform(fkparams, kOutEff));
+
+	// map the secondary transforms from global to local
+	ikeff = mapWorldPoseToObjectSpace(ikbone2, ikeff);
+	fkeff = mapWorldPoseToObjectSpace(fkbone2, fkeff);
+	ikbone2 = mapWorldPoseToObjectSpace(ikbone1, ikbone2);
+	fkbone2 = mapWorldPoseToObjectSpace(fkbone1, fkbone2);
+
+	// now blend them!
+	FKParams blended = fkparams;
+	blended.bone1 = interpolateTransform(fkbone1, ikbone1, blend);
+	blended.bone2 = interpolateTransform(fkbone2, ikbone2, blend);
+	blended.eff = interpolateTransform(fkeff, ikeff, blend);
+
+	// now map the local transform back to global!
+	blended.bone2 = mapObjectPoseToWorldSpace(blended.bone1, blended.bone2);
+	blended.eff = mapObjectPoseToWorldSpace(blended.bone2, blended.eff);
+
+	// calculate the result based on that
+	return getFKTransform(blended, output);
+}
+
+/////////////////////////////////////////////////
+// ROLL SPLINE KINE
+/////////////////////////////////////////////////
+static bool resampleBezier(const std::vector<Vec3>& presample, const std::vector<Vec3>& presampletan, double u, Vec3& position, Vec3& tangent)
+{
+   // position and tangent at u of the presampled polyline length
+   int count = (int)presample.size();
+   std::vector<double> samplelen(count, 0.0);
+   double overalllen = 0;
+   for (int i = 1; i < count; i++){
+      overalllen += (presample[i] - presample[i-1]).length();
+      samplelen[i] = overalllen;
+   }
+   if (overalllen <= 0.0)
+      return false;
+
+   for (int i = 0; i < count - 1; i++){
+      samplelen[i+1] = samplelen[i+1] / overalllen;
+      if (u >= samplelen[i] && u <= samplelen[i+1]){
+         double span = samplelen[i+1] - samplelen[i];
+         double v = span > 0.0 ? (u - samplelen[i]) / span : 0.0;
+         position = linearInterpolate(presample[i], presample[i+1], v);
+         tangent = linearInterpolate(presampletan[i], presampletan[i+1], v);
+         return true;
+      }
+   }
+   return false;
+}
+
+Mat44 rollSplineKine(const Mat44* inputs, const Mat44* parents, const double* roll, int count, const RollSplineParams& params)
+{
+    // Get roll, pos, tan, rot, scl
+    std::vector<Vec3> pos(count);
+    std::vector<Vec3> tan(count);
+    std::vector<Quat> rot(count);
+    std::vector<Vec3> scl(count);
+	for (int i = 0 ; i < count ; i++){
+		Xform t(inputs[i]);
+		pos[i] = t.translation;
+		rot[i] = Xform(parents[i]).rotation;
+		scl[i] = t.scale;
+		tan[i] = rotateBy(Vec3(t.scale.x * 2.5, 0, 0), t.rotation);
+	}
+
+    // Get step and indexes
+    // We define between wich controlers the object is to be able to
+    // calculate the bezier 4 points front this 2 objects
+	double step = 1.0 / std::max( 1, count-1 );
+	int index1 = std::min( count-2, int(floor(params.u / step)) );
+	int index2 = index1+1;
+	double v = (params.u - step * double(index1)) / step;
+
+   // calculate the bezier
+   Vec3 bezierPos;
+   Vec3 xAxis, yAxis, zAxis;
+   if(!params.resample){
+      // straight bezier solve
+      bezier4point(pos[index1],tan[index1],pos[index2],tan[index2],v,bezierPos,xAxis);
+   }
+   else{
+      int subdiv = params.subdiv;
+      std::vector<Vec3> presample(subdiv);
+      std::vector<Vec3> presampletan(subdiv);
+      double samplestep = 1.0 / double(subdiv-1);
+      if(!params.absolute){
+         presample[0] = pos[index1];
+         presampletan[0] = tan[index1];
+         for(int i=1;i<subdiv;i++)
+            bezier4point(pos[index1],tan[index1],pos[index2],tan[index2],samplestep*i,presample[i],presampletan[i]);
+         resampleBezier(presample, presampletan, v, bezierPos, xAxis);
+      }
+      else{
+         presample[0] = pos[0];
+         presampletan[0] = tan[0];
+         for(int i=1;i<subdiv;i++){
+            double sampleu = samplestep*i;
+            int i1 = std::min(count-2, int(floor(sampleu / step)));
+            double sv = (sampleu - step * double(i1)) / step;
+            bezier4point(pos[i1],tan[i1],pos[i1+1],tan[i1+1],sv,presample[i],presampletan[i]);
+         }
+         resampleBezier(presample, presampletan, params.u, bezierPos, xAxis);
+      }
+   }
+
+	// compute the scaling (straight interpolation!)
+	Vec3 scl1 = linearInterpolate(scl[index1], scl[index2], v);
+
+	// compute the rotation!
+	Quat q = slerp(rot[index1], rot[index2], v);
+	yAxis = rotateBy(Vec3(0,1,0), q);
+
+	// use directly or project the roll values!
+	double a = linearInterpolate(roll[index1], roll[index2], v);
+	yAxis = rotateBy(yAxis, Quat(xAxis.x * sin(a/2.0), xAxis.y * sin(a/2.0), xAxis.z * sin(a/2.0), cos(a/2.0)));
+
+	zAxis = (xAxis ^ yAxis).normal();
+	yAxis = (zAxis ^ xAxis).normal();
+
+	// the node scaling: the Z of the interpolated scale, then the Y and Z
+	// scale of the last input
+	return transform(bezierPos, getQuaternionFromAxes(xAxis, yAxis, zAxis),
+	                 Vec3(scl1.z, scl[count-1].y, scl[count-1].z));
+}
+
+} // namespace mgear
@@ -0,0 +1,110 @@
+/*
+
+MGEAR is under the terms of the MIT License
+
+Copyright (c) 2016 Jeremie Passerin, Miquel Campos
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+Author:     Jeremie Passerin      geerem@hotmail.com  www.jeremiepasserin.com
+Author:     Miquel Campos         hello@miquel-campos.com  www.miquel-campos.com
+Date:       2016 / 10 / 10
+
+*/
+#ifndef _mgearKinematics
+#define _mgearKinematics
+
+/////////////////////////////////////////////////
+// INCLUDE
+/////////////////////////////////////////////////
+// Maya free solvers of the mgear_ikfk2Bone and mgear_rollSplineKine nodes.
+// The results are in world space, the nodes multiply them by the inverse
+// of their output parent.
+#include "mgear_math.h"
+
+namespace mgear
+{
+
+/////////////////////////////////////////////////
+// STRUCTS
+/////////////////////////////////////////////////
+enum IkFkOutput
+{
+   kOutA,
+   kOutB,
+   kOutCenter,
+   kOutEff
+};
+
+struct FKParams
+{
+   bool negate;
+   Mat44 root;
+   Mat44 bone1;
+   Mat44 bone2;
+   Mat44 eff;
+
+   FKParams() : negate(false) {}
+};
+
+struct IKParams
+{
+   double lengthA;
+   double lengthB;
+   bool negate;
+   double roll;
+   double scaleA;
+   double scaleB;
+   double maxstretch;
+   double softness;
+   double slide;
+   double reverse;
+   Mat44 root;
+   Mat44 eff;
+   Mat44 upv;
+
+   IKParams()
+      : lengthA(0.0), lengthB(0.0), negate(false), roll(0.0), scaleA(1.0),
+        scaleB(1.0), maxstretch(1.5), softness(0.0), slide(0.5), reverse(0.0) {}
+};
+
+struct RollSplineParams
+{
+   double u;
+   bool resample;
+   int subdiv;
+   bool absolute;
+
+   RollSplineParams() : u(0.0), resample(false), subdiv(10), absolute(false) {}
+};
+
+/////////////////////////////////////////////////
+// METHODS
+/////////////////////////////////////////////////
+Mat44 getIKTransform(IKParams data, IkFkOutput output);
+Mat44 getFKTransform(const FKParams& data, IkFkOutput output);
+// blend 0.0 is FK, 1.0 is IK
+Mat44 ikfk2Bone(const IKParams& ikparams, const FKParams& fkparams, double blend, IkFkOutput output);
+
+// inputs, parents and roll (radians) have count elements, count > 1
+Mat44 rollSplineKine(const Mat44* inputs, const Mat44* parents, const double* roll, int count, const RollSplineParams& params);
+
+} // namespace mgear
+
+#endif
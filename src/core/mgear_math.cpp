@@ -0,0 +1,443 @@
+/*
+
+MGEAR is under the terms of the MIT License
+
+Copyright (c) 2016 Jeremie Passerin, Miquel Campos
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+Author:     Jeremie Passerin      geerem@hotmail.com  www.jeremiepasserin.com
+Author:     Miquel Campos         hello@miquel-campos.com  www.miquel-campos.com
+Date:       2016 / 10 / 10
+
+*/
+/////////////////////////////////////////////////
+// INCLUDE
+/////////////////////////////////////////////////
+#include "mgear_math.h"
+
+#include <algorithm>
+
+namespace mgear
+{
+
+/////////////////////////////////////////////////
+// TYPES
+/////////////////////////////////////////////////
+Vec3 Vec3::normal() const
+{
+   double l = length();
+   if (l == 0.0)
+      return *this;
+   return Vec3(x / l, y / l, z / l);
+}
+
+Quat Quat::operator*(const Quat& q) const
+{
+   // this rotation, then q
+   return Quat(
+      q.w * x + q.x * w + q.y * z - q.z * y,
+      q.w * y - q.x * z + q.y * w + q.z * x,
+      q.w * z + q.x * y - q.y * x + q.z * w,
+      q.w * w - q.x * x - q.y * y - q.z * z);
+}
+
+Quat Quat::normal() const
+{
+   double l = std::sqrt(x * x + y * y + z * z + w * w);
+   if (l == 0.0)
+      return Quat();
+   return Quat(x / l, y / l, z / l, w / l);
+}
+
+Mat44::Mat44()
+{
+   for (int i = 0; i < 4; i++)
+      for (int j = 0; j < 4; j++)
+         m[i][j] = (i == j) ? 1.0 : 0.0;
+}
+
+Mat44 Mat44::fromArray(const double values[16])
+{
+   Mat44 r;
+   for (int i = 0; i < 4; i++)
+      for (int j = 0; j < 4; j++)
+         r.m[i][j] = values[i * 4 + j];
+   return r;
+}
+
+Mat44 Mat44::operator*(const Mat44& b) const
+{
+   Mat44 r;
+   for (int i = 0; i < 4; i++)
+      for (int j = 0; j < 4; j++)
+         r.m[i][j] = m[i][0] * b.m[0][j] + m[i][1] * b.m[1][j] + m[i][2] * b.m[2][j] + m[i][3] * b.m[3][j];
+   return r;
+}
+
+Mat44 Mat44::inverse() const
+{
+   const double a = m[0][0], b = m[0][1], c = m[0][2];
+   const double d = m[1][0], e = m[1][1], f = m[1][2];
+   const double g = m[2][0], h = m[2][1], i = m[2][2];
+   double det = a * (e * i - f * h) - b * (d * i - f * g) + c * (d * h - e * g);
+   if (det == 0.0)
+      return Mat44();
+   det = 1.0 / det;
+
+   Mat44 r;
+   r.m[0][0] = (e * i - f * h) * det;
+   r.m[0][1] = (c * h - b * i) * det;
+   r.m[0][2] = (b * f - c * e) * det;
+   r.m[1][0] = (f * g - d * i) * det;
+   r.m[1][1] = (a * i - c * g) * det;
+   r.m[1][2] = (c * d - a * f) * det;
+   r.m[2][0] = (d * h - e * g) * det;
+   r.m[2][1] = (b * g - a * h) * det;
+   r.m[2][2] = (a * e - b * d) * det;
+   for (int j = 0; j < 3; j++)
+      r.m[3][j] = -(m[3][0] * r.m[0][j] + m[3][1] * r.m[1][j] + m[3][2] * r.m[2][j]);
+   return r;
+}
+
+static Quat quaternionFromRows(const Vec3& r0, const Vec3& r1, const Vec3& r2)
+{
+   // quaternion of orthonormal rotation rows
+   double trace = r0.x + r1.y + r2.z;
+   if (trace > 0.0){
+      double s = 0.5 / std::sqrt(trace + 1.0);
+      return Quat((r1.z - r2.y) * s, (r2.x - r0.z) * s, (r0.y - r1.x) * s, 0.25 / s);
+   }
+   if (r0.x > r1.y && r0.x > r2.z){
+      double s = 2.0 * std::sqrt(std::max(1.0 + r0.x - r1.y - r2.z, 1e-30));
+      return Quat(0.25 * s, (r1.x + r0.y) / s, (r2.x + r0.z) / s, (r1.z - r2.y) / s);
+   }
+   if (r1.y > r2.z){
+      double s = 2.0 * std::sqrt(std::max(1.0 + r1.y - r0.x - r2.z, 1e-30));
+      return Quat((r1.x + r0.y) / s, 0.25 * s, (r2.y + r1.z) / s, (r2.x - r0.z) / s);
+   }
+   double s = 2.0 * std::sqrt(std::max(1.0 + r2.z - r0.x - r1.y, 1e-30));
+   return Quat((r2.x + r0.z) / s, (r2.y + r1.z) / s, 0.25 * s, (r0.y - r1.x) / s);
+}
+
+static void quaternionRows(const Quat& q, Vec3& r0, Vec3& r1, Vec3& r2)
+{
+   const double x = q.x, y = q.y, z = q.z, w = q.w;
+   r0 = Vec3(1 - 2 * (y * y + z * z), 2 * (x * y + w * z), 2 * (x * z - w * y));
+   r1 = Vec3(2 * (x * y - w * z), 1 - 2 * (x * x + z * z), 2 * (y * z + w * x));
+   r2 = Vec3(2 * (x * z + w * y), 2 * (y * z - w * x), 1 - 2 * (x * x + y * y));
+}
+
+Xform::Xform(const Mat44& matrix)
+{
+   // orthonormalize the rows from the X axis, the shear is dropped
+   Vec3 a0(matrix.m[0][0], matrix.m[0][1], matrix.m[0][2]);
+   Vec3 a1(matrix.m[1][0], matrix.m[1][1], matrix.m[1][2]);
+   Vec3 a2(matrix.m[2][0], matrix.m[2][1], matrix.m[2][2]);
+
+   Vec3 x = a0.normal();
+   a1 = a1 - x * (x * a1);
+   Vec3 y = a1.normal();
+   a2 = a2 - x * (x * a2) - y * (y * a2);
+   Vec3 z = a2.normal();
+
+   scale = Vec3(a0.length(), a1.length(), a2.length());
+   if ((x * (y ^ z)) < 0.0){
+      scale = -scale;
+      x = -x;
+      y = -y;
+      z = -z;
+   }
+   rotation = quaternionFromRows(x, y, z);
+   translation = matrix.translation();
+}
+
+Mat44 Xform::asMatrix() const
+{
+   Vec3 r[3];
+   quaternionRows(rotation.normal(), r[0], r[1], r[2]);
+   const double s[3] = {scale.x, scale.y, scale.z};
+
+   Mat44 result;
+   for (int i = 0; i < 3; i++){
+      result.m[i][0] = r[i].x * s[i];
+      result.m[i][1] = r[i].y * s[i];
+      result.m[i][2] = r[i].z * s[i];
+   }
+   result.setTranslation(translation);
+   return result;
+}
+
+/////////////////////////////////////////////////
+// METHODS
+/////////////////////////////////////////////////
+Vec3 rotateBy(const Vec3& v, const Quat& q)
+{
+   Vec3 r0, r1, r2;
+   quaternionRows(q.normal(), r0, r1, r2);
+   return r0 * v.x + r1 * v.y + r2 * v.z;
+}
+
+Quat e2q(double x, double y, double z){
+
+    x = degrees2radians(x);
+    y = degrees2radians(y);
+    z = degrees2radians(z);
+
+    // Assuming the angles are in radians.
+    double c1 = cos(y/2.0);
+    double s1 = sin(y/2.0);
+    double c2 = cos(z/2.0);
+    double s2 = sin(z/2.0);
+    double c3 = cos(x/2.0);
+    double s3 = sin(x/2.0);
+    double c1c2 = c1*c2;
+    double s1s2 = s1*s2;
+    double qw =c1c2*c3 - s1s2*s3;
+    double qx =c1c2*s3 + s1s2*c3;
+    double qy =s1*c2*c3 + c1*s2*s3;
+    double qz =c1*s2*c3 - s1*c2*s3;
+
+    return Quat(qx,qy,qz,qw);
+}
+
+Quat slerp(const Quat& qA, const Quat& qB, double blend){
+
+	// shortest path spherical linear interpolation, like MQuaternion slerp
+	Quat q = qB;
+	double dot = getDot(qA, qB);
+	if (dot < 0.0){
+		dot = -dot;
+		q = Quat(-qB.x, -qB.y, -qB.z, -qB.w);
+	}
+
+	double scaleA = 1.0 - blend;
+	double scaleB = blend;
+	if (dot < 1.0 - 1.0e-6){
+		double angle = acos(std::min(dot, 1.0));
+		double factor = 1.0 / sin(angle);
+		scaleA = sin((1.0 - blend) * angle) * factor;
+		scaleB = sin(blend * angle) * factor;
+	}
+
+	return Quat(scaleA * qA.x + scaleB * q.x,
+	            scaleA * qA.y + scaleB * q.y,
+	            scaleA * qA.z + scaleB * q.z,
+	            scaleA * qA.w + scaleB * q.w);
+}
+
+Quat slerp2(const Quat& qA, const Quat& qB, double blend){
+
+	double dot = getDot(qA, qB);
+
+	double scaleA, scaleB;
+	// if q1 and target are really close then we can interpolate linerarly.
+	if (dot >= (1 - 1.0e-12)){
+		scaleA = 1 - blend;
+		scaleB = blend;
+	}
+	else {
+		// use standard spherical linear interpolation
+		dot = clamp(dot, -1.0, 1.0);
+	}
+
+	double angle;
+	if (round((-dot * dot+ 1),5) == 0)
+		return qA;
+	else
+		angle = acos(dot);
+
+	double factor;
+	if (round(sin(angle), 6) != 0)
+		factor = 1 / sin(angle);
+	else
+		return qA;
+
+	scaleA = sin( (1.0 - blend) * angle ) * factor;
+	scaleB = sin( blend * angle ) * factor;
+
+	double qx  = scaleA * qA.x + scaleB * qB.x;
+	double qy  = scaleA * qA.y + scaleB * qB.y;
+	double qz  = scaleA * qA.z + scaleB * qB.z;
+	double qw  = scaleA * qA.w + scaleB * qB.w;
+
+	return Quat(qx, qy, qz, qw);
+}
+
+double clamp(double d, double min_value, double max_value){
+
+        d = std::max(d, min_value);
+        d = std::min(d, max_value);
+        return d;
+}
+int clamp(int d, int min_value, int max_value){
+
+        d = std::max(d, min_value);
+        d = std::min(d, max_value);
+        return d;
+}
+
+double getDot(const Quat& qA, const Quat& qB){
+
+    double dot = qA.w * qB.w +
+				qA.x * qB.x +
+				qA.y * qB.y +
+				qA.z * qB.z;
+
+	return dot;
+}
+
+double radians2degrees(double a){
+	return a * 57.2957795;
+}
+double degrees2radians(double a){
+	return a * 0.0174532925;
+}
+
+double round(double value, int precision)
+ {
+     if (precision>=0) {
+         int p = clamp(precision,-15,15);
+         double pwr[] = {
+                 1e0,  1e1,  1e2,  1e3,  1e4,
+                 1e5,  1e6,  1e7,  1e8,  1e9,
+                 1e10, 1e11, 1e12, 1e13, 1e14 };
+
+         double invpwr[] = {
+                 1e0,   1e-1,  1e-2,  1e-3,  1e-4,
+                 1e-5,  1e-6,  1e-7,  1e-8,  1e-9,
+                 1e-10, 1e-11, 1e-12, 1e-13, 1e-14 };
+
+         double val = value;
+
+         if (value<0.0)
+             val = ceil(val*pwr[p]-0.5);
+
+         if (value>0.0)
+             val = floor(val*pwr[p]+0.5);
+
+         return val*invpwr[p];
+     }
+
+    return value;
+}
+
+double linearInterpolate(double first, double second, double blend){
+        return first * (1-blend) + second * blend;
+}
+Vec3 linearInterpolate(const Vec3& v0, const Vec3& v1, double blend){
+	return Vec3(linearInterpolate(v0.x, v1.x, blend),
+	            linearInterpolate(v0.y, v1.y, blend),
+	            linearInterpolate(v0.z, v1.z, blend));
+}
+
+void bezier4point(const Vec3& a, const Vec3& tan_a, const Vec3& d, const Vec3& tan_d, double u, Vec3& position, Vec3& tangent){
+
+    Vec3 b = a + tan_a;
+    Vec3 c = -tan_d + d;
+
+    Vec3 ab = linearInterpolate(a,b,u);
+    Vec3 bc = linearInterpolate(b,c,u);
+    Vec3 cd = linearInterpolate(c,d,u);
+    Vec3 abbc = linearInterpolate(ab,bc,u);
+    Vec3 bccd = linearInterpolate(bc,cd,u);
+
+    position = linearInterpolate(abbc,bccd,u);
+    tangent = (bccd - abbc).normal();
+}
+
+Vec3 rotateVectorAlongAxis(const Vec3& v, const Vec3& axis, double a){
+
+    // Angle as to be in radians
+
+    double sa = sin(a / 2.0);
+    double ca = cos(a / 2.0);
+
+    Quat q1 = Quat(v.x, v.y, v.z, 0);
+    Quat q2 = Quat(axis.x * sa, axis.y * sa, axis.z * sa, ca);
+    Quat q2n = Quat(-axis.x * sa, -axis.y * sa, -axis.z * sa, ca);
+    Quat q = q2 * q1;
+    q = q * q2n;
+
+    return Vec3(q.x, q.y, q.z);
+}
+
+Quat getQuaternionFromAxes(const Vec3& vx, const Vec3& vy, const Vec3& vz){
+
+	Mat44 m;
+	m.m[0][0] = vx.x;
+	m.m[0][1] = vx.y;
+	m.m[0][2] = vx.z;
+	m.m[1][0] = vy.x;
+	m.m[1][1] = vy.y;
+	m.m[1][2] = vy.z;
+	m.m[2][0] = vz.x;
+	m.m[2][1] = vz.y;
+	m.m[2][2] = vz.z;
+
+	return Xform(m).rotation;
+}
+
+Vec3 quaternionToEulerXYZ(const Quat& q){
+
+	// xyz rotation order, in radians
+	Vec3 r0, r1, r2;
+	quaternionRows(q.normal(), r0, r1, r2);
+	double y = asin(clamp(-r0.z, -1.0, 1.0));
+	if (std::fabs(r0.z) < 1.0 - 1e-12)
+		return Vec3(atan2(r1.z, r2.z), y, atan2(r0.y, r0.x));
+	return Vec3(atan2(-r2.y, r1.y), y, 0.0);
+}
+
+Quat eulerXYZToQuaternion(const Vec3& e){
+
+	// x, then y, then z
+	Quat qx(sin(e.x * .5), 0.0, 0.0, cos(e.x * .5));
+	Quat qy(0.0, sin(e.y * .5), 0.0, cos(e.y * .5));
+	Quat qz(0.0, 0.0, sin(e.z * .5), cos(e.z * .5));
+	return qx * qy * qz;
+}
+
+Mat44 mapWorldPoseToObjectSpace(const Mat44& objectSpace, const Mat44& pose){
+        return pose * objectSpace.inverse();
+}
+
+Mat44 mapObjectPoseToWorldSpace(const Mat44& objectSpace, const Mat44& pose){
+        return pose * objectSpace;
+}
+
+Mat44 interpolateTransform(const Mat44& xf1, const Mat44& xf2, double blend){
+
+    if (blend == 1.0)
+        return xf2;
+    else if (blend == 0.0)
+        return xf1;
+
+    Xform x1(xf1);
+    Xform x2(xf2);
+
+    Xform result;
+    result.translation = linearInterpolate(x1.translation, x2.translation, blend);
+    result.scale = linearInterpolate(x1.scale, x2.scale, blend);
+    result.rotation = slerp(x1.rotation, x2.rotation, blend);
+
+    return result.asMatrix();
+}
+
+} // namespace mgear
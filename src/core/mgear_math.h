@@ -0,0 +1,146 @@
+/*
+
+MGEAR is under the terms of the MIT License
+
+Copyright (c) 2016 Jeremie Passerin, Miquel Campos
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+Author:     Jeremie Passerin      geerem@hotmail.com  www.jeremiepasserin.com
+Author:     Miquel Campos         hello@miquel-campos.com  www.miquel-campos.com
+Date:       2016 / 10 / 10
+
+*/
+#ifndef _mgearMath
+#define _mgearMath
+
+/////////////////////////////////////////////////
+// INCLUDE
+/////////////////////////////////////////////////
+// Maya free math core of the solvers. The nodes convert their Maya types
+// and call these functions, so the math can be built, tested and profiled
+// without Maya.
+//
+// Conventions, same as the Maya API:
+//   - matrices use row vectors, the translation is the last row
+//   - the transforms are decomposed in translation, rotation and scale,
+//     without shear, like MTransformationMatrix built from a matrix
+#include <cmath>
+
+namespace mgear
+{
+
+/////////////////////////////////////////////////
+// TYPES
+/////////////////////////////////////////////////
+struct Vec3
+{
+   double x, y, z;
+
+   Vec3() : x(0.0), y(0.0), z(0.0) {}
+   Vec3(double x_, double y_, double z_) : x(x_), y(y_), z(z_) {}
+
+   Vec3 operator+(const Vec3& v) const { return Vec3(x + v.x, y + v.y, z + v.z); }
+   Vec3 operator-(const Vec3& v) const { return Vec3(x - v.x, y - v.y, z - v.z); }
+   Vec3 operator-() const { return Vec3(-x, -y, -z); }
+   Vec3 operator*(double s) const { return Vec3(x * s, y * s, z * s); }
+   Vec3& operator+=(const Vec3& v) { x += v.x; y += v.y; z += v.z; return *this; }
+   Vec3& operator*=(double s) { x *= s; y *= s; z *= s; return *this; }
+
+   double operator*(const Vec3& v) const { return x * v.x + y * v.y + z * v.z; }
+   // cross product, like MVector
+   Vec3 operator^(const Vec3& v) const
+   {
+      return Vec3(y * v.z - z * v.y, z * v.x - x * v.z, x * v.y - y * v.x);
+   }
+
+   double length() const { return std::sqrt(x * x + y * y + z * z); }
+   Vec3 normal() const;
+   void normalize() { *this = normal(); }
+};
+
+// (x, y, z, w) quaternion. The product a * b applies a then b, like
+// MQuaternion
+struct Quat
+{
+   double x, y, z, w;
+
+   Quat() : x(0.0), y(0.0), z(0.0), w(1.0) {}
+   Quat(double x_, double y_, double z_, double w_) : x(x_), y(y_), z(z_), w(w_) {}
+
+   Quat operator*(const Quat& q) const;
+   Quat normal() const;
+};
+
+struct Mat44
+{
+   double m[4][4];
+
+   Mat44();
+   static Mat44 fromArray(const double values[16]);
+
+   Mat44 operator*(const Mat44& b) const;
+   // inverse of an affine matrix
+   Mat44 inverse() const;
+
+   Vec3 translation() const { return Vec3(m[3][0], m[3][1], m[3][2]); }
+   void setTranslation(const Vec3& t) { m[3][0] = t.x; m[3][1] = t.y; m[3][2] = t.z; }
+};
+
+// translation, rotation and scale of a matrix
+struct Xform
+{
+   Vec3 translation;
+   Quat rotation;
+   Vec3 scale;
+
+   Xform() : scale(1.0, 1.0, 1.0) {}
+   explicit Xform(const Mat44& matrix);
+
+   Mat44 asMatrix() const;
+};
+
+/////////////////////////////////////////////////
+// METHODS
+/////////////////////////////////////////////////
+Vec3 rotateBy(const Vec3& v, const Quat& q);
+
+Quat e2q(double x, double y, double z);
+Quat slerp(const Quat& qA, const Quat& qB, double blend);
+Quat slerp2(const Quat& qA, const Quat& qB, double blend);
+double clamp(double d, double min_value, double max_value);
+int clamp(int d, int min_value, int max_value);
+double getDot(const Quat& qA, const Quat& qB);
+double radians2degrees(double a);
+double degrees2radians(double a);
+double round(double value, int precision);
+double linearInterpolate(double first, double second, double blend);
+Vec3 linearInterpolate(const Vec3& v0, const Vec3& v1, double blend);
+void bezier4point(const Vec3& a, const Vec3& tan_a, const Vec3& d, const Vec3& tan_d, double u, Vec3& position, Vec3& tangent);
+Vec3 rotateVectorAlongAxis(const Vec3& v, const Vec3& axis, double a);
+Quat getQuaternionFromAxes(const Vec3& vx, const Vec3& vy, const Vec3& vz);
+Vec3 quaternionToEulerXYZ(const Quat& q);
+Quat eulerXYZToQuaternion(const Vec3& e);
+Mat44 mapWorldPoseToObjectSpace(const Mat44& objectSpace, const Mat44& pose);
+Mat44 mapObjectPoseToWorldSpace(const Mat44& objectSpace, const Mat44& pose);
+Mat44 interpolateTransform(const Mat44& xf1, const Mat44& xf2, double blend);
+
+} // namespace mgear
+
+#endif
@@ -445,28 +445,41 @@ MStatus mgear_ikfk2Bone::compute(const MPlug& plug, MDataBlock& data)
 {
    MStatus returnStatus;
 
+	// OUTPUT
+	mgear::IkFkOutput output;
+	MObject parent;
+	if (plug == outA){
+		output = mgear::kOutA;
+		parent = inAparent;
+	}
+	else if (plug == outB){
+		output = mgear::kOutB;
+		parent = inBparent;
+	}
+	else if (plug == outCenter){
+		output = mgear::kOutCenter;
+		parent = inCenterparent;
+	}
+	else if (plug == outEff){
+		output = mgear::kOutEff;
+		parent = inEffparent;
+	}
+	else
+		return MStatus::kUnknownParameter;
+
 	// INPUT MATRICES
 	MMatrix in_root = data.inputValue( root, &returnStatus ).asMatrix();
-	MMatrix in_ikref = data.inputValue( ikref, &returnStatus ).asMatrix();
-	MMatrix in_upv = data.inputValue( upv, &returnStatus ).asMatrix();
-	MMatrix in_fk0 = data.inputValue( fk0, &returnStatus ).asMatrix();
-	MMatrix in_fk1 = data.inputValue( fk1, &returnStatus ).asMatrix();
-	MMatrix in_fk2 = data.inputValue( fk2, &returnStatus ).asMatrix();
-
-	MMatrix in_aParent = data.inputValue( inAparent, &returnStatus ).asMatrix();
-	MMatrix in_bParent = data.inputValue( inBparent, &returnStatus ).asMatrix();
-	MMatrix in_centerParent = data.inputValue( inCenterparent, &returnStatus ).asMatrix();
-	MMatrix in_effParent = data.inputValue( inEffparent, &returnStatus ).asMatrix();
+	MMatrix in_parent = data.inputValue( parent, &returnStatus ).asMatrix();
 
 	// SLIDERS
 	double in_blend = (double)data.inputValue( blend ).asFloat();
 
 	// setup the base IK parameters
-	s_GetIKTransform ikparams;
+	mgear::IKParams ikparams;
 
-	ikparams.root = in_root;
-	ikparams.eff = in_ikref;
-	ikparams.upv = in_upv;
+	ikparams.root = toMat44(in_root);
+	ikparams.eff = toMat44(data.inputValue( ikref, &returnStatus ).asMatrix());
+	ikparams.upv = toMat44(data.inputValue( upv, &returnStatus ).asMatrix());
 
 	ikparams.lengthA = (double)data.inputValue( lengthA ).asFloat();
 	ikparams.lengthB = (double)data.inputValue( lengthB ).asFloat();
@@ -480,397 +493,21 @@ MStatus mgear_ikfk2Bone::compute(const MPlug& plug, MDataBlock& data)
 	ikparams.reverse = (double)data.inputValue( reverse ).asFloat();
 
 	// setup the base FK parameters
-	s_GetFKTransform fkparams;
+	mgear::FKParams fkparams;
 
-	fkparams.root = in_root;
-	fkparams.bone1 = in_fk0;
-	fkparams.bone2 = in_fk1;
-	fkparams.eff = in_fk2;
-
-	fkparams.lengthA = ikparams.lengthA;
-	fkparams.lengthB = ikparams.lengthB;
+	fkparams.root = ikparams.root;
+	fkparams.bone1 = toMat44(data.inputValue( fk0, &returnStatus ).asMatrix());
+	fkparams.bone2 = toMat44(data.inputValue( fk1, &returnStatus ).asMatrix());
+	fkparams.eff = toMat44(data.inputValue( fk2, &returnStatus ).asMatrix());
 	fkparams.negate = ikparams.negate;
 
-	MStringArray outNameArray;
-	plug.name().split('.', outNameArray);
-	MString outName = outNameArray[outNameArray.length() - 1];
-
-	MTransformationMatrix result;
-	if(in_blend == 0.0)
-		result = getFKTransform(fkparams, outName);
-	else if(in_blend == 1.0)
-		result = getIKTransform(ikparams, outName);
-	else{
-		// here is where the blending happens!
-        MTransformationMatrix ikbone1 = getIKTransform(ikparams, "outA");
-        MTransformationMatrix ikbone2 = getIKTransform(ikparams, "outB");
-        MTransformationMatrix ikeff = getIKTransform(ikparams, "outEff");
-
-        MTransformationMatrix fkbone1 = getFKTransform(fkparams, "outA");
-        MTransformationMatrix fkbone2 = getFKTransform(fkparams, "outB");
-        MTransformationMatrix fkeff = getFKTransform(fkparams, "outEff");
-
-        // remove scale to avoid shearing issue
-        // This is not necessary in Softimage because the scaling hierarchy is not computed the same way.
-		double noScale[3] = {1,1,1};
-		ikbone1.setScale(noScale, MSpace::kWorld);
-		ikbone2.setScale(noScale, MSpace::kWorld);
-		ikeff.setScale(noScale, MSpace::kWorld);
-		fkbone1.setScale(noScale, MSpace::kWorld);
-		fkbone2.setScale(noScale, MSpace::kWorld);
-		fkeff.setScale(noScale, MSpace::kWorld);
-
-        // map the secondary transforms from global to local
-        ikeff = mapWorldPoseToObjectSpace(ikbone2, ikeff);
-        fkeff = mapWorldPoseToObjectSpace(fkbone2, fkeff);
-        ikbone2 = mapWorldPoseToObjectSpace(ikbone1, ikbone2);
-        fkbone2 = mapWorldPoseToObjectSpace(fkbone1, fkbone2);
-
-        // now blend them!
-		fkparams.bone1 = interpolateTransform(fkbone1, ikbone1, in_blend);
-		fkparams.bone2 = interpolateTransform(fkbone2, ikbone2, in_blend);
-		fkparams.eff = interpolateTransform(fkeff, ikeff, in_blend);
-
-
-        // now map the local transform back to global!
-		fkparams.bone2 = mapObjectPoseToWorldSpace(fkparams.bone1, fkparams.bone2);
-        fkparams.eff = mapObjectPoseToWorldSpace(fkparams.bone2, fkparams.eff);
-
-        // calculate the result based on that
-        result = getFKTransform(fkparams, outName);
-	}
+	// the solver is in the Maya free core, see core/mgear_kinematics.h
+	MMatrix result = toMMatrix(mgear::ikfk2Bone(ikparams, fkparams, in_blend, output));
 
     // Output
-	MDataHandle h;
-    if (plug == outA){
-        h = data.outputValue( outA );
-        h.setMMatrix( result.asMatrix() * in_aParent.inverse() );
-
-        data.setClean( plug );
-	}
-    else if (plug == outB){
-        h = data.outputValue( outB );
-        h.setMMatrix( result.asMatrix() *  in_bParent.inverse() );
-        data.setClean( plug );
-	}
-    else if (plug == outCenter){
-        h = data.outputValue( outCenter );
-        h.setMMatrix( result.asMatrix() * in_centerParent.inverse() );
-
-        data.setClean( plug );
-	}
-    else if (plug == outEff){
-        h = data.outputValue( outEff );
-        h.setMMatrix( result.asMatrix() * in_effParent.inverse() );
-
-        data.setClean( plug );
-	}
-    else
-        return MStatus::kUnknownParameter;
+	MDataHandle h = data.outputValue( plug );
+	h.setMMatrix( result * in_parent.inverse() );
+	data.setClean( plug );
 
    return MS::kSuccess;
 }
-
-MTransformationMatrix mgear_ikfk2Bone::getIKTransform(s_GetIKTransform data, MString name){
-
-    // prepare all variables
-	MTransformationMatrix result;
-	MVector bonePos, rootPos, effPos, upvPos, rootEff, xAxis, yAxis, zAxis, rollAxis;
-
-    rootPos = data.root.getTranslation(MSpace::kWorld);
-    effPos = data.eff.getTranslation(MSpace::kWorld);
-    upvPos = data.upv.getTranslation(MSpace::kWorld);
-    rootEff = effPos - rootPos;
-    rollAxis = rootEff.normal();
-
-    double rootEffDistance = rootEff.length();
-
-    // init the scaling
-	double scale[3];
-	data.root.getScale(scale, MSpace::kWorld);
-	double global_scale = scale[0];
-
-	result.setScale(scale, MSpace::kWorld);
-
-    // Distance with MaxStretch ---------------------
-    double restLength = (data.lengthA * data.scaleA + data.lengthB * data.scaleB) * global_scale;
-    double distance = rootEffDistance;
-    double distance2 = distance;
-    if (distance > (restLength * data.maxstretch))
-        distance = restLength * data.maxstretch;
-
-    // Adapt Softness value to chain length --------
-    data.softness = data.softness * restLength * .1;
-
-    // Stretch and softness ------------------------
-    // We use the real distance from root to controler to calculate the softness
-    // This way we have softness working even when there is no stretch
-    double stretch = std::max(1.0, distance / restLength);
-    double da = restLength - data.softness;
-    if ((data.softness > 0) && (distance2 > da)){
-        double newlen = data.softness*(1.0 - exp(-(distance2 -da)/data.softness)) + da;
-        stretch = distance / newlen;
-	}
-
-    data.lengthA = data.lengthA * stretch * data.scaleA * global_scale;
-    data.lengthB = data.lengthB * stretch * data.scaleB * global_scale;
-
-    // Reverse -------------------------------------
-    double d = distance / (data.lengthA + data.lengthB);
-
-	double reverse_scale;
-    if (data.reverse < 0.5)
-        reverse_scale = 1-(data.reverse*2 * (1-d));
-    else
-        reverse_scale = 1-((1-data.reverse)*2 * (1-d));
-
-    data.lengthA *= reverse_scale;
-    data.lengthB *= reverse_scale;
-
-    bool invert = data.reverse > 0.5;
-
-    // Slide ---------------------------------------
-	double slide_add;
-    if (data.slide < .5)
-        slide_add = (data.lengthA * (data.slide * 2)) - (data.lengthA);
-    else
-        slide_add = (data.lengthB * (data.slide * 2)) - (data.lengthB);
-
-    data.lengthA += slide_add;
-    data.lengthB -= slide_add;
-
-    // calculate the angle inside the triangle!
-    double angleA = 0;
-    double angleB = 0;
-
-    // check if the divider is not null otherwise the result is nan
-    // and the output disapear from xsi, that breaks constraints
-    if ((rootEffDistance < data.lengthA + data.lengthB) && (rootEffDistance > abs(data.lengthA - data.lengthB) + 1E-6)){
-
-        // use the law of cosine for lengthA
-        double a = data.lengthA;
-        double b = rootEffDistance;
-        double c = data.lengthB;
-
-        angleA = acos(std::min(1.0, (a * a + b * b - c * c ) / ( 2 * a * b)));
-
-        // use the law of cosine for lengthB
-        a = data.lengthB;
-        b = data.lengthA;
-        c = rootEffDistance;
-        angleB = acos(std::min(1.0, (a * a + b * b - c * c ) / ( 2 * a * b)));
-
-        // invert the angles if need be
-        if (invert){
-            angleA = -angleA;
-            angleB = -angleB;
-		}
-	}
-
-    // start with the X and Z axis
-    xAxis = rootEff;
-    xAxis.normalize();
-    yAxis = linearInterpolate(rootPos, effPos, .5);
-    yAxis = upvPos - yAxis;
-    yAxis.normalize();
-    yAxis = rotateVectorAlongAxis(yAxis, rollAxis, data.roll);
-    zAxis = xAxis ^ yAxis;
-    zAxis.normalize();
-    yAxis = zAxis ^ xAxis;
-    yAxis.normalize();
-
-    // switch depending on our mode
-    if (name == "outA"){
-
-        // check if we need to rotate the bone
-        if (angleA != 0.0)
-            xAxis = rotateVectorAlongAxis(xAxis, zAxis, -angleA);
-
-        if (data.negate)
-            xAxis *= -1;
-        // cross the yAxis and normalize
-        yAxis = zAxis ^ xAxis;
-        yAxis.normalize();
-
-        // output the rotation
-        MQuaternion q = getQuaternionFromAxes(xAxis,yAxis,zAxis);
-        result.setRotationQuaternion(q.x, q.y, q.z, q.w);
-
-        // set the scaling + the position
-		double s[3] = {data.lengthA, global_scale, global_scale};
-		result.setScale(s, MSpace::kWorld);
-        result.setTranslation(rootPos, MSpace::kWorld);
-	}
-    else if (name == "outB"){
-
-        // check if we need to rotate the bone
-        if (angleA != 0.0)
-            xAxis = rotateVectorAlongAxis(xAxis, zAxis, -angleA);
-
-        // calculate the position of the elbow!
-        bonePos = xAxis * data.lengthA;
-        bonePos += rootPos;
-
-        // check if we need to rotate the bone
-        if (angleB != 0.0)
-            xAxis = rotateVectorAlongAxis(xAxis, zAxis, -(angleB - PI));
-
-        if (data.negate)
-            xAxis *= -1;
-
-        // cross the yAxis and normalize
-        yAxis = zAxis ^ xAxis;
-        yAxis.normalize();
-
-        // output the rotation
-        MQuaternion q = getQuaternionFromAxes(xAxis,yAxis,zAxis);
-        result.setRotationQuaternion(q.x, q.y, q.z, q.w);
-
-        // set the scaling + the position
-		double s[3] = {data.lengthB, global_scale, global_scale};
-		result.setScale(s, MSpace::kWorld);
-        result.setTranslation(bonePos, MSpace::kWorld);
-	}
-    else if (name == "outCenter"){
-
-        // check if we need to rotate the bone
-        if (angleA != 0.0)
-            xAxis = rotateVectorAlongAxis(xAxis, zAxis, -angleA);
-
-        // calculate the position of the elbow!
-        bonePos = xAxis * data.lengthA;
-        bonePos += rootPos;
-
-        // check if we need to rotate the bone
-        if (angleB != 0.0){
-            if (invert){
-                angleB += PI * 2;
-			}
-            xAxis = rotateVectorAlongAxis(xAxis, zAxis, -(angleB *.5 - PI*.5));
-		}
-
-
-        // cross the yAxis and normalize
-        // yAxis.Sub(upvPos,bonePos); // this was flipping the centerN when the elbow/upv was aligned to root/eff
-        zAxis = xAxis ^ yAxis;
-        zAxis.normalize();
-
-        if (data.negate)
-            xAxis *= -1;
-
-        yAxis = zAxis ^ xAxis;
-        yAxis.normalize();
-
-        // output the rotation
-        MQuaternion q = getQuaternionFromAxes(xAxis,yAxis,zAxis);
-        result.setRotationQuaternion(q.x, q.y, q.z, q.w);
-
-        // set the scaling + the position
-        // result.SetSclX(stretch * data["root.GetSclX());
-
-        result.setTranslation(bonePos, MSpace::kWorld);
-	}
-
-    else if (name == "outEff"){
-
-        // check if we need to rotate the bone
-        effPos = rootPos;
-        if (angleA != 0.0)
-            xAxis = rotateVectorAlongAxis(xAxis, zAxis, -angleA);
-
-        // calculate the position of the elbow!
-        bonePos = xAxis * data.lengthA;
-        effPos += bonePos;
-
-        // check if we need to rotate the bone
-        if (angleB != 0.0)
-            xAxis = rotateVectorAlongAxis(xAxis, zAxis, -(angleB - PI));
-
-        // calculate the position of the effector!
-        bonePos = xAxis * data.lengthB;
-        effPos += bonePos;
-
-        // output the rotation
-        result = data.eff;
-        result.setTranslation(effPos, MSpace::kWorld);
-	}
-
-    return result;
-}
-
-MTransformationMatrix mgear_ikfk2Bone::getFKTransform(s_GetFKTransform data, MString name){
-
-	// prepare all variables
-	MTransformationMatrix result;
-
-	MVector xAxis, yAxis, zAxis;
-
-	if (name == "outA"){
-		result = data.bone1;
-		xAxis = data.bone2.getTranslation(MSpace::kWorld) - data.bone1.getTranslation(MSpace::kWorld);
-
-		double scale[3] = {xAxis.length(), 1.0, 1.0};
-		result.setScale(scale, MSpace::kWorld);
-
-		if (data.negate)
-			xAxis *= -1;
-
-		// cross the yAxis and normalize
-		xAxis.normalize();
-
-		zAxis = MVector(0,0,1);
-		zAxis = zAxis.rotateBy(data.bone1.rotation());
-		yAxis = zAxis ^ xAxis;
-
-		// rotation
-		MQuaternion q = getQuaternionFromAxes(xAxis,yAxis,zAxis);
-		result.setRotationQuaternion(q.x, q.y, q.z, q.w);
-	}
-	else if (name == "outB"){
-
-		result = data.bone2;
-		xAxis = data.eff.getTranslation(MSpace::kWorld) - data.bone2.getTranslation(MSpace::kWorld);
-
-		double scale[3] = {xAxis.length(), 1.0, 1.0};
-		result.setScale(scale, MSpace::kWorld);
-
-		if (data.negate)
-			xAxis *= -1;
-
-		// cross the yAxis and normalize
-		xAxis.normalize();
-		yAxis = MVector(0,1,0);
-		yAxis = yAxis.rotateBy(data.bone2.rotation());
-		zAxis = xAxis ^ yAxis;
-		zAxis.normalize();
-		yAxis = zAxis ^ xAxis;
-		yAxis.normalize();
-
-		// rotation
-		MQuaternion q = getQuaternionFromAxes(xAxis,yAxis,zAxis);
-		result.setRotationQuaternion(q.x, q.y, q.z, q.w);
-	}
-	else if (name == "outCenter"){
-
-
-        // Only +/-180 degree with this one but we don't get the shear issue anymore
-        MTransformationMatrix t = mapWorldPoseToObjectSpace(data.bone1, data.bone2);
-		MEulerRotation er = t.eulerRotation();
-        er *= .5;
-        MQuaternion q = er.asQuaternion();
-        t.setRotationQuaternion(q.x, q.y, q.z, q.w);
-        t = mapObjectPoseToWorldSpace(data.bone1, t);
-        q = t.rotation();
-
-        result.setRotationQuaternion(q.x, q.y, q.z, q.w);
-
-		// rotation
-		result.setTranslation(data.bone2.getTranslation(MSpace::kWorld), MSpace::kWorld);
-	}
-	else if (name == "outEff")
-		result = data.eff;
-
-	return result;
-}
-
-
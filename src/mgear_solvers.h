@@ -58,6 +58,7 @@ Date:       2016 / 10 / 10
 #include <iostream>
 #include <algorithm>
 #include <cmath>
+#include <vector>
 
 #include <maya/MGlobal.h>
 #include <maya/MPxNode.h>
@@ -112,41 +113,13 @@ Date:       2016 / 10 / 10
 //#include <minmax.h>
 #include <cstdlib>
 
+// Maya free math core
+#include "mgear_kinematics.h"
 
 
-#define PI 3.14159265
-
 
-/////////////////////////////////////////////////
-// STRUCTS
-/////////////////////////////////////////////////
-struct s_GetFKTransform
-{
-   double lengthA;
-   double lengthB;
-   bool negate;
-   MTransformationMatrix root;
-   MTransformationMatrix bone1;
-   MTransformationMatrix bone2;
-   MTransformationMatrix eff;
-};
+#define PI 3.14159265
 
-struct s_GetIKTransform
-{
-   double lengthA;
-   double lengthB;
-   bool negate;
-   double roll;
-   double scaleA;
-   double scaleB;
-   double maxstretch;
-   double softness;
-   double slide;
-   double reverse;
-   MTransformationMatrix root;
-   MTransformationMatrix eff;
-   MTransformationMatrix	 upv;
-};
 
 /////////////////////////////////////////////////
 // CLASSES
@@ -413,8 +386,6 @@ class mgear_ikfk2Bone : public MPxNode
    virtual SchedulingType schedulingType() const;
    static void* creator();
    static MStatus initialize();
-   MTransformationMatrix getIKTransform(s_GetIKTransform values, MString outportName);
-   MTransformationMatrix getFKTransform(s_GetFKTransform values, MString outportName);
 
  public:
 
@@ -737,6 +708,13 @@ public:
 /////////////////////////////////////////////////
 // METHODS
 /////////////////////////////////////////////////
+mgear::Vec3 toVec3(const MVector& v);
+MVector toMVector(const mgear::Vec3& v);
+mgear::Quat toQuat(const MQuaternion& q);
+MQuaternion toMQuaternion(const mgear::Quat& q);
+mgear::Mat44 toMat44(const MMatrix& m);
+MMatrix toMMatrix(const mgear::Mat44& m);
+
 MQuaternion e2q(double x, double y, double z);
 MQuaternion slerp2(MQuaternion qA, MQuaternion qB, double blend);
 double clamp(double d, double min_value, double max_value);
@@ -57,3 +57,24 @@ def run_with_maya_standalone():
 def run_with_maya_pymel():
     import pymel.core
     yield
+
+
+@pytest.fixture
+def skin_data_dic():
+    """Factory of object skin data dictionaries, as collected on export
+
+    The factory takes the object name and its DenseWeights.
+    """
+
+    def data_dic(name, dense):
+        return {
+            'objName': name,
+            'nameSpace': '',
+            'skinClsName': name + '_skinCluster',
+            'skinningMethod': 0,
+            'normalizeWeights': 1,
+            'weights': dense.toSparse(),
+            'blendWeights': [0.0] * dense.vertexCount,
+        }
+
+    return data_dic
@@ -0,0 +1,97 @@
+"""mgear.core.anim_bake test, with a stubbed scene"""
+
+import sys
+import types
+
+import pytest
+
+
+def _translate(x, y, z):
+    return (1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1, 0, x, y, z, 1)
+
+
+@pytest.fixture
+def anim_bake(setup_path, monkeypatch):
+    # stub the Maya modules imported by anim_bake, not used by the stubs
+    maya = types.ModuleType("maya")
+    api = types.ModuleType("maya.api")
+    maya.cmds = types.ModuleType("maya.cmds")
+    maya.api = api
+    api.OpenMaya = types.ModuleType("maya.api.OpenMaya")
+    api.OpenMayaAnim = types.ModuleType("maya.api.OpenMayaAnim")
+    monkeypatch.setitem(sys.modules, "maya", maya)
+    monkeypatch.setitem(sys.modules, "maya.cmds", maya.cmds)
+    monkeypatch.setitem(sys.modules, "maya.api", api)
+    monkeypatch.setitem(sys.modules, "maya.api.OpenMaya", api.OpenMaya)
+    monkeypatch.setitem(
+        sys.modules, "maya.api.OpenMayaAnim", api.OpenMayaAnim
+    )
+    for name in ("mgear.core.anim_bake", "mgear.core.callbackManager"):
+        monkeypatch.delitem(sys.modules, name, raising=False)
+
+    # mGear imports
+    from mgear.core import anim_bake
+
+    monkeypatch.delitem(sys.modules, "mgear.core.anim_bake")
+    monkeypatch.delitem(sys.modules, "mgear.core.callbackManager")
+    return anim_bake
+
+
+def test_bake_nested(anim_bake, monkeypatch):
+    # |A|B, both at the origin before the bake, only translated
+    keys = {"|A": (0.0, 0.0, 0.0), "|A|B": (0.0, 0.0, 0.0)}
+    calls = {"samples": 0, "writes": []}
+
+    def world(path):
+        x, y, z = keys[path]
+        if path == "|A|B":
+            x, y, z = [a + b for a, b in zip((x, y, z), keys["|A"])]
+        return _translate(x, y, z)
+
+    def samplePlugs(attributes, frames):
+        calls["samples"] += 1
+        result = []
+        for attr in attributes:
+            path, plug = attr.split(".")
+            if plug == "worldMatrix[0]":
+                matrix = world(path)
+            elif path == "|A|B":
+                matrix = world("|A")
+            else:
+                matrix = _translate(0, 0, 0)
+            result.append([matrix for _ in frames])
+        return result
+
+    def setKeys(attributes, frames, values):
+        calls["writes"].append(dict(zip(attributes, values)))
+        for attr, attrValues in zip(attributes, values):
+            path, channel = attr.split(".")
+            index = ("tx", "ty", "tz").index(channel)
+            translate = list(keys[path])
+            translate[index] = attrValues[0]
+            keys[path] = tuple(translate)
+
+    cmds = anim_bake.cmds
+    monkeypatch.setattr(cmds, "ls", lambda n, long: [n], raising=False)
+    monkeypatch.setattr(anim_bake, "samplePlugs", samplePlugs)
+    monkeypatch.setattr(anim_bake, "setKeys", setKeys)
+    monkeypatch.setattr(anim_bake, "_unitFactors", lambda: (1.0, 1.0))
+    monkeypatch.setattr(
+        anim_bake, "_transformData", lambda *a: (0, None, None, None)
+    )
+    monkeypatch.setattr(anim_bake, "_keyableChannels", lambda p: [0, 1, 2])
+
+    anim_bake.bakeWorldMatrices(
+        ["|A|B", "|A"],
+        [1, 2],
+        [[_translate(1, 1, 0)] * 2, [_translate(1, 0, 0)] * 2],
+    )
+
+    # the first pass has the right values, the check doesn't rebake
+    assert calls["samples"] == 2
+    assert len(calls["writes"]) == 1
+    written = calls["writes"][0]
+    assert [round(v, 6) for v in written["|A|B.tx"]] == [0.0, 0.0]
+    assert [round(v, 6) for v in written["|A|B.ty"]] == [1.0, 1.0]
+    assert [round(v, 6) for v in written["|A.tx"]] == [1.0, 1.0]
+    assert keys == {"|A": (1.0, 0.0, 0.0), "|A|B": (0.0, 1.0, 0.0)}
@@ -0,0 +1,74 @@
+"""mgear.core.fcurve_eval test"""
+
+
+def _close(a, b, tol=1e-6):
+    return all(abs(x - y) < tol for x, y in zip(a, b))
+
+
+def test_hermite_segments(setup_path):
+    # mGear imports
+    from mgear.core.fcurve_eval import FCurve
+
+    # flat tangents, smooth step
+    fcv = FCurve([0, 1], [0, 1], [(1, 0)] * 2, [(1, 0)] * 2)
+    assert _close(fcv.sample(5), [0.0, 0.15625, 0.5, 0.84375, 1.0])
+    assert _close(fcv.sample(3, 2.0), [0.0, 1.0, 2.0])
+
+    # linear tangents, straight line
+    fcv = FCurve([0, 0.5, 1], [0, 1, 2], [(1, 2)] * 3, [(1, 2)] * 3)
+    assert _close(fcv.sample(5), [0.0, 0.5, 1.0, 1.5, 2.0])
+
+    # squash profile like curve, symmetric around the mid key
+    fcv = FCurve([0, 0.5, 1], [0, 1, 0], [(1, 0)] * 3, [(1, 0)] * 3)
+    values = fcv.sample(11)
+    assert values[5] == 1.0
+    assert _close(values, values[::-1])
+
+
+def test_weighted_and_steps(setup_path):
+    # mGear imports
+    from mgear.core.fcurve_eval import FCurve, STEP, STEP_NEXT
+
+    # weighted linear tangents are a straight line
+    fcv = FCurve([0, 2], [0, 4], [(3, 6)] * 2, [(3, 6)] * 2, weighted=True)
+    assert _close(fcv.evaluate([0.5, 1.0, 1.5]), [1.0, 2.0, 3.0])
+    # same slopes as the not weighted curve, but longer tangents
+    hermite = FCurve([0, 1], [0, 1], [(1, 0)] * 2, [(1, 0)] * 2)
+    weighted = FCurve(
+        [0, 1], [0, 1], [(3, 0)] * 2, [(3, 0)] * 2, weighted=True
+    )
+    assert _close(weighted.evaluate([0.5]), [0.5])
+    assert _close(
+        FCurve(
+            [0, 1], [0, 1], [(1, 0)] * 2, [(1, 0)] * 2, weighted=True
+        ).evaluate([0.25, 0.5, 0.75]),
+        hermite.evaluate([0.25, 0.5, 0.75]),
+    )
+
+    fcv = FCurve(
+        [0, 1, 2], [0, 1, 2], [(1, 1)] * 3, [(1, 1)] * 3,
+        steps=[STEP, STEP_NEXT, STEP],
+    )
+    assert fcv.evaluate([0.0, 0.5, 1.0, 1.5, 2.0]) == [0, 0, 1, 2, 2]
+
+
+def test_infinity(setup_path):
+    # mGear imports
+    from mgear.core import fcurve_eval
+    from mgear.core.fcurve_eval import FCurve
+
+    args = ([0, 1], [0, 1], [(1, 1)] * 2, [(1, 1)] * 2)
+    fcv = FCurve(*args)
+    assert fcv.evaluate([-1.0, 2.0]) == [0.0, 1.0]
+    fcv = FCurve(
+        *args,
+        preInfinity=fcurve_eval.LINEAR,
+        postInfinity=fcurve_eval.CYCLE_RELATIVE
+    )
+    assert _close(fcv.evaluate([-1.0, 1.5, 2.25]), [-1.0, 1.5, 2.25])
+    fcv = FCurve(
+        *args,
+        preInfinity=fcurve_eval.CYCLE,
+        postInfinity=fcurve_eval.OSCILLATE
+    )
+    assert _close(fcv.evaluate([-0.75, 1.25, 2.25]), [0.25, 0.75, 0.25])
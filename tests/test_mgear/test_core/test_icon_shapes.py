@@ -0,0 +1,226 @@
+"""mgear.core.icon_shapes test"""
+
+import math
+
+
+def test_transform_points(setup_path):
+    # mGear imports
+    from mgear.core import icon_shapes
+
+    # rotateBy kXYZ: X first, then Y, then Z
+    points = icon_shapes.transform_points(
+        [(1, 0, 0), (0, 1, 0)],
+        scale=(2, 1, 1),
+        rotation=(math.pi / 2, 0, math.pi / 2),
+        offset=(0, 0, 1),
+    )
+    expected = [(0, 2, 1), (0, 0, 2)]
+    for p, e in zip(points, expected):
+        assert all(abs(a - b) < 1e-9 for a, b in zip(p, e))
+
+
+def test_shape_curves(setup_path):
+    # mGear imports
+    from mgear.core import icon_shapes
+
+    assert "cube" in icon_shapes.shape_names()
+    ((points, closed, degree),) = icon_shapes.shape_curves(
+        "cube", width=2, height=4, depth=6
+    )
+    assert points[0] == (1.0, 2.0, 3.0)
+    assert (closed, degree) == (False, 1)
+
+    circle = icon_shapes.shape_curves("circle", degree=1)
+    assert [(c, d) for _, c, d in circle] == [(True, 1)]
+    assert len(icon_shapes.shape_curves("cylinder", degree=3)) == 6
+
+
+def test_curve_data(setup_path):
+    # mGear imports
+    from mgear.core import icon_shapes
+
+    square = [(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0)]
+    cvs, knots, spans, form = icon_shapes.curve_data(square, True, 3)
+    assert len(cvs) == 7 and cvs[-3:] == square[:3]
+    assert knots == [float(k) for k in range(9)]
+    assert (spans, form) == (4, 2)
+
+    cvs, knots, spans, form = icon_shapes.curve_data(square, False, 3)
+    assert knots == [0.0, 0.0, 0.0, 1.0, 1.0, 1.0]
+    assert (spans, form) == (1, 0)
+
+
+# the point lists of the icon functions before they used the templates,
+# for width w, height h and depth d
+
+
+def _circle_points(w, y=0.0):
+    dlen = w * 0.5
+    return [
+        (0, y, -dlen * 1.108),
+        (dlen * .78, y, -dlen * .78),
+        (dlen * 1.108, y, 0),
+        (dlen * .78, y, dlen * .78),
+        (0, y, dlen * 1.108),
+        (-dlen * .78, y, dlen * .78),
+        (-dlen * 1.108, y, 0),
+        (-dlen * .78, y, -dlen * .78),
+    ]
+
+
+def _reference_points(icon, w, h, d, degree):
+    lx, ly, lz = w * .5, h * .5, d * .5
+    if icon == "cube":
+        ppp, ppN, pNp, Npp = (lx, ly, lz), (lx, ly, -lz), (lx, -ly, lz), (
+            -lx, ly, lz)
+        pNN, NNp, NpN, NNN = (lx, -ly, -lz), (-lx, -ly, lz), (
+            -lx, ly, -lz), (-lx, -ly, -lz)
+        return [[ppp, ppN, NpN, NNN, NNp, Npp, NpN, Npp, ppp, pNp, NNp,
+                 pNp, pNN, ppN, pNN, NNN]]
+    if icon == "pyramid":
+        top = (0, h, 0)
+        pp, pN, Np, NN = (lx, 0, lz), (lx, 0, -lz), (-lx, 0, lz), (
+            -lx, 0, -lz)
+        return [[pp, top, pN, pp, Np, top, NN, Np, NN, pN]]
+    if icon == "square":
+        return [[(lx, 0, lz), (lx, 0, -lz), (-lx, 0, -lz), (-lx, 0, lz)]]
+    if icon == "flower":
+        return [[(0, -w, 0), (-w * .4, w * .4, 0), (w, 0, 0),
+                 (-w * .4, -w * .4, 0), (0, w, 0), (w * .4, -w * .4, 0),
+                 (-w, 0, 0), (w * .4, w * .4, 0)]]
+    if icon == "circle":
+        return [_circle_points(w)]
+    if icon == "cylinder":
+        mult = 1 if degree == 3 else 1.108
+        return [
+            _circle_points(w, ly),
+            _circle_points(w, -ly),
+            [(0, ly, -lx * mult), (0, -ly, -lx * mult)],
+            [(0, -ly, lx * mult), (0, ly, lx * mult)],
+            [(lx * mult, ly, 0), (lx * mult, -ly, 0)],
+            [(-lx * mult, -ly, 0), (-lx * mult, ly, 0)],
+        ]
+    if icon == "compas":
+        points = []
+        v = (0, 0, lx)
+        step = 2 * math.pi / 24.0
+        for i in range(24):
+            points.append((v[0], v[1], v[2] - lx * .4) if i == 12 else v)
+            v = (
+                v[0] * math.cos(step) + v[2] * math.sin(step),
+                v[1],
+                -v[0] * math.sin(step) + v[2] * math.cos(step),
+            )
+        return [points]
+    if icon == "diamond":
+        top, bottom = (0, lx, 0), (0, -lx, 0)
+        pp, pN, Np, NN = (lx, 0, lx), (lx, 0, -lx), (-lx, 0, lx), (
+            -lx, 0, -lx)
+        return [[pp, top, pN, pp, Np, top, NN, Np, NN, pN, bottom, NN,
+                 bottom, Np, bottom, pp]]
+    if icon == "cubewithpeak":
+        peak = (0, w, 0)
+        ppp, ppN, pNp, Npp = (lx, lx, lx), (lx, lx, -lx), (lx, 0, lx), (
+            -lx, lx, lx)
+        pNN, NNp, NpN, NNN = (lx, 0, -lx), (-lx, 0, lx), (-lx, lx, -lx), (
+            -lx, 0, -lx)
+        return [[peak, ppp, ppN, peak, NpN, ppN, NpN, peak, Npp, NpN, NNN,
+                 NNp, Npp, NpN, Npp, ppp, pNp, NNp, pNp, pNN, ppN, pNN,
+                 NNN]]
+    if icon == "arrow":
+        return [[(0, .3 * lx, -lx), (0, .3 * lx, .3 * lx),
+                 (0, .6 * lx, .3 * lx), (0, 0, lx), (0, -.6 * lx, .3 * lx),
+                 (0, -.3 * lx, .3 * lx), (0, -.3 * lx, -lx)]]
+    if icon == "crossarrow":
+        xz = [(.2, .2), (.2, .6), (.4, .6), (0, 1), (-.4, .6), (-.2, .6),
+              (-.2, .2), (-.6, .2), (-.6, .4), (-1, 0), (-.6, -.4),
+              (-.6, -.2), (-.2, -.2), (-.2, -.6), (-.4, -.6), (0, -1),
+              (.4, -.6), (.2, -.6), (.2, -.2), (.6, -.2), (.6, -.4),
+              (1, 0), (.6, .4), (.6, .2)]
+        return [[(x * lx, 0, z * lx) for x, z in xz]]
+    if icon == "cross":
+        c = w * .35
+        o1, o2 = c * .5, c * 1.5
+        return [[(c, o2, 0), (o2, c, 0), (o1, 0, 0), (o2, -c, 0),
+                 (c, -o2, 0), (0, -o1, 0), (-c, -o2, 0), (-o2, -c, 0),
+                 (-o1, 0, 0), (-o2, c, 0), (-c, o2, 0), (0, o1, 0)]]
+    if icon == "null":
+        return [[(lx, 0, 0), (-lx, 0, 0)], [(0, lx, 0), (0, -lx, 0)],
+                [(0, 0, lx), (0, 0, -lx)]]
+    raise KeyError(icon)
+
+
+# closed and degree of the curves of the icon functions, None is the
+# requested degree
+_REFERENCE_CURVES = {
+    "cube": [(False, 1)],
+    "pyramid": [(False, 1)],
+    "square": [(True, 1)],
+    "flower": [(True, None)],
+    "circle": [(True, None)],
+    "cylinder": [(True, None)] * 2 + [(True, 1)] * 4,
+    "compas": [(True, None)],
+    "diamond": [(False, 1)],
+    "cubewithpeak": [(False, 1)],
+    "sphere": [(True, None)] * 3,
+    "arrow": [(True, 1)],
+    "crossarrow": [(True, 1)],
+    "cross": [(True, 1)],
+    "null": [(False, 1)] * 3,
+}
+
+
+def _assert_points(points, expected):
+    assert len(points) == len(expected)
+    for p, e in zip(points, expected):
+        assert all(abs(a - b) < 1e-6 for a, b in zip(p, e)), (p, e)
+
+
+def test_template_parity(setup_path):
+    # mGear imports
+    from mgear.core import icon_shapes
+
+    po = (0.5, -1.0, 2.0)
+    ro = (0.3, -0.7, 1.1)
+    assert sorted(_REFERENCE_CURVES) == icon_shapes.shape_names()
+    for icon in icon_shapes.shape_names():
+        if icon == "sphere":
+            continue
+        for degree in (1, 3):
+            reference = _reference_points(icon, 2.0, 3.0, 5.0, degree)
+            curves = icon_shapes.shape_curves(
+                icon, 2.0, 3.0, 5.0, po, ro, degree
+            )
+            assert [
+                (c, degree if d is None else d)
+                for c, d in _REFERENCE_CURVES[icon]
+            ] == [(c, d) for _, c, d in curves], icon
+            assert len(curves) == len(reference), icon
+            for (points, _, _), expected in zip(curves, reference):
+                _assert_points(
+                    points, icon_shapes.transform_points(
+                        expected, rotation=ro, offset=po
+                    )
+                )
+
+
+def test_sphere_parity(setup_path):
+    # mGear imports
+    from mgear.core import icon_shapes
+
+    # icon.sphere adds the euler angles of each circle to the offset
+    circle = _circle_points(2.0)
+    for ro in (None, (0.3, -0.7, 1.1)):
+        base = ro or (0.0, 0.0, 0.0)
+        rotations = [
+            base,
+            (base[0] + 1.5708, base[1], base[2]),
+            (base[0] + 6.2832, base[1], base[2] + 4.7124),
+        ]
+        curves = icon_shapes.shape_curves("sphere", 2.0, rot_offset=ro)
+        for (points, closed, degree), rotation in zip(curves, rotations):
+            assert (closed, degree) == (True, 3)
+            _assert_points(
+                points,
+                icon_shapes.transform_points(circle, rotation=rotation),
+            )
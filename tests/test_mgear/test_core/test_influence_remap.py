@@ -0,0 +1,37 @@
+"""mgear.core.influence_remap test"""
+
+
+def test_build_influence_remap(setup_path):
+    # mGear imports
+    from mgear.core.influence_remap import buildInfluenceRemap
+
+    target = ["arm_L0_0_jnt", "arm_R0_0_jnt", "spine_C0_0_jnt", "head_jnt"]
+    source = ["char:arm_L0_0_jnt", "old_spine_jnt", "tail_jnt", "neck_jnt"]
+    result = buildInfluenceRemap(
+        source,
+        target,
+        swapSides=True,
+        renames=[("^old_spine_jnt$", "spine_C0_0_jnt")],
+        nearest=True,
+        sourcePositions={"neck_jnt": (0, 9, 0)},
+        targetPositions=[(1, 5, 0), (-1, 5, 0), (0, 4, 0), (0, 10, 0)],
+    )
+    assert result["indices"] == [1, 2, -1, 3]
+    assert result["mapped"] == {
+        "char:arm_L0_0_jnt": "arm_R0_0_jnt",
+        "old_spine_jnt": "spine_C0_0_jnt",
+    }
+    assert result["nearest"] == {"neck_jnt": "head_jnt"}
+    assert result["unmapped"] == ["tail_jnt"]
+
+    strict = buildInfluenceRemap(source, target, stripNamespace=False)
+    assert strict["unmapped"] == source
+
+
+def test_remap_indices_merge(setup_path):
+    # mGear imports
+    from mgear.core.weight_array import DenseWeights
+
+    sparse = DenseWeights(["a", "b", "c"], 2, [0.5, 0.25, 0.25, 0, 0, 1])
+    remapped = sparse.toSparse().remapIndices(["x", "y"], [1, 1, -1])
+    assert list(remapped.toDense().values) == [0.0, 0.75, 0.0, 0.0]
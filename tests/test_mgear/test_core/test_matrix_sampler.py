@@ -0,0 +1,49 @@
+"""mgear.core.matrix_sampler test"""
+
+
+def _sampler(calls):
+    # mGear imports
+    from mgear.core.matrix_sampler import MatrixSampler
+
+    def evaluate(handles, frame):
+        calls.append((frame, sorted(handles)))
+        return [(h, frame) for h in handles]
+
+    return MatrixSampler(evaluate, resolve=lambda attr: attr.upper())
+
+
+def test_requests_are_merged(setup_path):
+    calls = []
+    sampler = _sampler(calls)
+    sampler.request(["a", "b"], [1, 2, 3])
+    sampler.request(["c"], [2, 3, 4])
+    values = sampler.get(["a"], [1, 2])
+    # one evaluation per frame for all the requests
+    assert [c[0] for c in calls] == [1, 2, 3, 4]
+    assert calls[1] == (2, ["A", "B", "C"])
+    assert values == [[("A", 1), ("A", 2)]]
+    assert sampler.evaluations == 4
+
+    # cached
+    assert sampler.get(["c", "b"], [3]) == [[("C", 3)], [("B", 3)]]
+    assert len(calls) == 4
+    # only the missing frames are sampled
+    sampler.get(["a"], [3, 4, 5])
+    assert calls[4:] == [(4, ["A"]), (5, ["A"])]
+
+
+def test_clear_and_hold(setup_path):
+    calls = []
+    sampler = _sampler(calls)
+    sampler.get(["a"], [1])
+    sampler.clear()
+    sampler.get(["a"], [1])
+    assert len(calls) == 2
+
+    with sampler.hold():
+        sampler.clear()
+        sampler.get(["a"], [1])
+        assert len(calls) == 2
+    # the clear is done at the end of the hold
+    sampler.get(["a"], [1])
+    assert len(calls) == 3
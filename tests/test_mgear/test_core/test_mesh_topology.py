@@ -0,0 +1,121 @@
+"""mgear.core.mesh_topology test"""
+
+
+def _grid(size):
+    # size x size quads in the XZ plane, (size + 1) ** 2 vertices
+    row = size + 1
+    counts = []
+    connects = []
+    for j in range(size):
+        for i in range(size):
+            v = j * row + i
+            counts.append(4)
+            connects.extend([v, v + 1, v + row + 1, v + row])
+    points = [(i, 0, j) for j in range(row) for i in range(row)]
+    return counts, connects, points
+
+
+def _cube():
+    counts = [4] * 6
+    connects = [
+        0, 1, 3, 2,
+        2, 3, 5, 4,
+        4, 5, 7, 6,
+        6, 7, 1, 0,
+        1, 7, 5, 3,
+        6, 0, 2, 4,
+    ]
+    return counts, connects
+
+
+def _vertices(topology, edges):
+    return [topology.edge_vertices[e] for e in edges]
+
+
+def test_edge_loop_and_ring(setup_path):
+    # mGear imports
+    from mgear.core import mesh_topology
+
+    counts, connects, _ = _grid(3)
+    topo = mesh_topology.MeshTopology(counts, connects)
+    assert topo.vertex_count == 16
+    assert len(topo.edge_vertices) == 24
+
+    # interior row of the grid, from border to border
+    loop = topo.edge_loop(topo.edge_index(5, 6))
+    assert _vertices(topo, loop) == [(4, 5), (5, 6), (6, 7)]
+    # border loops follow the border, up to the corners
+    loop = topo.edge_loop(topo.edge_index(1, 2))
+    assert _vertices(topo, loop) == [(0, 1), (1, 2), (2, 3)]
+
+    ring = topo.edge_ring(topo.edge_index(5, 9))
+    assert sorted(_vertices(topo, ring)) == [
+        (4, 8), (5, 9), (6, 10), (7, 11)
+    ]
+
+    # the cube rings are closed, the loops stop at the 3 edges vertices
+    topo = mesh_topology.MeshTopology(*_cube())
+    assert len(topo.edge_ring(topo.edge_index(0, 1))) == 4
+    assert topo.edge_loop(topo.edge_index(0, 1)) == [topo.edge_index(0, 1)]
+
+    # open tube of 2 rows of 4 quads, the mid loop is closed
+    connects = []
+    for j in range(2):
+        for i in range(4):
+            v = j * 4
+            connects.extend(
+                [v + i, v + (i + 1) % 4, v + 4 + (i + 1) % 4, v + 4 + i]
+            )
+    topo = mesh_topology.MeshTopology([4] * 8, connects)
+    loop = topo.edge_loop(topo.edge_index(4, 5))
+    assert sorted(_vertices(topo, loop)) == [(4, 5), (4, 7), (5, 6), (6, 7)]
+
+
+def test_edge_loop_path(setup_path):
+    # mGear imports
+    from mgear.core import mesh_topology
+
+    counts, connects, _ = _grid(3)
+    topo = mesh_topology.MeshTopology(counts, connects)
+    path = topo.edge_loop_path(4, 7)
+    assert _vertices(topo, path) == [(4, 5), (5, 6), (6, 7)]
+    path = topo.edge_loop_path(13, 1)
+    assert _vertices(topo, path) == [(9, 13), (5, 9), (1, 5)]
+    # not in the same loop
+    assert topo.edge_loop_path(5, 10) is None
+
+
+def test_concentric_loops_and_rows(setup_path):
+    # mGear imports
+    from mgear.core import mesh_topology
+
+    counts, connects, _ = _grid(4)
+    topo = mesh_topology.MeshTopology(counts, connects)
+    loops = topo.concentric_loops([12], 2)
+    assert loops[0] == [12]
+    assert sorted(loops[1]) == [7, 11, 13, 17]
+    assert sorted(loops[2]) == [2, 6, 8, 10, 14, 16, 18, 22]
+
+    rows = topo.vertex_rows([[12, 13], [7, 8, 14, 17, 18, 11]])
+    assert rows[0] == [12, 7, 11, 17]
+    assert rows[1] == [13, 8, 14, 18]
+
+
+def test_shortest_path_and_cache(setup_path):
+    # mGear imports
+    from mgear.core import mesh_topology
+
+    counts, connects, points = _grid(3)
+    topo = mesh_topology.get_topology(counts, connects)
+    path = topo.shortest_path(0, 15)
+    assert len(path) == 7 and path[0] == 0 and path[-1] == 15
+    assert all(e >= 0 for e in topo.path_edges(path))
+
+    # longer edges on the first column, the path avoids them
+    points = [(p[0] * 10 if p[0] else 0, p[1], p[2]) for p in points]
+    path = topo.shortest_path(1, 13, points)
+    assert path == [1, 5, 9, 13]
+
+    assert mesh_topology.get_topology(list(counts), list(connects)) is topo
+    mesh_topology.clear_topology_cache()
+    assert mesh_topology.get_topology(counts, connects) is not topo
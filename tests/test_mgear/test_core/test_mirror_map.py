@@ -0,0 +1,80 @@
+"""mgear.core.mirror_map test"""
+
+import pytest
+
+
+def _map():
+    # mGear imports
+    from mgear.core.mirror_map import MirrorMap
+
+    mirror = MirrorMap()
+    mirror.add("arm_L0_ctl", "arm_R0_ctl", [("tx", "tx", -1), ("ry", "ry", 1)])
+    mirror.add("arm_R0_ctl", "arm_L0_ctl", [("tx", "tx", -1), ("ry", "ry", 1)])
+    mirror.add("body_C0_ctl", "body_C0_ctl", [("tx", "tx", -1)])
+    return mirror
+
+
+def test_mirror(setup_path):
+    mirror = _map()
+    assert "arm_L0_ctl" in mirror
+    assert "hand_L0_ctl" not in mirror
+    assert len(mirror) == 3
+
+    plan = mirror.plan(["arm_L0_ctl", "body_C0_ctl"])
+    assert mirror.reads(plan) == [
+        ("arm_L0_ctl", "tx"),
+        ("arm_L0_ctl", "ry"),
+        ("body_C0_ctl", "tx"),
+    ]
+    values = {
+        ("arm_L0_ctl", "tx"): 2.0,
+        ("arm_L0_ctl", "ry"): 30.0,
+        ("body_C0_ctl", "tx"): 1.0,
+    }
+    assert sorted(mirror.writes(plan, values)) == [
+        ("arm_R0_ctl", "ry", 30.0),
+        ("arm_R0_ctl", "tx", -2.0),
+        ("body_C0_ctl", "tx", -1.0),
+    ]
+
+
+def test_flip(setup_path):
+    mirror = _map()
+    plan = mirror.plan(["arm_L0_ctl"], flip=True)
+    values = {
+        ("arm_L0_ctl", "tx"): 2.0,
+        ("arm_L0_ctl", "ry"): 30.0,
+        ("arm_R0_ctl", "tx"): -5.0,
+        ("arm_R0_ctl", "ry"): 10.0,
+    }
+    assert sorted(mirror.writes(plan, values)) == [
+        ("arm_L0_ctl", "ry", 10.0),
+        ("arm_L0_ctl", "tx", 5.0),
+        ("arm_R0_ctl", "ry", 30.0),
+        ("arm_R0_ctl", "tx", -2.0),
+    ]
+    # both sides selected, not copied twice
+    plan = mirror.plan(["arm_L0_ctl", "arm_R0_ctl"], flip=True)
+    assert len(plan) == 4
+
+
+def test_copies(setup_path):
+    mirror = _map()
+    plan = mirror.plan(["arm_L0_ctl", "arm_R0_ctl"], flip=True)
+    plan.append(("body_C0_ctl", "tx", "arm_R0_ctl", "tx", 1))
+    copies = mirror.copies(plan)
+    assert len(copies) == 4
+    assert ("body_C0_ctl", "tx", "arm_R0_ctl", "tx", 1) in copies
+    assert ("arm_L0_ctl", "tx", "arm_R0_ctl", "tx", -1) not in copies
+
+
+def test_cycle_offset(setup_path):
+    # mGear imports
+    from mgear.core.mirror_map import cycleOffset
+
+    assert cycleOffset(12, (1, 25)) == 12
+    assert cycleOffset(30, (1, 25)) == 6
+    assert cycleOffset(-6, (1, 25)) == 18
+    assert cycleOffset(24, (1, 25)) == 0
+    with pytest.raises(ValueError):
+        cycleOffset(12, (10, 10))
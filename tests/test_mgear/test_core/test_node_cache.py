@@ -0,0 +1,30 @@
+"""mgear.core.node_cache test"""
+
+
+def test_node_cache(setup_path):
+    # mGear imports
+    from mgear.core.node_cache import NodeCache
+
+    alive = {"rig:arm_L0_ctl"}
+
+    def validate(key, value):
+        return ":".join(key) in alive and value == key[1]
+
+    cache = NodeCache(validate)
+    key = ("rig", "arm_L0_ctl")
+    assert cache.get(key) is None
+    cache.add(key, "arm_L0_ctl")
+    assert cache.get(key) == "arm_L0_ctl"
+    assert cache.get(key) == "arm_L0_ctl"
+    assert (cache.hits, cache.misses) == (2, 1)
+    assert "66.7% hit rate" in cache.report()
+
+    # deleted or renamed, dropped on access
+    alive.clear()
+    assert cache.get(key) is None
+    assert len(cache) == 0
+
+    cache.add(key, "arm_L0_ctl")
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.hitRate() == 0.5
@@ -0,0 +1,105 @@
+"""mgear.core.nurbs test"""
+
+
+def _close(a, b, tol=1e-6):
+    return all(abs(x - y) < tol for x, y in zip(a, b))
+
+
+def test_evaluate_matches_cox_de_boor(setup_path):
+    # mGear imports
+    from mgear.core import nurbs
+
+    points = [
+        (0, 0, 0),
+        (1, 2, 0),
+        (3, 2, 1),
+        (4, 0, 1),
+        (6, 1, 2),
+        (7, 3, 0),
+    ]
+    knots = nurbs.uniform_knots(len(points), 3)
+    weights = [1.0, 2.0, 0.5, 1.0, 1.5, 1.0]
+    percentages = [0.0, 12.5, 33.0, 50.0, 99.0]
+    (positions,) = nurbs.evaluate_percentages(
+        points, percentages, knots=knots, weights=weights
+    )
+    for pct, pos in zip(percentages, positions):
+        ref = nurbs.evaluate_cubic_nurbs(points, pct, knots, weights)
+        assert _close(pos, ref)
+
+    # clamped curves interpolate the end points
+    (ends,) = nurbs.evaluate_percentages(points, [0.0, 100.0])
+    assert _close(ends[0], points[0]) and _close(ends[1], points[-1])
+
+
+def test_rational_derivatives(setup_path):
+    # mGear imports
+    from mgear.core import nurbs
+
+    # quarter circle of radius 1, degree 2
+    points = [(1, 0, 0), (1, 1, 0), (0, 1, 0)]
+    weights = [1.0, 0.5 ** 0.5, 1.0]
+    params = [0.1, 0.4, 0.7]
+    positions, first, second = nurbs.evaluate(
+        points, params, degree=2, weights=weights, derivs=2
+    )
+    for pos in positions:
+        assert abs(sum(c * c for c in pos) - 1.0) < 1e-9
+
+    h = 1e-5
+    plus = nurbs.evaluate(
+        points, [u + h for u in params], 2, weights=weights, derivs=1
+    )
+    minus = nurbs.evaluate(
+        points, [u - h for u in params], 2, weights=weights, derivs=1
+    )
+    for i in range(len(params)):
+        fd1 = [(a - b) / (2 * h) for a, b in zip(plus[0][i], minus[0][i])]
+        fd2 = [(a - b) / (2 * h) for a, b in zip(plus[1][i], minus[1][i])]
+        assert _close(first[i], fd1, 1e-5)
+        assert _close(second[i], fd2, 1e-4)
+
+
+def test_frames(setup_path):
+    # mGear imports
+    from mgear.core import nurbs
+
+    points = [(0, 0, 0), (1, 1, 0), (2, 0, 1), (3, 1, 1), (4, 0, 0)]
+    params = [i * 0.1 for i in range(21)]
+    positions, first, second = nurbs.evaluate(points, params, derivs=2)
+    for frames in (
+        nurbs.frenet_frames(first, second),
+        nurbs.parallel_transport_frames(positions, first, up=(0, 1, 0)),
+    ):
+        assert len(frames) == len(params)
+        for t, n, b in frames:
+            assert abs(nurbs._dot(t, n)) < 1e-6
+            assert abs(nurbs._dot(n, n) - 1.0) < 1e-6
+            assert _close(nurbs._cross(t, n), b)
+
+
+def test_arc_length_table(setup_path):
+    # Standard
+    import math
+
+    # mGear imports
+    from mgear.core import nurbs
+
+    # quarter circle of radius 1, degree 2
+    points = [(1, 0, 0), (1, 1, 0), (0, 1, 0)]
+    weights = [1.0, 0.5 ** 0.5, 1.0]
+    nurbs.clear_arc_length_cache()
+    table = nurbs.get_arc_length_table(points, 2, weights=weights)
+    assert nurbs.get_arc_length_table(points, 2, weights=weights) is table
+    assert abs(table.length - math.pi / 2) < 1e-9
+
+    params = table.uniform_params(5)
+    (positions,) = table.evaluate(params)
+    angles = [math.degrees(math.atan2(p[1], p[0])) for p in positions]
+    assert _close(angles, [0.0, 22.5, 45.0, 67.5, 90.0])
+    lengths = table.lengths_at_params(params)
+    assert _close(lengths, [i * math.pi / 8 for i in range(5)])
+    assert _close(table.params_at_lengths(lengths), params)
+
+    moved = [(2, 0, 0), (2, 2, 0), (0, 2, 0)]
+    assert nurbs.get_arc_length_table(moved, 2, weights=weights) is not table
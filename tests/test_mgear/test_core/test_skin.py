@@ -0,0 +1,97 @@
+"""mgear.core.skin test, with a stubbed scene"""
+
+import os
+import sys
+import types
+
+import pytest
+
+
+class _Node(object):
+    def __init__(self, name):
+        self._name = name
+
+    def name(self):
+        return self._name
+
+    def stripNamespace(self):
+        return self._name
+
+
+@pytest.fixture
+def skin(setup_path, monkeypatch):
+    # stub the Maya modules imported by skin, not used by the export
+    pymel = types.ModuleType("pymel")
+    pymel.core = types.ModuleType("pymel.core")
+    for name in ("displayInfo", "displayWarning", "displayError"):
+        setattr(pymel.core, name, lambda *args: None)
+    maya = types.ModuleType("maya")
+    maya.cmds = types.ModuleType("maya.cmds")
+    maya.OpenMaya = types.ModuleType("maya.OpenMaya")
+    maya.api = types.ModuleType("maya.api")
+    maya.api.OpenMaya = types.ModuleType("maya.api.OpenMaya")
+    maya.api.OpenMayaAnim = types.ModuleType("maya.api.OpenMayaAnim")
+    for module in (
+        pymel,
+        pymel.core,
+        maya,
+        maya.cmds,
+        maya.OpenMaya,
+        maya.api,
+        maya.api.OpenMaya,
+        maya.api.OpenMayaAnim,
+    ):
+        monkeypatch.setitem(sys.modules, module.__name__, module)
+    # mGear imports
+    import mgear.core
+
+    # import skin again with the stubs
+    monkeypatch.delitem(sys.modules, "mgear.core.skin", raising=False)
+    monkeypatch.delattr(mgear.core, "skin", raising=False)
+    from mgear.core import skin
+
+    return skin
+
+
+@pytest.mark.parametrize("use_bin", [False, True])
+def test_reexport_keeps_linked_files(
+    skin, monkeypatch, tmp_path, skin_data_dic, use_bin
+):
+    # mGear imports
+    from mgear.core.weight_array import DenseWeights
+
+    weights = {"body": DenseWeights(["a", "b"], 2, [1.0, 0.0, 0.5, 0.5])}
+    monkeypatch.setattr(
+        skin,
+        "collectSkinData",
+        lambda obj, ext: skin_data_dic(obj.name(), weights["body"]),
+    )
+    objs = [_Node("body")]
+    ext = skin.FILE_BIN_EXT if use_bin else skin.FILE_EXT
+    packA = str(tmp_path / "a" / ("pack" + skin.PACK_EXT))
+    packB = str(tmp_path / "b" / ("pack" + skin.PACK_EXT))
+    for packPath in (packA, packB):
+        os.makedirs(os.path.dirname(packPath))
+    fileA = os.path.join(os.path.dirname(packA), "body" + ext)
+    fileB = os.path.join(os.path.dirname(packB), "body" + ext)
+
+    skin.exportSkinPack(packA, objs, use_bin=use_bin, incremental=True)
+    skin.exportSkinPack(packB, objs, use_bin=use_bin, incremental=packA)
+    if hasattr(os, "link"):
+        assert os.path.samefile(fileA, fileB)
+    with open(fileB, "rb") as fp:
+        published = fp.read()
+
+    # the source pack is exported again, with new weights
+    weights["body"] = DenseWeights(["a", "b"], 2, [0.0, 1.0, 0.5, 0.5])
+    skin.exportSkinPack(packA, objs, use_bin=use_bin)
+    with open(fileB, "rb") as fp:
+        assert fp.read() == published
+    with open(fileA, "rb") as fp:
+        assert fp.read() != published
+    assert not os.path.samefile(fileA, fileB)
+    # the temporary files are moved, the manifest is removed
+    expected = ["pack" + skin.PACK_EXT, "body" + ext]
+    if not use_bin:
+        expected.append(os.path.basename(skin.skin_format.getIndexPath(fileA)))
+    assert sorted(os.listdir(os.path.dirname(packA))) == sorted(expected)
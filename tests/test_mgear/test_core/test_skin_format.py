@@ -0,0 +1,64 @@
+"""mgear.core.skin_format test"""
+
+
+def test_write_read_roundtrip(setup_path, tmp_path, skin_data_dic):
+    # mGear imports
+    from mgear.core import skin_format
+    from mgear.core.weight_array import DenseWeights
+
+    dense = DenseWeights(["a", "b"], 3, [1.0, 0.0, 0.5, 0.5, 0.0, 1.0])
+    other = DenseWeights(["c"], 2, [1.0, 1.0])
+    path = str(tmp_path / ("pack" + skin_format.FILE_BIN_EXT))
+    skin_format.writeSkinFile(
+        path, [skin_data_dic("body", dense), skin_data_dic("eye", other)]
+    )
+
+    assert skin_format.isSkinFile(path)
+    assert [e["objName"] for e in skin_format.readIndex(path)] == [
+        "body",
+        "eye",
+    ]
+    with skin_format.SkinFileReader(path) as reader:
+        assert reader.objects() == ["body", "eye"]
+        assert reader.validate(checksum=True) == []
+        data = reader.readDataDic("body")
+        assert data["vertexCount"] == 3
+        assert data["skinClsName"] == "body_skinCluster"
+        assert list(data["weights"].toDense().values) == list(dense.values)
+        assert list(data["blendWeights"]) == [0.0, 0.0, 0.0]
+        assert reader.readWeights("eye").influences == ["c"]
+
+
+def test_not_a_skin_file(setup_path, tmp_path):
+    # Pytest imports
+    import pytest
+
+    # mGear imports
+    from mgear.core import skin_format
+
+    path = tmp_path / "bad.bSkin"
+    path.write_bytes(b"not a skin file at all, not even close")
+    assert not skin_format.isSkinFile(str(path))
+    with pytest.raises(skin_format.SkinFormatError):
+        skin_format.readIndex(str(path))
+
+
+def test_hash_skin_data(setup_path, skin_data_dic):
+    # mGear imports
+    from mgear.core import skin_format
+    from mgear.core.weight_array import DenseWeights
+
+    dense = DenseWeights(["a", "b"], 2, [1.0, 0.0, 0.5, 0.5])
+    digest = skin_format.hashSkinData(skin_data_dic("body", dense))
+    assert digest == skin_format.hashSkinData(
+        skin_data_dic("body", dense.copy())
+    )
+
+    changed = dense.copy()
+    changed.values[2] = 0.4
+    changed.values[3] = 0.6
+    assert digest != skin_format.hashSkinData(skin_data_dic("body", changed))
+
+    method = skin_data_dic("body", dense)
+    method["skinningMethod"] = 1
+    assert digest != skin_format.hashSkinData(method)
@@ -0,0 +1,129 @@
+"""mgear.core.skin_tools test"""
+
+import pytest
+
+
+
+def test_write_read_formats(setup_path, tmp_path, skin_data_dic):
+    # mGear imports
+    from mgear.core import skin_tools
+    from mgear.core.weight_array import DenseWeights
+
+    dense = DenseWeights(["a", "b"], 3, [1.0, 0.0, 0.5, 0.5, 0.0, 1.0])
+    for ext in (
+        skin_tools.FILE_EXT,
+        skin_tools.FILE_JSON_EXT,
+        skin_tools.FILE_BIN_EXT,
+    ):
+        path = str(tmp_path / ("body" + ext))
+        skin_tools.writeSkinFile(path, [skin_data_dic("body", dense)])
+        (data,) = skin_tools.readSkinFile(path)
+        assert data["vertexCount"] == 3
+        assert list(data["weights"].toDense().values) == list(dense.values)
+        assert skin_tools.listObjects(path) == [
+            {"objName": "body", "vertexCount": 3, "influences": ["a", "b"]}
+        ]
+        assert skin_tools.validateFile(path) == []
+
+
+def test_diff_weights(setup_path):
+    # mGear imports
+    from mgear.core import skin_tools
+    from mgear.core.weight_array import DenseWeights
+
+    weightsA = DenseWeights(["a", "b"], 3, [1.0, 0.0, 0.5, 0.5, 0, 1.0])
+    weightsB = DenseWeights(["a", "c"], 3, [1.0, 0.0, 0.25, 0.75, 0, 0])
+    diff = skin_tools.diffWeights(weightsA.toSparse(), weightsB.toSparse())
+    assert diff["added"] == ["c"]
+    assert diff["removed"] == ["b"]
+    assert list(diff["vertices"]) == [0.0, 1.5, 1.0]
+    assert diff["influences"] == {"a": 0.25, "b": 1.0, "c": 0.75}
+    assert diff["maxDelta"] == 1.5
+
+    other = DenseWeights(["a"], 2, [1.0, 1.0]).toSparse()
+    assert skin_tools.diffWeights(weightsA.toSparse(), other) is None
+
+
+def test_diff_weights_numpy_parity(setup_path, monkeypatch):
+    pytest.importorskip("numpy")
+    # mGear imports
+    from mgear.core import skin_tools
+    from mgear.core import weight_array
+    from mgear.core.weight_array import DenseWeights
+
+    weightsA = DenseWeights(
+        ["a", "b", "c"], 3, [1.0, 0, 0, 0.5, 0.5, 0, 0.2, 0.3, 0.5]
+    ).toSparse()
+    weightsB = DenseWeights(
+        ["c", "a", "d"], 3, [0, 1.0, 0, 0, 0.25, 0.75, 0.5, 0.2, 0.3]
+    ).toSparse()
+
+    vectorized = skin_tools.diffWeights(weightsA, weightsB)
+    monkeypatch.setattr(weight_array, "numpy", None)
+    monkeypatch.setattr(skin_tools, "numpy", None)
+    pure = skin_tools.diffWeights(weightsA, weightsB)
+    assert list(vectorized.pop("vertices")) == pytest.approx(
+        list(pure.pop("vertices"))
+    )
+    assert vectorized.pop("influences") == pytest.approx(
+        pure.pop("influences")
+    )
+    assert vectorized.pop("maxDelta") == pytest.approx(pure.pop("maxDelta"))
+    assert vectorized == pure
+
+
+def test_merge_and_validate(setup_path, tmp_path, skin_data_dic):
+    # mGear imports
+    from mgear.core import skin_tools
+    from mgear.core.weight_array import DenseWeights
+
+    body = DenseWeights(["a"], 2, [1.0, 1.0])
+    newBody = DenseWeights(["a"], 2, [0.5, 1.0])
+    eye = DenseWeights(["b"], 1, [1.0])
+    pathA = str(tmp_path / "a.jSkin")
+    pathB = str(tmp_path / "b.gSkin")
+    merged = str(tmp_path / "merged.bSkin")
+    skin_tools.writeSkinFile(
+        pathA, [skin_data_dic("body", body), skin_data_dic("eye", eye)]
+    )
+    skin_tools.writeSkinFile(pathB, [skin_data_dic("body", newBody)])
+
+    assert skin_tools.mergeSkinFiles([pathA, pathB], merged) == ["body", "eye"]
+    errors = skin_tools.validateFile(merged)
+    assert errors == [
+        "body: 1 vertices not normalized (max deviation 0.500000)"
+    ]
+    diff = skin_tools.diffFiles(pathA, merged)
+    assert diff["added"] == diff["removed"] == []
+    assert diff["objects"]["body"]["maxDelta"] == 0.5
+    assert diff["objects"]["eye"]["maxDelta"] == 0.0
+
+    conditioned = str(tmp_path / "conditioned.jSkin")
+    skin_tools.conditionSkinFile(merged, conditioned)
+    assert skin_tools.validateFile(conditioned) == []
+    assert skin_tools.main(["validate", conditioned]) == 0
+
+
+def test_index_sidecar(setup_path, tmp_path, skin_data_dic):
+    # mGear imports
+    from mgear.core import skin_format
+    from mgear.core import skin_tools
+    from mgear.core.weight_array import DenseWeights
+
+    path = str(tmp_path / "body.gSkin")
+    dense = DenseWeights(["a", "b"], 2, [1.0, 0.0, 0.5, 0.5])
+    skin_tools.writeSkinFile(path, [skin_data_dic("body", dense)])
+    entries = skin_format.readIndexSidecar(path)
+    assert entries == [
+        {"objName": "body", "vertexCount": 2, "influences": ["a", "b"]}
+    ]
+
+    # rewritten without sidecar, the sidecar is stale and only rebuilt on
+    # a cached list
+    with open(path, "ab") as fp:
+        fp.write(b"\0")
+    assert skin_format.readIndexSidecar(path) is None
+    assert skin_tools.listObjects(path) == entries
+    assert skin_format.readIndexSidecar(path) is None
+    assert skin_tools.listObjects(path, cache=True) == entries
+    assert skin_format.readIndexSidecar(path) == entries
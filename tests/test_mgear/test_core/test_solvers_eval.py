@@ -0,0 +1,226 @@
+"""mgear.core.solvers_eval test"""
+
+import math
+
+import pytest
+
+
+def _close(a, b, tol=1e-6):
+    return len(a) == len(b) and all(abs(x - y) < tol for x, y in zip(a, b))
+
+
+def _translation(x, y, z):
+    return (1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1, 0, x, y, z, 1)
+
+
+def test_ikfk2bone_ik(setup_path):
+    # mGear imports
+    from mgear.core import solvers_eval
+
+    root = _translation(0, 0, 0)
+    upv = _translation(1, 5, 0)
+    ikrefs = [_translation(2, 0, 0), _translation(4, 0, 0)]
+    result = solvers_eval.ikfk2bone(
+        [root, root], ikrefs, upv, root, root, root, 1.5, 1.5, blend=1.0
+    )
+    assert sorted(result) == sorted(solvers_eval.IKFK_OUTPUTS)
+
+    # the elbow bends toward the up vector
+    h = math.sqrt(1.5 ** 2 - 1)
+    outA, outB = result["outA"][0], result["outB"][0]
+    assert _close(outA[:3], (1, h, 0))
+    assert _close(outA[12:15], (0, 0, 0))
+    assert _close(outB[12:15], (1, h, 0))
+    assert _close(outB[:3], (1, -h, 0))
+    assert _close(result["outCenter"][0][12:15], (1, h, 0))
+    # the center bisects the elbow angle
+    assert _close(result["outCenter"][0][:3], (1, 0, 0))
+    assert _close(result["outEff"][0][12:15], (2, 0, 0))
+
+    # stretched to the effector, the chain is straight
+    outA, outB = result["outA"][1], result["outB"][1]
+    assert _close(outA[:3], (2, 0, 0))
+    assert _close(outB[12:15], (2, 0, 0))
+    assert _close(result["outEff"][1][12:15], (4, 0, 0))
+
+    # max stretch
+    (outEff,) = solvers_eval.ikfk2bone(
+        [root], [_translation(6, 0, 0)], upv, root, root, root, 1.5, 1.5,
+        blend=1.0
+    )["outEff"]
+    assert _close(outEff[12:15], (4.5, 0, 0))
+
+    # outputs in the parent space
+    parents = {"outEff": _translation(1, 0, 0)}
+    (outEff,) = solvers_eval.ikfk2bone(
+        [root], ikrefs[:1], upv, root, root, root, 1.5, 1.5, blend=1.0,
+        parents=parents
+    )["outEff"]
+    assert _close(outEff[12:15], (1, 0, 0))
+
+
+def test_ikfk2bone_fk_and_blend(setup_path):
+    # mGear imports
+    from mgear.core import solvers_eval
+
+    root = _translation(0, 0, 0)
+    fk0 = root
+    fk1 = _translation(0, 2, 0)
+    fk2 = _translation(0, 2, 3)
+    result = solvers_eval.ikfk2bone(
+        [root], [root], root, [fk0], [fk1], [fk2], 2, 3, blend=0.0
+    )
+    assert _close(result["outA"][0], (0, 2, 0, 0, -1, 0, 0, 0,
+                                      0, 0, 1, 0, 0, 0, 0, 1))
+    assert _close(result["outB"][0][:3], (0, 0, 3))
+    assert _close(result["outB"][0][12:15], (0, 2, 0))
+    assert result["outEff"][0] == fk2
+
+    # FK controls on the IK pose, the blend gives the same pose
+    upv = _translation(1, 5, 0)
+    ikref = _translation(2, 0, 0)
+    ik = solvers_eval.ikfk2bone(
+        [root], [ikref], upv, root, root, root, 1.5, 1.5, blend=1.0
+    )
+    fks = []
+    for name in ("outA", "outB", "outEff"):
+        t, q, _ = solvers_eval._decompose(ik[name][0])
+        fks.append(solvers_eval._compose(t, q, (1, 1, 1)))
+    blended = solvers_eval.ikfk2bone(
+        [root] * 3, [ikref] * 3, upv, fks[0], fks[1], fks[2], 1.5, 1.5,
+        blend=[0.0, 0.5, 1.0]
+    )
+    for name in ("outA", "outB", "outEff"):
+        for m in blended[name]:
+            assert _close(m, ik[name][0], 1e-5)
+
+
+def test_roll_spline_kine(setup_path):
+    # mGear imports
+    from mgear.core import solvers_eval
+
+    controls = [_translation(0, 0, 0), _translation(10, 0, 0)]
+    (frame,) = solvers_eval.roll_spline_kine(
+        [controls], [controls], [0, 0], [0.0, 0.5, 1.0]
+    )
+    assert _close(frame[1], _translation(5, 0, 0))
+    assert _close(frame[2], _translation(10, 0, 0))
+
+    # roll around the spline
+    (frame,) = solvers_eval.roll_spline_kine(
+        [controls], [controls], [90, 90], [0.5],
+        output_parent=_translation(0, 1, 0)
+    )
+    assert _close(frame[0][4:7], (0, 0, 1))
+    assert _close(frame[0][12:15], (5, -1, 0))
+
+    # the bezier is slower at the ends, the resample evens the speed
+    (frame,) = solvers_eval.roll_spline_kine(
+        [controls], [controls], [0, 0], [0.25]
+    )
+    assert frame[0][12] < 2.5
+    for absolute in (False, True):
+        (frame,) = solvers_eval.roll_spline_kine(
+            [controls], [controls], [0, 0], [0.25], resample=True,
+            subdiv=11, absolute=absolute
+        )
+        assert _close(frame[0][12:15], (2.5, 0, 0))
+
+
+def test_slide_curve(setup_path):
+    # mGear imports
+    from mgear.core import solvers_eval
+
+    line = [(0, 0, 0), (1, 0, 0), (2, 0, 0), (3, 0, 0)]
+    frames = solvers_eval.slide_curve(
+        [line] * 3,
+        4,
+        slave_length=[3, 1.5, 4],
+        master_length=3,
+        position=[0, 1, 0],
+    )
+    expected = [
+        [0, 1, 2, 3],
+        # half the length, at the end of the curve
+        [1.5, 2, 2.5, 3],
+        # longer than the curve, continues along the end tangent
+        [0, 4 / 3.0, 8 / 3.0, 4],
+    ]
+    for points, xs in zip(frames, expected):
+        for point, x in zip(points, xs):
+            assert _close(point, (x, 0, 0), 1e-4)
+
+    # stretch, without softness
+    (points,) = solvers_eval.slide_curve(
+        [line], 4, slave_length=1.5, master_length=2, softness=0
+    )
+    assert _close(points[-1], (2.25, 0, 0), 1e-4)
+
+    (points,) = solvers_eval.slide_curve(
+        [line], 2, slave_length=3, master_length=3,
+        master_matrix=_translation(0, 0, 1)
+    )
+    assert _close(points[1], (3, 0, 1), 1e-4)
+
+
+def test_squash_stretch(setup_path):
+    # mGear imports
+    from mgear.core import solvers_eval
+
+    result = solvers_eval.squash_stretch(
+        (1, 1, 1), driver=[3, 6, 1, 6, 6], axis=[0, 0, 0, 1, 0],
+        blend=[1, 1, 1, 1, 0.5]
+    )
+    assert _close(result[0], (1, 1, 1))
+    assert _close(result[1], (1, 0.5, 0.5))
+    assert _close(result[2], (1, 1.5, 1.5))
+    assert _close(result[3], (0.5, 1, 0.5))
+    assert _close(result[4], (1, 0.75, 0.75))
+
+    # clamped scale
+    (result,) = solvers_eval.squash_stretch(
+        [(2, 2, 2)], driver=6, stretch=-2
+    )
+    assert _close(result, (2, 0.0001, 0.0001))
+
+    with pytest.raises(ValueError):
+        solvers_eval.squash_stretch([(1, 1, 1)], driver=[1, 2])
+
+
+def test_spine_point_at(setup_path):
+    # mGear imports
+    from mgear.core import solvers_eval
+
+    s = math.sqrt(0.5)
+    result = solvers_eval.spine_point_at(
+        (0, 0, 0), [(0, 0, 90), (0, 0, 90), (90, 0, 0), (0, 0, 0)],
+        axe=[0, 2, 1, 4], blend=[0.5, 0.5, 1.0, 0.5]
+    )
+    assert _close(result[0], (s, s, 0))
+    assert _close(result[1], (0, 0, 1))
+    assert _close(result[2], (0, 0, 1))
+    assert _close(result[3], (0, -1, 0))
+
+
+def test_spring(setup_path):
+    # mGear imports
+    from mgear.core import solvers_eval
+
+    goals = [(0, 0, 0), (1, 0, 0), (1, 0, 0), (1, 0, 0)]
+    result = solvers_eval.spring(goals, damping=0.5, stiffness=0.5)
+    xs = [p[0] for p in result]
+    assert _close(xs, [0, 0.5, 0.875, 1.03125])
+
+    # full stiffness follows the goal, no intensity gives the goal
+    result = solvers_eval.spring(goals, stiffness=1.0)
+    assert _close([p[0] for p in result], [0, 1, 1, 1])
+    result = solvers_eval.spring(
+        goals, damping=0.5, stiffness=0.5, intensity=0.0
+    )
+    assert _close([p[0] for p in result], [0, 1, 1, 1])
+
+    # the simulation restarts when the time jumps
+    result = solvers_eval.spring(
+        goals, times=[0, 1, 5, 6], damping=0.5, stiffness=0.5
+    )
+    assert _close([p[0] for p in result], [0, 0.5, 1, 1])
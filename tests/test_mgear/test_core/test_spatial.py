@@ -0,0 +1,93 @@
+"""mgear.core.spatial test"""
+
+import random
+
+
+def _random_points(count, seed):
+    rand = random.Random(seed)
+    return [
+        (rand.uniform(-5, 5), rand.uniform(-5, 5), rand.uniform(-5, 5))
+        for _ in range(count)
+    ]
+
+
+def _dist_sq(a, b):
+    return sum((a[i] - b[i]) ** 2 for i in range(3))
+
+
+def test_kdtree_matches_brute_force(setup_path):
+    # mGear imports
+    from mgear.core.spatial import KDTree
+
+    points = _random_points(500, 1)
+    tree = KDTree(points, leafSize=4)
+    for query in _random_points(50, 2):
+        distances = sorted(
+            (_dist_sq(query, p), i) for i, p in enumerate(points)
+        )
+        index, dist = tree.nearest(query)
+        assert index == distances[0][1]
+        assert abs(dist - distances[0][0]) < 1e-9
+
+        knn = tree.knn(query, 5)
+        assert [i for i, _ in knn] == [i for _, i in distances[:5]]
+
+        inside = sorted(i for i, _ in tree.within(query, 2.0))
+        assert inside == sorted(i for d, i in distances if d <= 4.0)
+
+
+def test_closest_point_on_triangle(setup_path):
+    # mGear imports
+    from mgear.core.spatial import closestPointOnTriangle
+
+    a, b, c = (0, 0, 0), (1, 0, 0), (0, 1, 0)
+    point, bary = closestPointOnTriangle((0.25, 0.25, 1.0), a, b, c)
+    assert point == (0.25, 0.25, 0.0)
+    assert bary == (0.5, 0.25, 0.25)
+
+    point, bary = closestPointOnTriangle((-1, -1, 0), a, b, c)
+    assert point == (0, 0, 0)
+    assert bary == (1.0, 0.0, 0.0)
+
+    point, bary = closestPointOnTriangle((2, 0.5, 0), a, b, c)
+    assert point == (1, 0, 0)
+
+
+def test_triangle_locator(setup_path):
+    # mGear imports
+    from mgear.core.spatial import TriangleLocator
+
+    # two quads side by side, split in triangles
+    points = [(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0), (2, 0, 0), (2, 1, 0)]
+    triangles = [0, 1, 2, 0, 2, 3, 1, 4, 5, 1, 5, 2]
+    locator = TriangleLocator(points, triangles)
+    tri, point, bary, dist = locator.closest((1.75, 0.1, 0.5))
+    assert tri == 2
+    assert abs(dist - 0.25) < 1e-9
+    assert abs(point[0] - 1.75) < 1e-9
+
+
+def test_mesh_locator(setup_path):
+    # mGear imports
+    from mgear.core import spatial
+
+    # two quads side by side, split in triangles
+    points = [(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0), (2, 0, 0), (2, 1, 0)]
+    triangles = [0, 1, 2, 0, 2, 3, 1, 4, 5, 1, 5, 2]
+    faceVertices = [(0, 1, 2, 3), (1, 4, 5, 2)]
+    locator = spatial.getMeshLocator(
+        points, triangles, [0, 0, 1, 1], faceVertices
+    )
+    queries = [(1.75, 0.1, 0.5), (0.2, 0.9, -1), (0.6, 0.4, 0), (5, 5, 5)]
+    assert locator.closestFaces(queries) == [1, 0, 0, 1]
+    # closest vertex of the closest face
+    assert locator.closestVertices(queries) == [4, 3, 1, 5]
+    closest = locator.closestPoints(queries)
+    assert all(abs(a - b) < 1e-9 for a, b in zip(closest[0], (1.75, .1, 0)))
+
+    # cached by points hash
+    assert spatial.getMeshLocator(list(points), triangles) is locator
+    moved = points[:-1] + [(2, 1, 0.5)]
+    assert spatial.getMeshLocator(moved, triangles) is not locator
+    spatial.clearMeshLocatorCache()
+    assert spatial.getMeshLocator(points, triangles) is not locator
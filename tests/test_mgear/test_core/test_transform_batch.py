@@ -0,0 +1,285 @@
+"""mgear.core.transform_batch test"""
+
+import math
+
+import pytest
+
+
+def _close(a, b, tol=1e-6):
+    return all(abs(x - y) < tol for x, y in zip(a, b))
+
+
+def test_chain_matrices(setup_path):
+    # mGear imports
+    from mgear.core import transform_batch
+
+    # planar chain in the XY plane, the normal is the plane normal
+    positions = [(0, 0, 0), (2, 0, 0), (2, 2, 0), (4, 4, 0)]
+    matrices = transform_batch.chain_matrices(positions, (0, 0, 1))
+    assert len(matrices) == 3
+    # "xz": X aims to the next position, Z is the normal
+    assert _close(matrices[0], (1, 0, 0, 0, 0, 1, 0, 0,
+                                0, 0, 1, 0, 0, 0, 0, 1))
+    assert _close(matrices[1], (0, 1, 0, 0, -1, 0, 0, 0,
+                                0, 0, 1, 0, 2, 0, 0, 1))
+    s = math.sqrt(0.5)
+    assert _close(matrices[2], (s, s, 0, 0, -s, s, 0, 0,
+                                0, 0, 1, 0, 2, 2, 0, 1))
+
+    negated = transform_batch.chain_matrices(positions, (0, 0, 1), True)
+    assert _close(negated[0][:3], (-1, 0, 0))
+
+    matrices2 = transform_batch.chain_matrices2(positions, (0, 0, 1))
+    assert len(matrices2) == 4
+    for m, m2 in zip(matrices, matrices2):
+        assert _close(m, m2)
+    # the last matrix keeps the orientation of the last segment
+    assert _close(matrices2[3][:12], matrices2[2][:12])
+    assert _close(matrices2[3][12:], (4, 4, 0, 1))
+
+    with pytest.raises(ValueError):
+        transform_batch.chain_matrices(positions, (0, 0, 1), axis="xx")
+
+
+def test_transpose_vector(setup_path):
+    # mGear imports
+    from mgear.core import transform_batch
+
+    # the rotation axis is kept
+    v = transform_batch.transpose_vector(
+        (0, 0, 1), ((0, 0, 0), (1, 0, 0)), ((0, 0, 0), (0, 1, 0))
+    )
+    assert _close(v, (0, 0, 1))
+    # 90 degrees turn, from X to Y around Z
+    v = transform_batch.transpose_vector(
+        (0, 1, 0), ((0, 0, 0), (1, 0, 0)), ((0, 0, 0), (0, 1, 0))
+    )
+    assert _close(v, (1, 0, 0)) or _close(v, (-1, 0, 0))
+    # same direction, unchanged
+    v = transform_batch.transpose_vector(
+        (0, 1, 0), ((0, 0, 0), (1, 0, 0)), ((1, 0, 0), (3, 0, 0))
+    )
+    assert _close(v, (0, 1, 0))
+
+
+def test_rotation_and_mirror(setup_path):
+    # mGear imports
+    from mgear.core import transform_batch
+
+    (m,) = transform_batch.rotation_from_axis_matrices(
+        [(0, 2, 0)], [(1, 0, 0)], "yx"
+    )
+    assert _close(m, (1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1))
+
+    looking = transform_batch.looking_at_matrices(
+        [(1, 2, 3)], [(1, 5, 3)], (1, 0, 0), "yx"
+    )
+    assert _close(looking[0][:12], m[:12])
+    assert _close(looking[0][12:], (1, 2, 3, 1))
+
+    matrix = tuple(float(v) for v in range(16))
+    (mirrored,) = transform_batch.mirror_matrices([matrix], "yz")
+    assert mirrored[0::4] == tuple(-v for v in matrix[0::4])
+    assert mirrored[1::4] == matrix[1::4]
+    # same as the multiplication by the mirror matrix
+    mirror = list(transform_batch.IDENTITY)
+    mirror[5] = -1.0
+    (zx,) = transform_batch.mirror_matrices([matrix], "zx")
+    (product,) = transform_batch.multiply_matrices([matrix], mirror)
+    assert _close(zx, product)
+
+
+def test_slerp_quaternions(setup_path):
+    # mGear imports
+    from mgear.core import transform_batch
+
+    half = math.sqrt(0.5)
+    q1 = [(0, 0, 0, 1), (0, 0, 0, 1), (0, 0, 0, 1)]
+    # 90 degrees around z, the last one on the other hemisphere
+    q2 = [(0, 0, half, half), (0, 0, half, half), (0, 0, -half, -half)]
+    result = transform_batch.slerp_quaternions(q1, q2, [0.0, 0.5, 0.5])
+    assert _close(result[0], (0, 0, 0, 1))
+    angle = math.radians(22.5)
+    assert _close(result[1], (0, 0, math.sin(angle), math.cos(angle)))
+    assert _close(result[2], result[1])
+
+    # close quaternions use a linear blend
+    (q,) = transform_batch.slerp_quaternions([(0, 0, 0, 1)], [q1[0]], 0.3)
+    assert _close(q, (0, 0, 0, 1))
+
+
+def test_parity_with_transform(setup_path):
+    pytest.importorskip("pymel.core")
+    # Maya imports
+    from pymel.core import datatypes
+
+    # mGear imports
+    from mgear.core import transform
+
+    positions = [
+        datatypes.Vector(0, 0, 0),
+        datatypes.Vector(1, 2, 0.5),
+        datatypes.Vector(2, 1, -1),
+        datatypes.Vector(4, 3, 0),
+    ]
+    for axis in ("xz", "xy", "yx", "zy"):
+        for negate in (False, True):
+            ref = transform.getChainTransform(
+                positions, datatypes.Vector(0.2, 0, 1), negate, axis
+            )
+            batch = transform.getChainTransformBatch(
+                positions, datatypes.Vector(0.2, 0, 1), negate, axis
+            )
+            for a, b in zip(ref, batch):
+                assert a.isEquivalent(b, 1e-5)
+            ref = transform.getChainTransform2(
+                positions, datatypes.Vector(0.2, 0, 1), negate, axis
+            )
+            batch = transform.getChainTransform2Batch(
+                positions, datatypes.Vector(0.2, 0, 1), negate, axis
+            )
+            for a, b in zip(ref, batch):
+                assert a.isEquivalent(b, 1e-5)
+
+    matrices = transform.getChainTransform(
+        positions, datatypes.Vector(0, 0, 1)
+    )
+    for axis in ("yz", "xy", "zx"):
+        ref = [
+            transform.getSymmetricalTransform(datatypes.Matrix(m), axis)
+            for m in matrices
+        ]
+        batch = transform.getSymmetricalTransformBatch(matrices, axis)
+        for a, b in zip(ref, batch):
+            assert datatypes.Matrix(a).isEquivalent(b, 1e-5)
+
+    q1 = datatypes.Quaternion(0.1, 0.2, 0.3, 0.9).normal()
+    q2 = datatypes.Quaternion(-0.4, 0.1, -0.2, -0.8).normal()
+    ref = transform.quaternionSlerp(
+        datatypes.Quaternion(q1), datatypes.Quaternion(q2), 0.3
+    )
+    (batch,) = transform.quaternionSlerpBatch([q1], [q2], 0.3)
+    assert ref.isEquivalent(batch, 1e-5)
+
+
+def test_pole_vectors(setup_path):
+    # mGear imports
+    from mgear.core import transform_batch
+
+    r2 = math.sqrt(2)
+    starts = [(0, 0, 0), (0, 0, 0), (0, 0, 0)]
+    mids = [(1, 1, 0), (1, 1, 0), (1, 1, 0)]
+    # same length bones, longer end bone, and a straight chain
+    ends = [(2, 0, 0), (3, -1, 0), (2, 2, 0)]
+    poles = transform_batch.pole_vectors(starts, mids, ends, 2.0)
+    assert _close(poles[0], (1, 1 + 2 * r2, 0))
+    assert _close(poles[1], (1, 1 + 3 * r2, 0))
+    # no bend, the pole stays on the mid joint
+    assert _close(poles[2], (1, 1, 0))
+
+    matrices = transform_batch.translation_matrices(poles)
+    assert _close(matrices[0][:12], transform_batch.IDENTITY[:12])
+    assert _close(matrices[0][12:], poles[0] + (1,))
+
+
+def _translate(v):
+    return (1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1, 0, v[0], v[1], v[2], 1)
+
+
+def test_inverse_matrices(setup_path):
+    # mGear imports
+    from mgear.core import transform_batch
+
+    (r,) = transform_batch.euler_matrices([(0.3, -1.2, 0.7)], "zxy")
+    scale = (2, 0, 0, 0, 0, 0.5, 0, 0, 0, 0, -3, 0, 0, 0, 0, 1)
+    (m,) = transform_batch.multiply_matrices(
+        transform_batch.multiply_matrices([scale], r), _translate((1, 2, 3))
+    )
+    (inv,) = transform_batch.inverse_matrices([m])
+    (identity,) = transform_batch.multiply_matrices([m], inv)
+    assert _close(identity, transform_batch.IDENTITY)
+
+    with pytest.raises(ValueError):
+        transform_batch.inverse_matrices([(0.0,) * 16])
+
+
+def test_matrices_to_channels(setup_path):
+    # mGear imports
+    from mgear.core import transform_batch
+
+    angles = (0.3, -1.2, 0.7)
+    for index, order in enumerate(transform_batch.ROTATE_ORDERS):
+        (r,) = transform_batch.euler_matrices([angles], index)
+        scale = (2, 0, 0, 0, 0, 0.5, 0, 0, 0, 0, 3, 0, 0, 0, 0, 1)
+        (m,) = transform_batch.multiply_matrices(
+            transform_batch.multiply_matrices([scale], r),
+            _translate((1, 2, 3)),
+        )
+        (channels,) = transform_batch.matrices_to_channels([m], order)
+        assert _close(channels, (1, 2, 3) + angles + (2, 0.5, 3))
+
+    # gimbal lock, the rotation of the middle axis is +-90 degrees
+    (r,) = transform_batch.euler_matrices([(0.4, math.pi / 2, 0.0)])
+    (channels,) = transform_batch.matrices_to_channels([r])
+    assert _close(channels[3:6], (0.4, math.pi / 2, 0.0))
+
+    # negative scale goes to X
+    mirror = (-1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1)
+    (channels,) = transform_batch.matrices_to_channels([mirror])
+    assert _close(channels, (0, 0, 0, 0, 0, 0, -1, 1, 1))
+
+
+def test_matrices_to_channels_filter(setup_path):
+    # mGear imports
+    from mgear.core import transform_batch
+
+    # a rotation turning over 180 degrees keeps going
+    rotations = [(0.0, 0.0, math.radians(a)) for a in range(0, 400, 40)]
+    matrices = transform_batch.euler_matrices(rotations)
+    channels = transform_batch.matrices_to_channels(
+        matrices, previous=(0, 0, 0)
+    )
+    for c, rotation in zip(channels, rotations):
+        assert _close(c[3:6], rotation)
+
+    # the equivalent rotation closest to the previous one
+    angles = (math.radians(170), math.radians(10), math.radians(-170))
+    matrices = transform_batch.euler_matrices([angles])
+    (channels,) = transform_batch.matrices_to_channels(
+        matrices, previous=(0, math.radians(170), 0)
+    )
+    flipped = (math.radians(-10), math.radians(170), math.radians(10))
+    assert _close(channels[3:6], flipped)
+
+
+def test_matrices_to_channels_offsets(setup_path):
+    # mGear imports
+    from mgear.core import transform_batch
+
+    multiply = transform_batch.multiply_matrices
+    rotate_axis = (0.2, 0.1, -0.3)
+    joint_orient = (0.0, 0.5, 1.0)
+    rp, rpt, sp, spt = (1, 2, 0), (0, 1, 0), (0.5, 0, 1), (0, 0, 2)
+    (ra,) = transform_batch.euler_matrices([rotate_axis])
+    (jo,) = transform_batch.euler_matrices([joint_orient])
+    (r,) = transform_batch.euler_matrices([(0.3, -1.2, 0.7)], "yzx")
+    scale = (2, 0, 0, 0, 0, 0.5, 0, 0, 0, 0, 3, 0, 0, 0, 0, 1)
+    # the transform matrix composition
+    m = [_translate([-v for v in sp])]
+    for matrix in (
+        scale,
+        _translate(sp),
+        _translate(spt),
+        _translate([-v for v in rp]),
+        ra,
+        r,
+        jo,
+        _translate(rp),
+        _translate(rpt),
+        _translate((1, 2, 3)),
+    ):
+        m = multiply(m, [matrix])
+    (channels,) = transform_batch.matrices_to_channels(
+        m, "yzx", rotate_axis, joint_orient, (rp, rpt, sp, spt)
+    )
+    assert _close(channels, (1, 2, 3, 0.3, -1.2, 0.7, 2, 0.5, 3))
@@ -0,0 +1,161 @@
+"""mgear.core.weight_array test"""
+
+import pytest
+
+
+def test_dense_influence_dict_roundtrip(setup_path):
+    # mGear imports
+    from mgear.core.weight_array import DenseWeights
+
+    weights = {"jnt_a": {0: 1.0, 2: 0.25}, "jnt_b": {"1": 1.0, "2": 0.75}}
+    dense = DenseWeights.fromInfluenceDict(weights, 3, ["jnt_a", "jnt_b"])
+    assert list(dense.values) == [1.0, 0.0, 0.0, 1.0, 0.25, 0.75]
+    assert list(dense.column(1)) == [0.0, 1.0, 0.75]
+    assert list(dense.row(2)) == [0.25, 0.75]
+    assert dense.toInfluenceDict() == {
+        "jnt_a": {0: 1.0, 2: 0.25},
+        "jnt_b": {1: 1.0, 2: 0.75},
+    }
+
+    legacy = DenseWeights.fromInfluenceDict({"jnt_a": [0.5, 0.5]}, 2)
+    assert legacy.toInfluenceDict(skipZero=False) == {"jnt_a": [0.5, 0.5]}
+
+
+def test_sparse_dense_roundtrip(setup_path):
+    # mGear imports
+    from mgear.core.weight_array import DenseWeights
+    from mgear.core.weight_array import SparseWeights
+
+    dense = DenseWeights(
+        ["a", "b", "c"], 3, [0.5, 0.0, 0.5, 0.0, 1.0, 0.0, 0.2, 0.3, 0.5]
+    )
+    sparse = dense.toSparse()
+    assert list(sparse.indptr) == [0, 2, 3, 6]
+    assert list(sparse.indices) == [0, 2, 1, 0, 1, 2]
+    assert sparse.nnz == 6
+    assert list(sparse.row(1)[0]) == [1]
+    assert list(sparse.toDense().values) == list(dense.values)
+    assert sparse.toInfluenceDict() == dense.toInfluenceDict()
+
+    pruned = SparseWeights.fromDense(dense, threshold=0.25)
+    assert list(pruned.indices) == [0, 2, 1, 1, 2]
+
+
+def test_sparse_remap_influences(setup_path):
+    # mGear imports
+    from mgear.core.weight_array import DenseWeights
+
+    sparse = DenseWeights(["a", "b", "c"], 2, [0.5, 0.5, 0, 0, 0.2, 0.8])
+    remapped = sparse.toSparse().remapInfluences(["c", "a", "d"])
+    assert remapped.influences == ["c", "a", "d"]
+    assert list(remapped.toDense().values) == [0, 0.5, 0, 0.8, 0, 0]
+
+
+def test_condition_weights(setup_path):
+    # mGear imports
+    from mgear.core.weight_array import DenseWeights
+    from mgear.core.weight_array import conditionWeights
+
+    dense = DenseWeights(
+        ["a", "b", "c", "d"],
+        2,
+        [0.4, 0.3, 0.2, 0.1, 0.0005, 0.9995, 0.0, 0.0],
+    )
+    weights, report = conditionWeights(
+        dense, pruneThreshold=0.001, maxInfluences=2, quantizeBits=8
+    )
+    values = list(weights.toDense().values)
+    assert values[4:] == [0.0, 1.0, 0.0, 0.0]
+    # 0.4 / 0.7 and 0.3 / 0.7 snapped to 1/255 steps, still normalized
+    assert abs(sum(values[:4]) - 1.0) < 1e-9
+    assert values[2:4] == [0.0, 0.0]
+    assert all(abs(w * 255 - round(w * 255)) < 1e-9 for w in values)
+    assert report["limitedVertices"] == 1
+    assert abs(report["prune"] - 0.0005) < 1e-12
+    assert abs(report["limit"] - 0.3) < 1e-12
+    assert report["quantize"] < 2.0 / 255
+    assert report["total"] >= report["limit"]
+
+
+def _csr(weights):
+    return (
+        weights.influences,
+        list(weights.indptr),
+        list(weights.indices),
+        list(weights.data),
+    )
+
+
+def test_numpy_parity(setup_path, monkeypatch):
+    pytest.importorskip("numpy")
+    # mGear imports
+    from mgear.core import weight_array
+    from mgear.core.weight_array import DenseWeights
+    from mgear.core.weight_array import SparseWeights
+
+    influenceDict = {
+        "a": {"0": 0.5, "2": 0.25, "3": 0.0},
+        "b": {0: 0.5, 1: 1.0},
+        "c": [0.0, 0.0, 0.75, 1.0],
+    }
+    sparse = DenseWeights(
+        ["a", "b", "c"], 3, [0.5, 0.5, 0, 0, 0.2, 0.8, 0.1, 0.6, 0.3]
+    ).toSparse()
+
+    def run():
+        return (
+            _csr(SparseWeights.fromInfluenceDict(influenceDict, 4)),
+            _csr(SparseWeights.fromInfluenceDict({}, 2, ["a"])),
+            _csr(sparse.remapInfluences(["c", "a", "d"])),
+            # a and c merged
+            _csr(sparse.remapIndices(["x", "y"], [0, -1, 0])),
+        )
+
+    vectorized = run()
+    monkeypatch.setattr(weight_array, "numpy", None)
+    assert vectorized == run()
+    assert vectorized[3] == (
+        ["x", "y"], [0, 1, 2, 3], [0, 0, 0], [0.5, 0.8, 0.4]
+    )
+
+
+def test_condition_weights_numpy_parity(setup_path, monkeypatch):
+    pytest.importorskip("numpy")
+    # mGear imports
+    from mgear.core import weight_array
+    from mgear.core.weight_array import DenseWeights
+    from mgear.core.weight_array import conditionWeights
+
+    # ties, zero rows, prunable and normalized rows
+    rows = [
+        [0.25, 0.25, 0.25, 0.25, 0.0, 0.0],
+        [0.4, 0.3, 0.2, 0.1, 0.0005, 0.0],
+        [0.0, 0.0, 0.0, 0.0, 0.0, 0.0],
+        [0.1, 0.1, 0.1, 0.2, 0.2, 0.3],
+        [0.5, 0.0, 0.0, 0.0, 0.0, 0.5],
+        [0.33, 0.33, 0.33, 0.0, 0.0, 0.0002],
+        [0.9, 0.8, 0.7, 0.6, 0.5, 0.4],
+    ]
+    dense = DenseWeights(
+        list("abcdef"), len(rows), [w for row in rows for w in row]
+    )
+    options = [
+        {"pruneThreshold": 0.001},
+        {"pruneThreshold": 0.001, "maxInfluences": 3, "quantizeBits": 8},
+        {"maxInfluences": 2, "normalize": False, "quantizeBits": 8},
+        {"maxInfluences": 4, "normalize": False},
+        {"quantizeBits": 4},
+    ]
+
+    def run():
+        return [conditionWeights(dense, **kwargs) for kwargs in options]
+
+    vectorized = run()
+    monkeypatch.setattr(weight_array, "numpy", None)
+    for (weights, report), (expected, expectedReport) in zip(
+        vectorized, run()
+    ):
+        assert _csr(weights) == _csr(expected)
+        assert report["limitedVertices"] == expectedReport["limitedVertices"]
+        for key, error in expectedReport.items():
+            assert abs(report[key] - error) < 1e-12
@@ -0,0 +1,61 @@
+"""mgear.core.weight_transfer test"""
+
+
+def _source():
+    # mGear imports
+    from mgear.core.weight_array import DenseWeights
+
+    points = [(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0)]
+    triangles = [0, 1, 2, 0, 2, 3]
+    weights = DenseWeights(
+        ["a", "b"], 4, [1.0, 0.0, 0.0, 1.0, 0.0, 1.0, 1.0, 0.0]
+    )
+    return points, triangles, weights
+
+
+def test_closest_point_transfer(setup_path):
+    # mGear imports
+    from mgear.core import weight_transfer
+
+    points, _, weights = _source()
+    result = weight_transfer.transferWeights(
+        weights, points, [(0.1, 0.1, 0.0), (0.9, 0.2, 0.5)]
+    )
+    assert result.influences == ["a", "b"]
+    assert list(result.toDense().values) == [1.0, 0.0, 0.0, 1.0]
+
+
+def test_barycentric_transfer(setup_path):
+    # mGear imports
+    from mgear.core import weight_transfer
+
+    points, triangles, weights = _source()
+    result = weight_transfer.transferWeights(
+        weights,
+        points,
+        [(0.5, 0.0, 1.0)],
+        mode=weight_transfer.BARYCENTRIC,
+        triangles=triangles,
+    )
+    assert list(result.toDense().values) == [0.5, 0.5]
+
+
+def test_inverse_distance_transfer(setup_path):
+    # mGear imports
+    from mgear.core import weight_transfer
+
+    points, _, weights = _source()
+    result = weight_transfer.transferWeights(
+        weights,
+        points,
+        [(0.5, 0.0, 0.0), (1.0, 1.0, 0.0)],
+        mode=weight_transfer.INVERSE_DISTANCE,
+        k=2,
+    )
+    values = list(result.toDense().values)
+    assert abs(values[0] - 0.5) < 1e-9
+    assert abs(values[1] - 0.5) < 1e-9
+    # exact match takes the source weights
+    assert values[2:] == [0.0, 1.0]
+    rows = [sum(values[i : i + 2]) for i in (0, 2)]
+    assert all(abs(r - 1.0) < 1e-9 for r in rows)
@@ -0,0 +1,36 @@
+"""mgear.core.wmap_format test"""
+
+
+def test_find_runs(setup_path):
+    # mGear imports
+    from mgear.core import wmap_format
+
+    values = [0.0] * 5 + [0.5, 1.0, 0.25] + [1.0] * 4 + [0.0, 0.0]
+    assert wmap_format.find_runs(values) == [
+        (wmap_format.RUN_ZERO, 0, 5),
+        (wmap_format.RUN_VALUES, 5, 8),
+        (wmap_format.RUN_ONE, 8, 12),
+        (wmap_format.RUN_VALUES, 12, 14),
+    ]
+
+
+def test_wmapz_roundtrip(setup_path, tmp_path):
+    # mGear imports
+    from mgear.core import wmap_format
+
+    body = [0.0] * 100 + [0.5, 0.25, 0.125] + [1.0] * 100
+    eye = [0.3, 0.7]
+    path = str(tmp_path / ("cluster" + wmap_format.FILE_EXT))
+    size = wmap_format.write_wmapz(path, [("|body", body), ("|eye", eye)])
+    assert size < len(body) * 4
+
+    maps = wmap_format.read_wmapz(path)
+    assert [name for name, _ in maps] == ["|body", "|eye"]
+    assert list(maps[0][1]) == body
+    assert [round(w, 6) for w in maps[1][1]] == eye
+
+    wmap_format.write_wmapz(
+        path, [("|eye", eye)], wmap_format.FLOAT16, compress=False
+    )
+    ((_, values),) = wmap_format.read_wmapz(path)
+    assert all(abs(a - b) < 1e-3 for a, b in zip(values, eye))